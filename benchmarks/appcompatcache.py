@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of parsing Application Compatibility Cache cached entries."""
+
+import argparse
+import functools
+import struct
+import sys
+import timeit
+
+from winregrc import appcompatcache
+
+
+def _CreateValueDataWindows2003(number_of_cached_entries):
+  """Creates Windows 2003 Application Compatibility Cache value data.
+
+  Args:
+    number_of_cached_entries (int): number of cached entries.
+
+  Returns:
+    bytes: value data.
+  """
+  path_data_offset = 8 + (number_of_cached_entries * 24)
+
+  cached_entries_data = []
+  paths_data = []
+  for cached_entry_index in range(number_of_cached_entries):
+    path = f'\\??\\C:\\WINDOWS\\system32\\program{cached_entry_index:d}.exe'
+    path_data = path.encode('utf-16-le')
+    path_size = len(path_data)
+
+    cached_entries_data.append(struct.pack(
+        '<HHIQQ', path_size, path_size + 2, path_data_offset,
+        0x01c2f24476863500, 0x12000))
+    paths_data.extend([path_data, b'\x00\x00'])
+
+    path_data_offset += path_size + 2
+
+  return b''.join([
+      struct.pack('<II', 0xbadc0ffe, number_of_cached_entries),
+      *cached_entries_data, *paths_data])
+
+
+def _CreateValueDataWindowsXP(number_of_cached_entries):
+  """Creates Windows XP Application Compatibility Cache value data.
+
+  Args:
+    number_of_cached_entries (int): number of cached entries.
+
+  Returns:
+    bytes: value data.
+  """
+  cached_entries_data = []
+  for cached_entry_index in range(number_of_cached_entries):
+    path = f'\\??\\C:\\WINDOWS\\system32\\program{cached_entry_index:d}.exe'
+    path_data = path.encode('utf-16-le').ljust(528, b'\x00')
+
+    cached_entries_data.append(struct.pack(
+        '<528sQQQ', path_data, 0x01c2f24476863500, 0x12000,
+        0x01ca39e9c70ed362))
+
+  header_data = struct.pack(
+      '<IIII', 0xdeadbeef, number_of_cached_entries, 0, 0)
+
+  return b''.join([header_data.ljust(400, b'\x00'), *cached_entries_data])
+
+
+def _GetCachedEntryValues(cached_entry):
+  """Retrieves the values of a cached entry.
+
+  Args:
+    cached_entry (AppCompatCacheCachedEntry): cached entry.
+
+  Returns:
+    tuple[object]: values of the cached entry.
+  """
+  return (
+      cached_entry.cached_entry_size, cached_entry.data, cached_entry.file_size,
+      cached_entry.insertion_flags, cached_entry.last_modification_time,
+      cached_entry.last_update_time, cached_entry.path, cached_entry.shim_flags)
+
+
+def _ParseCachedEntriesOneByOne(parser, format_type, value_data):
+  """Parses the cached entries one by one.
+
+  Args:
+    parser (AppCompatCacheDataParser): parser.
+    format_type (int): format type.
+    value_data (bytes): value data.
+
+  Returns:
+    list[AppCompatCacheCachedEntry]: cached entries.
+  """
+  cache_header = parser.ParseHeader(format_type, value_data)
+
+  cached_entries = []
+  cached_entry_offset = cache_header.header_size
+  for cached_entry_index in range(cache_header.number_of_cached_entries):
+    cached_entry = parser.ParseCachedEntry(
+        format_type, value_data, cached_entry_index, cached_entry_offset)
+    cached_entries.append(cached_entry)
+
+    cached_entry_offset += cached_entry.cached_entry_size
+
+  return cached_entries
+
+
+def _ParseCachedEntriesInBatch(parser, format_type, value_data):
+  """Parses the cached entries in a single pass.
+
+  Args:
+    parser (AppCompatCacheDataParser): parser.
+    format_type (int): format type.
+    value_data (bytes): value data.
+
+  Returns:
+    list[AppCompatCacheCachedEntry]: cached entries.
+  """
+  cache_header = parser.ParseHeader(format_type, value_data)
+  return parser.ParseCachedEntries(format_type, value_data, cache_header)
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks parsing Application Compatibility Cache cached entries one '
+      'by one against parsing them in a single pass.'))
+
+  argument_parser.add_argument(
+      '--number_of_cached_entries', '--number-of-cached-entries',
+      dest='number_of_cached_entries', type=int, action='store', default=1024,
+      metavar='NUMBER', help='number of cached entries per value.')
+
+  argument_parser.add_argument(
+      '--repeat', dest='repeat', type=int, action='store', default=20,
+      metavar='NUMBER', help='number of times each benchmark is repeated.')
+
+  options = argument_parser.parse_args()
+
+  parser = appcompatcache.AppCompatCacheDataParser()
+
+  # pylint: disable=protected-access
+  for description, format_type, value_data in (
+      ('Windows XP', parser._FORMAT_TYPE_XP, _CreateValueDataWindowsXP(
+          options.number_of_cached_entries)),
+      ('Windows 2003', parser._FORMAT_TYPE_2003, _CreateValueDataWindows2003(
+          options.number_of_cached_entries))):
+    one_by_one_cached_entries = _ParseCachedEntriesOneByOne(
+        parser, format_type, value_data)
+    batch_cached_entries = _ParseCachedEntriesInBatch(
+        parser, format_type, value_data)
+
+    if len(batch_cached_entries) != len(one_by_one_cached_entries):
+      print(f'{description:s}: number of cached entries differ.')
+      return False
+
+    for cached_entry, expected_cached_entry in zip(
+        batch_cached_entries, one_by_one_cached_entries):
+      if (_GetCachedEntryValues(cached_entry) !=
+          _GetCachedEntryValues(expected_cached_entry)):
+        print(f'{description:s}: cached entries differ.')
+        return False
+
+    one_by_one_time = min(timeit.repeat(functools.partial(
+        _ParseCachedEntriesOneByOne, parser, format_type, value_data),
+        number=1, repeat=options.repeat))
+    batch_time = min(timeit.repeat(functools.partial(
+        _ParseCachedEntriesInBatch, parser, format_type, value_data),
+        number=1, repeat=options.repeat))
+
+    print((
+        f'{description:s} ({options.number_of_cached_entries:d} cached '
+        f'entries): one by one: {one_by_one_time * 1000:.2f} ms, single '
+        f'pass: {batch_time * 1000:.2f} ms '
+        f'({one_by_one_time / batch_time:.1f}x)'))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of the binary parsers on large synthetic values."""
+
+import argparse
+import functools
+import struct
+import sys
+import timeit
+import tracemalloc
+
+from winregrc import mru
+from winregrc import programscache
+from winregrc import sam
+
+
+def _CreateMRUStringValueData(number_of_characters):
+  """Creates string and shell item MRU value data.
+
+  Args:
+    number_of_characters (int): number of characters of the string.
+
+  Returns:
+    bytes: value data.
+  """
+  string_data = ('A' * number_of_characters).encode('utf-16-le')
+  return b''.join([string_data, b'\x00\x00', b'\x00\x00'])
+
+
+def _CreateProgramsCacheValueData(number_of_entries):
+  """Creates format version 9 Programs Cache value data.
+
+  Args:
+    number_of_entries (int): number of entries.
+
+  Returns:
+    bytes: value data.
+  """
+  # Every entry consists of an entry header, an empty shell item list and
+  # an entry footer.
+  entry_data = b''.join([struct.pack('<I', 2), b'\x00\x00', b'\x01'])
+
+  return b''.join([
+      struct.pack('<IH', 9, 0), entry_data * number_of_entries])
+
+
+def _CreateSAMVValueData(number_of_characters):
+  """Creates SAM V value data.
+
+  Args:
+    number_of_characters (int): number of characters of the username.
+
+  Returns:
+    bytes: value data.
+  """
+  username_data = ('A' * number_of_characters).encode('utf-16-le')
+
+  descriptors_data = [struct.pack('<III', 0, 0, 0)] * 17
+  descriptors_data[1] = struct.pack('<III', 0, len(username_data), 0)
+
+  return b''.join([*descriptors_data, username_data])
+
+
+def _Measure(function, repeat):
+  """Measures the time and peak memory allocations of a function.
+
+  Args:
+    function (function): function to measure.
+    repeat (int): number of times the function is repeated.
+
+  Returns:
+    tuple[float, int]: fastest time in seconds and peak size of the memory
+        allocated in bytes.
+  """
+  tracemalloc.start()
+  function()
+  _, peak_size = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  time = min(timeit.repeat(function, number=1, repeat=repeat))
+
+  return time, peak_size
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks the binary parsers on large synthetic values.'))
+
+  argument_parser.add_argument(
+      '--repeat', dest='repeat', type=int, action='store', default=5,
+      metavar='NUMBER', help='number of times each benchmark is repeated.')
+
+  argument_parser.add_argument(
+      '--size', dest='size', type=int, action='store', default=65536,
+      metavar='NUMBER', help=(
+          'number of entries or characters of the synthetic values.'))
+
+  options = argument_parser.parse_args()
+
+  mru_collector = mru.MostRecentlyUsedCollector()
+  programs_cache_parser = programscache.ProgramsCacheDataParser()
+  sam_parser = sam.SecurityAccountManagerDataParser()
+
+  # pylint: disable=protected-access
+  mru_value_data = _CreateMRUStringValueData(options.size)
+  programs_cache_value_data = _CreateProgramsCacheValueData(options.size)
+  sam_value_data = _CreateSAMVValueData(options.size)
+
+  for description, value_data, function in (
+      ('MRU string and shell item', mru_value_data, functools.partial(
+          mru_collector._ProcessMRUEntryStringAndShellItem, '', '',
+          mru_value_data)),
+      ('Programs Cache', programs_cache_value_data, functools.partial(
+          programs_cache_parser.Parse, programs_cache_value_data)),
+      ('SAM V value', sam_value_data, functools.partial(
+          sam_parser.ParseVValue, sam_value_data, sam.UserAccount()))):
+    time, peak_size = _Measure(function, options.repeat)
+
+    value_data_size = len(value_data)
+    print((
+        f'{description:s} ({value_data_size:d} bytes): {time * 1000:.2f} ms, '
+        f'peak memory allocated: {peak_size:d} bytes'))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
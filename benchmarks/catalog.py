@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of collecting the catalog of Windows Registry keys and values."""
+
+import argparse
+import functools
+import os
+import sys
+import timeit
+
+from dfwinreg import definitions as dfwinreg_definitions
+from dfwinreg import fake as dfwinreg_fake
+
+from winregrc import catalog
+
+
+def _CollectRecursively(collector_object, registry_key):
+  """Collects the catalog key descriptors with a recursive traversal.
+
+  This is the traversal used before the explicit stack traversal.
+
+  Args:
+    collector_object (CatalogCollector): catalog collector.
+    registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+
+  Yields:
+    CatalogKeyDescriptor: catalog key descriptor.
+  """
+  # pylint: disable=protected-access
+  yield collector_object._GetCatalogKeyDescriptor(registry_key)
+
+  for sub_key in registry_key.GetSubkeys():
+    yield from _CollectRecursively(collector_object, sub_key)
+
+
+def _CreateRegistryKey(depth, number_of_subkeys, number_of_values):
+  """Creates a synthetic Windows Registry key tree.
+
+  Args:
+    depth (int): depth of the tree.
+    number_of_subkeys (int): number of subkeys per key.
+    number_of_values (int): number of values per key.
+
+  Returns:
+    dfwinreg.FakeWinRegistryKey: root key of the tree.
+  """
+  registry_key = dfwinreg_fake.FakeWinRegistryKey(
+      '', key_path_prefix='HKEY_LOCAL_MACHINE\\Software')
+
+  parent_keys = [registry_key]
+  for _ in range(depth):
+    sub_keys = []
+    for parent_key in parent_keys:
+      for key_index in range(number_of_subkeys):
+        sub_key = dfwinreg_fake.FakeWinRegistryKey(f'Key{key_index:d}')
+        parent_key.AddSubkey(sub_key.name, sub_key)
+
+        for value_index in range(number_of_values):
+          registry_value = dfwinreg_fake.FakeWinRegistryValue(
+              f'Value{value_index:d}', data=b'\x00\x00\x00\x00',
+              data_type=dfwinreg_definitions.REG_DWORD)
+          sub_key.AddValue(registry_value)
+
+        sub_keys.append(sub_key)
+
+    parent_keys = sub_keys
+
+  return registry_key
+
+
+def _GetKeyPaths(collector_object, root_key, path=None):
+  """Retrieves the key paths of the catalog key descriptors.
+
+  Args:
+    collector_object (CatalogCollector): catalog collector.
+    root_key (dfwinreg.WinRegistryKey): root Windows Registry key.
+    path (Optional[str]): path of the Windows Registry file.
+
+  Returns:
+    list[str]: key paths.
+  """
+  return [
+      key_descriptor.key_path
+      for key_descriptor in collector_object.Collect(root_key, path=path)]
+
+
+def _GetKeyPathsRecursively(collector_object, root_key):
+  """Retrieves the key paths of the catalog key descriptors recursively.
+
+  Args:
+    collector_object (CatalogCollector): catalog collector.
+    root_key (dfwinreg.WinRegistryKey): root Windows Registry key.
+
+  Returns:
+    list[str]: key paths.
+  """
+  return [
+      key_descriptor.key_path
+      for key_descriptor in _CollectRecursively(collector_object, root_key)]
+
+
+def _Measure(description, functions, repeat):
+  """Measures and prints the time of functions that collect key descriptors.
+
+  Args:
+    description (str): description of the benchmark.
+    functions (list[tuple[str, function]]): description and function that
+        collects the key descriptors.
+    repeat (int): number of times each function is repeated.
+
+  Returns:
+    bool: True if all functions collected the same key descriptors.
+  """
+  expected_key_paths = None
+
+  times = []
+  for function_description, function in functions:
+    key_paths = function()
+    if expected_key_paths is None:
+      expected_key_paths = key_paths
+    elif key_paths != expected_key_paths:
+      print(f'{description:s}: {function_description:s} key paths differ.')
+      return False
+
+    time = min(timeit.repeat(function, number=1, repeat=repeat))
+    times.append(f'{function_description:s}: {time * 1000:.2f} ms')
+
+  number_of_keys = len(expected_key_paths)
+  print(f'{description:s} ({number_of_keys:d} keys): {", ".join(times):s}')
+
+  return True
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks collecting the catalog of Windows Registry keys and values '
+      'recursively, with an explicit stack and with worker processes.'))
+
+  argument_parser.add_argument(
+      '--repeat', dest='repeat', type=int, action='store', default=3,
+      metavar='NUMBER', help='number of times each benchmark is repeated.')
+
+  argument_parser.add_argument(
+      '--workers', dest='number_of_workers', type=int, action='store',
+      default=4, metavar='NUMBER', help='number of worker processes.')
+
+  argument_parser.add_argument(
+      'sources', nargs='*', action='store', metavar='PATH', default=None,
+      help='paths of Windows Registry files.')
+
+  options = argument_parser.parse_args()
+
+  collector_object = catalog.CatalogCollector()
+  parallel_collector_object = catalog.CatalogCollector(
+      number_of_workers=options.number_of_workers)
+
+  root_key = _CreateRegistryKey(5, 10, 4)
+
+  if not _Measure('Synthetic tree', [
+      ('recursive', functools.partial(
+          _GetKeyPathsRecursively, collector_object, root_key)),
+      ('explicit stack', functools.partial(
+          _GetKeyPaths, collector_object, root_key))], options.repeat):
+    return False
+
+  root_key = _CreateRegistryKey(sys.getrecursionlimit() + 100, 1, 0)
+
+  try:
+    _GetKeyPathsRecursively(collector_object, root_key)
+    print('Deep synthetic tree: recursive: succeeded')
+  except RecursionError:
+    print('Deep synthetic tree: recursive: maximum recursion depth exceeded')
+
+  key_paths = _GetKeyPaths(collector_object, root_key)
+  print(f'Deep synthetic tree: explicit stack: {len(key_paths):d} keys')
+
+  for source in options.sources:
+    if not os.path.isfile(source):
+      print(f'No such file: {source:s}')
+      return False
+
+    with open(source, 'rb') as file_object:
+      registry_file = catalog.OpenWindowsRegistryFile(file_object)
+      if not registry_file:
+        print(f'Unable to open Windows Registry file: {source:s}')
+        return False
+
+      try:
+        root_key = registry_file.GetRootKey()
+
+        if not _Measure(source, [
+            ('recursive', functools.partial(
+                _GetKeyPathsRecursively, collector_object, root_key)),
+            ('explicit stack', functools.partial(
+                _GetKeyPaths, collector_object, root_key)),
+            (f'{options.number_of_workers:d} workers', functools.partial(
+                _GetKeyPaths, parallel_collector_object, root_key,
+                path=source))], options.repeat):
+          return False
+
+      finally:
+        registry_file.Close()
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of writing debug output as text against a binary debug trace."""
+
+import argparse
+import functools
+import os
+import struct
+import sys
+import tempfile
+import timeit
+
+from winregrc import appcompatcache
+from winregrc import debug_trace
+from winregrc import output_writers
+
+
+class FileOutputWriter(output_writers.StdoutOutputWriter):
+  """Output writer that writes text to a file."""
+
+  def __init__(self, path):
+    """Initializes a file output writer.
+
+    Args:
+      path (str): path of the file.
+    """
+    super(FileOutputWriter, self).__init__()
+    self._file_object = None
+    self._path = path
+
+  def Close(self):
+    """Closes the output writer."""
+    if self._file_object:
+      self._file_object.close()
+      self._file_object = None
+
+  def Open(self):
+    """Opens the output writer.
+
+    Returns:
+      bool: True if successful or False if not.
+    """
+    # pylint: disable=consider-using-with
+    self._file_object = open(self._path, 'w', encoding='utf-8')
+    return True
+
+  def WriteText(self, text):
+    """Writes text.
+
+    Args:
+      text (str): text to write.
+    """
+    self._file_object.write(text)
+
+
+def _CreateValueData(number_of_cached_entries):
+  """Creates Windows 2003 Application Compatibility Cache value data.
+
+  Args:
+    number_of_cached_entries (int): number of cached entries.
+
+  Returns:
+    bytes: value data.
+  """
+  path_data_offset = 8 + (number_of_cached_entries * 24)
+
+  cached_entries_data = []
+  paths_data = []
+  for cached_entry_index in range(number_of_cached_entries):
+    path = f'\\??\\C:\\WINDOWS\\system32\\program{cached_entry_index:d}.exe'
+    path_data = path.encode('utf-16-le')
+    path_size = len(path_data)
+
+    cached_entries_data.append(struct.pack(
+        '<HHIQQ', path_size, path_size + 2, path_data_offset,
+        0x01c2f24476863500, 0x12000))
+    paths_data.extend([path_data, b'\x00\x00'])
+
+    path_data_offset += path_size + 2
+
+  return b''.join([
+      struct.pack('<II', 0xbadc0ffe, number_of_cached_entries),
+      *cached_entries_data, *paths_data])
+
+
+def _FormatDebugTrace(path, output_path):
+  """Formats a binary debug trace.
+
+  Args:
+    path (str): path of the binary debug trace.
+    output_path (str): path of the file to write the formatted trace to.
+  """
+  output_writer = FileOutputWriter(output_path)
+  output_writer.Open()
+
+  try:
+    with open(path, 'rb') as file_object:
+      reader = debug_trace.DebugTraceReader(file_object)
+      formatter = debug_trace.DebugTraceFormatter(output_writer)
+      formatter.Format(reader)
+
+  finally:
+    output_writer.Close()
+
+
+def _ParseValueData(value_data, debug=False, output_writer=None):
+  """Parses Application Compatibility Cache value data.
+
+  Args:
+    value_data (bytes): value data.
+    debug (Optional[bool]): True if debug information should be written.
+    output_writer (Optional[OutputWriter]): output writer.
+  """
+  if output_writer:
+    output_writer.Open()
+
+  try:
+    parser = appcompatcache.AppCompatCacheDataParser(
+        debug=debug, output_writer=output_writer)
+    parser.ParseValueData(value_data)
+
+  finally:
+    if output_writer:
+      output_writer.Close()
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks parsing Application Compatibility Cache value data without '
+      'debug output, with debug output as text and with debug output as a '
+      'binary debug trace.'))
+
+  argument_parser.add_argument(
+      '--number_of_entries', '--number-of-entries', dest='number_of_entries',
+      type=int, action='store', default=8192, metavar='NUMBER',
+      help='number of cached entries of the synthetic value data.')
+
+  argument_parser.add_argument(
+      '--repeat', dest='repeat', type=int, action='store', default=3,
+      metavar='NUMBER', help='number of times each benchmark is repeated.')
+
+  options = argument_parser.parse_args()
+
+  value_data = _CreateValueData(options.number_of_entries)
+
+  with tempfile.TemporaryDirectory() as temporary_directory:
+    text_path = os.path.join(temporary_directory, 'debug.txt')
+    trace_path = os.path.join(temporary_directory, 'debug.trace')
+    formatted_trace_path = os.path.join(temporary_directory, 'trace.txt')
+
+    times = []
+    for function in (
+        functools.partial(_ParseValueData, value_data),
+        functools.partial(
+            _ParseValueData, value_data, debug=True,
+            output_writer=FileOutputWriter(text_path)),
+        functools.partial(
+            _ParseValueData, value_data, debug=True,
+            output_writer=debug_trace.DebugTraceOutputWriter(trace_path)),
+        functools.partial(
+            _FormatDebugTrace, trace_path, formatted_trace_path)):
+      time = min(timeit.repeat(function, number=1, repeat=options.repeat))
+      times.append(time * 1000)
+
+    with open(text_path, 'rb') as file_object:
+      text_data = file_object.read()
+
+    with open(formatted_trace_path, 'rb') as file_object:
+      formatted_trace_data = file_object.read()
+
+    if text_data != formatted_trace_data:
+      print('Formatted debug trace differs from debug output.')
+      return False
+
+    text_size = len(text_data)
+    trace_size = os.stat(trace_path).st_size
+
+  print((
+      f'{options.number_of_entries:d} cached entries ({len(value_data):d} '
+      f'bytes): no debug: {times[0]:.2f} ms, debug as text: {times[1]:.2f} ms '
+      f'({text_size:d} bytes), debug as trace: {times[2]:.2f} ms '
+      f'({trace_size:d} bytes), formatting trace: {times[3]:.2f} ms'))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
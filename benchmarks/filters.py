@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of the Windows Registry key with values filter."""
+
+import argparse
+import functools
+import os
+import sys
+import timeit
+
+from dfwinreg import definitions as dfwinreg_definitions
+from dfwinreg import fake as dfwinreg_fake
+from dfwinreg import regf as dfwinreg_regf
+
+from winregrc import filters
+
+
+def _CreateRegistryKey(number_of_values):
+  """Creates a Windows Registry key with many values.
+
+  Args:
+    number_of_values (int): number of values.
+
+  Returns:
+    dfwinreg.FakeWinRegistryKey: Windows Registry key.
+  """
+  registry_key = dfwinreg_fake.FakeWinRegistryKey('MRU')
+
+  for value_index in range(number_of_values):
+    registry_value = dfwinreg_fake.FakeWinRegistryValue(
+        f'{value_index:d}', data=b'\x00\x00',
+        data_type=dfwinreg_definitions.REG_SZ)
+    registry_key.AddValue(registry_value)
+
+  return registry_key
+
+
+def _GetRegistryKeys(registry_key):
+  """Retrieves a Windows Registry key and all its descendants.
+
+  Args:
+    registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+
+  Returns:
+    list[dfwinreg.WinRegistryKey]: Windows Registry keys.
+  """
+  registry_keys = [registry_key]
+  for subkey in registry_key.GetSubkeys():
+    registry_keys.extend(_GetRegistryKeys(subkey))
+
+  return registry_keys
+
+
+def _MatchRegistryKeys(match_function, registry_keys):
+  """Matches Windows Registry keys.
+
+  Args:
+    match_function (function): match function of the filter.
+    registry_keys (list[dfwinreg.WinRegistryKey]): Windows Registry keys.
+
+  Returns:
+    int: number of matching keys.
+  """
+  number_of_matches = 0
+  for registry_key in registry_keys:
+    if match_function(registry_key):
+      number_of_matches += 1
+
+  return number_of_matches
+
+
+def _PrintTimes(description, key_filter, registry_keys, repeat):
+  """Prints the times of matching Windows Registry keys per strategy.
+
+  Args:
+    description (str): description of the benchmark.
+    key_filter (WindowsRegistryKeyWithValuesFilter): key filter.
+    registry_keys (list[dfwinreg.WinRegistryKey]): Windows Registry keys.
+    repeat (int): number of times the benchmark is repeated.
+  """
+  # pylint: disable=protected-access
+  times = []
+  for match_function in (
+      key_filter._MatchByProbing, key_filter._MatchByValueNames,
+      key_filter.Match):
+    time = min(timeit.repeat(functools.partial(
+        _MatchRegistryKeys, match_function, registry_keys),
+        number=1, repeat=repeat))
+    times.append(time * 1000)
+
+  print((
+      f'{description:s}: lookup by name: {times[0]:.2f} ms, all value '
+      f'names: {times[1]:.2f} ms, adaptive: {times[2]:.2f} ms'))
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks matching Windows Registry keys with values by looking up '
+      'the values by name against retrieving all the value names.'))
+
+  argument_parser.add_argument(
+      '--number_of_values', '--number-of-values', dest='number_of_values',
+      type=int, action='store', default=5000, metavar='NUMBER',
+      help='number of values of the synthetic key.')
+
+  argument_parser.add_argument(
+      '--repeat', dest='repeat', type=int, action='store', default=5,
+      metavar='NUMBER', help='number of times each benchmark is repeated.')
+
+  argument_parser.add_argument(
+      'source', nargs='?', action='store', metavar='PATH', default=None,
+      help='path of a Windows Registry file to scan.')
+
+  options = argument_parser.parse_args()
+
+  registry_key = _CreateRegistryKey(options.number_of_values)
+
+  for number_of_value_names in (2, 128):
+    value_names = [
+        f'{value_index:d}' for value_index in range(number_of_value_names)]
+    key_filter = filters.WindowsRegistryKeyWithValuesFilter(value_names)
+
+    _PrintTimes((
+        f'Key with {options.number_of_values:d} values and '
+        f'{number_of_value_names:d} value names'), key_filter,
+        [registry_key] * 100, options.repeat)
+
+  if options.source:
+    if not os.path.isfile(options.source):
+      print(f'No such file: {options.source:s}')
+      return False
+
+    with open(options.source, 'rb') as file_object:
+      registry_file = dfwinreg_regf.REGFWinRegistryFile()
+      registry_file.Open(file_object)
+
+      try:
+        registry_keys = _GetRegistryKeys(registry_file.GetRootKey())
+
+        for value_names in (['MRUList'], ['MRUListEx', '0', '1']):
+          key_filter = filters.WindowsRegistryKeyWithValuesFilter(value_names)
+
+          _PrintTimes((
+              f'{len(registry_keys):d} keys of {options.source:s} and '
+              f'{len(value_names):d} value names'), key_filter, registry_keys,
+              options.repeat)
+
+      finally:
+        registry_file.Close()
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of formatting data in a hexadecimal representation."""
+
+import argparse
+import functools
+import os
+import sys
+import timeit
+import tracemalloc
+
+from winregrc import hexdump
+
+
+_HEXDUMP_CHARACTER_MAP = [
+    '.' if byte < 0x20 or byte > 0x7e else chr(byte) for byte in range(256)]
+
+
+def _HexdumpPerByte(data):
+  """Formats data in a hexadecimal representation per byte.
+
+  This is the implementation used before the implementation per chunk.
+
+  Args:
+    data (bytes): data.
+
+  Returns:
+    str: hexadecimal representation of the data.
+  """
+  in_group = False
+  previous_hexadecimal_string = None
+
+  lines = []
+  data_size = len(data)
+  for block_index in range(0, data_size, 16):
+    data_string = data[block_index:block_index + 16]
+
+    hexadecimal_byte_values = []
+    printable_values = []
+    for byte_value in data_string:
+      hexadecimal_byte_values.append(f'{byte_value:02x}')
+
+      printable_value = _HEXDUMP_CHARACTER_MAP[byte_value]
+      printable_values.append(printable_value)
+
+    remaining_size = 16 - len(data_string)
+    if remaining_size == 0:
+      whitespace = ''
+    elif remaining_size >= 8:
+      whitespace = ' ' * ((3 * remaining_size) - 1)
+    else:
+      whitespace = ' ' * (3 * remaining_size)
+
+    hexadecimal_string_part1 = ' '.join(hexadecimal_byte_values[0:8])
+    hexadecimal_string_part2 = ' '.join(hexadecimal_byte_values[8:16])
+    hexadecimal_string = (
+        f'{hexadecimal_string_part1:s}  {hexadecimal_string_part2:s}'
+        f'{whitespace:s}')
+
+    if (previous_hexadecimal_string is not None and
+        previous_hexadecimal_string == hexadecimal_string and
+        block_index + 16 < data_size):
+
+      if not in_group:
+        in_group = True
+
+        lines.append('...')
+
+    else:
+      printable_string = ''.join(printable_values)
+
+      lines.append(
+          f'0x{block_index:08x}  {hexadecimal_string:s}  {printable_string:s}')
+
+      in_group = False
+      previous_hexadecimal_string = hexadecimal_string
+
+  lines.extend(['', ''])
+  return '\n'.join(lines)
+
+
+def _WriteHexdump(data):
+  """Writes data in a hexadecimal representation incrementally.
+
+  Args:
+    data (bytes): data.
+
+  Returns:
+    int: number of characters written.
+  """
+  number_of_characters = 0
+  for text in hexdump.GenerateHexdump(data):
+    number_of_characters += len(text)
+
+  return number_of_characters
+
+
+def _Measure(function, repeat):
+  """Measures the time and peak memory allocations of a function.
+
+  Args:
+    function (function): function to measure.
+    repeat (int): number of times the function is repeated.
+
+  Returns:
+    tuple[float, int]: fastest time in seconds and peak size of the memory
+        allocated in bytes.
+  """
+  tracemalloc.start()
+  function()
+  _, peak_size = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  time = min(timeit.repeat(function, number=1, repeat=repeat))
+
+  return time, peak_size
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks formatting data in a hexadecimal representation per byte, '
+      'per chunk and incrementally per chunk.'))
+
+  argument_parser.add_argument(
+      '--repeat', dest='repeat', type=int, action='store', default=3,
+      metavar='NUMBER', help='number of times each benchmark is repeated.')
+
+  argument_parser.add_argument(
+      '--size', dest='size', type=int, action='store', default=512 * 1024,
+      metavar='NUMBER', help='size of the random data in bytes.')
+
+  options = argument_parser.parse_args()
+
+  data = os.urandom(options.size)
+
+  if hexdump.Hexdump(data) != _HexdumpPerByte(data):
+    print('Hexadecimal representations differ.')
+    return False
+
+  for description, function in (
+      ('per byte', functools.partial(_HexdumpPerByte, data)),
+      ('per chunk', functools.partial(hexdump.Hexdump, data)),
+      ('incrementally per chunk', functools.partial(_WriteHexdump, data))):
+    time, peak_size = _Measure(function, options.repeat)
+
+    print((
+        f'{description:s} ({options.size:d} bytes): {time * 1000:.2f} ms, '
+        f'peak memory allocated: {peak_size:d} bytes'))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of writing many small fragments of text to stdout."""
+
+import argparse
+import contextlib
+import functools
+import os
+import sys
+import timeit
+
+from winregrc import output_writers
+
+
+def _WriteEntries(output_writer, number_of_entries):
+  """Writes entries similar to those written by the scripts.
+
+  Args:
+    output_writer (OutputWriter): output writer.
+    number_of_entries (int): number of entries to write.
+  """
+  output_writer.Open()
+
+  for entry_index in range(number_of_entries):
+    output_writer.WriteText(f'Service{entry_index:d}\n')
+    output_writer.WriteValue('\tType', 'Kernel device driver (0x00000001)')
+    output_writer.WriteValue('\tDisplay name', f'Service {entry_index:d}')
+    output_writer.WriteValue(
+        '\tExecutable', f'System32\\drivers\\service{entry_index:d}.sys')
+    output_writer.WriteIntegerValueAsDecimal('\tError control', 1)
+    output_writer.WriteFiletimeValue('\tLast written time', 0)
+    output_writer.WriteValue('\tStart', 'Manual (3)')
+    output_writer.WriteText('\n')
+
+  output_writer.Close()
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks writing many small fragments of text to stdout with and '
+      'without buffering, where stdout is redirected to /dev/null.'))
+
+  argument_parser.add_argument(
+      '--buffer_size', '--buffer-size', dest='buffer_size', type=int,
+      action='store',
+      default=output_writers.BufferedStdoutOutputWriter.DEFAULT_BUFFER_SIZE,
+      metavar='NUMBER', help='number of characters to buffer.')
+
+  argument_parser.add_argument(
+      '--number_of_entries', '--number-of-entries', dest='number_of_entries',
+      type=int, action='store', default=100000, metavar='NUMBER',
+      help='number of entries to write.')
+
+  argument_parser.add_argument(
+      '--repeat', dest='repeat', type=int, action='store', default=3,
+      metavar='NUMBER', help='number of times each benchmark is repeated.')
+
+  options = argument_parser.parse_args()
+
+  number_of_fragments = options.number_of_entries * 8
+
+  with open(os.devnull, 'w', encoding='utf-8') as file_object:
+    for description, output_writer in (
+        ('unbuffered', output_writers.StdoutOutputWriter()),
+        ('buffered', output_writers.BufferedStdoutOutputWriter(
+            buffer_size=options.buffer_size))):
+      function = functools.partial(
+          _WriteEntries, output_writer, options.number_of_entries)
+
+      with contextlib.redirect_stdout(file_object):
+        time = min(timeit.repeat(function, number=1, repeat=options.repeat))
+
+      print((
+          f'{description:s}: {time * 1000:.2f} ms, '
+          f'{number_of_fragments / time:.0f} fragments per second'))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
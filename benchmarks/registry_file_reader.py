@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark of enumerating the keys of a Windows Registry file."""
+
+import argparse
+import functools
+import os
+import sys
+import timeit
+
+from winregrc import volume_scanner
+
+
+def _EnumerateKeys(path, use_mmap):
+  """Opens a Windows Registry file and enumerates its keys and values.
+
+  Args:
+    path (str): path of the Windows Registry file.
+    use_mmap (bool): True if the Windows Registry file should be memory
+        mapped instead of read with buffered reads.
+
+  Returns:
+    tuple[int, int]: number of keys and values or None if the Windows
+        Registry file cannot be opened.
+  """
+  file_reader = volume_scanner.SingleFileWindowsRegistryFileReader(
+      path, use_mmap=use_mmap)
+
+  registry_file = file_reader.Open(path)
+  if not registry_file:
+    return None
+
+  number_of_keys = 0
+  number_of_values = 0
+
+  try:
+    registry_keys = [registry_file.GetRootKey()]
+    while registry_keys:
+      registry_key = registry_keys.pop()
+      number_of_keys += 1
+
+      for registry_value in registry_key.GetValues():
+        _ = registry_value.data
+        number_of_values += 1
+
+      registry_keys.extend(registry_key.GetSubkeys())
+
+  finally:
+    registry_file.Close()
+
+  return number_of_keys, number_of_values
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks enumerating the keys and values of a Windows Registry file '
+      'read with buffered reads against a memory mapped file.'))
+
+  argument_parser.add_argument(
+      '--repeat', dest='repeat', type=int, action='store', default=5,
+      metavar='NUMBER', help='number of times each benchmark is repeated.')
+
+  argument_parser.add_argument(
+      'source', nargs='?', action='store', metavar='PATH',
+      default=os.path.join('test_data', 'NTUSER.DAT'), help=(
+          'path of the Windows Registry file, such as a SOFTWARE or '
+          'UsrClass.dat file.'))
+
+  options = argument_parser.parse_args()
+
+  if not os.path.isfile(options.source):
+    print(f'No such file: {options.source:s}.')
+    print('')
+    return False
+
+  buffered_result = _EnumerateKeys(options.source, False)
+  memory_mapped_result = _EnumerateKeys(options.source, True)
+
+  if not buffered_result:
+    print(f'Unable to open Windows Registry file: {options.source:s}.')
+    print('')
+    return False
+
+  if buffered_result != memory_mapped_result:
+    print('Number of keys and values differ.')
+    return False
+
+  number_of_keys, number_of_values = buffered_result
+
+  # Note that after the first run both readers read the Windows Registry
+  # file from the page cache of the operating system.
+  buffered_time = min(timeit.repeat(
+      functools.partial(_EnumerateKeys, options.source, False), number=1,
+      repeat=options.repeat))
+  memory_mapped_time = min(timeit.repeat(
+      functools.partial(_EnumerateKeys, options.source, True), number=1,
+      repeat=options.repeat))
+
+  print((
+      f'{options.source:s} ({number_of_keys:d} keys, {number_of_values:d} '
+      f'values): buffered reads: {buffered_time * 1000:.2f} ms '
+      f'({number_of_keys / buffered_time:.0f} keys/s), memory mapped: '
+      f'{memory_mapped_time * 1000:.2f} ms '
+      f'({number_of_keys / memory_mapped_time:.0f} keys/s) '
+      f'({buffered_time / memory_mapped_time:.1f}x)'))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -8,11 +8,55 @@ import sys
 
 from dfvfs.helpers import volume_scanner as dfvfs_volume_scanner
 
+import winregrc
+
 from winregrc import appcompatcache
+from winregrc import columnar_export
+from winregrc import debug_trace
+from winregrc import errors
 from winregrc import output_writers
+from winregrc import result_cache
+from winregrc import result_store
+from winregrc import snapshot_collection
 from winregrc import volume_scanner
 
 
+def WriteCachedEntries(
+    output_writer, export_writer, output_format, cached_entries,
+    all_control_sets=False, additional_values=None):
+  """Writes Application Compatibility Cache cached entries.
+
+  Args:
+    output_writer (OutputWriter): output writer.
+    export_writer (ColumnarExportWriter): columnar export writer or None if
+        the cached entries are written to the output writer.
+    output_format (str): output format, either "jsonl" or "text".
+    cached_entries (iterable[AppCompatCacheCachedEntry]): cached entries.
+    all_control_sets (Optional[bool]): True if the cached entries were
+        collected from all control sets.
+    additional_values (Optional[dict[str, object]]): values that are written
+        in addition to every cached entry, such as the snapshot identifier.
+  """
+  for cached_entry in cached_entries:
+    if export_writer:
+      export_writer.WriteRecord(cached_entry)
+      continue
+
+    if output_format == 'jsonl':
+      output_writer.WriteRecord(
+          cached_entry, additional_values=additional_values)
+      continue
+
+    if all_control_sets:
+      output_writer.WriteValue(
+          'Control sets', ', '.join(cached_entry.control_sets))
+
+    output_writer.WriteFiletimeValue(
+        'Last modification time', cached_entry.last_modification_time)
+    output_writer.WriteValue('Path', cached_entry.path)
+    output_writer.WriteText('\n')
+
+
 def Main():
   """The main program function.
 
@@ -28,10 +72,63 @@ def Main():
       help=(
           'Process all control sets instead of only the current control set.'))
 
+  argument_parser.add_argument(
+      '--cache', dest='cache', action='store', metavar='PATH', default=None,
+      help=(
+          'cache the results of the collector in the directory PATH, where '
+          'the cached results are used instead of collecting them again, if '
+          'the SYSTEM Registry file was processed before by the same '
+          'version of the collector. The cache is not used with --debug.'))
+
   argument_parser.add_argument(
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--export', dest='export', action='store', metavar='PATH',
+      default=None, help=(
+          'write every cached entry to a columnar export file at PATH '
+          'instead of stdout. An Apache Arrow IPC file or, if PATH ends '
+          'with ".parquet", a Parquet file is written when pyarrow is '
+          'installed, otherwise a NumPy .npz file.'))
+
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every cached entry as a JSON '
+          'object on a separate line.'))
+
+  argument_parser.add_argument(
+      '--store', dest='store', action='store', metavar='PATH', default=None,
+      help=(
+          'store the cached entries in a SQLite result store at PATH, where '
+          'the stored cached entries are written instead, without '
+          'collecting them again, if the SYSTEM Registry file was processed '
+          'before by the same version of the collector.'))
+
+  argument_parser.add_argument(
+      '--snapshots', dest='snapshots', action='store_true', default=False,
+      help=(
+          'also extract the cached entries from the Volume Shadow Snapshots '
+          '(VSS) of the Windows volume, where every cached entry is tagged '
+          'with the identifier and creation time of the snapshot. Snapshots '
+          'with a SYSTEM Registry file identical to that of the volume or '
+          'of an earlier snapshot are skipped.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='number_of_workers', type=int, action='store',
+      default=1, metavar='NUMBER', help=(
+          'number of worker processes used to parse the control sets, in '
+          'combination with --all, or to process the snapshots, in '
+          'combination with --snapshots.'))
+
+  argument_parser.add_argument(
+      '--trace', dest='trace', action='store', metavar='PATH', default=None,
+      help=(
+          'write the debug output as a binary debug trace to PATH instead of '
+          'formatting it, which can be formatted later with debug_trace.py. '
+          'Implies --debug.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -48,6 +145,16 @@ def Main():
     print('')
     return False
 
+  if options.export and options.format == 'jsonl':
+    print('Columnar export is not supported with the jsonl format.')
+    print('')
+    return False
+
+  if options.snapshots and (options.export or options.store):
+    print('Columnar export and result store are not supported with snapshots.')
+    print('')
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
@@ -66,30 +173,153 @@ def Main():
     print('')
     return False
 
-  output_writer = output_writers.StdoutOutputWriter()
+  if options.format == 'jsonl':
+    output_writer = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer = output_writers.BufferedStdoutOutputWriter()
 
-  if not output_writer.Open():
-    print('Unable to open output writer.')
-    print('')
-    return False
+  debug_output_writer = output_writer
+  if options.trace:
+    debug_output_writer = debug_trace.DebugTraceOutputWriter(options.trace)
+
+  collector_version = winregrc.__version__
+  if options.all_control_sets:
+    collector_version = f'{collector_version:s} (all control sets)'
+
+  export_writer = None
+  store = None
 
   try:
-    collector_object = appcompatcache.AppCompatCacheCollector(
-        debug=options.debug, output_writer=output_writer)
+    if not output_writer.Open():
+      print('Unable to open output writer.')
+      print('')
+      return False
+
+    if options.export:
+      try:
+        export_writer = columnar_export.CreateColumnarExportWriter(
+            options.export)
+      except errors.Error as exception:
+        print(f'Unable to create columnar export with error: {exception!s}')
+        print('')
+        return False
+
+      if not export_writer.Open():
+        print(f'Unable to open columnar export: {options.export:s}.')
+        print('')
+        return False
+
+    registry_file_digest = None
+    if options.cache or options.store:
+      registry_file_digest = scanner.GetRegistryFileDigest(
+          '%SystemRoot%\\System32\\config\\SYSTEM')
+      if not registry_file_digest:
+        print('Unable to determine the digest of the SYSTEM Registry file.')
+        print('')
+        return False
+
+    cache = None
+    if options.cache:
+      cache = result_cache.ResultCache(options.cache)
+
+    if options.store:
+      store = result_store.ResultStore(options.store)
+      if not store.Open():
+        print(f'Unable to open result store: {options.store:s}.')
+        print('')
+        return False
+
+    if options.trace and not debug_output_writer.Open():
+      print('Unable to open debug trace.')
+      print('')
+      return False
+
+    if store and store.HasRecords(
+        'appcompatcache_entries', registry_file_digest, collector_version):
+      has_results = True
+      cached_entries = store.GetRecords(
+          'appcompatcache_entries', registry_file_digest, collector_version)
+
+    else:
+      collector_object = appcompatcache.AppCompatCacheCollector(
+          debug=options.debug or bool(options.trace),
+          output_writer=debug_output_writer)
+
+      # TODO: change collector to generate AppCompatCacheCachedEntry
+      if cache:
+        has_results = cache.Collect(
+            collector_object, scanner.registry, registry_file_digest,
+            all_control_sets=options.all_control_sets,
+            number_of_workers=options.number_of_workers)
+      else:
+        has_results = collector_object.Collect(
+            scanner.registry, all_control_sets=options.all_control_sets,
+            number_of_workers=options.number_of_workers)
+      cached_entries = collector_object.cached_entries
+
+      if has_results and store:
+        store.WriteRecords(
+            'appcompatcache_entries', registry_file_digest, collector_version,
+            cached_entries)
 
-    # TODO: change collector to generate AppCompatCacheCachedEntry
-    has_results = collector_object.Collect(
-        scanner.registry, all_control_sets=options.all_control_sets)
     if has_results:
-      for cached_entry in collector_object.cached_entries:
-        output_writer.WriteFiletimeValue(
-            'Last modification time', cached_entry.last_modification_time)
-        output_writer.WriteValue('Path', cached_entry.path)
-        output_writer.WriteText('\n')
+      try:
+        WriteCachedEntries(
+            output_writer, export_writer, options.format, cached_entries,
+            all_control_sets=options.all_control_sets)
+      except errors.Error as exception:
+        print(f'Unable to write columnar export with error: {exception!s}')
+        print('')
+        return False
+
+    if options.snapshots:
+      snapshots_collector = snapshot_collection.SnapshotsCollector(
+          appcompatcache.AppCompatCacheCollector,
+          ['%SystemRoot%\\System32\\config\\SYSTEM'],
+          debug=options.debug or bool(options.trace),
+          number_of_workers=options.number_of_workers,
+          output_writer=debug_output_writer)
+
+      # The snapshots are processed by the worker processes, hence the control
+      # sets of a snapshot are parsed by a single process.
+      for snapshot_collection_object in snapshots_collector.Collect(
+          scanner, all_control_sets=options.all_control_sets,
+          number_of_workers=1):
+        if not snapshot_collection_object.result:
+          continue
+
+        creation_time = snapshot_collection_object.snapshot_creation_time
+        if creation_time:
+          creation_time = creation_time.CopyToDateTimeString()
+
+        if options.format == 'text':
+          output_writer.WriteValue(
+              'Snapshot', snapshot_collection_object.snapshot_identifier)
+          output_writer.WriteValue('Creation time', f'{creation_time!s}')
+          output_writer.WriteText('\n')
+
+        WriteCachedEntries(
+            output_writer, None, options.format,
+            snapshot_collection_object.collector.cached_entries,
+            all_control_sets=options.all_control_sets, additional_values={
+                'snapshot_creation_time': creation_time,
+                'snapshot_identifier': (
+                    snapshot_collection_object.snapshot_identifier)})
+
+        has_results = True
 
   finally:
     output_writer.Close()
 
+    if export_writer:
+      export_writer.Close()
+
+    if store:
+      store.Close()
+
+    if options.trace:
+      debug_output_writer.Close()
+
   if not has_results:
     print('No application compatibility cache entries found.')
 
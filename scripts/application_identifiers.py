@@ -13,7 +13,7 @@ from winregrc import output_writers
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   def WriteApplicationIdentifier(self, application_identifier):
@@ -40,6 +40,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every application identifier as a '
+          'JSON object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -77,7 +83,10 @@ def Main():
   collector_object = application_identifiers.ApplicationIdentifiersCollector(
       debug=options.debug)
 
-  output_writer_object = StdoutWriter()
+  if options.format == 'jsonl':
+    output_writer_object = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer_object = StdoutWriter()
 
   if not output_writer_object.Open():
     print('Unable to open output writer.')
@@ -87,7 +96,11 @@ def Main():
   try:
     has_results = False
     for application_identifier in collector_object.Collect(scanner.registry):
-      output_writer_object.WriteApplicationIdentifier(application_identifier)
+      if options.format == 'jsonl':
+        output_writer_object.WriteRecord(application_identifier)
+      else:
+        output_writer_object.WriteApplicationIdentifier(application_identifier)
+
       has_results = True
 
   finally:
@@ -44,7 +44,7 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutOutputWriter()
+  output_writer = output_writers.BufferedStdoutOutputWriter()
 
   if not output_writer.Open():
     print('Unable to open output writer.')
@@ -77,7 +77,7 @@ def Main():
 
   result = collector_object.Collect(scanner.registry)
   if not result:
-    print('No Cache key found.')
+    output_writer.WriteText('No Cache key found.\n')
   else:
     output_writer.WriteText('\n')
 
@@ -4,36 +4,152 @@
 
 import argparse
 import logging
-import re
 import sys
 
-from dfwinreg import creg as dfwinreg_creg
-from dfwinreg import regf as dfwinreg_regf
+import yaml
+
 from dfwinreg import registry as dfwinreg_registry
 
 from winregrc import catalog
+from winregrc import compact_catalog
 from winregrc import output_writers
+from winregrc import versions
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
-  def WriteKeyPath(self, key_path):
+  _WINDOWS_VERSIONS_KEY_FUNCTION = versions.WindowsVersions.KeyFunction
+
+  def _FormatWindowsVersions(self, windows_versions):
+    """Formats Windows versions.
+
+    Args:
+      windows_versions (list[str]): Windows versions.
+
+    Returns:
+      str: formatted Windows versions.
+    """
+    windows_versions = ', '.join([f'"{version:s}"' for version in sorted(
+        windows_versions, key=self._WINDOWS_VERSIONS_KEY_FUNCTION)])
+    return f'[{windows_versions:s}]'
+
+  def WriteKeyPath(self, key_path, windows_versions=None):
     """Writes a key path to the output.
 
     Args:
       key_path (str): key path.
+      windows_versions (Optional[list[str]]): Windows versions the key was
+          seen in.
     """
-    self.WriteText(f'{key_path:s}\n')
-
-  def WriteValueDescriptor(self, value_name, value_data_type):
+    if windows_versions is None:
+      self.WriteText(f'{key_path:s}\n')
+    else:
+      windows_versions = self._FormatWindowsVersions(windows_versions)
+      self.WriteText(f'{key_path:s}\t{windows_versions:s}\n')
+
+  def WriteValueDescriptor(
+      self, value_name, value_data_type, windows_versions=None):
     """Writes a value descriptor to the output.
 
     Args:
       value_name (str): name of the value.
       value_data_type (str): data type of the value.
+      windows_versions (Optional[list[str]]): Windows versions the value was
+          seen in.
     """
-    self.WriteText(f'\t{value_name:s}\t{value_data_type:s}\n')
+    if windows_versions is None:
+      self.WriteText(f'\t{value_name:s}\t{value_data_type:s}\n')
+    else:
+      windows_versions = self._FormatWindowsVersions(windows_versions)
+      self.WriteText(
+          f'\t{value_name:s}\t{value_data_type:s}\t{windows_versions:s}\n')
+
+
+# Signatures of Windows CREG and REGF Registry files.
+_REGISTRY_FILE_SIGNATURES = frozenset([b'CREG', b'regf'])
+
+
+def _ReadSourceDefinitions(path):
+  """Reads source definitions from a YAML file.
+
+  Args:
+    path (str): path of the source definitions file.
+
+  Returns:
+    list[dict[str, str]]: source definitions or None if the file does not
+        contain source definitions.
+  """
+  try:
+    with open(path, 'rb') as file_object:
+      signature = file_object.read(4)
+
+    # Windows Registry files are not parsed as YAML, since that requires
+    # reading and decoding the entire file.
+    if signature in _REGISTRY_FILE_SIGNATURES:
+      return None
+
+    with open(path, 'r', encoding='utf-8') as file_object:
+      source_definitions = list(yaml.safe_load_all(file_object))
+
+  except (OSError, SyntaxError, UnicodeDecodeError, yaml.YAMLError):
+    return None
+
+  if not source_definitions or not all(
+      isinstance(source_definition, dict) and 'source' in source_definition
+      for source_definition in source_definitions):
+    return None
+
+  return source_definitions
+
+
+def _WriteMergedCatalog(options, source_definitions):
+  """Writes the merged catalog of the Windows Registry files.
+
+  Args:
+    options (argparse.Namespace): command line arguments.
+    source_definitions (list[dict[str, str]]): source definitions.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  sources = [(
+      source_definition['source'],
+      source_definition.get('windows_version', None) or (
+          options.windows_version))
+      for source_definition in source_definitions]
+
+  output_writer_object = StdoutWriter()
+
+  if not output_writer_object.Open():
+    print('Unable to open output writer.')
+    print('')
+    return False
+
+  merger_object = catalog.CatalogMerger(
+      number_of_workers=options.number_of_workers)
+
+  try:
+    has_results = False
+    for key_descriptor in merger_object.Merge(sources):
+      output_writer_object.WriteKeyPath(
+          key_descriptor.key_path,
+          windows_versions=key_descriptor.windows_versions)
+
+      for value_descriptor in key_descriptor.value_descriptors:
+        output_writer_object.WriteValueDescriptor(
+            value_descriptor.name, value_descriptor.data_type,
+            windows_versions=value_descriptor.windows_versions)
+
+      has_results = True
+
+  finally:
+    output_writer_object.Close()
+
+  if not has_results:
+    print('No keys and values found.')
+
+  return True
 
 
 def Main():
@@ -45,13 +161,50 @@ def Main():
   argument_parser = argparse.ArgumentParser(description=(
       'Extracts a catalog of Windows Registry keys and values.'))
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['compact', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where compact is a prefix-compressed format that '
+          'can be expanded and compared with compact_catalog.py.'))
+
   argument_parser.add_argument(
       '--group_keys', '--group-keys', dest='group_keys', action='store_true',
       default=False, help='Group keys with similar values.')
 
+  argument_parser.add_argument(
+      '--maximum_fanout', '--maximum-fanout', dest='maximum_fanout', type=int,
+      action='store', default=None, metavar='NUMBER', help=(
+          'maximum number of subkeys collected per key, where the subkeys of '
+          'keys with more subkeys are sampled.'))
+
+  argument_parser.add_argument(
+      '--out_of_core', '--out-of-core', dest='out_of_core',
+      action='store_true', default=False, help=(
+          'Store the groups of keys with similar values in a temporary '
+          'database instead of in memory.'))
+
+  argument_parser.add_argument(
+      '--seed', dest='random_seed', type=int, action='store', default=None,
+      metavar='NUMBER', help='seed of the random sampling of subkeys.')
+
+  argument_parser.add_argument(
+      '--workers', dest='number_of_workers', type=int, action='store',
+      default=1, metavar='NUMBER', help=(
+          'number of worker processes used to collect the subtrees of the '
+          'root key or, with a source definitions file, the Windows Registry '
+          'files.'))
+
+  argument_parser.add_argument(
+      '-w', '--windows_version', '--windows-version', dest='windows_version',
+      action='store', metavar='Windows XP', default=None, help=(
+          'string that identifies the Windows version of Windows Registry '
+          'files without a Windows version in the source definitions file.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
-      help='path of a Windows Registry file.')
+      help=(
+          'path of a Windows Registry file or a YAML file with source '
+          'definitions, which are merged into a single catalog.'))
 
   options = argument_parser.parse_args()
 
@@ -62,25 +215,40 @@ def Main():
     print('')
     return False
 
+  if options.maximum_fanout is not None and options.maximum_fanout < 1:
+    print('Maximum fanout must be 1 or more.')
+    print('')
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  with open(options.source, 'rb') as file_object:
-    try:
-      registry_file = dfwinreg_regf.REGFWinRegistryFile()
+  if options.format == 'compact' and options.group_keys:
+    print('Grouping keys is not supported with the compact format.')
+    print('')
+    return False
 
-      registry_file.Open(file_object)
-    except IOError:
-      registry_file = None
+  source_definitions = _ReadSourceDefinitions(options.source)
+  if source_definitions:
+    if options.format == 'compact':
+      print('The compact format is not supported with source definitions.')
+      print('')
+      return False
 
-    if not registry_file:
-      try:
-        registry_file = dfwinreg_creg.CREGWinRegistryFile()
+    if options.group_keys:
+      print('Grouping keys is not supported with source definitions.')
+      print('')
+      return False
 
-        registry_file.Open(file_object)
-      except IOError:
-        registry_file = None
+    if options.maximum_fanout is not None:
+      print('Sampling keys is not supported with source definitions.')
+      print('')
+      return False
+
+    return _WriteMergedCatalog(options, source_definitions)
 
+  with open(options.source, 'rb') as file_object:
+    registry_file = catalog.OpenWindowsRegistryFile(file_object)
     if not registry_file:
       print('Unable to open Windows Registry file.')
       return False
@@ -100,35 +268,64 @@ def Main():
       print('')
       return False
 
-    collector_object = catalog.CatalogCollector(group_keys=options.group_keys)
+    collector_object = catalog.CatalogCollector(
+        group_keys=options.group_keys, maximum_fanout=options.maximum_fanout,
+        number_of_workers=options.number_of_workers,
+        out_of_core=options.out_of_core, random_seed=options.random_seed)
 
-    def AlphanumericCompare(key):
-      return (int(text) if text.isdigit() else text.lower()
-              for text in re.split('([0-9]+)', key[0]))
+    compact_catalog_writer = None
+    if options.format == 'compact':
+      compact_catalog_writer = compact_catalog.CompactCatalogWriter(sys.stdout)
+      compact_catalog_writer.WriteHeader()
 
     try:
       has_results = False
-      for key_descriptor in collector_object.Collect(root_key):
+      for key_descriptor in collector_object.Collect(
+          root_key, path=options.source):
+        has_results = True
+
+        if compact_catalog_writer:
+          compact_catalog_writer.WriteKeyDescriptor(key_descriptor)
+          continue
+
         output_writer_object.WriteKeyPath(key_descriptor.key_path)
 
         for key_path in key_descriptor.grouped_key_paths:
           output_writer_object.WriteKeyPath(key_path)
 
-        for value_name, data_type_string in sorted(
-            key_descriptor.value_descriptors, key=AlphanumericCompare):
+        for value_name, data_type_string in key_descriptor.value_descriptors:
           output_writer_object.WriteValueDescriptor(
               value_name, data_type_string)
 
         if options.group_keys:
           output_writer_object.WriteText('\n')
 
-        has_results = True
+      sampling_statistics = collector_object.sampling_statistics
+      if sampling_statistics:
+        text = (
+            f'Collected {sampling_statistics.number_of_keys:d} of an '
+            f'estimated {sampling_statistics.estimated_number_of_keys:.0f} '
+            f'keys (sampled fraction: '
+            f'{sampling_statistics.sampled_fraction:.4f}), sampled subkeys '
+            f'of {sampling_statistics.number_of_sampled_keys:d} keys, '
+            f'distinct value signatures: '
+            f'{sampling_statistics.number_of_value_signatures:d}')
+
+        # Statistics are not part of the compact format.
+        if compact_catalog_writer:
+          logging.info(text)
+        else:
+          output_writer_object.WriteText(f'\n{text:s}\n')
 
     finally:
       output_writer_object.Close()
 
   if not has_results:
-    print('No keys and values found.')
+    if options.format == 'compact':
+      # Stdout only contains the compact catalog.
+      print('No keys and values found.', file=sys.stderr)
+    else:
+      print('No keys and values found.')
 
   return True
 
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to expand or compare compact catalogs of Windows Registry keys."""
+
+import argparse
+import sys
+
+from winregrc import compact_catalog
+from winregrc import errors
+from winregrc import output_writers
+
+
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
+  """Stdout output writer."""
+
+  def WriteChange(self, change, key_path, value_descriptor):
+    """Writes a change between compact catalogs to the output.
+
+    Args:
+      change (str): "-" if the key or value is only in the first catalog and
+          "+" if only in the second catalog.
+      key_path (str): key path.
+      value_descriptor (tuple[str, str]): value name and data type or None
+          if the change applies to the key.
+    """
+    if not value_descriptor:
+      self.WriteText(f'{change:s} {key_path:s}\n')
+    else:
+      value_name, data_type = value_descriptor
+      self.WriteText(
+          f'{change:s} {key_path:s}\t{value_name:s}\t{data_type:s}\n')
+
+  def WriteKeyDescriptor(self, key_descriptor):
+    """Writes a catalog key descriptor to the output.
+
+    Args:
+      key_descriptor (CatalogKeyDescriptor): catalog key descriptor.
+    """
+    self.WriteText(f'{key_descriptor.key_path:s}\n')
+
+    for value_name, data_type in key_descriptor.value_descriptors:
+      self.WriteText(f'\t{value_name:s}\t{data_type:s}\n')
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Expands a compact catalog of Windows Registry keys and values or '
+      'compares two compact catalogs.'))
+
+  argument_parser.add_argument(
+      'sources', nargs='*', action='store', metavar='PATH', default=None,
+      help=(
+          'path of a compact catalog to expand or paths of two compact '
+          'catalogs to compare.'))
+
+  options = argument_parser.parse_args()
+
+  if len(options.sources) not in (1, 2):
+    print('Source value is missing.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  output_writer_object = StdoutWriter()
+
+  if not output_writer_object.Open():
+    print('Unable to open output writer.')
+    print('')
+    return False
+
+  try:
+    if len(options.sources) == 1:
+      with open(options.sources[0], 'r', encoding='utf-8') as file_object:
+        reader = compact_catalog.CompactCatalogReader(file_object)
+        for key_descriptor in reader.ReadKeyDescriptors():
+          output_writer_object.WriteKeyDescriptor(key_descriptor)
+
+    else:
+      with open(options.sources[0], 'r', encoding='utf-8') as file_object:
+        with open(
+            options.sources[1], 'r', encoding='utf-8') as other_file_object:
+          differ = compact_catalog.CompactCatalogDiffer()
+          for change, key_path, value_descriptor in differ.Diff(
+              compact_catalog.CompactCatalogReader(file_object),
+              compact_catalog.CompactCatalogReader(other_file_object)):
+            output_writer_object.WriteChange(
+                change, key_path, value_descriptor)
+
+  except errors.ParseError as exception:
+    output_writer_object.Flush()
+    print(f'Unable to read compact catalog with error: {exception!s}')
+    return False
+
+  finally:
+    output_writer_object.Close()
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
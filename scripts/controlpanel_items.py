@@ -13,14 +13,14 @@ from winregrc import versions
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   _WINDOWS_VERSIONS_KEY_FUNCTION = versions.WindowsVersions.KeyFunction
 
   def WriteHeader(self):
     """Writes the header to stdout."""
-    print('# winreg-kb controlpanel items definitions')
+    self.WriteText('# winreg-kb controlpanel items definitions\n')
 
   def WriteKnownFolder(self, control_panel_item, windows_versions):
     """Writes the control panel item to stdout.
@@ -29,19 +29,19 @@ class StdoutWriter(output_writers.StdoutOutputWriter):
       control_panel_item (KnownFolder): the control panel item.
       windows_versions (list[str]): the Windows versions.
     """
-    print('---')
-    print(f'identifier: "{control_panel_item.identifier:s}"')
+    self.WriteText('---\n')
+    self.WriteText(f'identifier: "{control_panel_item.identifier:s}"\n')
     if control_panel_item.module_name:
-      print(f'module_name: "{control_panel_item.module_name:s}"')
+      self.WriteText(f'module_name: "{control_panel_item.module_name:s}"\n')
 
     if control_panel_item.alternate_module_names:
       alternate_module_names = ', '.join([
           f'"{name:s}"' for name in control_panel_item.alternate_module_names])
-      print(f'alternate_module_names: [{alternate_module_names:s}]')
+      self.WriteText(f'alternate_module_names: [{alternate_module_names:s}]\n')
 
     windows_versions = ', '.join([f'"{version:s}"' for version in sorted(
         windows_versions, key=self._WINDOWS_VERSIONS_KEY_FUNCTION)])
-    print(f'windows_versions: [{windows_versions:s}]')
+    self.WriteText(f'windows_versions: [{windows_versions:s}]\n')
 
 
 def Main():
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to format a binary debug trace."""
+
+import argparse
+import sys
+
+from winregrc import debug_trace
+from winregrc import errors
+from winregrc import output_writers
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Formats a binary debug trace written by the --trace option of '
+      'a script.'))
+
+  argument_parser.add_argument(
+      '--structures', dest='structures', action='store_true', default=False,
+      help=(
+          'format the data of the structures read as well, which is not '
+          'part of the debug output.'))
+
+  argument_parser.add_argument(
+      'source', nargs='?', action='store', metavar='PATH', default=None,
+      help='path of the binary debug trace.')
+
+  options = argument_parser.parse_args()
+
+  if not options.source:
+    print('Source value is missing.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  output_writer = output_writers.BufferedStdoutOutputWriter()
+
+  if not output_writer.Open():
+    print('Unable to open output writer.')
+    print('')
+    return False
+
+  try:
+    with open(options.source, 'rb') as file_object:
+      reader = debug_trace.DebugTraceReader(file_object)
+
+      formatter = debug_trace.DebugTraceFormatter(
+          output_writer, structures=options.structures)
+      formatter.Format(reader)
+
+  except errors.ParseError as exception:
+    output_writer.Flush()
+    print(f'Unable to format debug trace with error: {exception!s}')
+    return False
+
+  finally:
+    output_writer.Close()
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -13,7 +13,7 @@ from winregrc import output_writers
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   def WriteDelegateFolder(self, delegate_folder):
@@ -42,6 +42,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every delegate folder as a JSON '
+          'object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -79,7 +85,10 @@ def Main():
   collector_object = delegatefolders.DelegateFoldersCollector(
       debug=options.debug)
 
-  output_writer_object = StdoutWriter()
+  if options.format == 'jsonl':
+    output_writer_object = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer_object = StdoutWriter()
 
   if not output_writer_object.Open():
     print('Unable to open output writer.')
@@ -89,7 +98,11 @@ def Main():
   try:
     has_results = False
     for delegate_folder in collector_object.Collect(scanner.registry):
-      output_writer_object.WriteDelegateFolder(delegate_folder)
+      if options.format == 'jsonl':
+        output_writer_object.WriteRecord(delegate_folder)
+      else:
+        output_writer_object.WriteDelegateFolder(delegate_folder)
+
       has_results = True
 
   finally:
@@ -13,7 +13,7 @@ from winregrc import output_writers
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   def WriteEnvironmentVariable(self, environment_variable):
@@ -38,6 +38,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every environment variable as a '
+          'JSON object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -75,7 +81,10 @@ def Main():
   collector_object = environment_variables.EnvironmentVariablesCollector(
       debug=options.debug)
 
-  output_writer_object = StdoutWriter()
+  if options.format == 'jsonl':
+    output_writer_object = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer_object = StdoutWriter()
 
   if not output_writer_object.Open():
     print('Unable to open output writer.')
@@ -87,7 +96,11 @@ def Main():
     for environment_variable in sorted(
         collector_object.Collect(scanner.registry),
         key=lambda environment_variable: environment_variable.name):
-      output_writer_object.WriteEnvironmentVariable(environment_variable)
+      if options.format == 'jsonl':
+        output_writer_object.WriteRecord(environment_variable)
+      else:
+        output_writer_object.WriteEnvironmentVariable(environment_variable)
+
       has_results = True
 
   finally:
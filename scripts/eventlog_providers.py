@@ -13,7 +13,7 @@ from winregrc import output_writers
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   def WriteEventLogProvider(self, eventlog_provider):
@@ -87,6 +87,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every Event Log provider as a '
+          'JSON object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=('path of the volume containing C:\\Windows, the filename of '
@@ -123,7 +129,10 @@ def Main():
   collector_object = eventlog_providers.EventLogProvidersCollector(
       debug=options.debug)
 
-  output_writer_object = StdoutWriter()
+  if options.format == 'jsonl':
+    output_writer_object = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer_object = StdoutWriter()
   if not output_writer_object.Open():
     print('Unable to open output writer.')
     print('')
@@ -132,7 +141,11 @@ def Main():
   try:
     has_results = False
     for eventlog_provider in collector_object.Collect(scanner.registry):
-      output_writer_object.WriteEventLogProvider(eventlog_provider)
+      if options.format == 'jsonl':
+        output_writer_object.WriteRecord(eventlog_provider)
+      else:
+        output_writer_object.WriteEventLogProvider(eventlog_provider)
+
       has_results = True
 
   finally:
@@ -13,14 +13,14 @@ from winregrc import versions
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   _WINDOWS_VERSIONS_KEY_FUNCTION = versions.WindowsVersions.KeyFunction
 
   def WriteHeader(self):
     """Writes the header to stdout."""
-    print('# winreg-kb knownfolder definitions')
+    self.WriteText('# winreg-kb knownfolder definitions\n')
 
   def WriteKnownFolder(self, known_folder, windows_versions):
     """Writes the known folder to stdout.
@@ -29,24 +29,26 @@ class StdoutWriter(output_writers.StdoutOutputWriter):
       known_folder (KnownFolder): the known folder.
       windows_versions (list[str]): the Windows versions.
     """
-    print('---')
-    print(f'identifier: "{known_folder.identifier:s}"')
+    self.WriteText('---\n')
+    self.WriteText(f'identifier: "{known_folder.identifier:s}"\n')
     # TODO: escape \ in display name
-    print(f'display_name: "{known_folder.display_name:s}"')
+    self.WriteText(f'display_name: "{known_folder.display_name:s}"\n')
 
     if known_folder.localized_display_name:
       # TODO: escape \ in localized display_name
-      print(
-          f'localized_display_name: "{known_folder.localized_display_name:s}"')
+      self.WriteText((
+          f'localized_display_name: '
+          f'"{known_folder.localized_display_name:s}"\n'))
 
     if known_folder.alternate_display_names:
       alternate_display_names = ', '.join([
           f'"{name:s}"' for name in known_folder.alternate_display_names])
-      print(f'alternate_display_names: [{alternate_display_names:s}]')
+      self.WriteText(
+          f'alternate_display_names: [{alternate_display_names:s}]\n')
 
     windows_versions = ', '.join([f'"{version:s}"' for version in sorted(
         windows_versions, key=self._WINDOWS_VERSIONS_KEY_FUNCTION)])
-    print(f'windows_versions: [{windows_versions:s}]')
+    self.WriteText(f'windows_versions: [{windows_versions:s}]\n')
 
 
 def Main():
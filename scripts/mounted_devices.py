@@ -13,7 +13,7 @@ from winregrc import output_writers
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   def WriteMountedDevice(self, mounted_device):
@@ -55,6 +55,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every mounted device as a JSON '
+          'object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -92,7 +98,10 @@ def Main():
   collector_object = mounted_devices.MountedDevicesCollector(
       debug=options.debug)
 
-  output_writer_object = StdoutWriter()
+  if options.format == 'jsonl':
+    output_writer_object = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer_object = StdoutWriter()
 
   if not output_writer_object.Open():
     print('Unable to open output writer.')
@@ -102,7 +111,11 @@ def Main():
   try:
     has_results = False
     for mounted_device in collector_object.Collect(scanner.registry):
-      output_writer_object.WriteMountedDevice(mounted_device)
+      if options.format == 'jsonl':
+        output_writer_object.WriteRecord(mounted_device)
+      else:
+        output_writer_object.WriteMountedDevice(mounted_device)
+
       has_results = True
 
   finally:
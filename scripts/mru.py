@@ -3,6 +3,7 @@
 """Script to extract Most Recently Used (MRU) information."""
 
 import argparse
+import hashlib
 import logging
 import sys
 
@@ -11,13 +12,18 @@ from dfvfs.lib import errors as dfvfs_errors
 import pyfwps
 import pyfwsi
 
+import winregrc
+
 from winregrc import mru
 from winregrc import output_writers
+from winregrc import result_cache
+from winregrc import result_store
 from winregrc import shell_property_keys
+from winregrc import user_collection
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   def _WritePropertyStore(self, fwps_store):
@@ -279,6 +285,79 @@ class StdoutWriter(output_writers.StdoutOutputWriter):
       self._WriteShellItem(fwsi_item)
 
 
+def GetUserRegistryFilesDigest(scanner):
+  """Determines the digest of the Windows Registry files of the user.
+
+  The Most Recently Used entries are collected from both the NTUSER.DAT and
+  UsrClass.dat Registry files, hence the digest covers both files.
+
+  Args:
+    scanner (WindowsRegistryVolumeScanner): Windows Registry volume scanner.
+
+  Returns:
+    str: hexadecimal SHA-256 digest of the Windows Registry files of the user
+        or None if the digest of the NTUSER.DAT Registry file is not
+        available.
+  """
+  registry_file_digest = scanner.GetRegistryFileDigest(
+      '%UserProfile%\\NTUSER.DAT')
+  if not registry_file_digest or scanner.IsSingleFileRegistry():
+    return registry_file_digest
+
+  digests = [registry_file_digest]
+  for windows_path in (
+      '%UserProfile%\\AppData\\Local\\Microsoft\\Windows\\UsrClass.dat',
+      ('%UserProfile%\\Local Settings\\Application Data\\Microsoft\\'
+       'Windows\\UsrClass.dat')):
+    usrclass_digest = scanner.GetRegistryFileDigest(windows_path)
+    if usrclass_digest:
+      digests.append(usrclass_digest)
+
+  if len(digests) == 1:
+    return registry_file_digest
+
+  digests_string = ' '.join(digests)
+  return hashlib.sha256(digests_string.encode('ascii')).hexdigest()
+
+
+def WriteMostRecentlyUsedEntries(
+    output_writer, output_format, mru_entries, additional_values=None):
+  """Writes Most Recently Used (MRU) entries.
+
+  Args:
+    output_writer (OutputWriter): output writer.
+    output_format (str): output format, either "jsonl" or "text".
+    mru_entries (iterable[MostRecentlyUsedEntry]): Most Recently Used
+        entries.
+    additional_values (Optional[dict[str, object]]): values that are written
+        in addition to every Most Recently Used entry, such as the username.
+  """
+  for mru_entry in mru_entries:
+    if output_format == 'jsonl':
+      output_writer.WriteRecord(
+          mru_entry, additional_values=additional_values)
+      continue
+
+    output_writer.WriteValue('Key path', mru_entry.key_path)
+    output_writer.WriteValue('Value name', mru_entry.value_name)
+
+    if mru_entry.string:
+      output_writer.WriteValue('String', mru_entry.string)
+      output_writer.WriteText('\n')
+
+    if mru_entry.shell_item_data:
+      fwsi_item = pyfwsi.item()
+      fwsi_item.copy_from_byte_stream(mru_entry.shell_item_data)
+
+      output_writer.WriteShellItem(fwsi_item)
+
+    elif mru_entry.shell_item_list_data:
+      shell_item_list = pyfwsi.item_list()
+      shell_item_list.copy_from_byte_stream(mru_entry.shell_item_list_data)
+
+      output_writer.WriteShellItemList(shell_item_list)
+
+
 def Main():
   """Entry point of console script to extract Most Recently Used information.
 
@@ -289,14 +368,52 @@ def Main():
       'Extracts Most Recently Used information from a NTUSER.DAT Registry '
       'file.'))
 
+  argument_parser.add_argument(
+      '--all_users', '--all-users', dest='all_users', action='store_true',
+      default=False, help=(
+          'extract the Most Recently Used information of all users within '
+          'a storage media image, where every Most Recently Used entry is '
+          'tagged with the username and security identifier (SID) of '
+          'the user.'))
+
+  argument_parser.add_argument(
+      '--cache', dest='cache', action='store', metavar='PATH', default=None,
+      help=(
+          'cache the results of the collector in the directory PATH, where '
+          'the cached results are used instead of collecting them again, if '
+          'the NTUSER.DAT and UsrClass.dat Registry files were processed '
+          'before by the same version of the collector. The cache is not '
+          'used with --debug.'))
+
   argument_parser.add_argument(
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--store', dest='store', action='store', metavar='PATH', default=None,
+      help=(
+          'store the Most Recently Used entries in a SQLite result store at '
+          'PATH, where the stored Most Recently Used entries are written '
+          'instead, without collecting them again, if the NTUSER.DAT and '
+          'UsrClass.dat Registry files were processed before by the same '
+          'version of the collector.'))
+
   argument_parser.add_argument(
       '-u', '--username', dest='username', action='store', metavar='USERNAME',
       default=None, help='username within a storage media image.')
 
+  argument_parser.add_argument(
+      '--workers', dest='number_of_workers', type=int, action='store',
+      default=1, metavar='NUMBER', help=(
+          'number of worker processes used to extract the Most Recently Used '
+          'information of the users, in combination with --all_users.'))
+
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every Most Recently Used entry '
+          'as a JSON object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -313,23 +430,27 @@ def Main():
     print('')
     return 1
 
-  logging.basicConfig(
-      level=logging.INFO, format='[%(levelname)s] %(message)s')
-
-  output_writer = StdoutWriter()
-
-  if not output_writer.Open():
-    print('Unable to open output writer.')
+  if options.all_users and (
+      options.cache or options.store or options.username):
+    print((
+        'Result cache, result store and username are not supported with all '
+        'users.'))
     print('')
     return 1
 
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
   mediator = volume_scanner.WindowsRegistryVolumeScannerMediator()
   scanner = volume_scanner.WindowsRegistryVolumeScanner(mediator=mediator)
 
   volume_scanner_options = volume_scanner.VolumeScannerOptions()
   volume_scanner_options.partitions = ['all']
   volume_scanner_options.snapshots = ['none']
-  volume_scanner_options.username = options.username
+  if options.all_users:
+    volume_scanner_options.username = ['all']
+  else:
+    volume_scanner_options.username = options.username
   volume_scanner_options.volumes = ['none']
 
   try:
@@ -352,36 +473,108 @@ def Main():
     print('')
     return 1
 
-  collector_object = mru.MostRecentlyUsedCollector(
-      debug=options.debug, output_writer=output_writer)
+  if options.format == 'jsonl':
+    output_writer = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer = StdoutWriter()
 
-  # TODO: change collector to generate MostRecentlyUsedEntry
-  result = collector_object.Collect(scanner.registry)
-  if not result:
-    print('No Most Recently Used key found.')
-    return 0
+  collector_version = winregrc.__version__
 
-  for mru_entry in collector_object.mru_entries:
-    output_writer.WriteValue('Key path', mru_entry.key_path)
-    output_writer.WriteValue('Value name', mru_entry.value_name)
+  store = None
 
-    if mru_entry.string:
-      output_writer.WriteValue('String', mru_entry.string)
-      output_writer.WriteText('\n')
+  try:
+    if not output_writer.Open():
+      print('Unable to open output writer.')
+      print('')
+      return 1
+
+    if options.all_users:
+      collector_object = user_collection.AllUsersCollector(
+          mru.MostRecentlyUsedCollector, debug=options.debug,
+          number_of_workers=options.number_of_workers,
+          output_writer=output_writer)
+
+      has_results = False
+      for user_collection_object in collector_object.Collect(scanner):
+        if not user_collection_object.result:
+          continue
+
+        if options.format == 'text':
+          output_writer.WriteValue(
+              'Username', user_collection_object.username)
+          output_writer.WriteValue(
+              'SID', f'{user_collection_object.security_identifier!s}')
+          output_writer.WriteText('\n')
+
+        WriteMostRecentlyUsedEntries(
+            output_writer, options.format,
+            user_collection_object.collector.mru_entries, additional_values={
+                'security_identifier': (
+                    user_collection_object.security_identifier),
+                'username': user_collection_object.username})
+
+        has_results = True
+
+      if not has_results:
+        output_writer.WriteText('No Most Recently Used key found.\n')
+
+      return 0
+
+    registry_file_digest = None
+    if options.cache or options.store:
+      registry_file_digest = GetUserRegistryFilesDigest(scanner)
+      if not registry_file_digest:
+        print((
+            'Unable to determine the digest of the NTUSER.DAT Registry '
+            'file.'))
+        print('')
+        return 1
+
+    cache = None
+    if options.cache:
+      cache = result_cache.ResultCache(options.cache)
+
+    if options.store:
+      store = result_store.ResultStore(options.store)
+      if not store.Open():
+        print(f'Unable to open result store: {options.store:s}.')
+        print('')
+        return 1
+
+    if store and store.HasRecords(
+        'mru_entries', registry_file_digest, collector_version):
+      WriteMostRecentlyUsedEntries(
+          output_writer, options.format, store.GetRecords(
+              'mru_entries', registry_file_digest, collector_version))
+      return 0
+
+    collector_object = mru.MostRecentlyUsedCollector(
+        debug=options.debug, output_writer=output_writer)
+
+    # TODO: change collector to generate MostRecentlyUsedEntry
+    if cache:
+      result = cache.Collect(
+          collector_object, scanner.registry, registry_file_digest)
+    else:
+      result = collector_object.Collect(scanner.registry)
 
-    if mru_entry.shell_item_data:
-      fwsi_item = pyfwsi.item()
-      fwsi_item.copy_from_byte_stream(mru_entry.shell_item_data)
+    if not result:
+      output_writer.WriteText('No Most Recently Used key found.\n')
+      return 0
 
-      output_writer.WriteShellItem(fwsi_item)
+    if store:
+      store.WriteRecords(
+          'mru_entries', registry_file_digest, collector_version,
+          collector_object.mru_entries)
 
-    elif mru_entry.shell_item_list_data:
-      shell_item_list = pyfwsi.item_list()
-      shell_item_list.copy_from_byte_stream(mru_entry.shell_item_list_data)
+    WriteMostRecentlyUsedEntries(
+        output_writer, options.format, collector_object.mru_entries)
 
-      output_writer.WriteShellItemList(shell_item_list)
+  finally:
+    output_writer.Close()
 
-  output_writer.Close()
+    if store:
+      store.Close()
 
   return 0
 
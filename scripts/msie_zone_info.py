@@ -13,7 +13,7 @@ from winregrc import output_writers
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   _DEFAULT_ZONE_NAMES = {
@@ -201,6 +201,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every zone as a JSON '
+          'object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -238,7 +244,10 @@ def Main():
   collector_object = msie_zone_info.MSIEZoneInformationCollector(
       debug=options.debug)
 
-  output_writer_object = StdoutWriter()
+  if options.format == 'jsonl':
+    output_writer_object = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer_object = StdoutWriter()
 
   if not output_writer_object.Open():
     print('Unable to open output writer.')
@@ -248,7 +257,11 @@ def Main():
   try:
     has_results = False
     for zone_information in collector_object.Collect(scanner.registry):
-      output_writer_object.WriteZoneInformation(zone_information)
+      if options.format == 'jsonl':
+        output_writer_object.WriteRecord(zone_information)
+      else:
+        output_writer_object.WriteZoneInformation(zone_information)
+
       has_results = True
 
   finally:
@@ -13,7 +13,7 @@ from winregrc import profiles
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   def WriteUserProfile(self, user_profile):
@@ -40,6 +40,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every user profile as a JSON '
+          'object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -78,7 +84,10 @@ def Main():
   collector_object = profiles.UserProfilesCollector(
       debug=options.debug)
 
-  output_writer_object = StdoutWriter()
+  if options.format == 'jsonl':
+    output_writer_object = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer_object = StdoutWriter()
 
   if not output_writer_object.Open():
     print('Unable to open output writer.')
@@ -88,10 +97,14 @@ def Main():
   try:
     has_results = False
     for user_profile in collector_object.Collect(scanner.registry):
-      output_writer_object.WriteUserProfile(user_profile)
+      if options.format == 'jsonl':
+        output_writer_object.WriteRecord(user_profile)
+      else:
+        output_writer_object.WriteUserProfile(user_profile)
+
       has_results = True
 
-    if has_results:
+    if has_results and options.format == 'text':
       output_writer_object.WriteText('\n')
 
   finally:
@@ -8,6 +8,7 @@ import sys
 
 from dfvfs.helpers import volume_scanner as dfvfs_volume_scanner
 
+from winregrc import debug_trace
 from winregrc import output_writers
 from winregrc import programscache
 from winregrc import volume_scanner
@@ -26,6 +27,13 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--trace', dest='trace', action='store', metavar='PATH', default=None,
+      help=(
+          'write the debug output as a binary debug trace to PATH instead of '
+          'formatting it, which can be formatted later with debug_trace.py. '
+          'Implies --debug.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -46,6 +54,9 @@ def Main():
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
   # TODO: add support to select user.
+  # Note that --all_users is not supported, since the collector only writes
+  # the program cache entries as debug output and does not store them, hence
+  # there are no per-user results to write.
   mediator = volume_scanner.WindowsRegistryVolumeScannerMediator()
   scanner = volume_scanner.WindowsRegistryVolumeScanner(mediator=mediator)
 
@@ -61,16 +72,26 @@ def Main():
     print('')
     return False
 
-  output_writer = output_writers.StdoutOutputWriter()
+  output_writer = output_writers.BufferedStdoutOutputWriter()
 
   if not output_writer.Open():
     print('Unable to open output writer.')
     print('')
     return False
 
+  debug_output_writer = output_writer
+  if options.trace:
+    debug_output_writer = debug_trace.DebugTraceOutputWriter(options.trace)
+
+    if not debug_output_writer.Open():
+      print('Unable to open debug trace.')
+      print('')
+      return False
+
   try:
     collector_object = programscache.ProgramsCacheCollector(
-        debug=options.debug, output_writer=output_writer)
+        debug=options.debug or bool(options.trace),
+        output_writer=debug_output_writer)
 
     # TODO: change collector to generate ProgramCacheEntry
     has_results = collector_object.Collect(scanner.registry)
@@ -78,6 +99,9 @@ def Main():
   finally:
     output_writer.Close()
 
+    if options.trace:
+      debug_output_writer.Close()
+
   if not has_results:
     print('No program cache entries found.')
 
@@ -8,7 +8,12 @@ import sys
 
 from dfvfs.helpers import volume_scanner as dfvfs_volume_scanner
 
+import winregrc
+
+from winregrc import debug_trace
 from winregrc import output_writers
+from winregrc import result_cache
+from winregrc import result_store
 from winregrc import sam
 from winregrc import volume_scanner
 
@@ -23,10 +28,39 @@ def Main():
       'Extracts Security Account Manager information from a SAM Registry '
       'file.'))
 
+  argument_parser.add_argument(
+      '--cache', dest='cache', action='store', metavar='PATH', default=None,
+      help=(
+          'cache the results of the collector in the directory PATH, where '
+          'the cached results are used instead of collecting them again, if '
+          'the SAM Registry file was processed before by the same '
+          'version of the collector. The cache is not used with --debug.'))
+
   argument_parser.add_argument(
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every user account as a JSON '
+          'object on a separate line.'))
+
+  argument_parser.add_argument(
+      '--store', dest='store', action='store', metavar='PATH', default=None,
+      help=(
+          'store the user accounts in a SQLite result store at PATH, where '
+          'the stored user accounts are written instead, without collecting '
+          'them again, if the SAM Registry file was processed before by '
+          'the same version of the collector.'))
+
+  argument_parser.add_argument(
+      '--trace', dest='trace', action='store', metavar='PATH', default=None,
+      help=(
+          'write the debug output as a binary debug trace to PATH instead of '
+          'formatting it, which can be formatted later with debug_trace.py. '
+          'Implies --debug.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -46,13 +80,6 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutOutputWriter()
-
-  if not output_writer.Open():
-    print('Unable to open output writer.')
-    print('')
-    return False
-
   mediator = volume_scanner.WindowsRegistryVolumeScannerMediator()
   scanner = volume_scanner.WindowsRegistryVolumeScanner(mediator=mediator)
 
@@ -68,17 +95,85 @@ def Main():
     print('')
     return False
 
-  # TODO: map collector to available Registry keys.
-  collector_object = sam.SecurityAccountManagerCollector(
-      debug=options.debug, output_writer=output_writer)
-
-  result = collector_object.Collect(scanner.registry)
-  if not result:
-    output_writer.WriteText('No Security Account Manager key found.')
-    output_writer.WriteText('')
-
+  if options.format == 'jsonl':
+    output_writer = output_writers.JSONLinesOutputWriter()
   else:
-    for user_account in collector_object.user_accounts:
+    output_writer = output_writers.BufferedStdoutOutputWriter()
+
+  debug_output_writer = output_writer
+  if options.trace:
+    debug_output_writer = debug_trace.DebugTraceOutputWriter(options.trace)
+
+  collector_version = winregrc.__version__
+
+  store = None
+
+  try:
+    if not output_writer.Open():
+      print('Unable to open output writer.')
+      print('')
+      return False
+
+    if options.trace and not debug_output_writer.Open():
+      print('Unable to open debug trace.')
+      print('')
+      return False
+
+    registry_file_digest = None
+    if options.cache or options.store:
+      registry_file_digest = scanner.GetRegistryFileDigest(
+          '%SystemRoot%\\System32\\config\\SAM')
+      if not registry_file_digest:
+        print('Unable to determine the digest of the SAM Registry file.')
+        print('')
+        return False
+
+    cache = None
+    if options.cache:
+      cache = result_cache.ResultCache(options.cache)
+
+    if options.store:
+      store = result_store.ResultStore(options.store)
+      if not store.Open():
+        print(f'Unable to open result store: {options.store:s}.')
+        print('')
+        return False
+
+    # TODO: map collector to available Registry keys.
+    collector_object = sam.SecurityAccountManagerCollector(
+        debug=options.debug or bool(options.trace),
+        output_writer=debug_output_writer)
+
+    user_accounts = []
+    if store and store.HasRecords(
+        'user_accounts', registry_file_digest, collector_version):
+      user_accounts = store.GetRecords(
+          'user_accounts', registry_file_digest, collector_version)
+
+    else:
+      if cache:
+        result = cache.Collect(
+            collector_object, scanner.registry, registry_file_digest)
+      else:
+        result = collector_object.Collect(scanner.registry)
+
+      if not result:
+        output_writer.WriteText('No Security Account Manager key found.')
+        output_writer.WriteText('')
+
+      else:
+        user_accounts = collector_object.user_accounts
+
+        if store:
+          store.WriteRecords(
+              'user_accounts', registry_file_digest, collector_version,
+              user_accounts)
+
+    for user_account in user_accounts:
+      if options.format == 'jsonl':
+        output_writer.WriteRecord(user_account)
+        continue
+
       output_writer.WriteValue('Username', user_account.username)
       output_writer.WriteValue('Relative identifier (RID)', user_account.rid)
       output_writer.WriteValue(
@@ -116,7 +211,14 @@ def Main():
 
       output_writer.WriteText('\n')
 
-  output_writer.Close()
+  finally:
+    output_writer.Close()
+
+    if options.trace:
+      debug_output_writer.Close()
+
+    if store:
+      store.Close()
 
   return True
 
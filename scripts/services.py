@@ -8,12 +8,18 @@ import sys
 
 from dfvfs.helpers import volume_scanner as dfvfs_volume_scanner
 
+import winregrc
+
+from winregrc import columnar_export
+from winregrc import errors
 from winregrc import output_writers
+from winregrc import result_cache
+from winregrc import result_store
 from winregrc import services
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   def __init__(self, use_tsv=False):
@@ -42,42 +48,46 @@ class StdoutWriter(output_writers.StdoutOutputWriter):
 
     if self._use_tsv:
       if not self._printed_header:
-        print('\t'.join([
+        header = '\t'.join([
             'Service', 'Type', 'Display name', 'Description', 'Executable',
-            'Start']))
+            'Start'])
+        self.WriteText(f'{header:s}\n')
         self._printed_header = True
 
       service_display_name = service.display_name or ''
       service_description = service.description or ''
       service_image_path = service.image_path or ''
 
-      print('\t'.join([
+      values = '\t'.join([
           service.name, service_type_description, service_display_name,
-          service_description, service_image_path, start_value_description]))
+          service_description, service_image_path, start_value_description])
+      self.WriteText(f'{values:s}\n')
 
     else:
-      print(f'{service.name:s}')
+      self.WriteText(f'{service.name:s}\n')
 
       if service.service_type:
-        print(f'\tType\t\t\t: {service_type_description:s}')
+        self.WriteText(f'\tType\t\t\t: {service_type_description:s}\n')
 
       if service.display_name:
-        print(f'\tDisplay name\t\t: {service.display_name:s}')
+        self.WriteText(f'\tDisplay name\t\t: {service.display_name:s}\n')
 
       if service.description:
-        print(f'\tDescription\t\t: {service.description:s}')
+        self.WriteText(f'\tDescription\t\t: {service.description:s}\n')
 
       if service.image_path:
-        print(f'\tExecutable\t\t: {service.image_path:s}')
+        self.WriteText(f'\tExecutable\t\t: {service.image_path:s}\n')
 
       if service.object_name:
         object_name_description = service.GetObjectNameDescription()
-        print(f'\t{object_name_description:s}\t\t: {service.object_name:s}')
+        self.WriteText((
+            f'\t{object_name_description:s}\t\t: '
+            f'{service.object_name:s}\n'))
 
       if service.start_value is not None:
-        print(f'\tStart\t\t\t: {start_value_description:s}')
+        self.WriteText(f'\tStart\t\t\t: {start_value_description:s}\n')
 
-      print('')
+      self.WriteText('\n')
 
 
 def Main():
@@ -98,10 +108,40 @@ def Main():
       '--diff', dest='diff_control_sets', action='store_true', default=False,
       help='Only list differences between control sets.')
 
+  argument_parser.add_argument(
+      '--export', dest='export', action='store', metavar='PATH',
+      default=None, help=(
+          'write every service to a columnar export file at PATH '
+          'instead of stdout. An Apache Arrow IPC file or, if PATH ends '
+          'with ".parquet", a Parquet file is written when pyarrow is '
+          'installed, otherwise a NumPy .npz file.'))
+
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every service as a JSON object '
+          'on a separate line.'))
+
+  argument_parser.add_argument(
+      '--store', dest='store', action='store', metavar='PATH', default=None,
+      help=(
+          'store the services in a SQLite result store at PATH, where the '
+          'stored services are written instead, without collecting them '
+          'again, if the SYSTEM Registry file was processed before by '
+          'the same version of the collector.'))
+
   argument_parser.add_argument(
       '--tsv', dest='use_tsv', action='store_true', default=False,
       help='Use tab separated value (TSV) output.')
 
+  argument_parser.add_argument(
+      '--cache', dest='cache', action='store', metavar='PATH', default=None,
+      help=(
+          'cache the results of the collector in the directory PATH, where '
+          'the cached results are used instead of collecting them again, if '
+          'the SYSTEM Registry file was processed before by the same '
+          'version of the collector. The cache is not used with --debug.'))
+
   argument_parser.add_argument(
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
@@ -122,6 +162,28 @@ def Main():
     print('')
     return False
 
+  if options.format == 'jsonl' and options.diff_control_sets:
+    print('Comparing control sets is not supported with the jsonl format.')
+    print('')
+    return False
+
+  if options.export and options.diff_control_sets:
+    print('Comparing control sets is not supported with columnar export.')
+    print('')
+    return False
+
+  if (options.cache or options.store) and options.diff_control_sets:
+    print((
+        'Comparing control sets is not supported with a result cache or '
+        'result store.'))
+    print('')
+    return False
+
+  if options.export and options.format == 'jsonl':
+    print('Columnar export is not supported with the jsonl format.')
+    print('')
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
@@ -142,28 +204,113 @@ def Main():
 
   collector_object = services.WindowsServicesCollector(debug=options.debug)
 
-  output_writer_object = StdoutWriter(use_tsv=options.use_tsv)
+  if options.format == 'jsonl':
+    output_writer_object = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer_object = StdoutWriter(use_tsv=options.use_tsv)
 
-  if not output_writer_object.Open():
-    print('Unable to open output writer.')
-    print('')
-    return False
+  collector_version = winregrc.__version__
+  if options.all_control_sets:
+    collector_version = f'{collector_version:s} (all control sets)'
+
+  export_writer = None
+  store = None
 
   try:
+    if not output_writer_object.Open():
+      print('Unable to open output writer.')
+      print('')
+      return False
+
+    if options.export:
+      try:
+        export_writer = columnar_export.CreateColumnarExportWriter(
+            options.export)
+      except errors.Error as exception:
+        print(f'Unable to create columnar export with error: {exception!s}')
+        print('')
+        return False
+
+      if not export_writer.Open():
+        print(f'Unable to open columnar export: {options.export:s}.')
+        print('')
+        return False
+
+    registry_file_digest = None
+    if options.cache or options.store:
+      registry_file_digest = scanner.GetRegistryFileDigest(
+          '%SystemRoot%\\System32\\config\\SYSTEM')
+      if not registry_file_digest:
+        print('Unable to determine the digest of the SYSTEM Registry file.')
+        print('')
+        return False
+
+    cache = None
+    if options.cache:
+      cache = result_cache.ResultCache(options.cache)
+
+    if options.store:
+      store = result_store.ResultStore(options.store)
+      if not store.Open():
+        print(f'Unable to open result store: {options.store:s}.')
+        print('')
+        return False
+
     if options.diff_control_sets:
       has_results = collector_object.Compare(
           scanner.registry, output_writer_object)
 
     else:
+      is_stored = bool(store) and store.HasRecords(
+          'services', registry_file_digest, collector_version)
+      if is_stored:
+        windows_services = store.GetRecords(
+            'services', registry_file_digest, collector_version)
+      elif cache:
+        windows_services = cache.Collect(
+            collector_object, scanner.registry, registry_file_digest,
+            all_control_sets=options.all_control_sets)
+      else:
+        windows_services = collector_object.Collect(
+            scanner.registry, all_control_sets=options.all_control_sets)
+
       has_results = False
-      for windows_service in collector_object.Collect(
-          scanner.registry, all_control_sets=options.all_control_sets):
-        output_writer_object.WriteWindowsService(windows_service)
+      collected_windows_services = []
+      for windows_service in windows_services:
+        if store and not is_stored:
+          collected_windows_services.append(windows_service)
+
+        if export_writer:
+          try:
+            export_writer.WriteRecord(windows_service)
+          except errors.Error as exception:
+            print((
+                f'Unable to write columnar export with error: '
+                f'{exception!s}'))
+            print('')
+            return False
+
+        elif options.format == 'jsonl':
+          output_writer_object.WriteRecord(windows_service)
+        else:
+          output_writer_object.WriteWindowsService(windows_service)
+
         has_results = True
 
+      if collected_windows_services:
+        store.WriteRecords(
+            'services', registry_file_digest, collector_version,
+            collected_windows_services)
+
   finally:
     output_writer_object.Close()
 
+    if export_writer:
+      export_writer.Close()
+
+    if store:
+      store.Close()
+
   if not has_results:
     print('No Services key found.')
 
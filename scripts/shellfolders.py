@@ -13,14 +13,14 @@ from winregrc import versions
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   _WINDOWS_VERSIONS_KEY_FUNCTION = versions.WindowsVersions.KeyFunction
 
   def WriteHeader(self):
     """Writes the header to stdout."""
-    print('# winreg-kb shellfolder definitions')
+    self.WriteText('# winreg-kb shellfolder definitions\n')
 
   def WriteShellFolder(self, shell_folder, windows_versions):
     """Writes the shell folder to stdout.
@@ -29,27 +29,27 @@ class StdoutWriter(output_writers.StdoutOutputWriter):
       shell_folder (WindowsShellFolder): the shell folder.
       windows_versions (list[str]): the Windows versions.
     """
-    print('---')
-    print(f'identifier: "{shell_folder.identifier:s}"')
+    self.WriteText('---\n')
+    self.WriteText(f'identifier: "{shell_folder.identifier:s}"\n')
 
     if shell_folder.class_name:
-      print(f'class_name: {shell_folder.class_name:s}')
+      self.WriteText(f'class_name: {shell_folder.class_name:s}\n')
 
     name = shell_folder.name
     if '\\' in name:
       name = name.replace('\\', '\\\\')
 
     if shell_folder.name:
-      print(f'name: "{name:s}"')
+      self.WriteText(f'name: "{name:s}"\n')
 
     if shell_folder.alternate_names:
       alternate_names = ', '.join([
           f'"{name:s}"' for name in shell_folder.alternate_names])
-      print(f'alternate_names: [{alternate_names:s}]')
+      self.WriteText(f'alternate_names: [{alternate_names:s}]\n')
 
     windows_versions = ', '.join([f'"{version:s}"' for version in sorted(
         windows_versions, key=self._WINDOWS_VERSIONS_KEY_FUNCTION)])
-    print(f'windows_versions: [{windows_versions:s}]')
+    self.WriteText(f'windows_versions: [{windows_versions:s}]\n')
 
 
 def Main():
@@ -13,7 +13,7 @@ from winregrc import srum_extensions
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   def WriteSRUMExtension(self, srum_extension):
@@ -25,6 +25,18 @@ class StdoutWriter(output_writers.StdoutOutputWriter):
     self.WriteText(f'{srum_extension.guid:s}\t{srum_extension.dll_name:s}\n')
 
 
+class JSONLinesWriter(output_writers.JSONLinesOutputWriter):
+  """JSON Lines output writer."""
+
+  def WriteSRUMExtension(self, srum_extension):
+    """Writes a SRUM extension to the output.
+
+    Args:
+      srum_extension (SRUMExtension): SRUM extension.
+    """
+    self.WriteRecord(srum_extension)
+
+
 def Main():
   """The main program function.
 
@@ -42,6 +54,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every SRUM extension as a JSON '
+          'object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -61,7 +79,10 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer_object = StdoutWriter()
+  if options.format == 'jsonl':
+    output_writer_object = JSONLinesWriter()
+  else:
+    output_writer_object = StdoutWriter()
 
   if not output_writer_object.Open():
     print('Unable to open output writer.')
@@ -89,7 +110,7 @@ def Main():
 
   result = collector_object.Collect(scanner.registry, output_writer_object)
   if not result:
-    print('No SRUM extensions key found.')
+    output_writer_object.WriteText('No SRUM extensions key found.\n')
 
   output_writer_object.Close()
 
@@ -26,6 +26,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False, help=(
           'enable debug output.'))
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes the system information as a '
+          'JSON object.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None, help=(
           'path of the volume containing C:\\Windows, the filename of '
@@ -44,7 +50,10 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutOutputWriter()
+  if options.format == 'jsonl':
+    output_writer = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer = output_writers.BufferedStdoutOutputWriter()
 
   if not output_writer.Open():
     print('Unable to open output writer.')
@@ -72,7 +81,11 @@ def Main():
 
   result = collector_object.Collect(scanner.registry)
   if not result:
-    print('No Current Version key found.')
+    output_writer.WriteText('No Current Version key found.\n')
+
+  elif options.format == 'jsonl':
+    output_writer.WriteRecord(collector_object.system_information)
+
   else:
     output_writer.WriteValue(
         'Product name', collector_object.system_information.product_name)
@@ -27,6 +27,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False, help=(
           'enable debug output.'))
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes the system key as a JSON '
+          'object.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None, help=(
           'path of the volume containing C:\\Windows, the filename of '
@@ -45,7 +51,10 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutOutputWriter()
+  if options.format == 'jsonl':
+    output_writer = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer = output_writers.BufferedStdoutOutputWriter()
 
   if not output_writer.Open():
     print('Unable to open output writer.')
@@ -73,7 +82,11 @@ def Main():
 
   result = collector_object.Collect(scanner.registry)
   if not result:
-    print('No LSA key found.')
+    output_writer.WriteText('No LSA key found.\n')
+
+  elif options.format == 'jsonl':
+    output_writer.WriteRecord(collector_object.system_key)
+
   else:
     boot_key = codecs.encode(collector_object.system_key.boot_key, 'hex')
     output_writer.WriteValue('Boot key', boot_key.decode('ascii'))
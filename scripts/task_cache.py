@@ -8,7 +8,13 @@ import sys
 
 from dfvfs.helpers import volume_scanner as dfvfs_volume_scanner
 
+import winregrc
+
+from winregrc import columnar_export
+from winregrc import errors
 from winregrc import output_writers
+from winregrc import result_cache
+from winregrc import result_store
 from winregrc import task_cache
 from winregrc import volume_scanner
 
@@ -23,10 +29,40 @@ def Main():
       'Extracts Task Scheduler Task Cache information from the Windows '
       'Registry.'))
 
+  argument_parser.add_argument(
+      '--cache', dest='cache', action='store', metavar='PATH', default=None,
+      help=(
+          'cache the results of the collector in the directory PATH, where '
+          'the cached results are used instead of collecting them again, if '
+          'the SOFTWARE Registry file was processed before by the same '
+          'version of the collector. The cache is not used with --debug.'))
+
   argument_parser.add_argument(
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--export', dest='export', action='store', metavar='PATH',
+      default=None, help=(
+          'write every cached task to a columnar export file at PATH '
+          'instead of stdout. An Apache Arrow IPC file or, if PATH ends '
+          'with ".parquet", a Parquet file is written when pyarrow is '
+          'installed, otherwise a NumPy .npz file.'))
+
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every cached task as a JSON '
+          'object on a separate line.'))
+
+  argument_parser.add_argument(
+      '--store', dest='store', action='store', metavar='PATH', default=None,
+      help=(
+          'store the cached tasks in a SQLite result store at PATH, where '
+          'the stored cached tasks are written instead, without collecting '
+          'them again, if the SOFTWARE Registry file was processed before by '
+          'the same version of the collector.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -43,16 +79,14 @@ def Main():
     print('')
     return False
 
-  logging.basicConfig(
-      level=logging.INFO, format='[%(levelname)s] %(message)s')
-
-  output_writer = output_writers.StdoutOutputWriter()
-
-  if not output_writer.Open():
-    print('Unable to open output writer.')
+  if options.export and options.format == 'jsonl':
+    print('Columnar export is not supported with the jsonl format.')
     print('')
     return False
 
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
   mediator = volume_scanner.WindowsRegistryVolumeScannerMediator()
   scanner = volume_scanner.WindowsRegistryVolumeScanner(mediator=mediator)
 
@@ -68,15 +102,105 @@ def Main():
     print('')
     return False
 
-  # TODO: map collector to available Registry keys.
-  collector_object = task_cache.TaskCacheCollector(
-      debug=options.debug, output_writer=output_writer)
-
-  result = collector_object.Collect(scanner.registry)
-  if not result:
-    print('No Task Cache key found.')
-
-  output_writer.Close()
+  if options.format == 'jsonl':
+    output_writer = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer = output_writers.BufferedStdoutOutputWriter()
+
+  collector_version = winregrc.__version__
+
+  export_writer = None
+  store = None
+
+  try:
+    if not output_writer.Open():
+      print('Unable to open output writer.')
+      print('')
+      return False
+
+    if options.export:
+      try:
+        export_writer = columnar_export.CreateColumnarExportWriter(
+            options.export)
+      except errors.Error as exception:
+        print(f'Unable to create columnar export with error: {exception!s}')
+        print('')
+        return False
+
+      if not export_writer.Open():
+        print(f'Unable to open columnar export: {options.export:s}.')
+        print('')
+        return False
+
+    registry_file_digest = None
+    if options.cache or options.store:
+      registry_file_digest = scanner.GetRegistryFileDigest(
+          '%SystemRoot%\\System32\\config\\SOFTWARE')
+      if not registry_file_digest:
+        print('Unable to determine the digest of the SOFTWARE Registry file.')
+        print('')
+        return False
+
+    cache = None
+    if options.cache:
+      cache = result_cache.ResultCache(options.cache)
+
+    if options.store:
+      store = result_store.ResultStore(options.store)
+      if not store.Open():
+        print(f'Unable to open result store: {options.store:s}.')
+        print('')
+        return False
+
+    # TODO: map collector to available Registry keys.
+    collector_object = task_cache.TaskCacheCollector(
+        debug=options.debug, output_writer=output_writer)
+
+    cached_tasks = []
+    if store and store.HasRecords(
+        'cached_tasks', registry_file_digest, collector_version):
+      cached_tasks = store.GetRecords(
+          'cached_tasks', registry_file_digest, collector_version)
+
+    else:
+      if cache:
+        result = cache.Collect(
+            collector_object, scanner.registry, registry_file_digest)
+      else:
+        result = collector_object.Collect(scanner.registry)
+
+      if not result:
+        output_writer.WriteText('No Task Cache key found.\n')
+
+      else:
+        cached_tasks = collector_object.cached_tasks
+
+        if store:
+          store.WriteRecords(
+              'cached_tasks', registry_file_digest, collector_version,
+              cached_tasks)
+
+    if export_writer:
+      try:
+        for cached_task in cached_tasks:
+          export_writer.WriteRecord(cached_task)
+      except errors.Error as exception:
+        print(f'Unable to write columnar export with error: {exception!s}')
+        print('')
+        return False
+
+    elif options.format == 'jsonl':
+      for cached_task in cached_tasks:
+        output_writer.WriteRecord(cached_task)
+
+  finally:
+    output_writer.Close()
+
+    if export_writer:
+      export_writer.Close()
+
+    if store:
+      store.Close()
 
   return True
 
@@ -70,7 +70,7 @@ class CSVFileWriter(output_writers.OutputWriter):
     return
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   def WriteTimeZone(self, time_zone):
@@ -92,6 +92,18 @@ class StdoutWriter(output_writers.StdoutOutputWriter):
         f'{minutes_from_utc:02d}\n'))
 
 
+class JSONLinesWriter(output_writers.JSONLinesOutputWriter):
+  """JSON Lines output writer."""
+
+  def WriteTimeZone(self, time_zone):
+    """Writes a time zone to the output.
+
+    Args:
+      time_zone (TimeZone): time zone.
+    """
+    self.WriteRecord(time_zone)
+
+
 def Main():
   """The main program function.
 
@@ -109,6 +121,12 @@ def Main():
       '--csv', dest='csv_file', action='store', metavar='time_zones.csv',
       default=None, help='path of the CSV file to write to.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format of stdout, where jsonl writes every time zone as '
+          'a JSON object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -130,6 +148,8 @@ def Main():
 
   if options.csv_file:
     output_writer_object = CSVFileWriter(options.csv_file)
+  elif options.format == 'jsonl':
+    output_writer_object = JSONLinesWriter()
   else:
     output_writer_object = StdoutWriter()
 
@@ -26,6 +26,12 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every type library as a JSON '
+          'object on a separate line.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -45,7 +51,10 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  output_writer = output_writers.StdoutOutputWriter()
+  if options.format == 'jsonl':
+    output_writer = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer = output_writers.BufferedStdoutOutputWriter()
 
   if not output_writer.Open():
     print('Unable to open output writer.')
@@ -73,12 +82,17 @@ def Main():
 
   result = collector_object.Collect(scanner.registry)
   if not result:
-    print('No TypeLib key found.')
+    output_writer.WriteText('No TypeLib key found.\n')
   else:
     for type_library in collector_object.type_libraries:
-      print((f'{type_library.identifier:s}\t{type_library.version:s}\t'
-             f'{type_library.description:s}\t'
-             f'{type_library.typelib_filename:s}'))
+      if options.format == 'jsonl':
+        output_writer.WriteRecord(type_library)
+        continue
+
+      output_writer.WriteText((
+          f'{type_library.identifier:s}\t{type_library.version:s}\t'
+          f'{type_library.description:s}\t'
+          f'{type_library.typelib_filename:s}\n'))
 
   output_writer.Close()
 
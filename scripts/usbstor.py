@@ -8,12 +8,16 @@ import sys
 
 from dfvfs.helpers import volume_scanner as dfvfs_volume_scanner
 
+import winregrc
+
 from winregrc import output_writers
+from winregrc import result_cache
+from winregrc import result_store
 from winregrc import usbstor
 from winregrc import volume_scanner
 
 
-class StdoutWriter(output_writers.StdoutOutputWriter):
+class StdoutWriter(output_writers.BufferedStdoutOutputWriter):
   """Stdout output writer."""
 
   _PROPERTY_IDENTIFIERS_PER_SET = {
@@ -98,10 +102,32 @@ def Main():
   argument_parser = argparse.ArgumentParser(description=(
       'Extracts the USB storage devices from the Windows Registry.'))
 
+  argument_parser.add_argument(
+      '--cache', dest='cache', action='store', metavar='PATH', default=None,
+      help=(
+          'cache the results of the collector in the directory PATH, where '
+          'the cached results are used instead of collecting them again, if '
+          'the SYSTEM Registry file was processed before by the same '
+          'version of the collector. The cache is not used with --debug.'))
+
   argument_parser.add_argument(
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every USB storage device as a '
+          'JSON object on a separate line.'))
+
+  argument_parser.add_argument(
+      '--store', dest='store', action='store', metavar='PATH', default=None,
+      help=(
+          'store the USB storage devices in a SQLite result store at PATH, '
+          'where the stored USB storage devices are written instead, without '
+          'collecting them again, if the SYSTEM Registry file was processed '
+          'before by the same version of the collector.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None,
       help=(
@@ -139,22 +165,76 @@ def Main():
   # TODO: map collector to available Registry keys.
   collector_object = usbstor.USBStorageDeviceCollector(debug=options.debug)
 
-  output_writer_object = StdoutWriter()
+  if options.format == 'jsonl':
+    output_writer_object = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer_object = StdoutWriter()
 
-  if not output_writer_object.Open():
-    print('Unable to open output writer.')
-    print('')
-    return False
+  collector_version = winregrc.__version__
+
+  store = None
 
   try:
+    if not output_writer_object.Open():
+      print('Unable to open output writer.')
+      print('')
+      return False
+
+    registry_file_digest = None
+    if options.cache or options.store:
+      registry_file_digest = scanner.GetRegistryFileDigest(
+          '%SystemRoot%\\System32\\config\\SYSTEM')
+      if not registry_file_digest:
+        print('Unable to determine the digest of the SYSTEM Registry file.')
+        print('')
+        return False
+
+    cache = None
+    if options.cache:
+      cache = result_cache.ResultCache(options.cache)
+
+    if options.store:
+      store = result_store.ResultStore(options.store)
+      if not store.Open():
+        print(f'Unable to open result store: {options.store:s}.')
+        print('')
+        return False
+
+    is_stored = bool(store) and store.HasRecords(
+        'usb_storage_devices', registry_file_digest, collector_version)
+    if is_stored:
+      storage_devices = store.GetRecords(
+          'usb_storage_devices', registry_file_digest, collector_version)
+    elif cache:
+      storage_devices = cache.Collect(
+          collector_object, scanner.registry, registry_file_digest)
+    else:
+      storage_devices = collector_object.Collect(scanner.registry)
+
     has_results = False
-    for storage_device in collector_object.Collect(scanner.registry):
-      output_writer_object.WriteUserProfile(storage_device)
+    collected_storage_devices = []
+    for storage_device in storage_devices:
+      if store and not is_stored:
+        collected_storage_devices.append(storage_device)
+
+      if options.format == 'jsonl':
+        output_writer_object.WriteRecord(storage_device)
+      else:
+        output_writer_object.WriteUserProfile(storage_device)
+
       has_results = True
 
+    if collected_storage_devices:
+      store.WriteRecords(
+          'usb_storage_devices', registry_file_digest, collector_version,
+          collected_storage_devices)
+
   finally:
     output_writer_object.Close()
 
+    if store:
+      store.Close()
+
   if not has_results:
     print('No USB storage devices found.')
 
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to extract user activity information in a single pass."""
+
+import argparse
+import logging
+import sys
+
+from dfvfs.helpers import volume_scanner as dfvfs_volume_scanner
+
+from winregrc import mru
+from winregrc import output_writers
+from winregrc import userassist
+from winregrc import volume_scanner
+from winregrc import walker
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Extracts the Most Recently Used (MRU) and UserAssist information from '
+      'a NTUSER.DAT Registry file, where the Registry keys are read only '
+      'once for all the collectors.'))
+
+  argument_parser.add_argument(
+      '-d', '--debug', dest='debug', action='store_true', default=False,
+      help='enable debug output.')
+
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every entry as a JSON object on '
+          'a separate line, with the name of its collector.'))
+
+  argument_parser.add_argument(
+      'source', nargs='?', action='store', metavar='PATH', default=None, help=(
+          'path of the volume containing C:\\Windows, the filename of '
+          'a storage media image containing the C:\\Windows directory, '
+          'or the path of a NTUSER.DAT Registry file.'))
+
+  options = argument_parser.parse_args()
+
+  if not options.source:
+    print('Source value is missing.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+  if options.format == 'jsonl':
+    output_writer = output_writers.JSONLinesOutputWriter()
+  else:
+    output_writer = output_writers.BufferedStdoutOutputWriter()
+
+  if not output_writer.Open():
+    print('Unable to open output writer.')
+    print('')
+    return False
+
+  mediator = volume_scanner.WindowsRegistryVolumeScannerMediator()
+  scanner = volume_scanner.WindowsRegistryVolumeScanner(mediator=mediator)
+
+  volume_scanner_options = dfvfs_volume_scanner.VolumeScannerOptions()
+  volume_scanner_options.partitions = ['all']
+  volume_scanner_options.snapshots = ['none']
+  volume_scanner_options.volumes = ['none']
+
+  if not scanner.ScanForWindowsVolume(
+      options.source, options=volume_scanner_options):
+    print((f'Unable to retrieve the volume with the Windows directory from: '
+           f'{options.source:s}.'))
+    print('')
+    return False
+
+  mru_collector = mru.MostRecentlyUsedCollector(
+      debug=options.debug, output_writer=output_writer)
+  user_assist_collector = userassist.UserAssistCollector(
+      debug=options.debug, output_writer=output_writer)
+
+  key_walker = walker.WindowsRegistryKeyWalker()
+  mru_collector.SubscribeToWalker(key_walker)
+  user_assist_collector.SubscribeToWalker(key_walker)
+
+  key_walker.Walk(scanner.registry)
+
+  records_per_collector = [
+      ('mru', mru_collector.mru_entries),
+      ('userassist', user_assist_collector.user_assist_entries)]
+
+  has_results = False
+  for collector_name, records in records_per_collector:
+    for record in records:
+      if options.format == 'jsonl':
+        output_writer.WriteRecord(
+            record, additional_values={'collector': collector_name})
+      else:
+        record_values = {
+            name: getattr(record, name, None)
+            for name in output_writers.GetRecordAttributeNames(record)}
+        output_writer.WriteValue('Collector', collector_name)
+        output_writer.WriteRecordValues(record_values)
+
+      has_results = True
+
+  if not has_results:
+    output_writer.WriteText('No user activity information found.\n')
+
+  output_writer.Close()
+
+  logging.info(
+      f'Walked {key_walker.number_of_keys_walked:d} Windows Registry keys.')
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
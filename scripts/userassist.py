@@ -8,11 +8,55 @@ import sys
 
 from dfvfs.helpers import volume_scanner as dfvfs_volume_scanner
 
+import winregrc
+
+from winregrc import columnar_export
+from winregrc import errors
 from winregrc import output_writers
+from winregrc import result_cache
+from winregrc import result_store
+from winregrc import user_collection
 from winregrc import userassist
 from winregrc import volume_scanner
 
 
+def WriteUserAssistEntries(
+    output_writer, export_writer, output_format, user_assist_entries,
+    additional_values=None):
+  """Writes UserAssist entries.
+
+  Args:
+    output_writer (OutputWriter): output writer.
+    export_writer (ColumnarExportWriter): columnar export writer or None if
+        the UserAssist entries are written to the output writer.
+    output_format (str): output format, either "jsonl" or "text".
+    user_assist_entries (iterable[UserAssistEntry]): UserAssist entries.
+    additional_values (Optional[dict[str, object]]): values that are written
+        in addition to every UserAssist entry, such as the username.
+  """
+  if export_writer:
+    for user_assist_entry in user_assist_entries:
+      export_writer.WriteRecord(user_assist_entry)
+
+  elif output_format == 'jsonl':
+    for user_assist_entry in user_assist_entries:
+      output_writer.WriteRecord(
+          user_assist_entry, additional_values=additional_values)
+
+  else:
+    guid = None
+    for user_assist_entry in user_assist_entries:
+      if user_assist_entry.guid != guid:
+        output_writer.WriteText(f'GUID\t\t: {user_assist_entry.guid:s}\n')
+        guid = user_assist_entry.guid
+
+      output_writer.WriteText(f'Name\t\t: {user_assist_entry.name:s}\n')
+      output_writer.WriteText(
+          f'Original name\t: {user_assist_entry.value_name:s}\n')
+
+    output_writer.WriteText('\n')
+
+
 def Main():
   """The main program function.
 
@@ -22,14 +66,57 @@ def Main():
   argument_parser = argparse.ArgumentParser(description=(
       'Extracts the UserAssist information from a NTUSER.DAT Registry file.'))
 
+  argument_parser.add_argument(
+      '--all_users', '--all-users', dest='all_users', action='store_true',
+      default=False, help=(
+          'extract the UserAssist information of all users within a storage '
+          'media image, where every UserAssist entry is tagged with the '
+          'username and security identifier (SID) of the user.'))
+
   argument_parser.add_argument(
       '--codepage', dest='codepage', action='store', metavar='CODEPAGE',
       default='cp1252', help='the codepage of the extended ASCII strings.')
 
+  argument_parser.add_argument(
+      '--cache', dest='cache', action='store', metavar='PATH', default=None,
+      help=(
+          'cache the results of the collector in the directory PATH, where '
+          'the cached results are used instead of collecting them again, if '
+          'the NTUSER.DAT Registry file was processed before by the same '
+          'version of the collector. The cache is not used with --debug.'))
+
   argument_parser.add_argument(
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--export', dest='export', action='store', metavar='PATH',
+      default=None, help=(
+          'write every UserAssist entry to a columnar export file at PATH '
+          'instead of stdout. An Apache Arrow IPC file or, if PATH ends '
+          'with ".parquet", a Parquet file is written when pyarrow is '
+          'installed, otherwise a NumPy .npz file.'))
+
+  argument_parser.add_argument(
+      '--format', dest='format', action='store', choices=['jsonl', 'text'],
+      default='text', metavar='FORMAT', help=(
+          'output format, where jsonl writes every UserAssist entry as a '
+          'JSON object on a separate line.'))
+
+  argument_parser.add_argument(
+      '--store', dest='store', action='store', metavar='PATH', default=None,
+      help=(
+          'store the UserAssist entries in a SQLite result store at PATH, '
+          'where the stored UserAssist entries are written instead, without '
+          'collecting them again, if the NTUSER.DAT Registry file was '
+          'processed before by the same version of the collector.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='number_of_workers', type=int, action='store',
+      default=1, metavar='NUMBER', help=(
+          'number of worker processes used to extract the UserAssist '
+          'information of the users, in combination with --all_users.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None, help=(
           'path of the volume containing C:\\Windows, the filename of '
@@ -45,16 +132,21 @@ def Main():
     print('')
     return False
 
-  logging.basicConfig(
-      level=logging.INFO, format='[%(levelname)s] %(message)s')
-
-  output_writer = output_writers.StdoutOutputWriter()
+  if options.export and options.format == 'jsonl':
+    print('Columnar export is not supported with the jsonl format.')
+    print('')
+    return False
 
-  if not output_writer.Open():
-    print('Unable to open output writer.')
+  if options.all_users and (options.cache or options.export or options.store):
+    print((
+        'Columnar export, result cache and result store are not supported '
+        'with all users.'))
     print('')
     return False
 
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
   mediator = volume_scanner.WindowsRegistryVolumeScannerMediator()
   scanner = volume_scanner.WindowsRegistryVolumeScanner(mediator=mediator)
 
@@ -63,6 +155,9 @@ def Main():
   volume_scanner_options.snapshots = ['none']
   volume_scanner_options.volumes = ['none']
 
+  if options.all_users:
+    volume_scanner_options.username = ['all']
+
   if not scanner.ScanForWindowsVolume(
       options.source, options=volume_scanner_options):
     print((f'Unable to retrieve the volume with the Windows directory from: '
@@ -70,25 +165,135 @@ def Main():
     print('')
     return False
 
-  # TODO: map collector to available Registry keys.
-  collector_object = userassist.UserAssistCollector(
-      debug=options.debug, output_writer=output_writer)
-
-  result = collector_object.Collect(scanner.registry)
-  if not result:
-    print('No UserAssist key found.')
+  if options.format == 'jsonl':
+    output_writer = output_writers.JSONLinesOutputWriter()
   else:
-    guid = None
-    for user_assist_entry in collector_object.user_assist_entries:
-      if user_assist_entry.guid != guid:
-        print(f'GUID\t\t: {user_assist_entry.guid:s}')
-        guid = user_assist_entry.guid
+    output_writer = output_writers.BufferedStdoutOutputWriter()
+
+  collector_version = winregrc.__version__
+
+  export_writer = None
+  store = None
+
+  try:
+    if not output_writer.Open():
+      print('Unable to open output writer.')
+      print('')
+      return False
+
+    if options.all_users:
+      collector_object = user_collection.AllUsersCollector(
+          userassist.UserAssistCollector, debug=options.debug,
+          number_of_workers=options.number_of_workers,
+          output_writer=output_writer)
+
+      has_results = False
+      for user_collection_object in collector_object.Collect(scanner):
+        if not user_collection_object.result:
+          continue
+
+        if options.format == 'text':
+          output_writer.WriteText(
+              f'Username\t: {user_collection_object.username:s}\n')
+          output_writer.WriteText((
+              f'SID\t\t: {user_collection_object.security_identifier!s}\n'
+              f'\n'))
+
+        WriteUserAssistEntries(
+            output_writer, None, options.format,
+            user_collection_object.collector.user_assist_entries,
+            additional_values={
+                'security_identifier': (
+                    user_collection_object.security_identifier),
+                'username': user_collection_object.username})
+
+        has_results = True
+
+      if not has_results:
+        output_writer.WriteText('No UserAssist key found.\n')
+
+      return True
+
+    if options.export:
+      try:
+        export_writer = columnar_export.CreateColumnarExportWriter(
+            options.export)
+      except errors.Error as exception:
+        print(f'Unable to create columnar export with error: {exception!s}')
+        print('')
+        return False
+
+      if not export_writer.Open():
+        print(f'Unable to open columnar export: {options.export:s}.')
+        print('')
+        return False
+
+    registry_file_digest = None
+    if options.cache or options.store:
+      registry_file_digest = scanner.GetRegistryFileDigest(
+          '%UserProfile%\\NTUSER.DAT')
+      if not registry_file_digest:
+        print((
+            'Unable to determine the digest of the NTUSER.DAT Registry '
+            'file.'))
+        print('')
+        return False
+
+    cache = None
+    if options.cache:
+      cache = result_cache.ResultCache(options.cache)
+
+    if options.store:
+      store = result_store.ResultStore(options.store)
+      if not store.Open():
+        print(f'Unable to open result store: {options.store:s}.')
+        print('')
+        return False
+
+    # TODO: map collector to available Registry keys.
+    collector_object = userassist.UserAssistCollector(
+        debug=options.debug, output_writer=output_writer)
+
+    user_assist_entries = None
+    if store and store.HasRecords(
+        'userassist_entries', registry_file_digest, collector_version):
+      user_assist_entries = store.GetRecords(
+          'userassist_entries', registry_file_digest, collector_version)
+
+    else:
+      if cache:
+        result = cache.Collect(
+            collector_object, scanner.registry, registry_file_digest)
+      else:
+        result = collector_object.Collect(scanner.registry)
+
+      if not result:
+        output_writer.WriteText('No UserAssist key found.\n')
+
+      else:
+        user_assist_entries = collector_object.user_assist_entries
+        if store:
+          store.WriteRecords(
+              'userassist_entries', registry_file_digest, collector_version,
+              user_assist_entries)
+
+    if user_assist_entries is not None:
+      try:
+        WriteUserAssistEntries(
+            output_writer, export_writer, options.format, user_assist_entries)
+      except errors.Error as exception:
+        print(f'Unable to write columnar export with error: {exception!s}')
+        print('')
+        return False
+
+  finally:
+    output_writer.Close()
 
-      print(f'Name\t\t: {user_assist_entry.name:s}')
-      print(f'Original name\t: {user_assist_entry.value_name:s}')
+    if export_writer:
+      export_writer.Close()
 
-  print('')
-  output_writer.Close()
+    if store:
+      store.Close()
 
   return True
 
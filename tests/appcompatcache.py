@@ -9,6 +9,7 @@ from dfwinreg import fake as dfwinreg_fake
 from dfwinreg import registry as dfwinreg_registry
 
 from winregrc import appcompatcache
+from winregrc import errors
 from winregrc import output_writers
 
 from tests import test_lib
@@ -247,11 +248,94 @@ class TestOutputWriter(output_writers.StdoutOutputWriter):
     self.cached_entries.append(cached_entry)
 
 
+class AppCompatCacheCachedEntryTest(test_lib.BaseTestCase):
+  """Tests for the Application Compatibility Cache cached entry."""
+
+  def testDataAndPath(self):
+    """Tests the data and path properties."""
+    value_data = b''.join([
+        '\\??\\C:\\test.exe'.encode('utf-16-le'), b'\x00\x00',
+        b'\x01\x02\x03\x04'])
+
+    cached_entry = appcompatcache.AppCompatCacheCachedEntry(
+        value_data=value_data)
+    self.assertIsNone(cached_entry.data)
+    self.assertIsNone(cached_entry.path)
+
+    with self.assertRaises(AttributeError):
+      cached_entry.bogus = None  # pylint: disable=assigning-non-slot
+
+    cached_entry.SetData(32, 4)
+    cached_entry.SetPath(0, 30)
+    self.assertEqual(cached_entry.data, b'\x01\x02\x03\x04')
+    self.assertEqual(cached_entry.path, '\\??\\C:\\test.exe')
+
+  def testSetData(self):
+    """Tests the SetData function."""
+    cached_entry = appcompatcache.AppCompatCacheCachedEntry(
+        value_data=b'\x01\x02\x03\x04')
+
+    cached_entry.SetData(2, 2)
+    self.assertEqual(cached_entry.data, b'\x03\x04')
+
+    with self.assertRaises(errors.ParseError):
+      cached_entry.SetData(2, 4)
+
+    with self.assertRaises(errors.ParseError):
+      cached_entry.SetData(-1, 2)
+
+    self.assertEqual(cached_entry.data, b'\x03\x04')
+
+  def testSetPath(self):
+    """Tests the SetPath function."""
+    value_data = b''.join([
+        'C:\\\U0001f600.exe'.encode('utf-16-le'), b'\x00\xd8\x41\x00'])
+
+    cached_entry = appcompatcache.AppCompatCacheCachedEntry(
+        value_data=value_data)
+
+    cached_entry.SetPath(0, 18)
+    self.assertEqual(cached_entry.path, 'C:\\\U0001f600.exe')
+
+    with self.assertRaises(errors.ParseError):
+      cached_entry.SetPath(0, 32)
+
+    with self.assertRaises(errors.ParseError):
+      cached_entry.SetPath(-2, 4)
+
+    # Odd path size.
+    with self.assertRaises(errors.ParseError):
+      cached_entry.SetPath(0, 17)
+
+    # Unpaired high surrogate.
+    with self.assertRaises(errors.ParseError):
+      cached_entry.SetPath(18, 4)
+
+    self.assertEqual(cached_entry.path, 'C:\\\U0001f600.exe')
+
+
 class AppCompatCacheDataParserTest(test_lib.BaseTestCase):
   """Tests for the Application Compatibility Cache data parser."""
 
   # pylint: disable=protected-access
 
+  _CACHED_ENTRY_ATTRIBUTE_NAMES = [
+      'cached_entry_size', 'data', 'file_size', 'insertion_flags',
+      'last_modification_time', 'last_update_time', 'path', 'shim_flags']
+
+  def _GetCachedEntryValues(self, cached_entry):
+    """Retrieves the values of a cached entry.
+
+    Args:
+      cached_entry (AppCompatCacheCachedEntry): cached entry.
+
+    Returns:
+      dict[str, object]: values of the cached entry per attribute name.
+    """
+    return {
+        attribute_name: getattr(cached_entry, attribute_name)
+        for attribute_name in self._CACHED_ENTRY_ATTRIBUTE_NAMES}
+
   def testCheckSignature(self):
     """Tests the CheckSignature function."""
     parser = appcompatcache.AppCompatCacheDataParser()
@@ -315,6 +399,42 @@ class AppCompatCacheDataParserTest(test_lib.BaseTestCase):
 
     # TODO: add bogus data tests.
 
+  def testParseCachedEntries(self):
+    """Tests the ParseCachedEntries function."""
+    parser = appcompatcache.AppCompatCacheDataParser()
+
+    for format_type, value_data in (
+        (parser._FORMAT_TYPE_XP, _CACHE_DATA_WINDOWS_XP),
+        (parser._FORMAT_TYPE_2003, _CACHE_DATA_WINDOWS_2003),
+        (parser._FORMAT_TYPE_8, _CACHE_DATA_WINDOWS_8_0)):
+      cache_header = parser.ParseHeader(format_type, value_data)
+      cached_entries = parser.ParseCachedEntries(
+          format_type, value_data, cache_header)
+      self.assertEqual(len(cached_entries), 1)
+
+      # Compare with the cached entries parsed one by one.
+      cache_header = parser.ParseHeader(format_type, value_data)
+      expected_cached_entry = parser.ParseCachedEntry(
+          format_type, value_data, 0, cache_header.header_size)
+
+      self.assertEqual(
+          self._GetCachedEntryValues(cached_entries[0]),
+          self._GetCachedEntryValues(expected_cached_entry))
+
+  def testParseCachedEntriesWithTruncatedData(self):
+    """Tests the ParseCachedEntries function with truncated data."""
+    parser = appcompatcache.AppCompatCacheDataParser()
+
+    value_data = b''.join([
+        _CACHE_DATA_WINDOWS_XP[:4], b'\x02\x00\x00\x00',
+        _CACHE_DATA_WINDOWS_XP[8:], b'\x00' * 8])
+
+    cache_header = parser.ParseHeader(parser._FORMAT_TYPE_XP, value_data)
+
+    with self.assertRaises(errors.ParseError):
+      parser.ParseCachedEntries(
+          parser._FORMAT_TYPE_XP, value_data, cache_header)
+
 
 class AppCompatCacheCollectorTest(test_lib.BaseTestCase):
   """Tests for the Application Compatibility Cache collector."""
@@ -338,14 +458,22 @@ class AppCompatCacheCollectorTest(test_lib.BaseTestCase):
         'Current', data=value_data, data_type=dfwinreg_definitions.REG_DWORD)
     registry_key.AddValue(registry_value)
 
-    registry_key = dfwinreg_fake.FakeWinRegistryKey('AppCompatibility')
-    registry_file.AddKeyByPath(
-        '\\ControlSet001\\Control\\Session Manager', registry_key)
-
-    registry_value = dfwinreg_fake.FakeWinRegistryValue(
-        'AppCompatCache', data=_CACHE_DATA_WINDOWS_XP,
-        data_type=dfwinreg_definitions.REG_BINARY)
-    registry_key.AddValue(registry_value)
+    # The AppCompatCache values of ControlSet001 and ControlSet002 are
+    # identical.
+    for control_set, value_data in (
+        ('ControlSet001', _CACHE_DATA_WINDOWS_XP),
+        ('ControlSet002', _CACHE_DATA_WINDOWS_XP),
+        ('ControlSet003', b''.join([
+            _CACHE_DATA_WINDOWS_XP[:400], b'X',
+            _CACHE_DATA_WINDOWS_XP[401:]]))):
+      registry_key = dfwinreg_fake.FakeWinRegistryKey('AppCompatibility')
+      registry_file.AddKeyByPath(
+          f'\\{control_set:s}\\Control\\Session Manager', registry_key)
+
+      registry_value = dfwinreg_fake.FakeWinRegistryValue(
+          'AppCompatCache', data=value_data,
+          data_type=dfwinreg_definitions.REG_BINARY)
+      registry_key.AddValue(registry_value)
 
     registry_file.Open(None)
 
@@ -366,7 +494,59 @@ class AppCompatCacheCollectorTest(test_lib.BaseTestCase):
 
     test_output_writer.Close()
 
-    self.assertEqual(len(collector_object.cached_entries), 1)
+    # The identical values of ControlSet001 and ControlSet002 are parsed once.
+    cached_entries = collector_object.cached_entries
+    self.assertEqual(len(cached_entries), 2)
+    self.assertEqual(
+        cached_entries[0].control_sets, ['ControlSet001', 'ControlSet002'])
+    self.assertEqual(cached_entries[1].control_sets, ['ControlSet003'])
+    self.assertNotEqual(cached_entries[0].path, cached_entries[1].path)
+
+  def testCollectMultipleTimes(self):
+    """Tests the Collect function called multiple times."""
+    registry = self._CreateTestRegistry()
+
+    test_output_writer = TestOutputWriter()
+    collector_object = appcompatcache.AppCompatCacheCollector(
+        output_writer=test_output_writer)
+
+    result = collector_object.Collect(registry, all_control_sets=True)
+    self.assertTrue(result)
+
+    # The cached entries are not deduplicated against the previous collection.
+    result = collector_object.Collect(registry, all_control_sets=True)
+    self.assertTrue(result)
+
+    test_output_writer.Close()
+
+    self.assertEqual(collector_object._cached_entries_per_digest, {})  # pylint: disable=protected-access
+
+    cached_entries = collector_object.cached_entries
+    self.assertEqual(len(cached_entries), 4)
+    self.assertEqual(
+        cached_entries[2].control_sets, ['ControlSet001', 'ControlSet002'])
+    self.assertEqual(cached_entries[3].control_sets, ['ControlSet003'])
+
+  def testCollectWithNumberOfWorkers(self):
+    """Tests the Collect function with worker processes."""
+    registry = self._CreateTestRegistry()
+
+    test_output_writer = TestOutputWriter()
+    collector_object = appcompatcache.AppCompatCacheCollector(
+        output_writer=test_output_writer)
+
+    result = collector_object.Collect(
+        registry, all_control_sets=True, number_of_workers=2)
+    self.assertTrue(result)
+
+    test_output_writer.Close()
+
+    cached_entries = collector_object.cached_entries
+    self.assertEqual(len(cached_entries), 2)
+    self.assertEqual(
+        cached_entries[0].control_sets, ['ControlSet001', 'ControlSet002'])
+    self.assertEqual(cached_entries[1].control_sets, ['ControlSet003'])
+    self.assertNotEqual(cached_entries[0].path, cached_entries[1].path)
 
   def testCollectEmpty(self):
     """Tests the Collect function on an empty Registry."""
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the catalog collector."""
+
+import os
+import tempfile
+import unittest
+
+from dfwinreg import definitions as dfwinreg_definitions
+from dfwinreg import fake as dfwinreg_fake
+
+from winregrc import catalog
+
+from tests import test_lib as shared_test_lib
+
+
+class CatalogCollectorTest(shared_test_lib.BaseTestCase):
+  """Tests for the catalog collector."""
+
+  # pylint: disable=protected-access
+
+  def _CreateTestKey(self):
+    """Creates a Windows Registry key for testing.
+
+    Returns:
+      dfwinreg.FakeWinRegistryKey: root Windows Registry key for testing.
+    """
+    root_key = dfwinreg_fake.FakeWinRegistryKey(
+        '', key_path_prefix='HKEY_CURRENT_USER')
+
+    for key_name in ('Console', 'Environment'):
+      registry_key = dfwinreg_fake.FakeWinRegistryKey(key_name)
+      root_key.AddSubkey(key_name, registry_key)
+
+      registry_value = dfwinreg_fake.FakeWinRegistryValue(
+          'Value', data=b'\x00\x00\x00\x00',
+          data_type=dfwinreg_definitions.REG_DWORD)
+      registry_key.AddValue(registry_value)
+
+      sub_key = dfwinreg_fake.FakeWinRegistryKey('Subkey')
+      registry_key.AddSubkey('Subkey', sub_key)
+
+    return root_key
+
+  def testCollect(self):
+    """Tests the Collect function."""
+    root_key = self._CreateTestKey()
+
+    collector_object = catalog.CatalogCollector()
+
+    key_descriptors = list(collector_object.Collect(root_key))
+    self.assertEqual(len(key_descriptors), 5)
+
+    key_paths = [
+        key_descriptor.key_path for key_descriptor in key_descriptors]
+    self.assertEqual(key_paths, [
+        'HKEY_CURRENT_USER',
+        'HKEY_CURRENT_USER\\Console',
+        'HKEY_CURRENT_USER\\Console\\Subkey',
+        'HKEY_CURRENT_USER\\Environment',
+        'HKEY_CURRENT_USER\\Environment\\Subkey'])
+
+    self.assertEqual(
+        key_descriptors[1].value_descriptors, [('Value', 'REG_DWORD_LE')])
+
+  def testCollectWithGroupKeys(self):
+    """Tests the Collect function with group keys."""
+    root_key = self._CreateTestKey()
+
+    collector_object = catalog.CatalogCollector(group_keys=True)
+
+    key_descriptors = list(collector_object.Collect(root_key))
+    self.assertEqual(len(key_descriptors), 2)
+
+    self.assertEqual(key_descriptors[0].key_path, 'HKEY_CURRENT_USER')
+    self.assertEqual(key_descriptors[0].grouped_key_paths, [
+        'HKEY_CURRENT_USER\\Console\\Subkey',
+        'HKEY_CURRENT_USER\\Environment\\Subkey'])
+
+    self.assertEqual(key_descriptors[1].key_path, 'HKEY_CURRENT_USER\\Console')
+    self.assertEqual(key_descriptors[1].grouped_key_paths, [
+        'HKEY_CURRENT_USER\\Environment'])
+    self.assertEqual(
+        key_descriptors[1].values_digest, '7c1cd27d72b7603c3e8f6b6789c42f6f')
+
+  def testCollectWithGroupKeysOutOfCore(self):
+    """Tests the Collect function with group keys out-of-core."""
+    root_key = self._CreateTestKey()
+
+    collector_object = catalog.CatalogCollector(group_keys=True)
+    expected_key_descriptors = list(collector_object.Collect(root_key))
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      collector_object = catalog.CatalogCollector(
+          group_keys=True, out_of_core=True,
+          temporary_directory=temporary_directory)
+      key_descriptors = list(collector_object.Collect(root_key))
+
+    self.assertEqual(len(key_descriptors), len(expected_key_descriptors))
+
+    for key_descriptor, expected_key_descriptor in zip(
+        key_descriptors, expected_key_descriptors):
+      self.assertEqual(
+          key_descriptor.__dict__, expected_key_descriptor.__dict__)
+
+  def testCollectWithNumberOfWorkers(self):
+    """Tests the Collect function with worker processes."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      registry_file = catalog.OpenWindowsRegistryFile(file_object)
+      self.assertIsNotNone(registry_file)
+
+      try:
+        registry_file.SetKeyPathPrefix('HKEY_CURRENT_USER')
+        root_key = registry_file.GetRootKey()
+
+        collector_object = catalog.CatalogCollector()
+        expected_key_paths = [
+            key_descriptor.key_path
+            for key_descriptor in collector_object.Collect(root_key)]
+
+        collector_object = catalog.CatalogCollector(number_of_workers=2)
+        key_paths = [
+            key_descriptor.key_path
+            for key_descriptor in collector_object.Collect(
+                root_key, path=test_file_path)]
+
+        # Small batches result in subtrees that are collected in multiple
+        # batches.
+        collector_object = catalog.CatalogCollector(number_of_workers=2)
+        collector_object._maximum_batch_size = 7
+        batched_key_paths = [
+            key_descriptor.key_path
+            for key_descriptor in collector_object.Collect(
+                root_key, path=test_file_path)]
+
+      finally:
+        registry_file.Close()
+
+    self.assertEqual(len(key_paths), 1597)
+    self.assertEqual(key_paths, expected_key_paths)
+    self.assertEqual(batched_key_paths, expected_key_paths)
+
+  def testCollectWithNumberOfWorkersAndUnsupportedFile(self):
+    """Tests the Collect function with a file the workers cannot open."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      unsupported_file_path = os.path.join(temporary_directory, 'bogus.dat')
+      with open(unsupported_file_path, 'wb') as file_object:
+        file_object.write(b'bogus')
+
+      with open(test_file_path, 'rb') as file_object:
+        registry_file = catalog.OpenWindowsRegistryFile(file_object)
+        self.assertIsNotNone(registry_file)
+
+        try:
+          registry_file.SetKeyPathPrefix('HKEY_CURRENT_USER')
+          root_key = registry_file.GetRootKey()
+
+          collector_object = catalog.CatalogCollector()
+          expected_key_paths = [
+              key_descriptor.key_path
+              for key_descriptor in collector_object.Collect(root_key)]
+
+          # The keys are collected in the current process instead.
+          collector_object = catalog.CatalogCollector(number_of_workers=2)
+          with self.assertLogs(level='WARNING'):
+            key_paths = [
+                key_descriptor.key_path
+                for key_descriptor in collector_object.Collect(
+                    root_key, path=unsupported_file_path)]
+
+        finally:
+          registry_file.Close()
+
+    self.assertEqual(len(key_paths), 1597)
+    self.assertEqual(key_paths, expected_key_paths)
+
+  def testCollectWithMaximumFanout(self):
+    """Tests the Collect function with a maximum fanout."""
+    root_key = dfwinreg_fake.FakeWinRegistryKey(
+        '', key_path_prefix='HKEY_LOCAL_MACHINE\\Software\\Classes')
+
+    for key_index in range(100):
+      key_name = f'{{{key_index:08d}-0000-0000-0000-000000000000}}'
+      registry_key = dfwinreg_fake.FakeWinRegistryKey(key_name)
+      root_key.AddSubkey(key_name, registry_key)
+
+      registry_value = dfwinreg_fake.FakeWinRegistryValue(
+          'Value', data=b'\x00\x00\x00\x00',
+          data_type=dfwinreg_definitions.REG_DWORD)
+      registry_key.AddValue(registry_value)
+
+    collector_object = catalog.CatalogCollector(
+        maximum_fanout=10, random_seed=0)
+
+    key_descriptors = list(collector_object.Collect(root_key))
+    self.assertEqual(len(key_descriptors), 11)
+
+    key_paths = [
+        key_descriptor.key_path for key_descriptor in key_descriptors[1:]]
+    self.assertEqual(key_paths, sorted(key_paths))
+    self.assertEqual(len(set(key_paths)), 10)
+
+    sampling_statistics = collector_object.sampling_statistics
+    self.assertIsNotNone(sampling_statistics)
+    self.assertEqual(sampling_statistics.estimated_number_of_keys, 101.0)
+    self.assertEqual(sampling_statistics.number_of_keys, 11)
+    self.assertEqual(sampling_statistics.number_of_sampled_keys, 1)
+    self.assertEqual(sampling_statistics.number_of_value_signatures, 2)
+    self.assertAlmostEqual(sampling_statistics.sampled_fraction, 11 / 101)
+
+    collector_object = catalog.CatalogCollector(maximum_fanout=100)
+
+    key_descriptors = list(collector_object.Collect(root_key))
+    self.assertEqual(len(key_descriptors), 101)
+
+    sampling_statistics = collector_object.sampling_statistics
+    self.assertEqual(sampling_statistics.number_of_sampled_keys, 0)
+    self.assertEqual(sampling_statistics.sampled_fraction, 1.0)
+
+  def testGetValueDescriptorSortKey(self):
+    """Tests the _GetValueDescriptorSortKey function."""
+    collector_object = catalog.CatalogCollector()
+
+    value_descriptors = [
+        ('Value10', 'REG_SZ'), ('value2', 'REG_SZ'), ('(default)', 'REG_SZ'),
+        ('Value1', 'REG_SZ')]
+    value_descriptors.sort(key=collector_object._GetValueDescriptorSortKey)
+
+    value_names = [value_name for value_name, _ in value_descriptors]
+    self.assertEqual(value_names, ['(default)', 'Value1', 'value2', 'Value10'])
+
+  def testCollectCatalogKeyDescriptorsWithDeepTree(self):
+    """Tests the _CollectCatalogKeyDescriptors function with a deep tree."""
+    root_key = dfwinreg_fake.FakeWinRegistryKey(
+        '', key_path_prefix='HKEY_CURRENT_USER')
+
+    registry_key = root_key
+    for _ in range(2000):
+      sub_key = dfwinreg_fake.FakeWinRegistryKey('Subkey')
+      registry_key.AddSubkey('Subkey', sub_key)
+      registry_key = sub_key
+
+    collector_object = catalog.CatalogCollector()
+
+    key_descriptors = list(
+        collector_object._CollectCatalogKeyDescriptors(root_key))
+    self.assertEqual(len(key_descriptors), 2001)
+
+
+class CatalogMergerTest(shared_test_lib.BaseTestCase):
+  """Tests for the catalog merger."""
+
+  def testMerge(self):
+    """Tests the Merge function."""
+    ntuser_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(ntuser_file_path)
+
+    usrclass_file_path = self._GetTestFilePath(['UsrClass.dat'])
+    self._SkipIfPathNotExists(usrclass_file_path)
+
+    merger_object = catalog.CatalogMerger()
+
+    key_descriptors = list(merger_object.Merge([
+        (ntuser_file_path, 'Windows XP 32-bit'),
+        (ntuser_file_path, 'Windows 7'),
+        (usrclass_file_path, 'Windows 7')]))
+    self.assertEqual(len(key_descriptors), 9102)
+
+    key_paths = [
+        key_descriptor.key_path.upper() for key_descriptor in key_descriptors]
+    self.assertEqual(key_paths, sorted(key_paths))
+
+    key_descriptor = key_descriptors[0]
+    self.assertEqual(key_descriptor.key_path, 'HKEY_CURRENT_USER')
+    self.assertEqual(
+        key_descriptor.windows_versions, ['Windows XP 32-bit', 'Windows 7'])
+
+    key_descriptor = key_descriptors[3]
+    self.assertEqual(
+        key_descriptor.key_path,
+        'HKEY_CURRENT_USER\\AppEvents\\EventLabels\\.Default')
+
+    value_descriptor = key_descriptor.value_descriptors[0]
+    self.assertEqual(value_descriptor.name, '(default)')
+    self.assertEqual(value_descriptor.data_type, 'REG_SZ')
+    self.assertEqual(
+        value_descriptor.windows_versions, ['Windows XP 32-bit', 'Windows 7'])
+
+    windows_versions = set()
+    for key_descriptor in key_descriptors:
+      if key_descriptor.key_path.upper().startswith(
+          'HKEY_CURRENT_USER\\SOFTWARE\\CLASSES\\'):
+        windows_versions.update(key_descriptor.windows_versions)
+
+    self.assertEqual(windows_versions, set(['Windows 7']))
+
+  def testMergeWithMissingFile(self):
+    """Tests the Merge function with a Windows Registry file that is missing."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      missing_file_path = os.path.join(temporary_directory, 'missing.dat')
+
+      sources = [(missing_file_path, 'Windows XP 32-bit'),
+                 (test_file_path, 'Windows 7')]
+
+      for number_of_workers in (1, 2):
+        merger_object = catalog.CatalogMerger(
+            number_of_workers=number_of_workers)
+
+        with self.assertLogs(level='WARNING'):
+          key_descriptors = list(merger_object.Merge(sources))
+
+        self.assertEqual(len(key_descriptors), 1597)
+
+  def testMergeWithNumberOfWorkers(self):
+    """Tests the Merge function with worker processes."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    sources = [(test_file_path, 'Windows 7'), (test_file_path, None)]
+
+    merger_object = catalog.CatalogMerger()
+    expected_key_paths = [
+        key_descriptor.key_path
+        for key_descriptor in merger_object.Merge(sources)]
+
+    merger_object = catalog.CatalogMerger(number_of_workers=2)
+    key_paths = [
+        key_descriptor.key_path
+        for key_descriptor in merger_object.Merge(sources)]
+
+    self.assertEqual(len(key_paths), 1597)
+    self.assertEqual(key_paths, expected_key_paths)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the columnar export."""
+
+import os
+import tempfile
+import types
+import unittest
+import zipfile
+
+from dfdatetime import filetime as dfdatetime_filetime
+
+from winregrc import appcompatcache
+from winregrc import columnar_export
+from winregrc import errors
+
+from tests import test_lib as shared_test_lib
+
+
+class TestColumnarExportWriter(columnar_export.ColumnarExportWriter):
+  """Columnar export writer for testing.
+
+  Attributes:
+    row_groups (list[dict[str, tuple[str, list[object]]]]): per row group
+        the value type and values per column name, where a row without
+        a value is None.
+  """
+
+  def __init__(self, row_group_size=2):
+    """Initializes a columnar export writer for testing.
+
+    Args:
+      row_group_size (Optional[int]): maximum number of rows per row group.
+    """
+    super(TestColumnarExportWriter, self).__init__(
+        None, row_group_size=row_group_size)
+    self.row_groups = []
+
+  def _WriteRowGroup(self, columns, number_of_rows):
+    """Writes a row group.
+
+    Args:
+      columns (list[ColumnBuffer]): columns.
+      number_of_rows (int): number of rows in the row group.
+    """
+    row_group = {}
+    for column in columns:
+      values = [
+          value if is_valid else None
+          for value, is_valid in zip(column.values, column.validity)]
+      row_group[column.name] = (column.value_type, values)
+
+    self.row_groups.append(row_group)
+
+  def Open(self):
+    """Opens the columnar export writer.
+
+    Returns:
+      bool: True if successful or False if not.
+    """
+    return True
+
+
+class ColumnBufferTest(shared_test_lib.BaseTestCase):
+  """Tests for the column buffer."""
+
+  def testAppend(self):
+    """Tests the Append function."""
+    column = columnar_export.ColumnBuffer('test')
+    column.Append(None, None)
+    column.Append(1, column.VALUE_TYPE_INTEGER)
+    column.Append(None, None)
+
+    self.assertEqual(column.value_type, column.VALUE_TYPE_INTEGER)
+    self.assertEqual(column.values.typecode, 'q')
+    self.assertEqual(list(column.values), [0, 1, 0])
+    self.assertEqual(column.validity, bytearray([0, 1, 0]))
+    self.assertEqual(len(column), 3)
+
+    # Values of different types promote the column to a string column.
+    column.Append(b'\xff', column.VALUE_TYPE_BINARY)
+
+    self.assertEqual(column.value_type, column.VALUE_TYPE_STRING)
+    self.assertEqual(column.values, ['', '1', '', 'ff'])
+
+    column = columnar_export.ColumnBuffer('test')
+    column.Append(True, column.VALUE_TYPE_BOOLEAN)
+    column.Append('string', column.VALUE_TYPE_STRING)
+
+    self.assertEqual(column.values, ['True', 'string'])
+
+  def testAppendFrozen(self):
+    """Tests the Append function on a frozen column."""
+    column = columnar_export.ColumnBuffer('test')
+    column.Freeze()
+
+    self.assertEqual(column.value_type, column.VALUE_TYPE_STRING)
+
+    column.Append(1, column.VALUE_TYPE_INTEGER)
+    self.assertEqual(column.values, ['1'])
+
+    column = columnar_export.ColumnBuffer('test')
+    column.Append(1, column.VALUE_TYPE_INTEGER)
+    column.Freeze()
+
+    with self.assertRaises(errors.Error):
+      column.Append('string', column.VALUE_TYPE_STRING)
+
+  def testClear(self):
+    """Tests the Clear function."""
+    column = columnar_export.ColumnBuffer('test')
+    column.Append(1.5, column.VALUE_TYPE_FLOAT)
+    column.Clear()
+
+    self.assertEqual(column.value_type, column.VALUE_TYPE_FLOAT)
+    self.assertEqual(len(column), 0)
+    self.assertEqual(len(column.values), 0)
+
+
+def _CreateCachedEntry():
+  """Creates an Application Compatibility Cache cached entry for testing.
+
+  Returns:
+    AppCompatCacheCachedEntry: cached entry.
+  """
+  cached_entry = appcompatcache.AppCompatCacheCachedEntry(
+      value_data=b''.join(['C:\\test.exe'.encode('utf-16-le'), b'\x01\x02']))
+  cached_entry.SetData(22, 2)
+  cached_entry.SetPath(0, 22)
+  cached_entry.file_size = 0x12000
+  cached_entry.last_modification_time = 0x01c2f24476863500
+  return cached_entry
+
+
+class ColumnarExportWriterTest(shared_test_lib.BaseTestCase):
+  """Tests for the columnar export writer."""
+
+  def testWriteRecord(self):
+    """Tests the WriteRecord function."""
+    cached_entry = _CreateCachedEntry()
+
+    test_writer = TestColumnarExportWriter(row_group_size=2)
+    test_writer.Open()
+    test_writer.WriteRecord(cached_entry)
+
+    cached_entry = appcompatcache.AppCompatCacheCachedEntry()
+    cached_entry.control_sets = ['ControlSet001']
+    cached_entry.last_modification_time = dfdatetime_filetime.Filetime(
+        timestamp=0x01c2f24476863500)
+
+    test_writer.WriteRecord(cached_entry)
+    test_writer.WriteRecord(appcompatcache.AppCompatCacheCachedEntry())
+    test_writer.Close()
+
+    self.assertEqual(len(test_writer.row_groups), 2)
+
+    row_group = test_writer.row_groups[0]
+    self.assertEqual(row_group['control_sets'], ('string', [
+        '[]', '["ControlSet001"]']))
+    self.assertEqual(row_group['data'], ('binary', [b'\x01\x02', None]))
+    self.assertEqual(row_group['file_size'], ('integer', [0x12000, None]))
+    self.assertEqual(row_group['insertion_flags'], ('string', [None, None]))
+    self.assertEqual(row_group['last_modification_time'], ('string', [
+        '126930115380000000', '2003-03-24 20:32:18.0000000']))
+    self.assertEqual(row_group['path'], ('string', ['C:\\test.exe', None]))
+
+    row_group = test_writer.row_groups[1]
+    self.assertEqual(row_group['path'], ('string', [None]))
+
+  def testWriteRecordWithDifferentInstanceAttributes(self):
+    """Tests the WriteRecord function with different instance attributes."""
+    test_writer = TestColumnarExportWriter(row_group_size=3)
+    test_writer.Open()
+    test_writer.WriteRecord(types.SimpleNamespace(name='test1'))
+    test_writer.WriteRecord(types.SimpleNamespace(name='test2', size=2))
+    test_writer.WriteRecord(types.SimpleNamespace(name='test3'))
+    test_writer.Close()
+
+    self.assertEqual(test_writer.row_groups, [{
+        'name': ('string', ['test1', 'test2', 'test3']),
+        'size': ('integer', [None, 2, None])}])
+
+    test_writer = TestColumnarExportWriter(row_group_size=1)
+    test_writer.Open()
+    test_writer.WriteRecord(types.SimpleNamespace(name='test1'))
+
+    with self.assertRaises(errors.Error):
+      test_writer.WriteRecord(types.SimpleNamespace(name='test2', size=2))
+
+  def testWriteRecordWithDifferentClasses(self):
+    """Tests the WriteRecord function with records of different classes."""
+    test_writer = TestColumnarExportWriter(row_group_size=1)
+    test_writer.Open()
+    test_writer.WriteRecord(appcompatcache.AppCompatCacheCachedEntry())
+
+    with self.assertRaises(errors.Error):
+      test_writer.WriteRecord(types.SimpleNamespace(name='test'))
+
+
+@unittest.skipIf(
+    columnar_export.numpy is None, 'requires numpy')
+class NumPyColumnarExportWriterTest(shared_test_lib.BaseTestCase):
+  """Tests for the NumPy .npz columnar export writer."""
+
+  def testWriteRecord(self):
+    """Tests the WriteRecord function."""
+    cached_entry = _CreateCachedEntry()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'export.npz')
+
+      test_writer = columnar_export.NumPyColumnarExportWriter(path)
+      result = test_writer.Open()
+      self.assertTrue(result)
+
+      test_writer.WriteRecord(cached_entry)
+      test_writer.WriteRecord(appcompatcache.AppCompatCacheCachedEntry())
+      test_writer.Close()
+
+      with zipfile.ZipFile(path) as zip_file:
+        self.assertIn('file_size.0.npy', zip_file.namelist())
+
+      npz_file = columnar_export.numpy.load(path)
+      self.assertEqual(list(npz_file['file_size.0']), [0x12000, 0])
+      self.assertEqual(list(npz_file['file_size.0.validity']), [True, False])
+      self.assertEqual(list(npz_file['path.0']), [
+          'C:\\test.exe', ''])
+      npz_file.close()
+
+
+@unittest.skipIf(
+    columnar_export.pyarrow is None, 'requires pyarrow')
+class ArrowColumnarExportWriterTest(shared_test_lib.BaseTestCase):
+  """Tests for the Apache Arrow IPC or Parquet columnar export writer."""
+
+  def testWriteRecord(self):
+    """Tests the WriteRecord function."""
+    cached_entry = _CreateCachedEntry()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      for filename in ('export.arrow', 'export.parquet'):
+        path = os.path.join(temporary_directory, filename)
+
+        test_writer = columnar_export.ArrowColumnarExportWriter(
+            path, row_group_size=1)
+        result = test_writer.Open()
+        self.assertTrue(result)
+
+        test_writer.WriteRecord(cached_entry)
+        test_writer.WriteRecord(appcompatcache.AppCompatCacheCachedEntry())
+        test_writer.Close()
+
+        if filename.endswith('.parquet'):
+          table = columnar_export.pyarrow_parquet.read_table(path)
+        else:
+          with columnar_export.pyarrow.memory_map(path, 'r') as source:
+            table = columnar_export.pyarrow_ipc.open_file(source).read_all()
+
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column('file_size').to_pylist(), [
+            0x12000, None])
+        self.assertEqual(table.column('path').to_pylist(), [
+            'C:\\test.exe', None])
+
+
+if __name__ == '__main__':
+  unittest.main()
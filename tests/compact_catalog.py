@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the compact catalog."""
+
+import io
+import unittest
+
+from winregrc import catalog
+from winregrc import compact_catalog
+from winregrc import errors
+
+from tests import test_lib as shared_test_lib
+
+
+class CompactCatalogTestCase(shared_test_lib.BaseTestCase):
+  """Compact catalog test case."""
+
+  def _CreateCompactCatalog(self, key_descriptors):
+    """Creates a compact catalog.
+
+    Args:
+      key_descriptors (list[tuple[str, list[tuple[str, str]]]]): key path and
+          value descriptors of the keys.
+
+    Returns:
+      io.StringIO: compact catalog.
+    """
+    file_object = io.StringIO()
+
+    writer = compact_catalog.CompactCatalogWriter(file_object)
+    writer.WriteHeader()
+
+    for key_path, value_descriptors in key_descriptors:
+      key_descriptor = catalog.CatalogKeyDescriptor()
+      key_descriptor.key_path = key_path
+      key_descriptor.value_descriptors = value_descriptors
+
+      writer.WriteKeyDescriptor(key_descriptor)
+
+    file_object.seek(0, io.SEEK_SET)
+    return file_object
+
+
+class CompactCatalogWriterTest(CompactCatalogTestCase):
+  """Tests for the compact catalog writer."""
+
+  def testWriteKeyDescriptor(self):
+    """Tests the WriteKeyDescriptor function."""
+    file_object = self._CreateCompactCatalog([
+        ('HKEY_CURRENT_USER', []),
+        ('HKEY_CURRENT_USER\\Console', [('Value', 'REG_DWORD_LE')]),
+        ('HKEY_CURRENT_USER\\Environment', [])])
+
+    self.assertEqual(file_object.getvalue(), (
+        '# winregrc compact catalog 1\n'
+        '0\tHKEY_CURRENT_USER\n'
+        '17\t\\Console\n'
+        '\tValue\tREG_DWORD_LE\n'
+        '18\tEnvironment\n'))
+
+  def testWriteKeyDescriptorWithEscapedCharacters(self):
+    """Tests the WriteKeyDescriptor function with escaped characters."""
+    file_object = self._CreateCompactCatalog([
+        ('HKEY_CURRENT_USER\\Line\nfeed', [('100%\r\n', 'REG_SZ')]),
+        ('HKEY_CURRENT_USER\\Line\nfeed\\Subkey', [])])
+
+    self.assertEqual(file_object.getvalue(), (
+        '# winregrc compact catalog 1\n'
+        '0\tHKEY_CURRENT_USER\\Line%0Afeed\n'
+        '\t100%25%0D%0A\tREG_SZ\n'
+        '29\t\\Subkey\n'))
+
+
+class CompactCatalogReaderTest(CompactCatalogTestCase):
+  """Tests for the compact catalog reader."""
+
+  def testReadKeyDescriptors(self):
+    """Tests the ReadKeyDescriptors function."""
+    expected_key_descriptors = [
+        ('HKEY_CURRENT_USER', []),
+        ('HKEY_CURRENT_USER\\Console', [
+            ('(default)', 'REG_SZ'), ('Value', 'REG_DWORD_LE')]),
+        ('HKEY_CURRENT_USER\\Console\\Subkey', []),
+        ('HKEY_CURRENT_USER\\Environment', [('Path', 'REG_EXPAND_SZ')])]
+
+    file_object = self._CreateCompactCatalog(expected_key_descriptors)
+
+    reader = compact_catalog.CompactCatalogReader(file_object)
+    key_descriptors = [
+        (key_descriptor.key_path, key_descriptor.value_descriptors)
+        for key_descriptor in reader.ReadKeyDescriptors()]
+
+    self.assertEqual(key_descriptors, expected_key_descriptors)
+
+  def testReadKeyDescriptorsWithEscapedCharacters(self):
+    """Tests the ReadKeyDescriptors function with escaped characters."""
+    expected_key_descriptors = [
+        ('HKEY_CURRENT_USER\\Line\nfeed', [('100%\r\n', 'REG_SZ')]),
+        ('HKEY_CURRENT_USER\\Line\nfeed\\Subkey', []),
+        ('HKEY_CURRENT_USER\\Percent%0A', [('%25', 'REG_SZ')])]
+
+    file_object = self._CreateCompactCatalog(expected_key_descriptors)
+
+    reader = compact_catalog.CompactCatalogReader(file_object)
+    key_descriptors = [
+        (key_descriptor.key_path, key_descriptor.value_descriptors)
+        for key_descriptor in reader.ReadKeyDescriptors()]
+
+    self.assertEqual(key_descriptors, expected_key_descriptors)
+
+  def testReadRecordsWithUnsupportedHeader(self):
+    """Tests the ReadRecords function with an unsupported header."""
+    file_object = io.StringIO('HKEY_CURRENT_USER\n')
+
+    reader = compact_catalog.CompactCatalogReader(file_object)
+    with self.assertRaises(errors.ParseError):
+      list(reader.ReadRecords())
+
+
+class CompactCatalogDifferTest(CompactCatalogTestCase):
+  """Tests for the compact catalog differ."""
+
+  # pylint: disable=protected-access
+
+  def testDiff(self):
+    """Tests the Diff function."""
+    file_object = self._CreateCompactCatalog([
+        ('HKEY_CURRENT_USER', []),
+        ('HKEY_CURRENT_USER\\Console', [
+            ('(default)', 'REG_SZ'), ('Value', 'REG_DWORD_LE')]),
+        ('HKEY_CURRENT_USER\\Console\\Subkey', []),
+        ('HKEY_CURRENT_USER\\Environment', [])])
+
+    other_file_object = self._CreateCompactCatalog([
+        ('HKEY_CURRENT_USER', []),
+        ('HKEY_CURRENT_USER\\Console', [
+            ('(default)', 'REG_SZ'), ('Value', 'REG_QWORD')]),
+        ('HKEY_CURRENT_USER\\Environment', []),
+        ('HKEY_CURRENT_USER\\Software', [])])
+
+    differ = compact_catalog.CompactCatalogDiffer()
+    changes = list(differ.Diff(
+        compact_catalog.CompactCatalogReader(file_object),
+        compact_catalog.CompactCatalogReader(other_file_object)))
+
+    self.assertEqual(changes, [
+        ('-', 'HKEY_CURRENT_USER\\Console', ('Value', 'REG_DWORD_LE')),
+        ('+', 'HKEY_CURRENT_USER\\Console', ('Value', 'REG_QWORD')),
+        ('-', 'HKEY_CURRENT_USER\\Console\\Subkey', None),
+        ('+', 'HKEY_CURRENT_USER\\Software', None)])
+
+  def testGetKeyPathSortKey(self):
+    """Tests the _GetKeyPathSortKey function."""
+    differ = compact_catalog.CompactCatalogDiffer()
+
+    sort_key = differ._GetKeyPathSortKey('HKEY_CURRENT_USER\\Console')
+    self.assertEqual(sort_key, ('HKEY_CURRENT_USER', 'CONSOLE'))
+
+    # Every character is converted to upper case individually.
+    sort_key = differ._GetKeyPathSortKey('HKEY_CURRENT_USER\\Straße\\é')
+    self.assertEqual(sort_key, ('HKEY_CURRENT_USER', 'STRAßE', 'É'))
+
+  def testDiffWithKeysOutOfOrder(self):
+    """Tests the Diff function with keys out of order."""
+    file_object = self._CreateCompactCatalog([
+        ('HKEY_CURRENT_USER\\Environment', []),
+        ('HKEY_CURRENT_USER\\Console', [])])
+
+    other_file_object = self._CreateCompactCatalog([])
+
+    differ = compact_catalog.CompactCatalogDiffer()
+    with self.assertRaises(errors.ParseError):
+      list(differ.Diff(
+          compact_catalog.CompactCatalogReader(file_object),
+          compact_catalog.CompactCatalogReader(other_file_object)))
+
+
+if __name__ == '__main__':
+  unittest.main()
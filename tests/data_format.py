@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 """Tests for binary data format and file."""
 
+import glob
 import io
+import os
+import pickle
+import tempfile
 import unittest
 
+from dtfabric import data_types as dtfabric_data_types
 from dtfabric import errors as dtfabric_errors
 from dtfabric.runtime import data_maps as dtfabric_data_maps
 from dtfabric.runtime import fabric as dtfabric_fabric
@@ -75,6 +80,72 @@ class ErrorDataTypeMap(dtfabric_data_maps.DataTypeMap):
         'Unable to map byte stream for testing purposes.')
 
 
+class StructDecoderTest(test_lib.BaseTestCase):
+  """Tests for the decoder of a fixed-size structure."""
+
+  _DATA_TYPE_FABRIC_DEFINITION = b"""\
+name: uint32
+type: integer
+attributes:
+  format: unsigned
+  size: 4
+  units: bytes
+---
+name: point2d
+type: structure
+attributes:
+  byte_order: little-endian
+members:
+- name: x
+  data_type: uint32
+- name: y
+  data_type: uint32
+---
+name: signature
+type: structure
+attributes:
+  byte_order: little-endian
+members:
+- name: signature
+  data_type: uint32
+  values: [0x80000000]
+"""
+
+  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
+      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
+
+  def testCreateFromDefinition(self):
+    """Tests the CreateFromDefinition function."""
+    for name, expected_result in (
+        ('point2d', True), ('signature', False), ('uint32', False)):
+      data_type_map = self._DATA_TYPE_FABRIC.CreateDataTypeMap(name)
+      data_type_definition = self._DATA_TYPE_FABRIC.GetDefinitionByName(name)
+
+      struct_decoder = data_format.StructDecoder.CreateFromDefinition(
+          data_type_map, data_type_definition)
+      self.assertEqual(struct_decoder is not None, expected_result)
+
+  def testDecode(self):
+    """Tests the Decode function."""
+    data_type_map = self._DATA_TYPE_FABRIC.CreateDataTypeMap('point2d')
+    data_type_definition = self._DATA_TYPE_FABRIC.GetDefinitionByName(
+        'point2d')
+
+    struct_decoder = data_format.StructDecoder.CreateFromDefinition(
+        data_type_map, data_type_definition)
+    self.assertEqual(struct_decoder.size, 8)
+
+    point2d = struct_decoder.Decode(b'\x01\x00\x00\x00\x02\x00\x00\x00')
+    self.assertEqual(point2d.x, 1)
+    self.assertEqual(point2d.y, 2)
+
+
+class TestBinaryDataFormat(data_format.BinaryDataFormat):
+  """Binary data format for testing."""
+
+  _DEFINITION_FILE = 'appcompatcache.yaml'
+
+
 class BinaryDataFormatTest(test_lib.BaseTestCase):
   """Binary data format tests."""
 
@@ -166,8 +237,131 @@ members:
     expected_output = ['Text']
     self.assertEqual(output_writer.output, expected_output)
 
-  # TODO: add tests for _GetDataTypeMap
-  # TODO: add tests for _ReadDefinitionFile
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    test_format1 = TestBinaryDataFormat()
+    test_format2 = TestBinaryDataFormat()
+
+    self.assertIsNotNone(test_format1._fabric)
+    self.assertIs(test_format1._fabric, test_format2._fabric)
+    self.assertIs(test_format1._data_type_maps, test_format2._data_type_maps)
+
+  def testGetDataTypeMap(self):
+    """Tests the _GetDataTypeMap function."""
+    test_format1 = TestBinaryDataFormat()
+    test_format2 = TestBinaryDataFormat()
+
+    data_type_map = test_format1._GetDataTypeMap('uint32')
+    self.assertIsNotNone(data_type_map)
+    self.assertIs(test_format2._GetDataTypeMap('uint32'), data_type_map)
+
+  def testGetUTF16StringSize(self):
+    """Tests the _GetUTF16StringSize function."""
+    test_format = data_format.BinaryDataFormat()
+
+    string_size = test_format._GetUTF16StringSize(b'A\x00B\x00\x00\x00C\x00')
+    self.assertEqual(string_size, 4)
+
+    # Test with an end-of-string character that is not 16-bit aligned.
+    string_size = test_format._GetUTF16StringSize(b'A\x00\x00X\x00\x00')
+    self.assertEqual(string_size, 4)
+
+    string_size = test_format._GetUTF16StringSize(b'A\x00B\x00')
+    self.assertEqual(string_size, 4)
+
+    # Test with an offset and maximum size.
+    string_size = test_format._GetUTF16StringSize(
+        b'XA\x00B\x00\x00\x00', offset=1)
+    self.assertEqual(string_size, 4)
+
+    string_size = test_format._GetUTF16StringSize(
+        b'XA\x00B\x00C\x00\x00\x00', offset=1, maximum_size=4)
+    self.assertEqual(string_size, 4)
+
+  def testReadDefinitionFile(self):
+    """Tests the _ReadDefinitionFile function."""
+    test_format = TestBinaryDataFormat()
+
+    fabric = test_format._ReadDefinitionFile(None)
+    self.assertIsNone(fabric)
+
+    fabric = test_format._ReadDefinitionFile('appcompatcache.yaml')
+    self.assertIsNotNone(fabric)
+    self.assertIsNotNone(fabric.CreateDataTypeMap('uint32'))
+
+  def testReadDefinitionFileWithCache(self):
+    """Tests the _ReadDefinitionFile function with a definitions cache."""
+    test_format = TestBinaryDataFormat()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      data_format.BinaryDataFormat.SetDefinitionsCachePath(temporary_directory)
+      try:
+        fabric = test_format._ReadDefinitionFile('appcompatcache.yaml')
+        self.assertIsNotNone(fabric)
+
+        cache_path = os.path.join(
+            temporary_directory, 'appcompatcache.yaml.pickle')
+        self.assertTrue(os.path.exists(cache_path))
+
+        fabric = test_format._ReadDefinitionFile('appcompatcache.yaml')
+        self.assertIsNotNone(fabric)
+        self.assertIsNotNone(fabric.CreateDataTypeMap('uint32'))
+
+        path = os.path.join(
+            test_format._DEFINITION_FILES_PATH, test_format._DEFINITION_FILE)
+        with open(path, 'rb') as file_object:
+          definition = file_object.read()
+
+        # Test with a changed modification time and an unchanged digest.
+        fabric = test_format._ReadCachedDefinitionFile(
+            cache_path, definition, 0)
+        self.assertIsNotNone(fabric)
+
+        # The cache file is written again with the changed modification time.
+        with open(cache_path, 'rb') as file_object:
+          cached_definition = pickle.load(file_object)
+
+        self.assertEqual(cached_definition['modification_time'], 0)
+
+        # Test with a cache file written by another version of dtFabric.
+        cached_definition['dtfabric_version'] = '19700101'
+        with open(cache_path, 'wb') as file_object:
+          pickle.dump(cached_definition, file_object)
+
+        fabric = test_format._ReadCachedDefinitionFile(
+            cache_path, definition, 0)
+        self.assertIsNone(fabric)
+
+        # Test with a changed modification time and a changed digest.
+        fabric = test_format._ReadCachedDefinitionFile(
+            cache_path, b'changed', 0)
+        self.assertIsNone(fabric)
+
+        # Test with a corrupt cache file.
+        with open(cache_path, 'wb') as file_object:
+          file_object.write(b'corrupt')
+
+        fabric = test_format._ReadCachedDefinitionFile(
+            cache_path, definition, 0)
+        self.assertIsNone(fabric)
+
+        # Test with a cache file that refers to a class that is not available.
+        with open(cache_path, 'wb') as file_object:
+          file_object.write(b'\x80\x04cwinregrc.bogus\nBogus\n.')
+
+        fabric = test_format._ReadCachedDefinitionFile(
+            cache_path, definition, 0)
+        self.assertIsNone(fabric)
+
+        with open(cache_path, 'wb') as file_object:
+          file_object.write(b'\x80\x04cwinregrc.data_format\nBogus\n.')
+
+        fabric = test_format._ReadCachedDefinitionFile(
+            cache_path, definition, 0)
+        self.assertIsNone(fabric)
+
+      finally:
+        data_format.BinaryDataFormat.SetDefinitionsCachePath(None)
 
   def testReadStructureFromByteStream(self):
     """Tests the _ReadStructureFromByteStream function."""
@@ -200,6 +394,55 @@ members:
           b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00', 0,
           data_type_map, 'point3d')
 
+  def testReadStructureFromByteStreamWithStructDecoder(self):
+    """Tests the _ReadStructureFromByteStream function with struct decoders."""
+    test_format = data_format.BinaryDataFormat()
+
+    definition_files = glob.glob(os.path.join(
+        data_format.BinaryDataFormat._DEFINITION_FILES_PATH, '*.yaml'))
+
+    number_of_struct_decoders = 0
+    for path in sorted(definition_files):
+      with open(path, 'rb') as file_object:
+        fabric = dtfabric_fabric.DataTypeFabric(
+            yaml_definition=file_object.read())
+
+      for data_type_definition in (
+          fabric._definitions_registry.GetDefinitions()):
+        if not isinstance(
+            data_type_definition, dtfabric_data_types.StructureDefinition):
+          continue
+
+        data_type_map = fabric.CreateDataTypeMap(data_type_definition.name)
+        struct_decoder = data_format.StructDecoder.CreateFromDefinition(
+            data_type_map, data_type_definition)
+        if not struct_decoder:
+          continue
+
+        number_of_struct_decoders += 1
+
+        byte_stream = bytes(
+            (index * 37 + 11) % 256 for index in range(struct_decoder.size))
+
+        test_format._struct_decoders = {}
+
+        expected_structure = test_format._ReadStructureFromByteStream(
+            byte_stream, 0, data_type_map, data_type_definition.name)
+
+        test_format._struct_decoders = {
+            data_type_definition.name: struct_decoder}
+
+        structure = test_format._ReadStructureFromByteStream(
+            byte_stream, 0, data_type_map, data_type_definition.name)
+        self.assertIsInstance(structure, tuple)
+
+        for member_definition in data_type_definition.members:
+          self.assertEqual(
+              getattr(structure, member_definition.name),
+              getattr(expected_structure, member_definition.name))
+
+    self.assertGreater(number_of_struct_decoders, 0)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the binary debug trace."""
+
+import io
+import os
+import tempfile
+import types
+import unittest
+
+from winregrc import data_format
+from winregrc import debug_trace
+from winregrc import errors
+
+from tests import test_lib as shared_test_lib
+
+
+class DebugTraceTest(shared_test_lib.BaseTestCase):
+  """Tests for the binary debug trace."""
+
+  # pylint: disable=protected-access
+
+  _DEBUG_INFO = [
+      ('signature', 'Signature', '_FormatIntegerAsHexadecimal4'),
+      ('signature', 'Signature (decimal)', '_FormatIntegerAsDecimal'),
+      ('last_written_time', 'Last written time', '_FormatIntegerAsFiletime'),
+      ('data', 'Data', '_FormatDataInHexadecimal'),
+      ('name', 'Name', None),
+      ('unknown1', 'Unknown1', '_FormatIntegerAsHexadecimal8')]
+
+  def _WriteEvents(self, output_writer):
+    """Writes events to an output writer.
+
+    Args:
+      output_writer (OutputWriter): output writer.
+    """
+    binary_data_format = data_format.BinaryDataFormat()
+
+    structure_object = types.SimpleNamespace(
+        data=b'ABCDEFGHIJ\x00\xff', last_written_time=0x01cb3a623d0a17ce,
+        name='été', signature=0x6b6e, unknown1=None)
+
+    output_writer.DebugPrintData('Data', b'\x00\x01\x02\x03')
+    output_writer.DebugPrintFiletimeValue('Time', 0x01cb3a623d0a17ce)
+    output_writer.DebugPrintStructure('header', 0x1000, 'header', b'\x01\x02')
+    output_writer.DebugPrintStructureObject(
+        structure_object, self._DEBUG_INFO, binary_data_format)
+    output_writer.DebugPrintText('Text\n')
+    output_writer.DebugPrintValue('Integer', 0x7fffffffffffffff + 1)
+    output_writer.DebugPrintValue('Tuple', (1, 2))
+    output_writer.DebugPrintValue('None', None)
+    output_writer.WriteDebugData('Data', b'\x00' * 48 + b'\x01')
+    output_writer.WriteFiletimeValue('Time', 0)
+    output_writer.WriteIntegerValueAsDecimal('Number', -1)
+    output_writer.WriteText('Text\n')
+    output_writer.WriteValue('Value', 'string')
+
+  def testWriteReadAndFormat(self):
+    """Tests writing, reading and formatting a debug trace."""
+    test_output_writer = shared_test_lib.TestOutputWriter()
+    self._WriteEvents(test_output_writer)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'debug.trace')
+
+      output_writer = debug_trace.DebugTraceOutputWriter(path)
+      result = output_writer.Open()
+      self.assertTrue(result)
+
+      self._WriteEvents(output_writer)
+      output_writer.Close()
+
+      with open(path, 'rb') as file_object:
+        reader = debug_trace.DebugTraceReader(file_object)
+
+        events = list(reader.ReadEvents())
+        self.assertEqual(len(events), 13)
+
+        file_object.seek(0, os.SEEK_SET)
+
+        formatter_output_writer = shared_test_lib.TestOutputWriter()
+        formatter = debug_trace.DebugTraceFormatter(formatter_output_writer)
+        formatter.Format(reader)
+
+    self.assertEqual(
+        ''.join(formatter_output_writer.output),
+        ''.join(test_output_writer.output))
+
+  def testFormatWithStructures(self):
+    """Tests the Format function with structures."""
+    file_object = io.BytesIO()
+
+    output_writer = debug_trace.DebugTraceOutputWriter(None)
+    output_writer._file_object = file_object
+    output_writer.DebugPrintStructure('header', 0x1000, 'header', b'\x01\x02')
+
+    file_object = io.BytesIO(b''.join([
+        output_writer._HEADER.pack(
+            output_writer.SIGNATURE, output_writer.FORMAT_VERSION),
+        file_object.getvalue()]))
+
+    test_output_writer = shared_test_lib.TestOutputWriter()
+    reader = debug_trace.DebugTraceReader(file_object)
+    formatter = debug_trace.DebugTraceFormatter(
+        test_output_writer, structures=True)
+    formatter.Format(reader)
+
+    self.assertEqual(''.join(test_output_writer.output), (
+        'header (header) at offset: 0x00001000:\n'
+        '0x00000000  01 02                                             '
+        '..\n'
+        '\n'))
+
+  def testReadEventsWithUnsupportedData(self):
+    """Tests the ReadEvents function with unsupported data."""
+    reader = debug_trace.DebugTraceReader(io.BytesIO(b'WRCTRAC'))
+    with self.assertRaises(errors.ParseError):
+      list(reader.ReadEvents())
+
+    reader = debug_trace.DebugTraceReader(
+        io.BytesIO(b'BADTRACE\x01\x00\x00\x00'))
+    with self.assertRaises(errors.ParseError):
+      list(reader.ReadEvents())
+
+    reader = debug_trace.DebugTraceReader(
+        io.BytesIO(b'WRCTRACE\x02\x00\x00\x00'))
+    with self.assertRaises(errors.ParseError):
+      list(reader.ReadEvents())
+
+    # Event data that is smaller than the event data size.
+    reader = debug_trace.DebugTraceReader(
+        io.BytesIO(b'WRCTRACE\x01\x00\x00\x00\x0a\x10\x00\x00\x00'))
+    with self.assertRaises(errors.ParseError):
+      list(reader.ReadEvents())
+
+    # Event data with an unsupported value tag.
+    reader = debug_trace.DebugTraceReader(
+        io.BytesIO(b'WRCTRACE\x01\x00\x00\x00\x0a\x01\x00\x00\x00\xff'))
+    with self.assertRaises(errors.ParseError):
+      list(reader.ReadEvents())
+
+
+if __name__ == '__main__':
+  unittest.main()
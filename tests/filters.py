@@ -4,6 +4,9 @@
 
 import unittest
 
+from dfwinreg import definitions as dfwinreg_definitions
+from dfwinreg import fake as dfwinreg_fake
+
 from winregrc import filters
 
 from tests import test_lib as shared_test_lib
@@ -51,7 +54,246 @@ class WindowsRegistryKeyWithValuesFilterTest(shared_test_lib.BaseTestCase):
     test_filter = filters.WindowsRegistryKeyWithValuesFilter(['test'])
     self.assertIsNotNone(test_filter)
 
-  # TODO: add test for Match.
+  def testMatch(self):
+    """Tests the Match function."""
+    registry_key = dfwinreg_fake.FakeWinRegistryKey('MRUList')
+
+    for value_name in ('a', 'b', 'c', 'MRUList'):
+      registry_value = dfwinreg_fake.FakeWinRegistryValue(
+          value_name, data=b'\x00\x00', data_type=dfwinreg_definitions.REG_SZ)
+      registry_key.AddValue(registry_value)
+
+    test_filter = filters.WindowsRegistryKeyWithValuesFilter(['a', 'MRUList'])
+    self.assertTrue(test_filter.Match(registry_key))
+
+    test_filter = filters.WindowsRegistryKeyWithValuesFilter(['a', 'MRUListEx'])
+    self.assertFalse(test_filter.Match(registry_key))
+
+    # Value names are matched case-sensitive.
+    test_filter = filters.WindowsRegistryKeyWithValuesFilter(['a', 'mrulist'])
+    self.assertFalse(test_filter.Match(registry_key))
+
+    test_filter = filters.WindowsRegistryKeyWithValuesFilter(
+        ['a', 'b', 'c', 'd', 'MRUList'])
+    self.assertFalse(test_filter.Match(registry_key))
+
+    # Test with more value names than are looked up by name.
+    value_names = [f'{index:d}' for index in range(64)]
+    for value_name in value_names:
+      registry_value = dfwinreg_fake.FakeWinRegistryValue(
+          value_name, data=b'\x00\x00', data_type=dfwinreg_definitions.REG_SZ)
+      registry_key.AddValue(registry_value)
+
+    test_filter = filters.WindowsRegistryKeyWithValuesFilter(value_names)
+    self.assertTrue(test_filter.Match(registry_key))
+
+    test_filter = filters.WindowsRegistryKeyWithValuesFilter(
+        value_names + ['MRUListEx'])
+    self.assertFalse(test_filter.Match(registry_key))
+
+
+class CompiledKeyFilterSetTest(shared_test_lib.BaseTestCase):
+  """Tests for the compiled key filter set."""
+
+  _KEY_PATHS = [
+      'HKEY_CURRENT_USER\\Software\\Microsoft\\Windows\\CurrentVersion\\Run',
+      ('HKEY_CURRENT_USER\\Software\\Wow6432Node\\Microsoft\\Windows\\'
+       'CurrentVersion\\Run'),
+      'HKEY_LOCAL_MACHINE\\System\\ControlSet001\\Services\\Dhcp',
+      'HKEY_LOCAL_MACHINE\\System\\ControlSet002\\Services\\Dhcp',
+      'HKEY_LOCAL_MACHINE\\System\\ControlSetXYZ\\Services\\Dhcp',
+      'HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\Services\\Dhcp',
+      'HKEY_LOCAL_MACHINE\\System\\Select']
+
+  def _CreateTestKey(self, key_path, value_names=None):
+    """Creates a Windows Registry key for testing.
+
+    Args:
+      key_path (str): key path.
+      value_names (Optional[list[str]]): names of the values of the key.
+
+    Returns:
+      dfwinreg.FakeWinRegistryKey: Windows Registry key for testing.
+    """
+    key_path_prefix, _, relative_key_path = key_path.partition('\\')
+    _, _, key_name = key_path.rpartition('\\')
+
+    registry_key = dfwinreg_fake.FakeWinRegistryKey(
+        key_name, key_path_prefix=key_path_prefix,
+        relative_key_path=relative_key_path)
+
+    for value_name in value_names or []:
+      registry_value = dfwinreg_fake.FakeWinRegistryValue(
+          value_name, data=b'\x00\x00\x00\x00',
+          data_type=dfwinreg_definitions.REG_DWORD)
+      registry_key.AddValue(registry_value)
+
+    return registry_key
+
+  def _CreateTestFilters(self):
+    """Creates key filters for testing.
+
+    Returns:
+      list[BaseWindowsRegistryKeyFilter]: key filters for testing.
+    """
+    return [
+        filters.WindowsRegistryKeyPathFilter(
+            'HKEY_CURRENT_USER\\Software\\Microsoft\\Windows\\CurrentVersion\\'
+            'Run'),
+        filters.WindowsRegistryKeyPathFilter(
+            'HKEY_LOCAL_MACHINE\\System\\CurrentControlSet\\Services\\Dhcp'),
+        filters.WindowsRegistryKeyPathPrefixFilter(
+            'HKEY_LOCAL_MACHINE\\System\\ControlSet'),
+        filters.WindowsRegistryKeyPathPrefixFilter(
+            'HKEY_LOCAL_MACHINE\\System\\'),
+        filters.WindowsRegistryKeyPathSuffixFilter('Services\\Dhcp'),
+        filters.WindowsRegistryKeyPathSuffixFilter('\\CurrentVersion\\Run'),
+        filters.WindowsRegistryKeyPathSuffixFilter('lect'),
+        filters.WindowsRegistryKeyWithValuesFilter(['Current', 'Default'])]
+
+  def testCanMatchDescendants(self):
+    """Tests the CanMatchDescendants function."""
+    key_filter = filters.WindowsRegistryKeyPathFilter(
+        'HKEY_LOCAL_MACHINE\\System\\Select')
+    filter_set = filters.CompiledKeyFilterSet([key_filter])
+
+    state = filter_set.GetStateByPath('HKEY_LOCAL_MACHINE\\System')
+    self.assertTrue(filter_set.CanMatchDescendants(state))
+
+    state = filter_set.GetStateByPath('HKEY_LOCAL_MACHINE\\System\\Select')
+    self.assertFalse(filter_set.CanMatchDescendants(state))
+
+    state = filter_set.GetStateByPath('HKEY_LOCAL_MACHINE\\Software')
+    self.assertFalse(filter_set.CanMatchDescendants(state))
+
+  def testGetChildState(self):
+    """Tests the GetChildState function."""
+    key_filters = self._CreateTestFilters()
+    filter_set = filters.CompiledKeyFilterSet(key_filters)
+
+    state = filter_set.GetRootState()
+    for key_name in ('HKEY_LOCAL_MACHINE', 'System', 'ControlSet001'):
+      state = filter_set.GetChildState(state, key_name)
+
+    services_state = filter_set.GetChildState(state, 'Services')
+
+    registry_key = self._CreateTestKey(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet001\\Services\\Dhcp')
+    state = filter_set.GetChildState(services_state, 'Dhcp')
+    matching_filters = filter_set.GetMatchingFilters(registry_key, state=state)
+    self.assertEqual(matching_filters, [
+        key_filters[1], key_filters[2], key_filters[3], key_filters[4]])
+
+    registry_key = self._CreateTestKey(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet001\\Services\\WwanSvc')
+    state = filter_set.GetChildState(services_state, 'WwanSvc')
+    matching_filters = filter_set.GetMatchingFilters(registry_key, state=state)
+    self.assertEqual(matching_filters, [key_filters[2], key_filters[3]])
+
+  def testGetMatchingFilters(self):
+    """Tests the GetMatchingFilters function."""
+    key_filters = self._CreateTestFilters()
+    filter_set = filters.CompiledKeyFilterSet(key_filters)
+
+    for key_path in self._KEY_PATHS:
+      registry_key = self._CreateTestKey(
+          key_path, value_names=['Current', 'Default', 'Failed'])
+
+      expected_filters = [
+          key_filter for key_filter in key_filters
+          if key_filter.Match(registry_key)]
+
+      matching_filters = filter_set.GetMatchingFilters(registry_key)
+      self.assertEqual(matching_filters, expected_filters, msg=key_path)
+
+    # Key names are matched case-insensitive by key path filters and
+    # case-sensitive by key path prefix and suffix filters.
+    registry_key = self._CreateTestKey(
+        'HKEY_LOCAL_MACHINE\\SYSTEM\\ControlSet001\\services\\DHCP')
+    matching_filters = filter_set.GetMatchingFilters(registry_key)
+    self.assertEqual(matching_filters, [key_filters[1]])
+
+    # Value names are matched case-sensitive.
+    key_filter = filters.WindowsRegistryKeyWithValuesFilter(['FOO'])
+    filter_set = filters.CompiledKeyFilterSet([key_filter])
+
+    registry_key = self._CreateTestKey(
+        'HKEY_LOCAL_MACHINE\\Software\\Microsoft', value_names=['foo'])
+    matching_filters = filter_set.GetMatchingFilters(registry_key)
+    self.assertEqual(matching_filters, [])
+
+  def testGetMatchingFiltersWithKeyTree(self):
+    """Tests the GetMatchingFilters function with a tree of keys."""
+    key_filters = self._CreateTestFilters()
+    key_filters.extend([
+        filters.WindowsRegistryKeyPathFilter('HKEY_CURRENT_USER\\Software'),
+        filters.WindowsRegistryKeyPathPrefixFilter(
+            'HKEY_LOCAL_MACHINE\\SOFTWARE'),
+        filters.WindowsRegistryKeyPathSuffixFilter('\\microsoft'),
+        filters.WindowsRegistryKeyWithValuesFilter(['FOO'])])
+
+    filter_set = filters.CompiledKeyFilterSet(key_filters)
+
+    root_keys = [
+        dfwinreg_fake.FakeWinRegistryKey(
+            'HKEY_CURRENT_USER', key_path_prefix='HKEY_CURRENT_USER'),
+        dfwinreg_fake.FakeWinRegistryKey(
+            'HKEY_LOCAL_MACHINE', key_path_prefix='HKEY_LOCAL_MACHINE')]
+
+    key_paths = list(self._KEY_PATHS)
+    key_paths.extend([
+        'HKEY_CURRENT_USER\\SOFTWARE\\Wow6432Node',
+        'HKEY_LOCAL_MACHINE\\Software\\Microsoft',
+        'HKEY_LOCAL_MACHINE\\SOFTWARE\\microsoft',
+        'HKEY_LOCAL_MACHINE\\system\\controlset003\\services\\dhcp'])
+
+    for key_path in key_paths:
+      key_path_segments = key_path.split('\\')
+      registry_key = root_keys[0]
+      if key_path_segments[0] == 'HKEY_LOCAL_MACHINE':
+        registry_key = root_keys[1]
+
+      for key_name in key_path_segments[1:]:
+        subkey = registry_key.GetSubkeyByName(key_name)
+        if not subkey:
+          subkey = dfwinreg_fake.FakeWinRegistryKey(key_name)
+          for value_name in ('Current', 'Default', 'foo'):
+            registry_value = dfwinreg_fake.FakeWinRegistryValue(
+                value_name, data=b'\x00\x00\x00\x00',
+                data_type=dfwinreg_definitions.REG_DWORD)
+            subkey.AddValue(registry_value)
+
+          registry_key.AddSubkey(key_name, subkey)
+
+        registry_key = subkey
+
+    number_of_keys = 0
+    states = [
+        (registry_key, filter_set.GetChildState(
+            filter_set.GetRootState(), registry_key.name))
+        for registry_key in root_keys]
+
+    while states:
+      registry_key, state = states.pop()
+      number_of_keys += 1
+
+      expected_filters = [
+          key_filter for key_filter in key_filters
+          if key_filter.Match(registry_key)]
+
+      matching_filters = filter_set.GetMatchingFilters(
+          registry_key, state=state)
+      self.assertEqual(
+          matching_filters, expected_filters, msg=registry_key.path)
+
+      matching_filters = filter_set.GetMatchingFilters(registry_key)
+      self.assertEqual(
+          matching_filters, expected_filters, msg=registry_key.path)
+
+      for subkey in registry_key.GetSubkeys():
+        states.append((subkey, filter_set.GetChildState(state, subkey.name)))
+
+    self.assertEqual(number_of_keys, 31)
 
 
 if __name__ == '__main__':
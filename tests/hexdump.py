@@ -13,7 +13,7 @@ class HexdumpTest(shared_test_lib.BaseTestCase):
   """Tests for the hexadecimal representation functions."""
 
   def testHexdump(self):
-    """Tests the Collect function."""
+    """Tests the Hexdump function."""
     hexdump.Hexdump(b'')
 
     hexdump.Hexdump(b'\x00\x01\x02\x03\x04\x05\x06')
@@ -28,6 +28,51 @@ class HexdumpTest(shared_test_lib.BaseTestCase):
         b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f'
         b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f')
 
+    hexdump_text = hexdump.Hexdump(b'')
+    self.assertEqual(hexdump_text, '\n')
+
+    hexdump_text = hexdump.Hexdump(b'ABCDEFGHIJ\x00\xff')
+    self.assertEqual(hexdump_text, (
+        '0x00000000  41 42 43 44 45 46 47 48  49 4a 00 ff              '
+        'ABCDEFGHIJ..\n'
+        '\n'))
+
+    hexdump_text = hexdump.Hexdump(b'\x00' * 48 + b'\x01')
+    self.assertEqual(hexdump_text, (
+        '0x00000000  00 00 00 00 00 00 00 00  00 00 00 00 00 00 00 00  '
+        '................\n'
+        '...\n'
+        '0x00000030  01                                                .\n'
+        '\n'))
+
+  def testGenerateHexdump(self):
+    """Tests the GenerateHexdump function."""
+    data = bytes(range(256)) * 64
+
+    hexdump_text_chunks = list(hexdump.GenerateHexdump(data))
+    self.assertEqual(len(hexdump_text_chunks), 4)
+    self.assertTrue(hexdump_text_chunks[-1].endswith('................\n\n'))
+
+    hexdump_text = ''.join(hexdump_text_chunks)
+    self.assertEqual(hexdump_text.count('\n'), 1025)
+    self.assertEqual(hexdump_text, hexdump.Hexdump(memoryview(data)))
+
+    lines = hexdump_text.split('\n')
+    self.assertEqual(lines[256], (
+        '0x00001000  00 01 02 03 04 05 06 07  08 09 0a 0b 0c 0d 0e 0f  '
+        '................'))
+
+    data = b'\x00' * 10000
+
+    hexdump_text = ''.join(hexdump.GenerateHexdump(data))
+    self.assertEqual(hexdump_text, (
+        '0x00000000  00 00 00 00 00 00 00 00  00 00 00 00 00 00 00 00  '
+        '................\n'
+        '...\n'
+        '0x00002700  00 00 00 00 00 00 00 00  00 00 00 00 00 00 00 00  '
+        '................\n'
+        '\n'))
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -9,6 +9,7 @@ from dfwinreg import fake as dfwinreg_fake
 from dfwinreg import registry as dfwinreg_registry
 
 from winregrc import mru
+from winregrc import walker
 
 from tests import test_lib
 
@@ -16,13 +17,16 @@ from tests import test_lib
 class MostRecentlyUsedCollectorTest(test_lib.BaseTestCase):
   """Tests for the Most Recently Used (MRU) collector."""
 
-  def _CreateTestRegistry(self):
+  def _CreateTestRegistry(self, key_path_prefix='HKEY_CURRENT_USER'):
     """Creates Registry keys and values for testing.
 
+    Args:
+      key_path_prefix (Optional[str]): key path prefix of the Windows Registry
+          file that contains the keys and values.
+
     Returns:
       dfwinreg.WinRegistry: Windows Registry for testing.
     """
-    key_path_prefix = 'HKEY_CURRENT_USER'
 
     registry_file = dfwinreg_fake.FakeWinRegistryFile(
         key_path_prefix=key_path_prefix)
@@ -82,6 +86,52 @@ class MostRecentlyUsedCollectorTest(test_lib.BaseTestCase):
 
     self.assertEqual(len(collector_object.mru_entries), 0)
 
+  def testSubscribeToWalker(self):
+    """Tests the SubscribeToWalker function."""
+    registry = self._CreateTestRegistry()
+
+    test_output_writer = test_lib.TestOutputWriter()
+    collector_object = mru.MostRecentlyUsedCollector(
+        output_writer=test_output_writer)
+
+    test_walker = walker.WindowsRegistryKeyWalker()
+    collector_object.SubscribeToWalker(test_walker)
+
+    test_walker.Walk(registry)
+
+    test_output_writer.Close()
+
+    self.assertEqual(len(collector_object.mru_entries), 1)
+
+    mru_entry = collector_object.mru_entries[0]
+    self.assertIsNotNone(mru_entry)
+    self.assertEqual(mru_entry.string, 'MyFile.txt')
+
+  def testSubscribeToWalkerWithCurrentUserClasses(self):
+    """Tests the SubscribeToWalker function with a UsrClass.dat file."""
+    registry = self._CreateTestRegistry(
+        key_path_prefix='HKEY_CURRENT_USER\\Software\\Classes')
+
+    collector_object = mru.MostRecentlyUsedCollector()
+
+    result = collector_object.Collect(registry)
+    self.assertTrue(result)
+
+    expected_key_paths = [
+        mru_entry.key_path for mru_entry in collector_object.mru_entries]
+    self.assertEqual(len(expected_key_paths), 1)
+
+    collector_object = mru.MostRecentlyUsedCollector()
+
+    test_walker = walker.WindowsRegistryKeyWalker()
+    collector_object.SubscribeToWalker(test_walker)
+
+    test_walker.Walk(registry)
+
+    key_paths = [
+        mru_entry.key_path for mru_entry in collector_object.mru_entries]
+    self.assertEqual(key_paths, expected_key_paths)
+
 
 if __name__ == '__main__':
   unittest.main()
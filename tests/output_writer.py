@@ -2,9 +2,17 @@
 # -*- coding: utf-8 -*-
 """Tests for the output writer."""
 
+import contextlib
+import io
+import json
 import unittest
 
+from dfdatetime import filetime as dfdatetime_filetime
+
+from winregrc import appcompatcache
 from winregrc import output_writers
+from winregrc import usbstor
+from winregrc import userassist
 
 from tests import test_lib as shared_test_lib
 
@@ -71,12 +79,33 @@ class StdoutOutputWriterTest(shared_test_lib.BaseTestCase):
 
     test_output_writer.WriteDebugData('Description', b'DATA')
 
+  def testWriteRecordValues(self):
+    """Tests the WriteRecordValues function."""
+    test_output_writer = output_writers.StdoutOutputWriter()
+
+    with contextlib.redirect_stdout(io.StringIO()) as file_object:
+      test_output_writer.WriteRecordValues({
+          'data': b'\x01\x02', 'name': 'Test', 'value': None})
+
+    self.assertEqual(file_object.getvalue(), (
+        'data\t\t\t\t\t\t\t\t\t: 0102\n'
+        'name\t\t\t\t\t\t\t\t\t: Test\n'
+        '\n'))
+
   def testWriteValue(self):
     """Tests the WriteValue function."""
     test_output_writer = output_writers.StdoutOutputWriter()
 
     test_output_writer.WriteValue('Description', 'Value')
 
+    with contextlib.redirect_stdout(io.StringIO()) as file_object:
+      test_output_writer.WriteValue('Description', 'Value')
+      test_output_writer.WriteValue('\tDescription', 1)
+
+    self.assertEqual(file_object.getvalue(), (
+        'Description\t\t\t\t\t\t\t\t: Value\n'
+        '\tDescription\t\t\t\t\t\t\t: 1\n'))
+
   def testWriteText(self):
     """Tests the WriteText function."""
     test_output_writer = output_writers.StdoutOutputWriter()
@@ -84,5 +113,223 @@ class StdoutOutputWriterTest(shared_test_lib.BaseTestCase):
     test_output_writer.WriteText('Test')
 
 
+class BufferedStdoutOutputWriterTest(shared_test_lib.BaseTestCase):
+  """Tests for the buffered stdout output writer."""
+
+  def testFlush(self):
+    """Tests the Flush function."""
+    test_output_writer = output_writers.BufferedStdoutOutputWriter()
+
+    with contextlib.redirect_stdout(io.StringIO()) as file_object:
+      test_output_writer.WriteText('Test')
+      self.assertEqual(file_object.getvalue(), '')
+
+      test_output_writer.Flush()
+      self.assertEqual(file_object.getvalue(), 'Test')
+
+  def testOpenClose(self):
+    """Tests the Open and Close functions."""
+    test_output_writer = output_writers.BufferedStdoutOutputWriter()
+
+    with contextlib.redirect_stdout(io.StringIO()) as file_object:
+      result = test_output_writer.Open()
+      self.assertTrue(result)
+
+      test_output_writer.WriteValue('Description', 'Value')
+      self.assertEqual(file_object.getvalue(), '')
+
+      test_output_writer.Close()
+
+    self.assertEqual(
+        file_object.getvalue(), 'Description\t\t\t\t\t\t\t\t: Value\n')
+
+  def testWriteText(self):
+    """Tests the WriteText function."""
+    test_output_writer = output_writers.BufferedStdoutOutputWriter(
+        buffer_size=8)
+
+    with contextlib.redirect_stdout(io.StringIO()) as file_object:
+      test_output_writer.WriteText('Test')
+      self.assertEqual(file_object.getvalue(), '')
+
+      test_output_writer.WriteText('Test')
+      self.assertEqual(file_object.getvalue(), 'TestTest')
+
+      test_output_writer.WriteText('Test')
+      self.assertEqual(file_object.getvalue(), 'TestTest')
+
+      test_output_writer.Close()
+
+    self.assertEqual(file_object.getvalue(), 'TestTestTest')
+
+
+class JSONLinesOutputWriterTest(shared_test_lib.BaseTestCase):
+  """Tests for the JSON Lines output writer."""
+
+  # pylint: disable=protected-access
+
+  def testEncodeValue(self):
+    """Tests the _EncodeValue function."""
+    test_output_writer = output_writers.JSONLinesOutputWriter()
+
+    self.assertIsNone(test_output_writer._EncodeValue(None))
+    self.assertEqual(test_output_writer._EncodeValue(1), 1)
+    self.assertEqual(test_output_writer._EncodeValue('string'), 'string')
+    self.assertEqual(test_output_writer._EncodeValue(b'\x01\xff'), '01ff')
+    self.assertEqual(test_output_writer._EncodeValue((1, b'\x02')), [1, '02'])
+    self.assertEqual(test_output_writer._EncodeValue({1: None}), {'1': None})
+
+    date_time = dfdatetime_filetime.Filetime(timestamp=0x01cb3a623d0a17ce)
+    self.assertEqual(
+        test_output_writer._EncodeValue(date_time),
+        '2010-08-12 21:06:31.5468750')
+
+  def testWriteRecord(self):
+    """Tests the WriteRecord function."""
+    test_output_writer = output_writers.JSONLinesOutputWriter()
+
+    cached_entry = appcompatcache.AppCompatCacheCachedEntry(
+        value_data='C:\\test.exe'.encode('utf-16-le'))
+    cached_entry.SetPath(0, 22)
+    cached_entry.last_modification_time = 0x01cb3a623d0a17ce
+
+    storage_device = usbstor.USBStorageDevice()
+    storage_device.key_path = 'Disk&Ven_Test'
+    storage_device.properties.append(
+        usbstor.USBStorageDeviceProperty('{GUID}', 2))
+
+    with contextlib.redirect_stdout(io.StringIO()) as file_object:
+      test_output_writer.WriteRecord(cached_entry)
+      test_output_writer.WriteRecord(storage_device)
+      test_output_writer.WriteRecord(cached_entry)
+      test_output_writer.Close()
+
+    lines = file_object.getvalue().split('\n')
+    self.assertEqual(len(lines), 4)
+    self.assertEqual(lines[0], lines[2])
+    self.assertEqual(lines[3], '')
+
+    expected_record = {
+        'cached_entry_size': 0,
+        'control_sets': [],
+        'data': None,
+        'file_size': None,
+        'insertion_flags': None,
+        'last_modification_time': 0x01cb3a623d0a17ce,
+        'last_update_time': None,
+        'path': 'C:\\test.exe',
+        'shim_flags': None}
+    self.assertEqual(json.loads(lines[0]), expected_record)
+
+    expected_record = {
+        'device_type': None,
+        'display_name': None,
+        'key_path': 'Disk&Ven_Test',
+        'product': None,
+        'properties': [{
+            'identifier': 2,
+            'property_set': '{GUID}',
+            'value': None,
+            'value_type': None}],
+        'revision': None,
+        'vendor': None}
+    self.assertEqual(json.loads(lines[1]), expected_record)
+
+    self.assertEqual(len(test_output_writer._record_encoders), 3)
+
+    user_assist_entry = userassist.UserAssistEntry(
+        guid='{GUID}', name='Name', value_name='Value')
+
+    with contextlib.redirect_stdout(io.StringIO()) as file_object:
+      test_output_writer.WriteRecord(user_assist_entry, additional_values={
+          'security_identifier': 'S-1-5-21-1000-1000-1000-1001',
+          'username': 'user1'})
+      test_output_writer.Close()
+
+    expected_record = {
+        'guid': '{GUID}',
+        'name': 'Name',
+        'security_identifier': 'S-1-5-21-1000-1000-1000-1001',
+        'username': 'user1',
+        'value_name': 'Value'}
+    self.assertEqual(json.loads(file_object.getvalue()), expected_record)
+
+    # An additional value is not overwritten by an attribute of the record.
+    user_assist_entry.username = 'user2'
+
+    test_output_writer = output_writers.JSONLinesOutputWriter()
+
+    with contextlib.redirect_stdout(io.StringIO()) as file_object:
+      test_output_writer.WriteRecord(user_assist_entry, additional_values={
+          'security_identifier': 'S-1-5-21-1000-1000-1000-1001',
+          'username': 'user1'})
+      test_output_writer.Close()
+
+    self.assertEqual(json.loads(file_object.getvalue()), expected_record)
+
+  def testWriteRecordWithDifferentInstanceAttributes(self):
+    """Tests the WriteRecord function with different instance attributes."""
+    test_output_writer = output_writers.JSONLinesOutputWriter()
+
+    first_record = userassist.UserAssistEntry(guid='{GUID}', name='Name1')
+
+    second_record = userassist.UserAssistEntry(guid='{GUID}', name='Name2')
+    second_record.extra = 'Extra'
+
+    third_record = userassist.UserAssistEntry(guid='{GUID}', name='Name3')
+    del third_record.value_name
+
+    with contextlib.redirect_stdout(io.StringIO()) as file_object:
+      test_output_writer.WriteRecord(first_record)
+      test_output_writer.WriteRecord(second_record)
+      test_output_writer.WriteRecord(third_record)
+      test_output_writer.Close()
+
+    records = [
+        json.loads(line) for line in file_object.getvalue().splitlines()]
+    self.assertEqual(records, [
+        {'guid': '{GUID}', 'name': 'Name1', 'value_name': None},
+        {'extra': 'Extra', 'guid': '{GUID}', 'name': 'Name2',
+         'value_name': None},
+        {'guid': '{GUID}', 'name': 'Name3'}])
+
+  def testWriteRecordValues(self):
+    """Tests the WriteRecordValues function."""
+    test_output_writer = output_writers.JSONLinesOutputWriter()
+
+    with contextlib.redirect_stdout(io.StringIO()) as file_object:
+      test_output_writer.WriteRecordValues({
+          'data': b'\x01\x02', 'name': 'Test', 'value': None})
+      test_output_writer.Close()
+
+    self.assertEqual(
+        file_object.getvalue(), '{"data":"0102","name":"Test","value":null}\n')
+
+  def testWriteText(self):
+    """Tests the WriteText function."""
+    test_output_writer = output_writers.JSONLinesOutputWriter()
+
+    user_assist_entry = userassist.UserAssistEntry(
+        guid='{GUID}', name='Name', value_name='Value')
+
+    with contextlib.redirect_stderr(io.StringIO()) as stderr_file_object:
+      with contextlib.redirect_stdout(io.StringIO()) as stdout_file_object:
+        test_output_writer.WriteRecord(user_assist_entry)
+        test_output_writer.WriteText('No UserAssist key found.\n')
+        test_output_writer.WriteValue('Description', 'Value')
+        test_output_writer.WriteRecord(user_assist_entry)
+        test_output_writer.Close()
+
+    # Every line written to stdout is a JSON object.
+    lines = stdout_file_object.getvalue().splitlines()
+    self.assertEqual(len(lines), 2)
+    for line in lines:
+      self.assertIsInstance(json.loads(line), dict)
+
+    self.assertEqual(stderr_file_object.getvalue(), (
+        'No UserAssist key found.\n'
+        'Description\t\t\t\t\t\t\t\t: Value\n'))
+
+
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the content-addressed on-disk cache of collector results."""
+
+import os
+import tempfile
+import unittest
+
+from dfwinreg import registry as dfwinreg_registry
+
+from winregrc import result_cache
+from winregrc import userassist
+from winregrc import volume_scanner
+
+from tests import test_lib as shared_test_lib
+
+
+class TestCollector(object):
+  """Collector for testing.
+
+  Attributes:
+    number_of_collections (int): number of times Collect was called.
+    values (list[str]): collected values.
+  """
+
+  def __init__(self, debug=False):
+    """Initializes a collector for testing.
+
+    Args:
+      debug (Optional[bool]): True if debug information should be printed.
+    """
+    super(TestCollector, self).__init__()
+    self._debug = debug
+    self.number_of_collections = 0
+    self.values = []
+
+  def Collect(self, registry, size=1, number_of_workers=1):  # pylint: disable=unused-argument
+    """Collects values.
+
+    Args:
+      registry (dfwinreg.WinRegistry): Windows Registry.
+      size (Optional[int]): size of every value.
+      number_of_workers (Optional[int]): number of worker processes.
+
+    Yields:
+      str: value.
+    """
+    self.number_of_collections += 1
+    self.values = ['A' * size, 'B' * size]
+    yield from self.values
+
+
+class UnpicklableTestCollector(TestCollector):
+  """Collector for testing with an attribute that cannot be pickled.
+
+  Attributes:
+    callback (function): callback, which cannot be pickled.
+  """
+
+  def __init__(self):
+    """Initializes a collector for testing."""
+    super(UnpicklableTestCollector, self).__init__()
+    self.callback = lambda value: value
+
+
+class ResultCacheTest(shared_test_lib.BaseTestCase):
+  """Tests for the content-addressed on-disk cache of collector results."""
+
+  # pylint: disable=protected-access
+
+  def testCollect(self):
+    """Tests the Collect function."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      cache = result_cache.ResultCache(temporary_directory)
+
+      collector_object = TestCollector()
+      results = cache.Collect(collector_object, None, 'digest', size=2)
+      self.assertEqual(results, ['AA', 'BB'])
+      self.assertEqual(collector_object.number_of_collections, 1)
+
+      collector_object = TestCollector()
+      results = cache.Collect(
+          collector_object, None, 'digest', size=2, number_of_workers=4)
+      self.assertEqual(results, ['AA', 'BB'])
+      self.assertEqual(collector_object.values, ['AA', 'BB'])
+
+      # The collector attributes are restored from the cache, including
+      # the number of collections of the first collector.
+      self.assertEqual(collector_object.number_of_collections, 1)
+
+      results = cache.Collect(TestCollector(), None, 'digest', size=3)
+      self.assertEqual(results, ['AAA', 'BBB'])
+
+      results = cache.Collect(TestCollector(), None, 'other', size=2)
+      self.assertEqual(results, ['AA', 'BB'])
+
+      self.assertEqual(cache.number_of_cache_hits, 1)
+      self.assertEqual(cache.number_of_cache_misses, 3)
+
+  def testCollectWithDebug(self):
+    """Tests the Collect function with a collector with debug enabled."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      cache = result_cache.ResultCache(temporary_directory)
+
+      cache.Collect(TestCollector(), None, 'digest', size=2)
+
+      collector_object = TestCollector(debug=True)
+      results = cache.Collect(collector_object, None, 'digest', size=2)
+      self.assertEqual(results, ['AA', 'BB'])
+      self.assertEqual(collector_object.number_of_collections, 1)
+
+      self.assertEqual(cache.number_of_cache_hits, 0)
+      self.assertEqual(cache.number_of_cache_misses, 1)
+
+  def testCollectWithUnreadableResults(self):
+    """Tests the Collect function with results that cannot be read."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      cache = result_cache.ResultCache(temporary_directory)
+
+      cache_key = cache.GetCacheKey(TestCollector(), 'digest', size=2)
+      path = cache._GetCacheFilePath(cache_key)
+
+      # Results cached by a version with a class or a module that no longer
+      # exists, and results that are not a tuple of the return value and
+      # attributes.
+      for data, is_logged in (
+          (b'cwinregrc.result_cache\nMissingRecord\n.', True),
+          (b'cwinregrc.missing_module\nRecord\n.', True),
+          (b'I1\n.', False)):
+        with open(path, 'wb') as file_object:
+          file_object.write(data)
+
+        collector_object = TestCollector()
+        if is_logged:
+          with self.assertLogs(level='WARNING'):
+            results = cache.Collect(collector_object, None, 'digest', size=2)
+        else:
+          results = cache.Collect(collector_object, None, 'digest', size=2)
+
+        self.assertEqual(results, ['AA', 'BB'])
+        self.assertEqual(collector_object.number_of_collections, 1)
+
+      self.assertEqual(cache.number_of_cache_hits, 0)
+      self.assertEqual(cache.number_of_cache_misses, 3)
+
+  def testCollectWithUnpicklableResults(self):
+    """Tests the Collect function with results that cannot be pickled."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      cache = result_cache.ResultCache(temporary_directory)
+
+      with self.assertLogs(level='WARNING'):
+        results = cache.Collect(
+            UnpicklableTestCollector(), None, 'digest', size=2)
+
+      self.assertEqual(results, ['AA', 'BB'])
+      self.assertEqual(os.listdir(temporary_directory), [])
+
+  def testCollectWithUnwritableCacheDirectory(self):
+    """Tests the Collect function with an unwritable cache directory."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      # A file is used instead of a directory, since permissions do not
+      # prevent a privileged user from writing to a directory.
+      path = os.path.join(temporary_directory, 'cache')
+      with open(path, 'wb'):
+        pass
+
+      for cache_path in (path, os.path.join(path, 'cache')):
+        cache = result_cache.ResultCache(cache_path)
+
+        collector_object = TestCollector()
+        with self.assertLogs(level='WARNING'):
+          results = cache.Collect(collector_object, None, 'digest', size=2)
+
+        self.assertEqual(results, ['AA', 'BB'])
+        self.assertEqual(collector_object.values, ['AA', 'BB'])
+        self.assertEqual(cache.number_of_cache_misses, 1)
+
+  def testCollectWithUserAssistCollector(self):
+    """Tests the Collect function with an UserAssist collector."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    registry = dfwinreg_registry.WinRegistry(
+        registry_file_reader=(
+            volume_scanner.SingleFileWindowsRegistryFileReader(
+                test_file_path)))
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      cache = result_cache.ResultCache(temporary_directory)
+
+      collector_object = userassist.UserAssistCollector()
+      result = cache.Collect(collector_object, registry, 'digest')
+      self.assertTrue(result)
+
+      expected_entries = [
+          (entry.guid, entry.name, entry.value_name)
+          for entry in collector_object.user_assist_entries]
+      self.assertEqual(len(expected_entries), 13)
+
+      collector_object = userassist.UserAssistCollector()
+      result = cache.Collect(collector_object, None, 'digest')
+      self.assertTrue(result)
+
+      entries = [
+          (entry.guid, entry.name, entry.value_name)
+          for entry in collector_object.user_assist_entries]
+      self.assertEqual(entries, expected_entries)
+
+      self.assertEqual(cache.number_of_cache_hits, 1)
+
+  def testEvictCacheFiles(self):
+    """Tests the _EvictCacheFiles function."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      cache = result_cache.ResultCache(
+          temporary_directory, maximum_size=2048)
+
+      cache_keys = []
+      for digest in ('digest1', 'digest2', 'digest3'):
+        cache.Collect(TestCollector(), None, digest, size=256)
+        cache_keys.append(cache.GetCacheKey(
+            TestCollector(), digest, size=256))
+
+        # Make sure the modification times differ.
+        path = cache._GetCacheFilePath(cache_keys[-1])
+        modification_time = len(cache_keys) * 1000
+        os.utime(path, (modification_time, modification_time))
+
+      # Using the results of the first collection makes the results of
+      # the second collection the least recently used.
+      cache.Collect(TestCollector(), None, 'digest1', size=256)
+
+      cache.Collect(TestCollector(), None, 'digest4', size=512)
+
+      self.assertTrue(os.path.exists(cache._GetCacheFilePath(cache_keys[0])))
+      self.assertFalse(os.path.exists(cache._GetCacheFilePath(cache_keys[1])))
+
+      total_size = sum(
+          directory_entry.stat().st_size
+          for directory_entry in os.scandir(temporary_directory))
+      self.assertLessEqual(total_size, 2048)
+
+      with self.assertRaises(ValueError):
+        result_cache.ResultCache(temporary_directory, maximum_size=0)
+
+  def testGetCacheKey(self):
+    """Tests the GetCacheKey function."""
+    cache = result_cache.ResultCache(None)
+
+    collector_object = TestCollector()
+    cache_key = cache.GetCacheKey(collector_object, 'digest', size=1)
+    self.assertEqual(len(cache_key), 64)
+
+    self.assertEqual(cache.GetCacheKey(
+        collector_object, 'digest', number_of_workers=2, size=1), cache_key)
+    self.assertNotEqual(
+        cache.GetCacheKey(collector_object, 'digest', size=2), cache_key)
+    self.assertNotEqual(
+        cache.GetCacheKey(collector_object, 'other', size=1), cache_key)
+    self.assertNotEqual(cache.GetCacheKey(
+        userassist.UserAssistCollector(), 'digest', size=1), cache_key)
+
+
+if __name__ == '__main__':
+  unittest.main()
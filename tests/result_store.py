@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the SQLite result store."""
+
+import os
+import tempfile
+import unittest
+
+from dfdatetime import filetime as dfdatetime_filetime
+from dfdatetime import semantic_time as dfdatetime_semantic_time
+
+from winregrc import appcompatcache
+from winregrc import errors
+from winregrc import mru
+from winregrc import output_writers
+from winregrc import result_store
+from winregrc import sam
+from winregrc import services
+from winregrc import task_cache
+from winregrc import usbstor
+from winregrc import userassist
+
+from tests import test_lib as shared_test_lib
+
+
+class ResultStoreTest(shared_test_lib.BaseTestCase):
+  """Tests for the SQLite result store."""
+
+  # pylint: disable=protected-access
+
+  _DIGEST = (
+      'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855')
+
+  def testEncodeValue(self):
+    """Tests the _EncodeValue function."""
+    test_store = result_store.ResultStore(None)
+
+    self.assertIsNone(test_store._EncodeValue(None))
+    self.assertEqual(test_store._EncodeValue(1), 1)
+    self.assertEqual(
+        test_store._EncodeValue(0xffffffffffffffff), '18446744073709551615')
+    self.assertEqual(test_store._EncodeValue(True), 1)
+    self.assertEqual(test_store._EncodeValue(bytearray(b'\x01')), b'\x01')
+    self.assertEqual(test_store._EncodeValue(['a', b'\x02']), '["a","02"]')
+
+    date_time = dfdatetime_filetime.Filetime(timestamp=0x01cb3a623d0a17ce)
+    self.assertEqual(test_store._EncodeValue(date_time), 0x01cb3a623d0a17ce)
+
+    date_time = dfdatetime_semantic_time.SemanticTime(string='Never')
+    self.assertEqual(test_store._EncodeValue(date_time), 'Never')
+
+    storage_device_property = usbstor.USBStorageDeviceProperty('{GUID}', 2)
+    self.assertEqual(test_store._EncodeValue([storage_device_property]), (
+        '[{"identifier":2,"property_set":"{GUID}","value":null,'
+        '"value_type":null}]'))
+
+  def testResultTypes(self):
+    """Tests that the result types correspond with the records."""
+    records_per_result_type = {
+        'appcompatcache_entries': appcompatcache.AppCompatCacheCachedEntry(),
+        'cached_tasks': task_cache.CachedTask(),
+        'mru_entries': mru.MostRecentlyUsedEntry(),
+        'services': services.WindowsService(
+            'Test', 1, None, None, None, None, 3),
+        'usb_storage_devices': usbstor.USBStorageDevice(),
+        'user_accounts': sam.UserAccount(),
+        'userassist_entries': userassist.UserAssistEntry()}
+
+    for result_type, record in records_per_result_type.items():
+      self.assertEqual(
+          result_store.ResultStore.RESULT_TYPES[result_type],
+          output_writers.GetRecordAttributeNames(record))
+
+  def testWriteAndGetRecords(self):
+    """Tests the WriteRecords and GetRecords functions."""
+    user_assist_entries = [
+        userassist.UserAssistEntry(
+            guid='{GUID}', name=f'Name{index:d}', value_name=f'Value{index:d}')
+        for index in range(5)]
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'results.db')
+
+      test_store = result_store.ResultStore(path, batch_size=2)
+      result = test_store.Open()
+      self.assertTrue(result)
+
+      try:
+        result = test_store.HasRecords(
+            'userassist_entries', self._DIGEST, '20240211')
+        self.assertFalse(result)
+
+        number_of_records = test_store.WriteRecords(
+            'userassist_entries', self._DIGEST, '20240211',
+            iter(user_assist_entries))
+        self.assertEqual(number_of_records, 5)
+
+        # Writing the records again replaces the stored records.
+        number_of_records = test_store.WriteRecords(
+            'userassist_entries', self._DIGEST, '20240211',
+            user_assist_entries[:3])
+        self.assertEqual(number_of_records, 3)
+
+      finally:
+        test_store.Close()
+
+      test_store = result_store.ResultStore(path)
+      result = test_store.Open()
+      self.assertTrue(result)
+
+      try:
+        result = test_store.HasRecords(
+            'userassist_entries', self._DIGEST, '20240211')
+        self.assertTrue(result)
+
+        result = test_store.HasRecords(
+            'userassist_entries', self._DIGEST, '20240212')
+        self.assertFalse(result)
+
+        result = test_store.HasRecords('services', self._DIGEST, '20240211')
+        self.assertFalse(result)
+
+        records = list(test_store.GetRecords(
+            'userassist_entries', self._DIGEST, '20240211'))
+        self.assertEqual(len(records), 3)
+        self.assertIsInstance(records[0], userassist.UserAssistEntry)
+        self.assertEqual(
+            [vars(record) for record in records],
+            [vars(record) for record in user_assist_entries[:3]])
+
+        records = list(test_store.GetRecords(
+            'userassist_entries', self._DIGEST, '20240212'))
+        self.assertEqual(records, [])
+
+        with self.assertRaises(errors.Error):
+          list(test_store.GetRecords('bogus', self._DIGEST, '20240211'))
+
+        with self.assertRaises(errors.Error):
+          test_store.WriteRecords('bogus', self._DIGEST, '20240211', [])
+
+      finally:
+        test_store.Close()
+
+  def testWriteAndGetRecordsWithEncodedValues(self):
+    """Tests the WriteRecords and GetRecords functions with encoded values."""
+    cached_entry = appcompatcache.AppCompatCacheCachedEntry(
+        value_data=b'\xff\xffC\x00:\x00\\\x00\x01\x02')
+    cached_entry.SetData(8, 2)
+    cached_entry.SetPath(2, 6)
+    cached_entry.control_sets = ['ControlSet001', 'ControlSet002']
+    cached_entry.file_size = 1024
+    cached_entry.last_modification_time = 0xffffffffffffffff
+
+    cached_task = task_cache.CachedTask()
+    cached_task.identifier = '{GUID}'
+    cached_task.last_registered_time = dfdatetime_filetime.Filetime(
+        timestamp=0x01cb3a623d0a17ce)
+    cached_task.launch_time = dfdatetime_semantic_time.SemanticTime(
+        string='Never')
+
+    storage_device_property = usbstor.USBStorageDeviceProperty(
+        '{83da6326-97a6-4088-9453-a1923f573b29}', '00000064')
+    storage_device_property.value = dfdatetime_filetime.Filetime(
+        timestamp=0x01cb3a623d0a17ce)
+    storage_device_property.value_type = 0x00000010
+
+    storage_device = usbstor.USBStorageDevice()
+    storage_device.key_path = 'HKEY_LOCAL_MACHINE\\System'
+    storage_device.properties = [storage_device_property]
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'results.db')
+
+      test_store = result_store.ResultStore(path)
+      result = test_store.Open()
+      self.assertTrue(result)
+
+      try:
+        for result_type, record in (
+            ('appcompatcache_entries', cached_entry),
+            ('cached_tasks', cached_task),
+            ('usb_storage_devices', storage_device)):
+          test_store.WriteRecords(
+              result_type, self._DIGEST, '20240211', [record])
+
+        records = list(test_store.GetRecords(
+            'appcompatcache_entries', self._DIGEST, '20240211'))
+        self.assertEqual(len(records), 1)
+        self.assertIsInstance(
+            records[0], appcompatcache.AppCompatCacheCachedEntry)
+        self.assertEqual(records[0].control_sets, cached_entry.control_sets)
+        self.assertEqual(records[0].data, b'\x01\x02')
+        self.assertEqual(records[0].file_size, 1024)
+        self.assertEqual(
+            records[0].last_modification_time, 0xffffffffffffffff)
+        self.assertEqual(records[0].path, 'C:\\')
+
+        records = list(test_store.GetRecords(
+            'cached_tasks', self._DIGEST, '20240211'))
+        self.assertEqual(len(records), 1)
+        self.assertIsInstance(records[0], task_cache.CachedTask)
+        self.assertEqual(records[0].identifier, '{GUID}')
+        self.assertEqual(
+            records[0].last_registered_time, cached_task.last_registered_time)
+        self.assertIsInstance(
+            records[0].launch_time, dfdatetime_semantic_time.SemanticTime)
+        self.assertEqual(records[0].launch_time.string, 'Never')
+
+        records = list(test_store.GetRecords(
+            'usb_storage_devices', self._DIGEST, '20240211'))
+        self.assertEqual(len(records), 1)
+        self.assertIsInstance(records[0], usbstor.USBStorageDevice)
+        self.assertEqual(records[0].key_path, 'HKEY_LOCAL_MACHINE\\System')
+        self.assertEqual(len(records[0].properties), 1)
+
+        test_property = records[0].properties[0]
+        self.assertIsInstance(test_property, usbstor.USBStorageDeviceProperty)
+        self.assertEqual(test_property.identifier, '00000064')
+        self.assertEqual(test_property.value, storage_device_property.value)
+        self.assertEqual(test_property.value_type, 0x00000010)
+
+      finally:
+        test_store.Close()
+
+  def testOpenWithMissingDirectory(self):
+    """Tests the Open function with a missing directory."""
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'bogus', 'results.db')
+
+      test_store = result_store.ResultStore(path)
+      result = test_store.Open()
+      self.assertFalse(result)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the scripts."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from tests import test_lib
+
+
+class ScriptsTest(test_lib.BaseTestCase):
+  """Tests for the scripts."""
+
+  _SCRIPTS_PATH = os.path.join(os.getcwd(), 'scripts')
+
+  def _RunScript(self, script_name, arguments):
+    """Runs a script.
+
+    Args:
+      script_name (str): name of the script, such as "userassist.py".
+      arguments (list[str]): command line arguments of the script.
+
+    Returns:
+      str: output the script wrote to stdout.
+    """
+    script_path = os.path.join(self._SCRIPTS_PATH, script_name)
+
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.getcwd()
+
+    process = subprocess.run(
+        [sys.executable, script_path, *arguments], capture_output=True,
+        check=False, env=environment, text=True)
+    self.assertEqual(process.returncode, 0, msg=process.stderr)
+
+    return process.stdout
+
+  def _TestCachedOutput(self, script_name, filename):
+    """Tests that the output of cached results equals that of a fresh run.
+
+    Args:
+      script_name (str): name of the script, such as "userassist.py".
+      filename (str): name of the test file.
+    """
+    test_file_path = self._GetTestFilePath([filename])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      cache_path = os.path.join(temporary_directory, 'cache')
+      arguments = ['--format', 'jsonl', '--cache', cache_path, test_file_path]
+
+      expected_output = self._RunScript(script_name, arguments)
+      self.assertEqual(len(os.listdir(cache_path)), 1)
+
+      output = self._RunScript(script_name, arguments)
+      self.assertNotEqual(output, '')
+      self.assertEqual(output, expected_output)
+
+  def _TestStoredOutput(self, script_name, filename):
+    """Tests that the output of stored records equals that of a fresh run.
+
+    Args:
+      script_name (str): name of the script, such as "userassist.py".
+      filename (str): name of the test file.
+    """
+    test_file_path = self._GetTestFilePath([filename])
+    self._SkipIfPathNotExists(test_file_path)
+
+    for output_format in ('jsonl', 'text'):
+      with tempfile.TemporaryDirectory() as temporary_directory:
+        store_path = os.path.join(temporary_directory, 'results.db')
+        arguments = [
+            '--format', output_format, '--store', store_path, test_file_path]
+
+        expected_output = self._RunScript(script_name, arguments)
+        self.assertTrue(os.path.exists(store_path))
+
+        output = self._RunScript(script_name, arguments)
+        self.assertNotEqual(output, '')
+        self.assertEqual(output, expected_output)
+
+  def testCatalog(self):
+    """Tests the catalog.py script."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    output = self._RunScript('catalog.py', [test_file_path])
+
+    key_paths = [
+        line for line in output.splitlines()
+        if line and not line.startswith('\t')]
+    self.assertEqual(len(key_paths), 1597)
+    self.assertEqual(key_paths[0], 'HKEY_CURRENT_USER')
+
+  def testCatalogWithSourceDefinitions(self):
+    """Tests the catalog.py script with a source definitions file."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'sources.yaml')
+      with open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write((
+            f'source: {test_file_path:s}\n'
+            f'windows_version: Windows 10\n'))
+
+      output = self._RunScript('catalog.py', [path])
+
+    lines = output.splitlines()
+    self.assertEqual(len(lines[0].split('\t')), 2)
+    self.assertEqual(lines[0].split('\t')[1], '["Windows 10"]')
+
+  def testMRUWithCache(self):
+    """Tests the mru.py script with a result cache."""
+    self._TestCachedOutput('mru.py', 'NTUSER.DAT')
+
+  def testMRUWithStore(self):
+    """Tests the mru.py script with a result store."""
+    self._TestStoredOutput('mru.py', 'NTUSER.DAT')
+
+  def testSAMWithCache(self):
+    """Tests the sam.py script with a result cache."""
+    self._TestCachedOutput('sam.py', 'SAM')
+
+  def testSAMWithStore(self):
+    """Tests the sam.py script with a result store."""
+    self._TestStoredOutput('sam.py', 'SAM')
+
+  def testUserActivity(self):
+    """Tests the user_activity.py script."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    output = self._RunScript(
+        'user_activity.py', ['--format', 'jsonl', test_file_path])
+
+    records_per_collector = {}
+    for line in output.splitlines():
+      record = json.loads(line)
+      collector_name = record.pop('collector')
+      records_per_collector.setdefault(collector_name, []).append(record)
+
+    # The entries collected in a single pass are the same as those of
+    # the individual scripts.
+    for collector_name, script_name in (
+        ('mru', 'mru.py'), ('userassist', 'userassist.py')):
+      output = self._RunScript(
+          script_name, ['--format', 'jsonl', test_file_path])
+      expected_records = [json.loads(line) for line in output.splitlines()]
+
+      self.assertNotEqual(expected_records, [])
+      self.assertEqual(
+          records_per_collector.get(collector_name, None), expected_records)
+
+  def testUserAssistWithCache(self):
+    """Tests the userassist.py script with a result cache."""
+    self._TestCachedOutput('userassist.py', 'NTUSER.DAT')
+
+  def testUserAssistWithStore(self):
+    """Tests the userassist.py script with a result store."""
+    self._TestStoredOutput('userassist.py', 'NTUSER.DAT')
+
+
+if __name__ == '__main__':
+  unittest.main()
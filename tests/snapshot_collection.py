@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the collection of information from Volume Shadow Snapshots."""
+
+import unittest
+
+from winregrc import snapshot_collection
+from winregrc import userassist
+
+from tests import test_lib as shared_test_lib
+
+
+class SnapshotsCollectorTest(shared_test_lib.BaseTestCase):
+  """Tests for the snapshots collector."""
+
+  _REGISTRY_FILE_PATHS = ['%UserProfile%\\NTUSER.DAT']
+
+  def _CreateTestVolumeScanner(self):
+    """Creates a volume scanner for testing.
+
+    Returns:
+      TestVolumeScanner: volume scanner for testing.
+    """
+    data = self._ReadTestFile(['NTUSER.DAT'])
+
+    # Trailing data results in a distinct digest of the same Windows
+    # Registry file.
+    modified_data1 = b''.join([data, b'\x00' * 4096])
+    modified_data2 = b''.join([data, b'\x00' * 8192])
+
+    return shared_test_lib.TestVolumeScanner(data, data_per_snapshot={
+        'vss1': modified_data1,
+        'vss2': None,
+        'vss3': data,
+        'vss4': modified_data1,
+        'vss5': modified_data2})
+
+  def _GetSnapshotCollectionValues(self, snapshot_collections):
+    """Retrieves the values of snapshot collections of UserAssist entries.
+
+    Args:
+      snapshot_collections (list[SnapshotCollection]): snapshot collections.
+
+    Returns:
+      list[tuple[str, str, bool, int]]: snapshot identifier, creation time,
+          result and number of UserAssist entries per snapshot.
+    """
+    values = []
+    for snapshot_collection_object in snapshot_collections:
+      creation_time = snapshot_collection_object.snapshot_creation_time
+      values.append((
+          snapshot_collection_object.snapshot_identifier,
+          creation_time.CopyToDateTimeString(),
+          snapshot_collection_object.result,
+          len(snapshot_collection_object.collector.user_assist_entries)))
+
+    return values
+
+  def testCollect(self):
+    """Tests the Collect function."""
+    scanner = self._CreateTestVolumeScanner()
+
+    collector_object = snapshot_collection.SnapshotsCollector(
+        userassist.UserAssistCollector, self._REGISTRY_FILE_PATHS)
+
+    # vss2 has no Windows Registry file and vss3 and vss4 are identical to
+    # the current volume and vss1.
+    snapshot_collections = list(collector_object.Collect(scanner))
+    self.assertEqual(
+        self._GetSnapshotCollectionValues(snapshot_collections), [
+            ('vss1', '2010-08-12 21:06:31.5468750', True, 13),
+            ('vss5', '2010-08-12 21:06:31.5468754', True, 13)])
+
+  def testCollectInParallel(self):
+    """Tests the Collect function with multiple worker processes."""
+    scanner = self._CreateTestVolumeScanner()
+
+    collector_object = snapshot_collection.SnapshotsCollector(
+        userassist.UserAssistCollector, self._REGISTRY_FILE_PATHS,
+        number_of_workers=2)
+
+    snapshot_collections = list(collector_object.Collect(scanner))
+    self.assertEqual(
+        self._GetSnapshotCollectionValues(snapshot_collections), [
+            ('vss1', '2010-08-12 21:06:31.5468750', True, 13),
+            ('vss5', '2010-08-12 21:06:31.5468754', True, 13)])
+
+
+if __name__ == '__main__':
+  unittest.main()
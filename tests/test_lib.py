@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 """Shared test case."""
 
+import hashlib
 import os
 import unittest
 
+from dfdatetime import filetime as dfdatetime_filetime
+
 from winregrc import output_writers
+from winregrc import volume_scanner
 
 
 class BaseTestCase(unittest.TestCase):
@@ -29,6 +33,25 @@ class BaseTestCase(unittest.TestCase):
     # and not a list.
     return os.path.join(self._TEST_DATA_PATH, *path_segments)
 
+  def _ReadTestFile(self, path_segments):
+    """Reads a test file in the test data directory.
+
+    Args:
+      path_segments (list[str]): path segments inside the test data directory.
+
+    Returns:
+      bytes: data of the test file.
+
+    Raises:
+      SkipTest: if the test file does not exist and the test should be
+          skipped.
+    """
+    test_file_path = self._GetTestFilePath(path_segments)
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      return file_object.read()
+
   def _SkipIfPathNotExists(self, path):
     """Skips the test if the path does not exist.
 
@@ -70,3 +93,89 @@ class TestOutputWriter(output_writers.StdoutOutputWriter):
       text (str): text to write.
     """
     self.output.append(text)
+
+
+class TestVolumeScanner(object):
+  """Volume scanner for testing.
+
+  The volume scanner provides the data of a Windows Registry file for
+  the current volume, every user profile with a security identifier (SID)
+  and every snapshot.
+  """
+
+  def __init__(self, data, data_per_snapshot=None, user_profiles=None):
+    """Initializes a volume scanner for testing.
+
+    Args:
+      data (bytes): data of the Windows Registry file of the current volume
+          and of every user profile.
+      data_per_snapshot (Optional[dict[str, bytes]]): data of the Windows
+          Registry file per snapshot identifier, where None represents
+          a snapshot without the Windows Registry file.
+      user_profiles (Optional[list[WindowsUserProfile]]): user profiles.
+    """
+    super(TestVolumeScanner, self).__init__()
+    self._data = data
+    self._data_per_snapshot = data_per_snapshot or {}
+    self._user_profiles = user_profiles or []
+
+  def GetRegistryFileDigest(self, windows_path):  # pylint: disable=unused-argument
+    """Calculates the SHA-256 digest of a Windows Registry file.
+
+    Args:
+      windows_path (str): Windows path of the Windows Registry file.
+
+    Returns:
+      str: hexadecimal SHA-256 digest of the Windows Registry file.
+    """
+    return hashlib.sha256(self._data).hexdigest()
+
+  def GetSnapshots(self):
+    """Retrieves the Volume Shadow Snapshots.
+
+    Returns:
+      list[VolumeSnapshot]: snapshots.
+    """
+    return [
+        volume_scanner.VolumeSnapshot(
+            identifier, creation_time=dfdatetime_filetime.Filetime(
+                timestamp=0x01cb3a623d0a17ce + index))
+        for index, identifier in enumerate(self._data_per_snapshot.keys())]
+
+  def GetUserProfiles(self):
+    """Retrieves the user profiles.
+
+    Returns:
+      list[WindowsUserProfile]: user profiles.
+    """
+    return self._user_profiles
+
+  def ReadSnapshotRegistryFiles(self, snapshot, windows_paths):
+    """Reads Windows Registry files from a Volume Shadow Snapshot.
+
+    Args:
+      snapshot (VolumeSnapshot): snapshot.
+      windows_paths (list[str]): Windows paths of the Windows Registry files.
+
+    Returns:
+      dict[str, bytes]: data of the Windows Registry files per Windows path.
+    """
+    data = self._data_per_snapshot[snapshot.identifier]
+    if data is None:
+      return {}
+
+    return {windows_path: data for windows_path in windows_paths}
+
+  def ReadUserRegistryFiles(self, user_profile):
+    """Reads the Windows Registry files of a user profile.
+
+    Args:
+      user_profile (WindowsUserProfile): user profile.
+
+    Returns:
+      dict[str, bytes]: data of the Windows Registry files per Windows path.
+    """
+    if not user_profile.security_identifier:
+      return {}
+
+    return {'%UserProfile%\\NTUSER.DAT': self._data}
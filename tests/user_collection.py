@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the collection of per-user information from all user profiles."""
+
+import unittest
+
+from winregrc import user_collection
+from winregrc import userassist
+from winregrc import volume_scanner
+
+from tests import test_lib as shared_test_lib
+
+
+class AllUsersCollectorTest(shared_test_lib.BaseTestCase):
+  """Tests for the all users collector."""
+
+  def _CreateTestVolumeScanner(self):
+    """Creates a volume scanner for testing.
+
+    Returns:
+      TestVolumeScanner: volume scanner for testing.
+    """
+    data = self._ReadTestFile(['NTUSER.DAT'])
+
+    user_profiles = [
+        volume_scanner.WindowsUserProfile(
+            'user1', '\\Users\\user1', security_identifier=(
+                'S-1-5-21-1000-1000-1000-1001')),
+        volume_scanner.WindowsUserProfile('user2', '\\Users\\user2'),
+        volume_scanner.WindowsUserProfile(
+            'user3', '\\Users\\user3', security_identifier=(
+                'S-1-5-21-1000-1000-1000-1003'))]
+
+    return shared_test_lib.TestVolumeScanner(
+        data, user_profiles=user_profiles)
+
+  def _GetUserCollectionValues(self, user_collections):
+    """Retrieves the values of user collections of UserAssist entries.
+
+    Args:
+      user_collections (list[UserCollection]): user collections.
+
+    Returns:
+      list[tuple[str, str, bool, int]]: username, security identifier, result
+          and number of UserAssist entries per user.
+    """
+    return [
+        (user_collection_object.username,
+         user_collection_object.security_identifier,
+         user_collection_object.result,
+         len(user_collection_object.collector.user_assist_entries))
+        for user_collection_object in user_collections]
+
+  def testCollect(self):
+    """Tests the Collect function."""
+    scanner = self._CreateTestVolumeScanner()
+
+    collector_object = user_collection.AllUsersCollector(
+        userassist.UserAssistCollector)
+
+    user_collections = list(collector_object.Collect(scanner))
+    self.assertEqual(self._GetUserCollectionValues(user_collections), [
+        ('user1', 'S-1-5-21-1000-1000-1000-1001', True, 13),
+        ('user2', None, False, 0),
+        ('user3', 'S-1-5-21-1000-1000-1000-1003', True, 13)])
+
+  def testCollectInParallel(self):
+    """Tests the Collect function with multiple worker processes."""
+    scanner = self._CreateTestVolumeScanner()
+
+    collector_object = user_collection.AllUsersCollector(
+        userassist.UserAssistCollector, number_of_workers=2)
+
+    user_collections = list(collector_object.Collect(scanner))
+    self.assertEqual(self._GetUserCollectionValues(user_collections), [
+        ('user1', 'S-1-5-21-1000-1000-1000-1001', True, 13),
+        ('user2', None, False, 0),
+        ('user3', 'S-1-5-21-1000-1000-1000-1003', True, 13)])
+
+    user_assist_entry = user_collections[0].collector.user_assist_entries[0]
+    self.assertIsInstance(user_assist_entry, userassist.UserAssistEntry)
+
+  def testCollectInParallelWithMaximumPendingDataSize(self):
+    """Tests the Collect function with a maximum pending data size."""
+    # pylint: disable=invalid-name,protected-access
+    scanner = self._CreateTestVolumeScanner()
+
+    collector_object = user_collection.AllUsersCollector(
+        userassist.UserAssistCollector, number_of_workers=2)
+    collector_object._MAXIMUM_PENDING_DATA_SIZE = 1
+
+    read_usernames = []
+    read_user_registry_files = scanner.ReadUserRegistryFiles
+
+    def _ReadUserRegistryFiles(user_profile):
+      read_usernames.append(user_profile.username)
+      return read_user_registry_files(user_profile)
+
+    scanner.ReadUserRegistryFiles = _ReadUserRegistryFiles
+
+    number_of_read_users = []
+    for _ in collector_object.Collect(scanner):
+      number_of_read_users.append(len(read_usernames))
+
+    # Note that the Windows Registry files of the second user are empty and
+    # do not count for the maximum pending data size.
+    self.assertEqual(number_of_read_users, [1, 3, 3])
+
+    read_usernames = []
+
+    collector_object = user_collection.AllUsersCollector(
+        userassist.UserAssistCollector, number_of_workers=2)
+
+    number_of_read_users = []
+    for _ in collector_object.Collect(scanner):
+      number_of_read_users.append(len(read_usernames))
+
+    # At most one user per worker process is read ahead.
+    self.assertEqual(number_of_read_users, [2, 3, 3])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the Windows Registry volume scanner."""
+
+import hashlib
+import os
+import tempfile
+import unittest
+
+from dfwinreg import fake as dfwinreg_fake
+from dfwinreg import registry as dfwinreg_registry
+
+from winregrc import volume_scanner
+
+from tests import test_lib as shared_test_lib
+
+
+class CachingWindowsRegistryTest(shared_test_lib.BaseTestCase):
+  """Tests for the caching Windows Registry."""
+
+  # pylint: disable=protected-access
+
+  def _CreateTestRegistry(self):
+    """Creates Registry keys and values for testing.
+
+    Returns:
+      dfwinreg.WinRegistry: Windows Registry for testing.
+    """
+    registry = dfwinreg_registry.WinRegistry()
+
+    key_path_prefix = 'HKEY_LOCAL_MACHINE\\System'
+
+    registry_file = dfwinreg_fake.FakeWinRegistryFile(
+        key_path_prefix=key_path_prefix)
+
+    for key_name in ('AppCompatCache', 'AppCompatibility'):
+      registry_key = dfwinreg_fake.FakeWinRegistryKey(key_name)
+      registry_file.AddKeyByPath(
+          '\\ControlSet001\\Control\\Session Manager', registry_key)
+
+    registry_file.Open(None)
+    registry.MapFile(key_path_prefix, registry_file)
+
+    return registry
+
+  def testGetMountPointDepth(self):
+    """Tests the _GetMountPointDepth function."""
+    registry = self._CreateTestRegistry()
+    caching_registry = volume_scanner.CachingWindowsRegistry(registry)
+
+    mount_point_depth = caching_registry._GetMountPointDepth(
+        ('HKEY_LOCAL_MACHINE', 'SYSTEM', 'CONTROLSET001'))
+    self.assertEqual(mount_point_depth, 2)
+
+    mount_point_depth = caching_registry._GetMountPointDepth(
+        ('HKEY_CURRENT_USER', 'SOFTWARE', 'CLASSES', 'CLSID'))
+    self.assertEqual(mount_point_depth, 3)
+
+    mount_point_depth = caching_registry._GetMountPointDepth(
+        ('HKEY_CURRENT_USER', 'SOFTWARE', 'MICROSOFT'))
+    self.assertEqual(mount_point_depth, 1)
+
+    # Keys contained by a virtual key are not contained by a mount point.
+    mount_point_depth = caching_registry._GetMountPointDepth(
+        ('HKEY_USERS', 'S-1-5-18', 'SOFTWARE'))
+    self.assertEqual(mount_point_depth, 0)
+
+    mount_point_depth = caching_registry._GetMountPointDepth(
+        ('HKEY_CURRENT_CONFIG', 'SOFTWARE'))
+    self.assertEqual(mount_point_depth, 0)
+
+    # A mapped Windows Registry file adds a mount point.
+    key_path_prefix = 'HKEY_CURRENT_CONFIG\\Software'
+
+    registry_file = dfwinreg_fake.FakeWinRegistryFile(
+        key_path_prefix=key_path_prefix)
+    registry_file.Open(None)
+    caching_registry.MapFile(key_path_prefix, registry_file)
+
+    mount_point_depth = caching_registry._GetMountPointDepth(
+        ('HKEY_CURRENT_CONFIG', 'SOFTWARE', 'FONTS'))
+    self.assertEqual(mount_point_depth, 2)
+
+  def testGetKeyByPath(self):
+    """Tests the GetKeyByPath function."""
+    registry = self._CreateTestRegistry()
+    caching_registry = volume_scanner.CachingWindowsRegistry(registry)
+
+    registry_key = caching_registry.GetKeyByPath(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet001\\Control\\Session Manager\\'
+        'AppCompatCache')
+    self.assertIsNotNone(registry_key)
+    self.assertEqual(registry_key.name, 'AppCompatCache')
+    self.assertEqual(caching_registry.number_of_cache_hits, 0)
+    self.assertEqual(caching_registry.number_of_cache_misses, 1)
+
+    # The mount point and all the intermediate keys are cached.
+    self.assertEqual(caching_registry.number_of_cached_keys, 5)
+
+    registry_key = caching_registry.GetKeyByPath(
+        'HKLM\\SYSTEM\\ControlSet001\\Control\\Session Manager\\'
+        'AppCompatCache')
+    self.assertIsNotNone(registry_key)
+    self.assertEqual(caching_registry.number_of_cache_hits, 1)
+    self.assertEqual(caching_registry.number_of_cache_misses, 1)
+
+    # Resolved from the cached Session Manager key.
+    registry_key = caching_registry.GetKeyByPath(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet001\\Control\\Session Manager\\'
+        'AppCompatibility')
+    self.assertIsNotNone(registry_key)
+    self.assertEqual(registry_key.name, 'AppCompatibility')
+    self.assertEqual(caching_registry.number_of_cache_hits, 1)
+    self.assertEqual(caching_registry.number_of_cache_misses, 2)
+    self.assertEqual(caching_registry.number_of_cached_keys, 6)
+
+    # Negative lookups are cached.
+    registry_key = caching_registry.GetKeyByPath(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet002\\Services')
+    self.assertIsNone(registry_key)
+
+    registry_key = caching_registry.GetKeyByPath(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet002\\Services')
+    self.assertIsNone(registry_key)
+    self.assertEqual(caching_registry.number_of_cache_hits, 2)
+    self.assertEqual(caching_registry.number_of_cache_misses, 3)
+
+    registry_key = caching_registry.GetKeyByPath(
+        'HKEY_LOCAL_MACHINE\\Software\\Microsoft')
+    self.assertIsNone(registry_key)
+
+    with self.assertRaises(RuntimeError):
+      caching_registry.GetKeyByPath('HKEY_BOGUS\\Software')
+
+  def testGetKeyByPathWithMaximumNumberOfCachedKeys(self):
+    """Tests the GetKeyByPath function with a maximum number of cached keys."""
+    registry = self._CreateTestRegistry()
+    caching_registry = volume_scanner.CachingWindowsRegistry(
+        registry, maximum_number_of_cached_keys=2)
+
+    registry_key = caching_registry.GetKeyByPath(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet001\\Control\\Session Manager\\'
+        'AppCompatCache')
+    self.assertIsNotNone(registry_key)
+    self.assertEqual(caching_registry.number_of_cached_keys, 2)
+
+    registry_key = caching_registry.GetKeyByPath(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet001')
+    self.assertIsNotNone(registry_key)
+    self.assertEqual(caching_registry.number_of_cache_hits, 0)
+    self.assertEqual(caching_registry.number_of_cache_misses, 2)
+
+    with self.assertRaises(ValueError):
+      volume_scanner.CachingWindowsRegistry(
+          registry, maximum_number_of_cached_keys=0)
+
+
+class DataWindowsRegistryFileReaderTest(shared_test_lib.BaseTestCase):
+  """Tests for the Windows Registry file reader of data."""
+
+  def testOpen(self):
+    """Tests the Open function."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    with open(test_file_path, 'rb') as file_object:
+      data = file_object.read()
+
+    file_reader = volume_scanner.DataWindowsRegistryFileReader({
+        '%UserProfile%\\NTUSER.DAT': data})
+
+    registry_file = file_reader.Open('%USERPROFILE%\\ntuser.dat')
+    self.assertIsNotNone(registry_file)
+    registry_file.Close()
+
+    registry_file = file_reader.Open('%UserProfile%\\bogus.dat')
+    self.assertIsNone(registry_file)
+
+
+class SingleFileWindowsRegistryFileReaderTest(shared_test_lib.BaseTestCase):
+  """Tests for the single file Windows Registry file reader."""
+
+  # pylint: disable=protected-access
+
+  def testOpen(self):
+    """Tests the Open function."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    key_path = 'HKEY_CURRENT_USER\\Software\\Microsoft\\Windows'
+
+    number_of_sub_keys = []
+    for use_mmap in (True, False):
+      file_reader = volume_scanner.SingleFileWindowsRegistryFileReader(
+          test_file_path, use_mmap=use_mmap)
+      registry = dfwinreg_registry.WinRegistry(
+          registry_file_reader=file_reader)
+
+      registry_key = registry.GetKeyByPath(key_path)
+      self.assertIsNotNone(registry_key)
+      number_of_sub_keys.append(registry_key.number_of_subkeys)
+
+    self.assertEqual(number_of_sub_keys[0], number_of_sub_keys[1])
+
+  def testOpenMemoryMappedFile(self):
+    """Tests the _OpenMemoryMappedFile function."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    file_reader = volume_scanner.SingleFileWindowsRegistryFileReader(
+        test_file_path)
+
+    file_object = file_reader._OpenMemoryMappedFile()
+    self.assertIsNotNone(file_object)
+
+    try:
+      self.assertEqual(file_object.read(4), b'regf')
+      self.assertEqual(file_object.size(), os.path.getsize(test_file_path))
+    finally:
+      file_object.close()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+      test_file_path = os.path.join(temporary_directory, 'empty')
+      with open(test_file_path, 'wb'):
+        pass
+
+      # An empty file cannot be memory mapped.
+      file_reader = volume_scanner.SingleFileWindowsRegistryFileReader(
+          test_file_path)
+
+      file_object = file_reader._OpenMemoryMappedFile()
+      self.assertIsNone(file_object)
+
+
+class WindowsRegistryVolumeScannerTest(shared_test_lib.BaseTestCase):
+  """Tests for the Windows Registry volume scanner."""
+
+  # pylint: disable=protected-access
+
+  def testGetProfilePath(self):
+    """Tests the _GetProfilePath function."""
+    scanner = volume_scanner.WindowsRegistryVolumeScanner()
+
+    self.assertEqual(
+        scanner._GetProfilePath('%SystemDrive%\\Users\\user1'),
+        '\\Users\\user1')
+    self.assertEqual(
+        scanner._GetProfilePath('C:\\Users\\user1\\'), '\\Users\\user1')
+    self.assertEqual(
+        scanner._GetProfilePath(
+            '%systemroot%\\system32\\config\\systemprofile'),
+        '%systemroot%\\system32\\config\\systemprofile')
+    self.assertEqual(
+        scanner._GetProfilePath('Users\\user1'), '\\Users\\user1')
+    self.assertIsNone(scanner._GetProfilePath('C:\\'))
+    self.assertIsNone(scanner._GetProfilePath(None))
+
+  def testGetRegistryFileDigest(self):
+    """Tests the GetRegistryFileDigest function."""
+    test_file_path = self._GetTestFilePath(['SAM'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    scanner = volume_scanner.WindowsRegistryVolumeScanner()
+
+    digest = scanner.GetRegistryFileDigest(
+        '%SystemRoot%\\System32\\config\\SAM')
+    self.assertIsNone(digest)
+
+    result = scanner.ScanForWindowsVolume(test_file_path)
+    self.assertTrue(result)
+
+    with open(test_file_path, 'rb') as file_object:
+      expected_digest = hashlib.sha256(file_object.read()).hexdigest()
+
+    digest = scanner.GetRegistryFileDigest(
+        '%SystemRoot%\\System32\\config\\SAM')
+    self.assertEqual(digest, expected_digest)
+
+  def testGetSnapshots(self):
+    """Tests the GetSnapshots function."""
+    test_file_path = self._GetTestFilePath(['SAM'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    scanner = volume_scanner.WindowsRegistryVolumeScanner()
+
+    snapshots = scanner.GetSnapshots()
+    self.assertEqual(snapshots, [])
+
+    result = scanner.ScanForWindowsVolume(test_file_path)
+    self.assertTrue(result)
+
+    # Snapshots are not available in a single Windows Registry file.
+    snapshots = scanner.GetSnapshots()
+    self.assertEqual(snapshots, [])
+
+  def testGetUserProfiles(self):
+    """Tests the GetUserProfiles function."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    scanner = volume_scanner.WindowsRegistryVolumeScanner()
+
+    result = scanner.ScanForWindowsVolume(test_file_path)
+    self.assertTrue(result)
+
+    # User profiles are not available in a single Windows Registry file.
+    user_profiles = scanner.GetUserProfiles()
+    self.assertEqual(user_profiles, [])
+
+  def testScanForWindowsVolume(self):
+    """Tests the ScanForWindowsVolume function."""
+    test_file_path = self._GetTestFilePath(['NTUSER.DAT'])
+    self._SkipIfPathNotExists(test_file_path)
+
+    scanner = volume_scanner.WindowsRegistryVolumeScanner()
+
+    result = scanner.ScanForWindowsVolume(test_file_path)
+    self.assertTrue(result)
+    self.assertIsInstance(
+        scanner.registry, volume_scanner.CachingWindowsRegistry)
+
+    registry_key = scanner.registry.GetKeyByPath(
+        'HKEY_CURRENT_USER\\Software\\Microsoft')
+    self.assertIsNotNone(registry_key)
+
+    options = volume_scanner.VolumeScannerOptions()
+    options.key_cache_size = 0
+
+    scanner = volume_scanner.WindowsRegistryVolumeScanner()
+
+    result = scanner.ScanForWindowsVolume(test_file_path, options=options)
+    self.assertTrue(result)
+    self.assertIsInstance(scanner.registry, dfwinreg_registry.WinRegistry)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the single-pass Windows Registry key walker."""
+
+import unittest
+
+from dfwinreg import definitions as dfwinreg_definitions
+from dfwinreg import fake as dfwinreg_fake
+from dfwinreg import registry as dfwinreg_registry
+
+from winregrc import appcompatcache
+from winregrc import userassist
+from winregrc import walker
+
+from tests import test_lib as shared_test_lib
+
+
+class WindowsRegistryKeyWalkerTest(shared_test_lib.BaseTestCase):
+  """Tests for the single-pass Windows Registry key walker."""
+
+  # pylint: disable=protected-access
+
+  def _CreateTestRegistry(self):
+    """Creates Registry keys and values for testing.
+
+    Returns:
+      dfwinreg.WinRegistry: Windows Registry for testing.
+    """
+    registry = dfwinreg_registry.WinRegistry()
+
+    key_path_prefix = 'HKEY_LOCAL_MACHINE\\System'
+
+    registry_file = dfwinreg_fake.FakeWinRegistryFile(
+        key_path_prefix=key_path_prefix)
+
+    for control_set in ('ControlSet001', 'ControlSet002'):
+      for service_name in ('Dhcp', 'WwanSvc'):
+        registry_key = dfwinreg_fake.FakeWinRegistryKey(service_name)
+        registry_file.AddKeyByPath(
+            f'\\{control_set:s}\\Services', registry_key)
+
+        subkey = dfwinreg_fake.FakeWinRegistryKey('Parameters')
+        registry_key.AddSubkey('Parameters', subkey)
+
+    registry_key = dfwinreg_fake.FakeWinRegistryKey('AppCompatCache')
+    registry_file.AddKeyByPath(
+        '\\ControlSet001\\Control\\Session Manager', registry_key)
+
+    registry_value = dfwinreg_fake.FakeWinRegistryValue(
+        'AppCompatCache', data=b'\x00\x00\x00\x00',
+        data_type=dfwinreg_definitions.REG_BINARY)
+    registry_key.AddValue(registry_value)
+
+    registry_file.Open(None)
+    registry.MapFile(key_path_prefix, registry_file)
+
+    key_path_prefix = 'HKEY_CURRENT_USER'
+
+    registry_file = dfwinreg_fake.FakeWinRegistryFile(
+        key_path_prefix=key_path_prefix)
+
+    registry_key = dfwinreg_fake.FakeWinRegistryKey(
+        '{5E6AB780-7743-11CF-A12B-00AA004AE837}')
+    registry_file.AddKeyByPath(
+        '\\Software\\Microsoft\\Windows\\CurrentVersion\\Explorer\\UserAssist',
+        registry_key)
+
+    registry_value = dfwinreg_fake.FakeWinRegistryValue(
+        'Version', data=b'\x03\x00\x00\x00',
+        data_type=dfwinreg_definitions.REG_DWORD)
+    registry_key.AddValue(registry_value)
+
+    subkey = dfwinreg_fake.FakeWinRegistryKey('Count')
+    registry_key.AddSubkey('Count', subkey)
+
+    registry_value = dfwinreg_fake.FakeWinRegistryValue(
+        'HRZR_EHACVQY:%pfvqy2%\\Jvaqbjf Zrffratre.yax', data=(
+            b'\x01\x00\x00\x00\x11\x00\x00\x00\x54\x4b\xf6\xd3\x15\x15\xca'
+            b'\x01'), data_type=dfwinreg_definitions.REG_BINARY)
+    subkey.AddValue(registry_value)
+
+    registry_file.Open(None)
+    registry.MapFile(key_path_prefix, registry_file)
+
+    return registry
+
+  def testAddSubscription(self):
+    """Tests the AddSubscription function."""
+    test_walker = walker.WindowsRegistryKeyWalker()
+
+    subscription = test_walker.AddSubscription(
+        'HKLM\\System\\ControlSet*\\Services', None)
+    self.assertIsNotNone(subscription)
+    self.assertIn('HKEY_LOCAL_MACHINE', test_walker._root_node.literal_nodes)
+
+    with self.assertRaises(ValueError):
+      test_walker.AddSubscription('', None)
+
+    with self.assertRaises(ValueError):
+      test_walker.AddSubscription('HKEY_*\\Software', None)
+
+  def testWalk(self):
+    """Tests the Walk function."""
+    registry = self._CreateTestRegistry()
+
+    services_key_names = []
+    service_key_names = []
+    parameters_key_names = []
+    user_assist_key_names = []
+    walk_completed_registries = []
+
+    test_walker = walker.WindowsRegistryKeyWalker()
+    test_walker.AddWalkCompletedCallback(walk_completed_registries.append)
+    test_walker.AddSubscription(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet*\\Services',
+        lambda registry_key: services_key_names.append(registry_key.name))
+    test_walker.AddSubscription(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet001\\Services\\*',
+        lambda registry_key: service_key_names.append(registry_key.name))
+    test_walker.AddSubscription(
+        'HKEY_LOCAL_MACHINE\\System\\ControlSet002\\Services\\Dhcp',
+        lambda registry_key: parameters_key_names.append(registry_key.name),
+        recursive=True)
+    test_walker.AddSubscription(
+        'HKCU\\Software\\Microsoft\\Windows\\CurrentVersion\\Explorer\\'
+        'UserAssist',
+        lambda registry_key: user_assist_key_names.append(registry_key.name))
+
+    test_walker.Walk(registry)
+
+    self.assertEqual(services_key_names, ['Services', 'Services'])
+    self.assertEqual(service_key_names, ['Dhcp', 'WwanSvc'])
+    self.assertEqual(parameters_key_names, ['Dhcp', 'Parameters'])
+    self.assertEqual(user_assist_key_names, ['UserAssist'])
+    self.assertEqual(walk_completed_registries, [registry])
+
+    # The System and UserAssist anchor keys, 2 control set keys, 2 services
+    # keys, 2 service keys of ControlSet001, 1 service key and 1 parameters
+    # key of ControlSet002.
+    self.assertEqual(test_walker.number_of_keys_walked, 10)
+
+  def testWalkWithCollectors(self):
+    """Tests the Walk function with collectors."""
+    registry = self._CreateTestRegistry()
+
+    test_output_writer = shared_test_lib.TestOutputWriter()
+
+    app_compat_cache_collector = appcompatcache.AppCompatCacheCollector(
+        output_writer=test_output_writer)
+    user_assist_collector = userassist.UserAssistCollector(
+        output_writer=test_output_writer)
+
+    test_walker = walker.WindowsRegistryKeyWalker()
+    app_compat_cache_collector.SubscribeToWalker(
+        test_walker, all_control_sets=True)
+    user_assist_collector.SubscribeToWalker(test_walker)
+
+    test_walker.Walk(registry)
+
+    self.assertEqual(len(app_compat_cache_collector.cached_entries), 0)
+    self.assertEqual(len(user_assist_collector.user_assist_entries), 1)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 """Application Compatibility Cache collector."""
 
+import concurrent.futures
+import hashlib
 import logging
+import re
 
 from dtfabric.runtime import data_maps as dtfabric_data_maps
 
@@ -28,29 +31,131 @@ class AppCompatCacheHeader(object):
 class AppCompatCacheCachedEntry(object):
   """Application Compatibility Cache cached entry.
 
+  The cached entry references the value data, which is shared by all cached
+  entries of the value, and only decodes the path and copies the data when
+  they are accessed.
+
   Attributes:
     cached_entry_size (int): size of the cached entry.
-    data (bytes): data of the cached entry.
+    control_sets (list[str]): names of the control sets that contain the
+        cached entry.
     file_size (int): size of file corresponding to the cached entry.
     insertion_flags (int): insertion flags of the cached entry.
     last_modification_time (int): last modification timestamp of the file
         corresponding to the cached entry.
     last_update_time (int): last update timestamp the cached entry.
     shim_flags (int): shim flags of the cached entry.
-    path (str): path of the cached entry.
   """
 
-  def __init__(self):
-    """Initializes an Application Compatibility Cache cached entry."""
+  __slots__ = [
+      '_data_offset',
+      '_data_size',
+      '_path_offset',
+      '_path_size',
+      '_value_data',
+      'cached_entry_size',
+      'control_sets',
+      'file_size',
+      'insertion_flags',
+      'last_modification_time',
+      'last_update_time',
+      'shim_flags']
+
+  _SURROGATE_BYTE_RE = re.compile(b'[\xd8-\xdf]')
+
+  def __init__(self, value_data=None):
+    """Initializes an Application Compatibility Cache cached entry.
+
+    Args:
+      value_data (Optional[bytes]): value data that contains the cached entry.
+    """
     super(AppCompatCacheCachedEntry, self).__init__()
+    self._data_offset = 0
+    self._data_size = 0
+    self._path_offset = None
+    self._path_size = 0
+    self._value_data = value_data
     self.cached_entry_size = 0
-    self.data = None
+    self.control_sets = []
     self.file_size = None
     self.insertion_flags = None
     self.last_modification_time = None
     self.last_update_time = None
     self.shim_flags = None
-    self.path = None
+
+  @property
+  def data(self):
+    """bytes: data of the cached entry or None if not available."""
+    if not self._data_size:
+      return None
+
+    return self._value_data[
+        self._data_offset:self._data_offset + self._data_size]
+
+  @property
+  def path(self):
+    """str: path of the cached entry or None if not available."""
+    if self._path_offset is None:
+      return None
+
+    return str(memoryview(self._value_data)[
+        self._path_offset:self._path_offset + self._path_size], 'utf-16-le')
+
+  def SetData(self, data_offset, data_size):
+    """Sets the location of the data in the value data.
+
+    Args:
+      data_offset (int): offset of the data relative to the start of the value
+          data.
+      data_size (int): size of the data.
+
+    Raises:
+      ParseError: if the data is outside of the value data.
+    """
+    if (data_offset < 0 or data_size < 0 or
+        data_offset + data_size > len(self._value_data)):
+      raise errors.ParseError((
+          f'Data at offset: {data_offset:d} with size: {data_size:d} is '
+          f'outside of the value data.'))
+
+    self._data_offset = data_offset
+    self._data_size = data_size
+
+  def SetPath(self, path_offset, path_size):
+    """Sets the location of the UTF-16 little-endian path in the value data.
+
+    Args:
+      path_offset (int): offset of the path relative to the start of the value
+          data.
+      path_size (int): size of the path without the end-of-string character.
+
+    Raises:
+      ParseError: if the path is outside of the value data or is not a valid
+          UTF-16 little-endian string.
+    """
+    if (path_offset < 0 or path_size < 0 or
+        path_offset + path_size > len(self._value_data)):
+      raise errors.ParseError((
+          f'Path at offset: {path_offset:d} with size: {path_size:d} is '
+          f'outside of the value data.'))
+
+    if path_size % 2 != 0:
+      raise errors.ParseError(f'Unsupported path size: {path_size:d}.')
+
+    # Only a path that contains surrogates can be an invalid UTF-16 string,
+    # hence the path is only decoded if the upper byte of one of its
+    # characters is in the surrogate range.
+    if self._SURROGATE_BYTE_RE.search(
+        self._value_data[path_offset + 1:path_offset + path_size:2]):
+      try:
+        str(memoryview(self._value_data)[
+            path_offset:path_offset + path_size], 'utf-16-le')
+      except UnicodeDecodeError as exception:
+        raise errors.ParseError(
+            f'Unable to decode path with error: {exception!s}')
+
+    self._path_offset = path_offset
+    self._path_size = path_size
 
 
 class AppCompatCacheDataParser(data_format.BinaryDataFormat):
@@ -89,6 +194,20 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
 
   _SUPPORTED_FORMAT_TYPES = frozenset(_HEADER_DATA_TYPE_MAP_NAMES.keys())
 
+  # Format types of which all the cached entries have the same size.
+  _FIXED_SIZE_FORMAT_TYPES = frozenset([
+      _FORMAT_TYPE_XP, _FORMAT_TYPE_2003, _FORMAT_TYPE_VISTA, _FORMAT_TYPE_7])
+
+  # The Windows XP cached entry contains a fixed-size path, which is not
+  # supported by the dtFabric generated struct decoders. The path is skipped
+  # since it is decoded from the value data on access.
+  _CACHED_ENTRY_XP_32BIT_FORMAT = '<528xQQQ'
+
+  _CACHED_ENTRY_XP_32BIT_MEMBER_NAMES = [
+      'last_modification_time', 'file_size', 'last_update_time']
+
+  _CACHED_ENTRY_XP_32BIT_PATH_SIZE = 528
+
   # AppCompatCache format used in Windows 8.0.
   _CACHED_ENTRY_SIGNATURE_8_0 = b'00ts'
 
@@ -105,6 +224,7 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
     super(AppCompatCacheDataParser, self).__init__(
         debug=debug, output_writer=output_writer)
     self._cached_entry_data_type_map = None
+    self._cached_entry_xp_32bit_decoder = None
 
   def _DebugPrintCachedEntryXP(self, cached_entry):
     """Prints Windows XP AppCompatCache cached entry value debug information.
@@ -291,6 +411,114 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
 
     return self._GetDataTypeMap(data_type_map_name)
 
+  def _GetCachedEntryStructDecoder(self, format_type, data_type_map):
+    """Retrieves the struct decoder of a fixed-size cached entry.
+
+    Args:
+      format_type (int): format type.
+      data_type_map (dtfabric.DataTypeMap): data type map of the cached entry.
+
+    Returns:
+      StructDecoder: struct decoder or None if not available.
+    """
+    if format_type != self._FORMAT_TYPE_XP:
+      struct_decoder = self._struct_decoders.get(data_type_map.name, None)
+      if struct_decoder and struct_decoder.data_type_map is data_type_map:
+        return struct_decoder
+      return None
+
+    if not self._cached_entry_xp_32bit_decoder:
+      self._cached_entry_xp_32bit_decoder = data_format.StructDecoder(
+          data_type_map, self._CACHED_ENTRY_XP_32BIT_FORMAT,
+          self._CACHED_ENTRY_XP_32BIT_MEMBER_NAMES)
+
+    return self._cached_entry_xp_32bit_decoder
+
+  def _ParseFixedSizeCachedEntries(
+      self, format_type, value_data, cached_entry_offset,
+      number_of_cached_entries):
+    """Parses fixed-size cached entries in a single pass.
+
+    Args:
+      format_type (int): format type.
+      value_data (bytes): value data.
+      cached_entry_offset (int): offset of the first cached entry data
+          relative to the start of the value data.
+      number_of_cached_entries (int): number of cached entries to parse, where
+          0 represents all cached entries in the value data.
+
+    Returns:
+      list[AppCompatCacheCachedEntry]: cached entries or None if the cached
+          entries cannot be parsed in a single pass.
+
+    Raises:
+      ParseError: if the value data could not be parsed.
+    """
+    if not self._cached_entry_data_type_map:
+      self._cached_entry_data_type_map = self._GetCachedEntryDataTypeMap(
+          format_type, value_data, cached_entry_offset)
+
+    if not self._cached_entry_data_type_map:
+      raise errors.ParseError('Unable to determine cached entry data type.')
+
+    struct_decoder = self._GetCachedEntryStructDecoder(
+        format_type, self._cached_entry_data_type_map)
+    if not struct_decoder:
+      return None
+
+    cached_entry_size = struct_decoder.size
+
+    maximum_number_of_cached_entries, _ = divmod(
+        len(value_data) - cached_entry_offset, cached_entry_size)
+    if (not number_of_cached_entries or
+        number_of_cached_entries > maximum_number_of_cached_entries):
+      number_of_cached_entries = maximum_number_of_cached_entries
+
+    cached_entries_end_offset = cached_entry_offset + (
+        number_of_cached_entries * cached_entry_size)
+
+    cached_entries_data = memoryview(value_data)[
+        cached_entry_offset:cached_entries_end_offset]
+
+    cached_entry_objects = []
+    for cached_entry in struct_decoder.DecodeSequence(cached_entries_data):
+      cached_entry_object = AppCompatCacheCachedEntry(value_data=value_data)
+      cached_entry_object.cached_entry_size = cached_entry_size
+      cached_entry_object.last_modification_time = (
+          cached_entry.last_modification_time)
+
+      if format_type == self._FORMAT_TYPE_XP:
+        string_size = self._GetUTF16StringSize(
+            value_data, offset=cached_entry_offset,
+            maximum_size=self._CACHED_ENTRY_XP_32BIT_PATH_SIZE)
+
+        cached_entry_object.file_size = cached_entry.file_size
+        cached_entry_object.last_update_time = cached_entry.last_update_time
+        cached_entry_object.SetPath(cached_entry_offset, string_size)
+
+      else:
+        path_offset = cached_entry.path_offset
+        path_size = cached_entry.path_size
+        if path_offset > 0 and path_size > 0:
+          cached_entry_object.SetPath(path_offset, path_size)
+
+        if format_type == self._FORMAT_TYPE_2003:
+          cached_entry_object.file_size = cached_entry.file_size
+
+        else:
+          cached_entry_object.insertion_flags = cached_entry.insertion_flags
+          cached_entry_object.shim_flags = cached_entry.shim_flags
+
+        if format_type == self._FORMAT_TYPE_7:
+          data_size = cached_entry.data_size
+          if data_size > 0:
+            cached_entry_object.SetData(cached_entry.data_offset, data_size)
+
+      cached_entry_objects.append(cached_entry_object)
+      cached_entry_offset += cached_entry_size
+
+    return cached_entry_objects
+
   def _ParseCommon2003CachedEntry(self, value_data, cached_entry_offset):
     """Parses the cached entry structure common for Windows 2003, Vista and 7.
 
@@ -306,7 +534,7 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
     Raises:
       ParseError: if the value data could not be parsed.
     """
-    cached_entry_data = value_data[cached_entry_offset:]
+    cached_entry_data = memoryview(value_data)[cached_entry_offset:]
 
     data_type_map = self._GetDataTypeMap(
         'appcompatcache_cached_entry_2003_common')
@@ -394,9 +622,12 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
     if not self._cached_entry_data_type_map:
       raise errors.ParseError('Unable to determine cached entry data type.')
 
+    value_data_view = memoryview(value_data)
+
     cached_entry_size = self._cached_entry_data_type_map.GetSizeHint()
     cached_entry_end_offset = cached_entry_offset + cached_entry_size
-    cached_entry_data = value_data[cached_entry_offset:cached_entry_end_offset]
+    cached_entry_data = value_data_view[
+        cached_entry_offset:cached_entry_end_offset]
 
     if self._debug:
       if format_type not in (self._FORMAT_TYPE_8, self._FORMAT_TYPE_10):
@@ -425,27 +656,24 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
 
         raise errors.ParseError('Unsupported cache entry signature')
 
-    cached_entry_object = AppCompatCacheCachedEntry()
+    cached_entry_object = AppCompatCacheCachedEntry(value_data=value_data)
 
     data_offset = 0
     data_size = 0
+    last_modification_time = None
 
     if format_type == self._FORMAT_TYPE_XP:
       if self._debug:
         self._DebugPrintCachedEntryXP(cached_entry)
 
-      # TODO: have dtFabric handle string conversion.
-      string_size = 0
-      for string_index in range(0, 528, 2):
-        if (cached_entry.path[string_index] == 0 and
-            cached_entry.path[string_index + 1] == 0):
-          break
-        string_size += 2
+      string_size = self._GetUTF16StringSize(
+          value_data, offset=cached_entry_offset,
+          maximum_size=self._CACHED_ENTRY_XP_32BIT_PATH_SIZE)
 
       last_modification_time = cached_entry.last_modification_time
-      path = bytearray(cached_entry.path[0:string_size]).decode('utf-16-le')
 
       cached_entry_object.last_update_time = cached_entry.last_update_time
+      cached_entry_object.SetPath(cached_entry_offset, string_size)
 
     elif format_type in (
         self._FORMAT_TYPE_2003, self._FORMAT_TYPE_VISTA, self._FORMAT_TYPE_7):
@@ -459,21 +687,18 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
         cached_entry_object.shim_flags = cached_entry.shim_flags
 
       path_size = cached_entry.path_size
-      maximum_path_size = cached_entry.maximum_path_size
       path_offset = cached_entry.path_offset
 
       if path_offset > 0 and path_size > 0:
-        path_size += path_offset
-        maximum_path_size += path_offset
+        cached_entry_object.SetPath(path_offset, path_size)
 
         if self._debug:
+          maximum_path_size = cached_entry.maximum_path_size
           self._DebugPrintData(
-              'Path data', value_data[path_offset:maximum_path_size])
-
-        path = value_data[path_offset:path_size].decode('utf-16-le')
+              'Path data',
+              value_data[path_offset:path_offset + maximum_path_size])
 
-        if self._debug:
-          self._DebugPrintValue('Path', path)
+          self._DebugPrintValue('Path', cached_entry_object.path)
 
       if format_type == self._FORMAT_TYPE_7:
         data_offset = cached_entry.data_offset
@@ -484,7 +709,7 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
       cached_entry_size = 12 + cached_entry_data_size
       cached_entry_end_offset = cached_entry_offset + cached_entry_size
 
-      cached_entry_data = value_data[
+      cached_entry_data = value_data_view[
           cached_entry_offset:cached_entry_end_offset]
 
       if self._debug:
@@ -503,10 +728,12 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
       data_type_map = self._GetDataTypeMap(data_type_map_name)
       context = dtfabric_data_maps.DataTypeMapContext()
 
+      # Note that dtFabric requires bytes to map the path string.
       try:
         cached_entry_body = self._ReadStructureFromByteStream(
-            cached_entry_data[12:], cached_entry_offset + 12,
-            data_type_map, 'cached entry body', context=context)
+            value_data[cached_entry_offset + 12:cached_entry_end_offset],
+            cached_entry_offset + 12, data_type_map, 'cached entry body',
+            context=context)
       except (ValueError, errors.ParseError) as exception:
         raise errors.ParseError(
             f'Unable to parse cached entry body with error: {exception!s}')
@@ -515,7 +742,11 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
         self._DebugPrintCachedEntry8(cached_entry, cached_entry_body)
 
       last_modification_time = cached_entry_body.last_modification_time
-      path = cached_entry_body.path
+
+      # The path follows the 12-byte cached entry header and the 16-bit path
+      # size.
+      cached_entry_object.SetPath(
+          cached_entry_offset + 14, cached_entry_body.path_size)
 
       if format_type == self._FORMAT_TYPE_8:
         cached_entry_object.insertion_flags = cached_entry_body.insertion_flags
@@ -530,16 +761,91 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
     cached_entry_object.cached_entry_size = cached_entry_size
     cached_entry_object.file_size = getattr(cached_entry, 'file_size', None)
     cached_entry_object.last_modification_time = last_modification_time
-    cached_entry_object.path = path
 
     if data_size > 0:
-      cached_entry_object.data = value_data[data_offset:data_offset + data_size]
+      cached_entry_object.SetData(data_offset, data_size)
 
       if self._debug:
         self._DebugPrintData('Data', cached_entry_object.data)
 
     return cached_entry_object
 
+  def ParseCachedEntries(self, format_type, value_data, cache_header):
+    """Parses all the cached entries.
+
+    Cached entries of the Windows XP, 2003, Vista and 7 formats have a fixed
+    size and are decoded in a single pass, unless debug information should
+    be written. Other cached entries are parsed one by one.
+
+    Args:
+      format_type (int): format type.
+      value_data (bytes): value data.
+      cache_header (AppCompatCacheHeader): header.
+
+    Returns:
+      list[AppCompatCacheCachedEntry]: cached entries.
+
+    Raises:
+      ParseError: if the value data could not be parsed.
+    """
+    value_data_size = len(value_data)
+    number_of_cached_entries = cache_header.number_of_cached_entries or 0
+
+    cached_entries = []
+    if format_type in self._FIXED_SIZE_FORMAT_TYPES and not self._debug:
+      cached_entries = self._ParseFixedSizeCachedEntries(
+          format_type, value_data, cache_header.header_size,
+          number_of_cached_entries) or []
+
+    cached_entry_offset = cache_header.header_size
+    for cached_entry in cached_entries:
+      cached_entry_offset += cached_entry.cached_entry_size
+
+    cached_entry_index = len(cached_entries)
+
+    # Parse the remaining cached entries, such as a truncated cached entry,
+    # one by one.
+    while cached_entry_offset < value_data_size:
+      if (number_of_cached_entries != 0 and
+          cached_entry_index >= number_of_cached_entries):
+        break
+
+      cached_entry = self.ParseCachedEntry(
+          format_type, value_data, cached_entry_index, cached_entry_offset)
+
+      cached_entries.append(cached_entry)
+
+      cached_entry_offset += cached_entry.cached_entry_size
+      cached_entry_index += 1
+
+    return cached_entries
+
+  def ParseValueData(self, value_data):
+    """Parses the cached entries of Application Compatibility Cache value data.
+
+    Args:
+      value_data (bytes): value data.
+
+    Returns:
+      list[AppCompatCacheCachedEntry]: cached entries or None if the format of
+          the value data is not supported.
+
+    Raises:
+      ParseError: if the value data could not be parsed.
+    """
+    format_type = self.CheckSignature(value_data)
+    if not format_type:
+      return None
+
+    cache_header = self.ParseHeader(format_type, value_data)
+
+    # On Windows Vista and 2008 when the cache is empty it will
+    # only consist of the header.
+    if len(value_data) <= cache_header.header_size:
+      return []
+
+    return self.ParseCachedEntries(format_type, value_data, cache_header)
+
   def ParseHeader(self, format_type, value_data):
     """Parses the header.
 
@@ -616,9 +922,30 @@ class AppCompatCacheDataParser(data_format.BinaryDataFormat):
     return cache_header
 
 
+def _ParseValueData(value_data):
+  """Parses Application Compatibility Cache value data in a worker process.
+
+  Args:
+    value_data (bytes): value data.
+
+  Returns:
+    list[AppCompatCacheCachedEntry]: cached entries or None if the format of
+        the value data is not supported.
+
+  Raises:
+    ParseError: if the value data could not be parsed.
+  """
+  parser = AppCompatCacheDataParser()
+  return parser.ParseValueData(value_data)
+
+
 class AppCompatCacheCollector(interface.WindowsRegistryKeyCollector):
   """Application Compatibility Cache collector.
 
+  Application Compatibility Cache values that are identical in multiple
+  control sets are parsed only once. Their cached entries are collected once
+  and tagged with the names of all the control sets that contain the value.
+
   Attributes:
     cached_entries (list[AppCompatCacheCachedEntry]): cached entries.
   """
@@ -631,66 +958,171 @@ class AppCompatCacheCollector(interface.WindowsRegistryKeyCollector):
       output_writer (Optional[OutputWriter]): output writer.
     """
     super(AppCompatCacheCollector, self).__init__(debug=debug)
+    self._cached_entries_per_digest = {}
     self._parser = AppCompatCacheDataParser(
         debug=self._debug, output_writer=output_writer)
     self._output_writer = output_writer
     self.cached_entries = []
 
-  def _CollectAppCompatCacheFromKey(self, app_compat_cache_key):
+  def _AddCachedEntries(self, digest, control_set, cached_entries):
+    """Adds the cached entries of Application Compatibility Cache value data.
+
+    Args:
+      digest (bytes): SHA-256 digest of the value data.
+      control_set (str): name of the control set that contains the value data.
+      cached_entries (list[AppCompatCacheCachedEntry]): cached entries.
+    """
+    self._cached_entries_per_digest[digest] = cached_entries
+
+    for cached_entry in cached_entries:
+      if control_set:
+        cached_entry.control_sets.append(control_set)
+
+    self.cached_entries.extend(cached_entries)
+
+  def _CollectAppCompatCacheFromKey(
+      self, app_compat_cache_key, control_set=None):
     """Collects Application Compatibility Cache from a Windows Registry key.
 
     Args:
       app_compat_cache_key (dfwinreg.WinRegistryKey): Application Compatibility
           Cache Windows Registry key.
+      control_set (Optional[str]): name of the control set that contains
+          the key, where None represents the control set is determined from
+          the key path.
 
     Returns:
       bool: True if the Application Compatibility Cache key was found,
           False if not.
     """
+    if not control_set:
+      control_set = self._GetControlSetName(app_compat_cache_key.path)
+
+    value_data = self._GetAppCompatCacheValueData(app_compat_cache_key)
+    if value_data is None:
+      return True
+
+    digest = hashlib.sha256(value_data).digest()
+    if self._TagDuplicateCachedEntries(digest, control_set):
+      return True
+
+    cached_entries = self._parser.ParseValueData(value_data)
+    if cached_entries is None:
+      logging.warning('Unsupported signature.')
+      self._cached_entries_per_digest[digest] = []
+      return True
+
+    self._AddCachedEntries(digest, control_set, cached_entries)
+
+    return True
+
+  def _CollectAppCompatCacheFromKeysInParallel(
+      self, app_compat_cache_keys, number_of_workers):
+    """Collects Application Compatibility Cache from Windows Registry keys.
+
+    The value data is read from the Windows Registry sequentially, since
+    dfWinReg does not support concurrent access, after which the distinct
+    value data is parsed by a pool of worker processes. The cached entries are
+    collected in the order of the keys.
+
+    Args:
+      app_compat_cache_keys (list[tuple[str, dfwinreg.WinRegistryKey]]): name
+          of the control set and corresponding Application Compatibility Cache
+          Windows Registry key.
+      number_of_workers (int): number of worker processes.
+    """
+    value_data_per_digest = {}
+    digests_and_control_sets = []
+    for control_set, app_compat_cache_key in app_compat_cache_keys:
+      value_data = self._GetAppCompatCacheValueData(app_compat_cache_key)
+      if value_data is not None:
+        digest = hashlib.sha256(value_data).digest()
+        if digest not in self._cached_entries_per_digest:
+          value_data_per_digest.setdefault(digest, value_data)
+
+        digests_and_control_sets.append((digest, control_set))
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=number_of_workers) as executor:
+      cached_entries_per_digest = dict(zip(
+          value_data_per_digest.keys(),
+          executor.map(_ParseValueData, value_data_per_digest.values())))
+
+    for digest, control_set in digests_and_control_sets:
+      if self._TagDuplicateCachedEntries(digest, control_set):
+        continue
+
+      cached_entries = cached_entries_per_digest[digest]
+      if cached_entries is None:
+        logging.warning('Unsupported signature.')
+        self._cached_entries_per_digest[digest] = []
+        continue
+
+      self._AddCachedEntries(digest, control_set, cached_entries)
+
+  def _GetAppCompatCacheValueData(self, app_compat_cache_key):
+    """Retrieves the AppCompatCache value data from a Windows Registry key.
+
+    Args:
+      app_compat_cache_key (dfwinreg.WinRegistryKey): Application Compatibility
+          Cache Windows Registry key.
+
+    Returns:
+      bytes: value data or None if not available.
+    """
     value = app_compat_cache_key.GetValueByName('AppCompatCache')
     if not value:
       logging.warning(
           f'Missing AppCompatCache value in key: {app_compat_cache_key.path:s}')
-      return True
+      return None
 
     value_data = value.data
-    value_data_size = len(value.data)
 
     # TODO: add non debug output
     if self._debug:
       self._output_writer.WriteDebugData('Value data:\n', value_data)
 
-    format_type = self._parser.CheckSignature(value_data)
-    if not format_type:
-      logging.warning('Unsupported signature.')
-      return True
+    return value_data
 
-    cache_header = self._parser.ParseHeader(format_type, value_data)
+  def _GetControlSetName(self, key_path):
+    """Retrieves the name of the control set from a key path.
 
-    # On Windows Vista and 2008 when the cache is empty it will
-    # only consist of the header.
-    if value_data_size <= cache_header.header_size:
-      return True
+    Args:
+      key_path (str): key path.
 
-    cached_entry_offset = cache_header.header_size
-    cached_entry_index = 0
+    Returns:
+      str: name of the control set or None if not available.
+    """
+    for key_path_segment in key_path.split('\\'):
+      key_path_segment_upper = key_path_segment.upper()
+      if (key_path_segment_upper == 'CURRENTCONTROLSET' or
+          key_path_segment_upper.startswith('CONTROLSET')):
+        return key_path_segment
 
-    while cached_entry_offset < value_data_size:
-      cached_entry = self._parser.ParseCachedEntry(
-          format_type, value_data, cached_entry_index, cached_entry_offset)
+    return None
 
-      self.cached_entries.append(cached_entry)
+  def _TagDuplicateCachedEntries(self, digest, control_set):
+    """Tags previously collected cached entries with a control set.
 
-      cached_entry_offset += cached_entry.cached_entry_size
-      cached_entry_index += 1
+    Args:
+      digest (bytes): SHA-256 digest of the value data.
+      control_set (str): name of the control set that contains the value data.
 
-      if (cache_header.number_of_cached_entries != 0 and
-          cached_entry_index >= cache_header.number_of_cached_entries):
-        break
+    Returns:
+      bool: True if cached entries of identical value data were previously
+          collected, False if not.
+    """
+    cached_entries = self._cached_entries_per_digest.get(digest, None)
+    if cached_entries is None:
+      return False
+
+    for cached_entry in cached_entries:
+      if control_set and control_set not in cached_entry.control_sets:
+        cached_entry.control_sets.append(control_set)
 
     return True
 
-  def Collect(self, registry, all_control_sets=False):
+  def Collect(self, registry, all_control_sets=False, number_of_workers=1):
     """Collects the Application Compatibility Cache.
 
     Args:
@@ -698,11 +1130,18 @@ class AppCompatCacheCollector(interface.WindowsRegistryKeyCollector):
       all_control_sets (Optional[bool]): True if the services should be
           collected from all control sets instead of only the current control
           set.
+      number_of_workers (Optional[int]): number of worker processes used to
+          parse the Application Compatibility Cache values of all control sets,
+          where 1 represents the values are parsed in the current process.
+          Worker processes are not used in debug mode.
 
     Returns:
       bool: True if the Application Compatibility Cache key was found,
           False if not.
     """
+    # Cached entries are only deduplicated within a single collection.
+    self._cached_entries_per_digest = {}
+
     result = False
 
     if all_control_sets:
@@ -710,21 +1149,35 @@ class AppCompatCacheCollector(interface.WindowsRegistryKeyCollector):
       if not system_key:
         return result
 
+      app_compat_cache_keys = []
       for control_set_key in system_key.GetSubkeys():
         if control_set_key.name.startswith('ControlSet'):
           # Windows XP
           app_compat_cache_key = control_set_key.GetSubkeyByPath(
               'Control\\Session Manager\\AppCompatibility')
           if app_compat_cache_key:
-            if self._CollectAppCompatCacheFromKey(app_compat_cache_key):
-              result = True
+            app_compat_cache_keys.append(
+                (control_set_key.name, app_compat_cache_key))
 
           # Windows 2003 and later
           app_compat_cache_key = control_set_key.GetSubkeyByPath(
               'Control\\Session Manager\\AppCompatCache')
           if app_compat_cache_key:
-            if self._CollectAppCompatCacheFromKey(app_compat_cache_key):
-              result = True
+            app_compat_cache_keys.append(
+                (control_set_key.name, app_compat_cache_key))
+
+      if app_compat_cache_keys:
+        result = True
+
+      if number_of_workers > 1 and not self._debug:
+        self._CollectAppCompatCacheFromKeysInParallel(
+            app_compat_cache_keys, number_of_workers)
+
+      else:
+        for control_set, app_compat_cache_key in app_compat_cache_keys:
+          self._CollectAppCompatCacheFromKey(
+              app_compat_cache_key, control_set=control_set)
+
     else:
       # Windows XP
       key_path = (
@@ -754,4 +1207,35 @@ class AppCompatCacheCollector(interface.WindowsRegistryKeyCollector):
         if self._CollectAppCompatCacheFromKey(app_compat_cache_key):
           result = True
 
+    self._cached_entries_per_digest = {}
+
     return result
+
+  def SubscribeToWalker(self, walker, all_control_sets=False):
+    """Subscribes to the Application Compatibility Cache keys of a key walker.
+
+    The cached entries are collected when the walker walks the Windows
+    Registry.
+
+    Args:
+      walker (WindowsRegistryKeyWalker): Windows Registry key walker.
+      all_control_sets (Optional[bool]): True if the cached entries should be
+          collected from all control sets instead of only the current control
+          set.
+    """
+    self._cached_entries_per_digest = {}
+
+    if all_control_sets:
+      control_set_key_path = 'HKEY_LOCAL_MACHINE\\System\\ControlSet*'
+    else:
+      control_set_key_path = 'HKEY_LOCAL_MACHINE\\System\\CurrentControlSet'
+
+    # Windows XP
+    walker.AddSubscription(
+        f'{control_set_key_path:s}\\Control\\Session Manager\\'
+        f'AppCompatibility', self._CollectAppCompatCacheFromKey)
+
+    # Windows 2003 and later
+    walker.AddSubscription(
+        f'{control_set_key_path:s}\\Control\\Session Manager\\AppCompatCache',
+        self._CollectAppCompatCacheFromKey)
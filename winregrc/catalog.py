@@ -1,7 +1,26 @@
 # -*- coding: utf-8 -*-
 """Catalog collector."""
 
+import collections
+import concurrent.futures
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import multiprocessing.util
+import os
+import random
 import re
+import sqlite3
+import tempfile
+
+from dfwinreg import creg as dfwinreg_creg
+from dfwinreg import regf as dfwinreg_regf
+from dfwinreg import registry as dfwinreg_registry
+
+from winregrc import errors
+from winregrc import versions
 
 
 class CatalogKeyDescriptor(object):
@@ -11,7 +30,11 @@ class CatalogKeyDescriptor(object):
     grouped_key_paths (list[str]): paths of Windows Registry keys with similar
         values.
     key_path (str): path of Windows Registry key.
-    value_descriptors (tuple[str,str]): pairs of value name and data type.
+    value_descriptors (tuple[str,str]): pairs of value name and data type,
+        sorted alphanumerically by value name.
+    values_digest (str): hexadecimal BLAKE2b digest of the value descriptors,
+        which identifies the group of keys with similar values, or None if
+        keys are not grouped.
   """
 
   def __init__(self):
@@ -20,29 +43,532 @@ class CatalogKeyDescriptor(object):
     self.grouped_key_paths = []
     self.key_path = None
     self.value_descriptors = []
+    self.values_digest = None
+
+
+class CatalogSamplingStatistics(object):
+  """Catalog sampling statistics.
+
+  Attributes:
+    estimated_number_of_keys (float): estimated number of keys in the
+        Windows Registry file, where every collected key of a sample counts
+        for the keys it was sampled from.
+    number_of_keys (int): number of collected keys.
+    number_of_sampled_keys (int): number of keys with more subkeys than the
+        maximum fanout, of which the subkeys were sampled.
+    number_of_value_signatures (int): number of distinct value signatures,
+        the names and data types of the values of a key, seen in the
+        collected keys.
+  """
+
+  def __init__(self):
+    """Initializes catalog sampling statistics."""
+    super(CatalogSamplingStatistics, self).__init__()
+    self.estimated_number_of_keys = 0.0
+    self.number_of_keys = 0
+    self.number_of_sampled_keys = 0
+    self.number_of_value_signatures = 0
+
+  @property
+  def sampled_fraction(self):
+    """float: estimated fraction of the keys that was collected."""
+    if not self.estimated_number_of_keys:
+      return 1.0
+
+    return self.number_of_keys / self.estimated_number_of_keys
+
+
+class CatalogValueDescriptor(object):
+  """Catalog value descriptor.
+
+  Attributes:
+    data_type (str): data type of the value.
+    name (str): name of the value.
+    windows_versions (list[str]): Windows versions the value was seen in.
+  """
+
+  def __init__(self, name, data_type):
+    """Initializes a catalog value descriptor.
+
+    Args:
+      name (str): name of the value.
+      data_type (str): data type of the value.
+    """
+    super(CatalogValueDescriptor, self).__init__()
+    self.data_type = data_type
+    self.name = name
+    self.windows_versions = []
+
+
+class MergedCatalogKeyDescriptor(object):
+  """Catalog key descriptor merged from multiple Windows Registry files.
+
+  Attributes:
+    key_path (str): path of Windows Registry key.
+    value_descriptors (list[CatalogValueDescriptor]): value descriptors,
+        sorted alphanumerically by value name.
+    windows_versions (list[str]): Windows versions the key was seen in.
+  """
+
+  def __init__(self):
+    """Initializes a merged catalog key descriptor."""
+    super(MergedCatalogKeyDescriptor, self).__init__()
+    self.key_path = None
+    self.value_descriptors = []
+    self.windows_versions = []
+
+
+def OpenWindowsRegistryFile(file_object):
+  """Opens a Windows REGF or CREG Registry file.
+
+  Args:
+    file_object (file): file-like object of the Windows Registry file.
+
+  Returns:
+    dfwinreg.WinRegistryFile: Windows Registry file or None if the file
+        could not be opened.
+  """
+  try:
+    registry_file = dfwinreg_regf.REGFWinRegistryFile()
+
+    registry_file.Open(file_object)
+  except IOError:
+    registry_file = None
+
+  if not registry_file:
+    try:
+      registry_file = dfwinreg_creg.CREGWinRegistryFile()
+
+      registry_file.Open(file_object)
+    except IOError:
+      registry_file = None
+
+  return registry_file
+
+
+# Windows Registry file of a worker process and the path of the file or None
+# if the file could not be opened.
+_worker_registry_file = None
+_worker_registry_file_path = None
+
+
+def _CloseWorker(registry_file, file_object):
+  """Closes the Windows Registry file of a worker process.
+
+  Args:
+    registry_file (dfwinreg.WinRegistryFile): Windows Registry file or None
+        if the file could not be opened.
+    file_object (file): file-like object of the Windows Registry file.
+  """
+  if registry_file:
+    registry_file.Close()
+
+  file_object.close()
+
+
+def _CollectCatalogKeyDescriptorsFromSubtrees(
+    parent_key_path, first_subkey_index, last_subkey_index,
+    maximum_number_of_key_descriptors):
+  """Collects the catalog key descriptors of subtrees in a worker process.
+
+  At most the maximum number of catalog key descriptors are collected, such
+  that the results returned by a worker process are bounded in size. The
+  subtrees that were not, or only partially, collected are returned as
+  continuations, which are collected by subsequent calls.
+
+  Args:
+    parent_key_path (str): path of the parent key of the subtrees.
+    first_subkey_index (int): index of the subkey of the parent key that is
+        the root of the first subtree.
+    last_subkey_index (int): index of the subkey of the parent key after
+        the root of the last subtree.
+    maximum_number_of_key_descriptors (int): maximum number of catalog key
+        descriptors to collect.
+
+  Returns:
+    tuple[list[CatalogKeyDescriptor], list[tuple[str, int, int]]]: catalog
+        key descriptors and continuations, which consist of the path of
+        the parent key and the index of the first and after the last subkey,
+        in depth-first order.
+
+  Raises:
+    Error: if the Windows Registry file or the parent key cannot be opened
+        by the worker process.
+  """
+  if not _worker_registry_file:
+    raise errors.Error(
+        f'Unable to open Windows Registry file: {_worker_registry_file_path!s}')
+
+  parent_key = _worker_registry_file.GetKeyByPath(parent_key_path)
+  if not parent_key:
+    raise errors.Error(f'Unable to retrieve key: {parent_key_path:s}')
+
+  collector_object = CatalogCollector()
+
+  key_descriptors = []
+  subkeys_stack = [[parent_key, first_subkey_index, last_subkey_index]]
+  while subkeys_stack:
+    registry_key, subkey_index, last_index = subkeys_stack[-1]
+    if subkey_index >= last_index:
+      subkeys_stack.pop()
+      continue
+
+    if len(key_descriptors) >= maximum_number_of_key_descriptors:
+      continuations = [
+          (registry_key.path, subkey_index, last_index)
+          for registry_key, subkey_index, last_index in reversed(
+              subkeys_stack)]
+      return key_descriptors, continuations
+
+    sub_key = registry_key.GetSubkeyByIndex(subkey_index)
+    subkeys_stack[-1][1] = subkey_index + 1
+
+    key_descriptors.append(
+        collector_object._GetCatalogKeyDescriptor(sub_key))  # pylint: disable=protected-access
+
+    subkeys_stack.append([sub_key, 0, sub_key.number_of_subkeys])
+
+  return key_descriptors, []
+
+
+def _InitializeWorker(path, key_path_prefix):
+  """Initializes a worker process.
+
+  The worker process opens its own handle on the Windows Registry file since
+  dfWinReg keys cannot be shared between processes. The file is opened once
+  per worker process instead of once per subtree and remains open until
+  the worker process exits. Note that atexit handlers are not run by a worker
+  process that was forked, hence the file is closed by a multiprocessing
+  finalizer.
+
+  The initializer does not raise if the file cannot be opened, since that
+  would break the process pool, instead the subtrees collected by the worker
+  process raise an error.
+
+  Args:
+    path (str): path of the Windows Registry file.
+    key_path_prefix (str): key path prefix of the Windows Registry file.
+  """
+  # pylint: disable=global-statement
+  global _worker_registry_file
+  global _worker_registry_file_path
+
+  _worker_registry_file_path = path
+
+  try:
+    file_object = open(path, 'rb')  # pylint: disable=consider-using-with
+  except OSError:
+    return
+
+  _worker_registry_file = OpenWindowsRegistryFile(file_object)
+  if _worker_registry_file:
+    _worker_registry_file.SetKeyPathPrefix(key_path_prefix)
+
+  multiprocessing.util.Finalize(
+      None, _CloseWorker, args=(_worker_registry_file, file_object),
+      exitpriority=0)
+
+
+def _WriteCatalogToDatabase(path, database_path):
+  """Writes the catalog of a Windows Registry file to a SQLite database.
+
+  The database contains a row per key and per value, sorted by upper case key
+  path, such that the catalogs of multiple Windows Registry files can be
+  merged without reading them into memory.
+
+  Args:
+    path (str): path of the Windows Registry file.
+    database_path (str): path of the SQLite database.
+
+  Returns:
+    bool: True if the catalog was written, False if the Windows Registry file
+        could not be opened.
+  """
+  try:
+    file_object = open(path, 'rb')  # pylint: disable=consider-using-with
+  except OSError:
+    return False
+
+  with file_object:
+    registry_file = OpenWindowsRegistryFile(file_object)
+    if not registry_file:
+      return False
+
+    try:
+      # Using dfWinReg to determine Windows native key paths if available.
+      registry = dfwinreg_registry.WinRegistry()
+
+      key_path_prefix = registry.GetRegistryFileMapping(registry_file)
+      registry_file.SetKeyPathPrefix(key_path_prefix)
+
+      collector_object = CatalogCollector()
+      key_descriptors = collector_object.Collect(registry_file.GetRootKey())
+
+      connection = sqlite3.connect(database_path)
+
+      try:
+        connection.execute((
+            'CREATE TABLE catalog (key_path_upper TEXT, key_path TEXT, '
+            'value_name TEXT, data_type TEXT)'))
+
+        with connection:
+          while True:
+            rows = []
+            for key_descriptor in itertools.islice(key_descriptors, 1024):
+              key_path_upper = key_descriptor.key_path.upper()
+              rows.append((key_path_upper, key_descriptor.key_path, None, None))
+              for value_name, data_type in key_descriptor.value_descriptors:
+                rows.append((key_path_upper, None, value_name, data_type))
+
+            if not rows:
+              break
+
+            connection.executemany(
+                'INSERT INTO catalog VALUES (?, ?, ?, ?)', rows)
+
+          connection.execute(
+              'CREATE INDEX catalog_index ON catalog (key_path_upper)')
+
+      finally:
+        connection.close()
+
+    finally:
+      registry_file.Close()
+
+  return True
 
 
 class CatalogCollector(object):
-  """Catalog collector."""
+  """Catalog collector.
 
-  def __init__(self, group_keys=False):
+  Attributes:
+    sampling_statistics (CatalogSamplingStatistics): sampling statistics of
+        the last collection, which are only maintained when a maximum fanout
+        is set.
+  """
+
+  # Maximum number of catalog key descriptors collected per batch by
+  # a worker process.
+  _MAXIMUM_BATCH_SIZE = 4096
+
+  _MAXIMUM_NUMBER_OF_CACHED_SORT_KEYS = 65536
+
+  _NUMBERS_RE = re.compile('([0-9]+)')
+
+  def __init__(
+      self, group_keys=False, maximum_fanout=None, number_of_workers=1,
+      out_of_core=False, random_seed=None, temporary_directory=None):
     """Initializes a catalog collector.
 
     Args:
       group_keys (bool): group keys with similar values.
+      maximum_fanout (Optional[int]): maximum number of subkeys collected per
+          key, where the subkeys of a key with more subkeys are sampled, or
+          None to collect all subkeys. Sampling keys collects the keys in
+          the current process.
+      number_of_workers (Optional[int]): number of worker processes that
+          collect the subtrees of the subkeys of the root key, where 1
+          represents the keys are collected in the current process.
+      out_of_core (Optional[bool]): True if the groups of keys with similar
+          values should be stored in a temporary SQLite database instead of
+          in memory.
+      random_seed (Optional[int]): seed of the random number generator used
+          to sample subkeys, where None represents a seed from the operating
+          system.
+      temporary_directory (Optional[str]): path of the directory to store
+          the temporary SQLite database, where None represents the default
+          temporary directory.
     """
     super(CatalogCollector, self).__init__()
     self._group_keys = group_keys
+    self._maximum_batch_size = self._MAXIMUM_BATCH_SIZE
+    self._maximum_fanout = maximum_fanout
+    self._number_of_workers = number_of_workers
+    self._out_of_core = out_of_core
+    self._random = random.Random(random_seed)
+    self._sort_keys_per_value_name = {}
+    self._temporary_directory = temporary_directory
+
+    self.sampling_statistics = None
 
   def _CollectCatalogKeyDescriptors(self, registry_key):
     """Collects the catalog key descriptors from a Windows Registry key.
 
+    The keys are traversed depth-first, in the same order as a recursive
+    traversal, with an explicit stack of subkey iterators.
+
+    Args:
+      registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+
+    Yields:
+      CatalogKeyDescriptor: catalog key descriptor.
+    """
+    yield self._GetCatalogKeyDescriptor(registry_key)
+
+    subkeys_stack = [iter(registry_key.GetSubkeys())]
+    while subkeys_stack:
+      sub_key = next(subkeys_stack[-1], None)
+      if sub_key is None:
+        subkeys_stack.pop()
+        continue
+
+      yield self._GetCatalogKeyDescriptor(sub_key)
+
+      subkeys_stack.append(iter(sub_key.GetSubkeys()))
+
+  def _CollectCatalogKeyDescriptorsWithSampling(self, registry_key):
+    """Collects the catalog key descriptors from a Windows Registry key.
+
+    The keys are traversed like _CollectCatalogKeyDescriptors but of keys
+    with more subkeys than the maximum fanout only a sample of the subkeys
+    is traversed.
+
     Args:
       registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
 
     Yields:
       CatalogKeyDescriptor: catalog key descriptor.
     """
+    values_digests = set()
+
+    self.sampling_statistics = CatalogSamplingStatistics()
+
+    # Every key on the stack has the weight of the number of keys it
+    # represents, which is the inverse of the probability it was sampled.
+    subkeys_stack = [(iter([registry_key]), 1.0)]
+    while subkeys_stack:
+      sub_key = next(subkeys_stack[-1][0], None)
+      if sub_key is None:
+        subkeys_stack.pop()
+        continue
+
+      weight = subkeys_stack[-1][1]
+
+      key_descriptor = self._GetCatalogKeyDescriptor(sub_key)
+
+      values_digest, _ = self._GetValuesDigest(
+          key_descriptor.value_descriptors)
+      values_digests.add(values_digest)
+
+      self.sampling_statistics.estimated_number_of_keys += weight
+      self.sampling_statistics.number_of_keys += 1
+      self.sampling_statistics.number_of_value_signatures = len(
+          values_digests)
+
+      yield key_descriptor
+
+      number_of_subkeys = sub_key.number_of_subkeys
+      if number_of_subkeys <= self._maximum_fanout:
+        subkeys_stack.append((iter(sub_key.GetSubkeys()), weight))
+      else:
+        self.sampling_statistics.number_of_sampled_keys += 1
+
+        weight *= number_of_subkeys / self._maximum_fanout
+        subkeys_stack.append((self._SampleSubkeys(sub_key), weight))
+
+  def _CollectCatalogKeyDescriptorsInParallel(self, root_key, path):
+    """Collects the catalog key descriptors with worker processes.
+
+    The subtree of every subkey of the root key is collected by worker
+    processes, in batches of at most the maximum batch size catalog key
+    descriptors. A worker process returns the remainder of a subtree that
+    exceeds the batch size as continuations, which are collected by
+    subsequent batches. The catalog key descriptors are yielded in the order
+    of a depth-first traversal, once the corresponding batch has finished.
+
+    To bound the memory used, at most twice the number of workers batches
+    are collected ahead of the batch of which the key descriptors are
+    yielded.
+
+    If the worker processes cannot open the Windows Registry file, the keys
+    are collected in the current process instead.
+
+    Args:
+      root_key (dfwinreg.WinRegistryKey): root Windows Registry key.
+      path (str): path of the Windows Registry file.
+
+    Yields:
+      CatalogKeyDescriptor: catalog key descriptor.
+
+    Raises:
+      Error: if a worker process fails after key descriptors collected by
+          the worker processes were yielded.
+    """
+    yield self._GetCatalogKeyDescriptor(root_key)
+
+    number_of_subkeys = root_key.number_of_subkeys
+    if not number_of_subkeys:
+      return
+
+    # The path of the root key of a Windows Registry file without key path
+    # prefix is "\\".
+    key_path_prefix = root_key.path.rstrip('\\')
+
+    maximum_number_of_pending = self._number_of_workers * 2
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=self._number_of_workers, initializer=_InitializeWorker,
+        initargs=(path, key_path_prefix)) as executor:
+      # Batches in depth-first order, as a list of the arguments and
+      # the future of the batch, which is None if not yet submitted.
+      batches = collections.deque(
+          [(root_key.path, subkey_index, subkey_index + 1), None]
+          for subkey_index in range(number_of_subkeys))
+
+      collect_in_current_process = False
+      is_first_batch = True
+      number_of_pending = 0
+      while batches:
+        for batch in itertools.islice(batches, maximum_number_of_pending):
+          if batch[1] is None and (
+              batch is batches[0] or
+              number_of_pending < maximum_number_of_pending):
+            batch[1] = executor.submit(
+                _CollectCatalogKeyDescriptorsFromSubtrees, *batch[0],
+                self._maximum_batch_size)
+            number_of_pending += 1
+
+        _, future = batches.popleft()
+        try:
+          key_descriptors, continuations = future.result()
+        except errors.Error as exception:
+          if not is_first_batch:
+            raise
+
+          logging.warning((
+              f'Unable to collect keys with worker processes with error: '
+              f'{exception!s}, collecting keys in the current process.'))
+
+          for _, pending_future in batches:
+            if pending_future:
+              pending_future.cancel()
+
+          collect_in_current_process = True
+          break
+
+        is_first_batch = False
+        number_of_pending -= 1
+
+        batches.extendleft(
+            [continuation, None] for continuation in reversed(continuations))
+
+        yield from key_descriptors
+
+    if collect_in_current_process:
+      # Skip the catalog key descriptor of the root key, which was yielded
+      # already.
+      yield from itertools.islice(
+          self._CollectCatalogKeyDescriptors(root_key), 1, None)
+
+  def _GetCatalogKeyDescriptor(self, registry_key):
+    """Retrieves the catalog key descriptor of a Windows Registry key.
+
+    Args:
+      registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+
+    Returns:
+      CatalogKeyDescriptor: catalog key descriptor.
+    """
     key_descriptor = CatalogKeyDescriptor()
     key_descriptor.key_path = registry_key.path
 
@@ -51,42 +577,344 @@ class CatalogCollector(object):
           registry_value.name or '(default)', registry_value.data_type_string)
       key_descriptor.value_descriptors.append(value_descriptor)
 
-    yield key_descriptor
+    if len(key_descriptor.value_descriptors) > 1:
+      key_descriptor.value_descriptors.sort(key=self._GetValueDescriptorSortKey)
+
+    return key_descriptor
+
+  def _GetValueDescriptorSortKey(self, value_descriptor):
+    """Retrieves the alphanumeric sort key of a value descriptor.
+
+    The sort key consists of the lower case text and the numbers in the value
+    name, such that "Value2" sorts before "Value10". Sort keys are cached per
+    value name since value names recur in many keys.
+
+    Args:
+      value_descriptor (tuple[str, str]): pair of value name and data type.
+
+    Returns:
+      tuple[object]: sort key.
+    """
+    value_name = value_descriptor[0]
+
+    sort_key = self._sort_keys_per_value_name.get(value_name, None)
+    if sort_key is None:
+      if (len(self._sort_keys_per_value_name) >=
+          self._MAXIMUM_NUMBER_OF_CACHED_SORT_KEYS):
+        self._sort_keys_per_value_name = {}
+
+      # The split results alternate between text and numbers.
+      sort_key = tuple(
+          int(text, 10) if index % 2 else text.lower()
+          for index, text in enumerate(self._NUMBERS_RE.split(value_name)))
+
+      self._sort_keys_per_value_name[value_name] = sort_key
+
+    return sort_key
+
+  def _SampleSubkeys(self, registry_key):
+    """Samples the subkeys of a Windows Registry key.
+
+    The subkey indexes are sampled with reservoir sampling, such that only
+    the sampled subkeys are read from the Windows Registry file.
+
+    Args:
+      registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+
+    Yields:
+      dfwinreg.WinRegistryKey: maximum fanout number of subkeys, sampled
+          uniformly without replacement, in the order of the subkeys.
+    """
+    reservoir = list(range(self._maximum_fanout))
+    for subkey_index in range(
+        self._maximum_fanout, registry_key.number_of_subkeys):
+      reservoir_index = self._random.randint(0, subkey_index)
+      if reservoir_index < self._maximum_fanout:
+        reservoir[reservoir_index] = subkey_index
+
+    for subkey_index in sorted(reservoir):
+      yield registry_key.GetSubkeyByIndex(subkey_index)
+
+  def _GetValuesDigest(self, value_descriptors):
+    """Retrieves the digest of value descriptors.
+
+    The digest is calculated over the canonical UTF-8 encoded JSON
+    representation of the sorted value descriptors, which makes it stable
+    across runs and hosts.
+
+    Args:
+      value_descriptors (list[tuple[str, str]]): sorted pairs of value name
+          and data type.
+
+    Returns:
+      tuple[str, str]: hexadecimal BLAKE2b digest and JSON representation of
+          the value descriptors.
+    """
+    encoded_value_descriptors = json.dumps(
+        value_descriptors, ensure_ascii=False, separators=(',', ':'))
+
+    values_digest = hashlib.blake2b(
+        encoded_value_descriptors.encode('utf-8'), digest_size=16)
+
+    return values_digest.hexdigest(), encoded_value_descriptors
+
+  def _GroupKeyDescriptors(self, key_descriptors):
+    """Groups catalog key descriptors with similar values in memory.
+
+    Args:
+      key_descriptors (iterable[CatalogKeyDescriptor]): catalog key
+          descriptors.
+
+    Returns:
+      list[CatalogKeyDescriptor]: catalog key descriptor of every group,
+          in order of first occurrence.
+    """
+    key_descriptors_per_values_digest = {}
+
+    for key_descriptor in key_descriptors:
+      values_digest, _ = self._GetValuesDigest(
+          key_descriptor.value_descriptors)
+
+      matching_key_descriptor = key_descriptors_per_values_digest.get(
+          values_digest, None)
+      if matching_key_descriptor:
+        matching_key_descriptor.grouped_key_paths.append(
+            key_descriptor.key_path)
+      else:
+        key_descriptor.values_digest = values_digest
+        key_descriptors_per_values_digest[values_digest] = key_descriptor
+
+    return list(key_descriptors_per_values_digest.values())
+
+  def _GroupKeyDescriptorsOutOfCore(self, key_descriptors, database_path):
+    """Groups catalog key descriptors with similar values in SQLite.
+
+    Only the groups that are being yielded are kept in memory.
+
+    Args:
+      key_descriptors (iterable[CatalogKeyDescriptor]): catalog key
+          descriptors.
+      database_path (str): path of the SQLite database.
+
+    Yields:
+      CatalogKeyDescriptor: catalog key descriptor of every group, in order of
+          first occurrence.
+    """
+    connection = sqlite3.connect(database_path)
+
+    try:
+      connection.execute((
+          'CREATE TABLE key_groups (values_digest TEXT PRIMARY KEY, '
+          'key_path TEXT, value_descriptors TEXT)'))
+      connection.execute((
+          'CREATE TABLE grouped_key_paths (values_digest TEXT, '
+          'key_path TEXT)'))
+
+      with connection:
+        for key_descriptor in key_descriptors:
+          values_digest, encoded_value_descriptors = self._GetValuesDigest(
+              key_descriptor.value_descriptors)
+
+          cursor = connection.execute((
+              'INSERT OR IGNORE INTO key_groups VALUES (?, ?, ?)'), (
+                  values_digest, key_descriptor.key_path,
+                  encoded_value_descriptors))
+          if not cursor.rowcount:
+            connection.execute(
+                'INSERT INTO grouped_key_paths VALUES (?, ?)',
+                (values_digest, key_descriptor.key_path))
+
+        connection.execute((
+            'CREATE INDEX grouped_key_paths_index ON grouped_key_paths '
+            '(values_digest)'))
 
-    for sub_key in registry_key.GetSubkeys():
-      yield from self._CollectCatalogKeyDescriptors(sub_key)
+      groups_cursor = connection.execute(
+          'SELECT * FROM key_groups ORDER BY rowid')
+      for values_digest, key_path, encoded_value_descriptors in groups_cursor:
+        key_descriptor = CatalogKeyDescriptor()
+        key_descriptor.key_path = key_path
+        key_descriptor.values_digest = values_digest
+        key_descriptor.value_descriptors = [
+            tuple(value_descriptor)
+            for value_descriptor in json.loads(encoded_value_descriptors)]
 
-  def Collect(self, root_key):
+        key_paths_cursor = connection.execute((
+            'SELECT key_path FROM grouped_key_paths WHERE values_digest = ? '
+            'ORDER BY rowid'), (values_digest, ))
+        key_descriptor.grouped_key_paths = [
+            grouped_key_path for grouped_key_path, in key_paths_cursor]
+
+        yield key_descriptor
+
+    finally:
+      connection.close()
+
+  def Collect(self, root_key, path=None):
     """Collects the catalog descriptors from a Windows Registry file.
 
     Args:
       root_key (dfwinreg.WinRegistryKey): root Windows Registry key.
+      path (Optional[str]): path of the Windows Registry file, which is
+          required to collect the catalog descriptors with worker processes.
 
     Yields:
       CatalogKeyDescriptor: catalog key descriptor.
     """
+    if self._maximum_fanout is not None:
+      key_descriptors = self._CollectCatalogKeyDescriptorsWithSampling(
+          root_key)
+    elif self._number_of_workers > 1 and path:
+      key_descriptors = self._CollectCatalogKeyDescriptorsInParallel(
+          root_key, path)
+    else:
+      key_descriptors = self._CollectCatalogKeyDescriptors(root_key)
+
     if not self._group_keys:
-      yield from self._CollectCatalogKeyDescriptors(root_key)
+      yield from key_descriptors
+
+    elif not self._out_of_core:
+      yield from self._GroupKeyDescriptors(key_descriptors)
 
     else:
-      def AlphanumericCompare(key):
-        return (int(text) if text.isdigit() else text.lower()
-                for text in re.split('([0-9]+)', key[0]))
-
-      key_descriptors_per_value_hash = {}
-
-      for key_descriptor in self._CollectCatalogKeyDescriptors(root_key):
-        values_hash = hash('\n'.join([
-            '\t'.join([value_name, data_type_string])
-            for value_name, data_type_string in sorted(
-                key_descriptor.value_descriptors, key=AlphanumericCompare)]))
-
-        matching_key_descriptor = key_descriptors_per_value_hash.get(
-            values_hash, None)
-        if matching_key_descriptor:
-          matching_key_descriptor.grouped_key_paths.append(
-              key_descriptor.key_path)
+      with tempfile.TemporaryDirectory(
+          dir=self._temporary_directory) as temporary_directory:
+        database_path = os.path.join(temporary_directory, 'key_groups.db')
+        yield from self._GroupKeyDescriptorsOutOfCore(
+            key_descriptors, database_path)
+
+
+class CatalogMerger(object):
+  """Merges the catalogs of multiple Windows Registry files.
+
+  The Windows Registry files are cataloged in worker processes, which write
+  the catalog of every file to a temporary SQLite database. The catalogs are
+  then merged in order of upper case key path, so that memory use is bounded
+  by a single key.
+  """
+
+  def __init__(self, number_of_workers=1, temporary_directory=None):
+    """Initializes a catalog merger.
+
+    Args:
+      number_of_workers (Optional[int]): number of worker processes that
+          catalog the Windows Registry files.
+      temporary_directory (Optional[str]): path of the directory to store
+          the temporary SQLite databases, where None represents the default
+          temporary directory.
+    """
+    super(CatalogMerger, self).__init__()
+    self._collector = CatalogCollector()
+    self._number_of_workers = number_of_workers
+    self._temporary_directory = temporary_directory
+
+  def _GetRowsFromDatabase(self, database_path, windows_version):
+    """Retrieves the catalog rows from a SQLite database.
+
+    Args:
+      database_path (str): path of the SQLite database.
+      windows_version (str): Windows version of the catalog.
+
+    Yields:
+      tuple[str, str, str, str, str]: upper case key path, key path, value
+          name, data type and Windows version, where the key path is None
+          for a value row and the value name and data type are None for
+          a key row.
+    """
+    connection = sqlite3.connect(database_path)
+
+    try:
+      cursor = connection.execute((
+          'SELECT key_path_upper, key_path, value_name, data_type '
+          'FROM catalog ORDER BY key_path_upper, rowid'))
+      for key_path_upper, key_path, value_name, data_type in cursor:
+        yield key_path_upper, key_path, value_name, data_type, windows_version
+
+    finally:
+      connection.close()
+
+  def _MergeRows(self, rows):
+    """Merges the catalog rows of a key from multiple catalogs.
+
+    Args:
+      rows (iterable[tuple[str, str, str, str, str]]): upper case key path,
+          key path, value name, data type and Windows version.
+
+    Returns:
+      MergedCatalogKeyDescriptor: merged catalog key descriptor.
+    """
+    key_descriptor = MergedCatalogKeyDescriptor()
+    value_descriptors = {}
+
+    for _, key_path, value_name, data_type, windows_version in rows:
+      if key_path:
+        if not key_descriptor.key_path:
+          key_descriptor.key_path = key_path
+
+        windows_versions = key_descriptor.windows_versions
+
+      else:
+        value_descriptor = value_descriptors.get((value_name, data_type), None)
+        if not value_descriptor:
+          value_descriptor = CatalogValueDescriptor(value_name, data_type)
+          value_descriptors[(value_name, data_type)] = value_descriptor
+
+        windows_versions = value_descriptor.windows_versions
+
+      if windows_version and windows_version not in windows_versions:
+        windows_versions.append(windows_version)
+
+    key_descriptor.windows_versions.sort(
+        key=versions.WindowsVersions.KeyFunction)
+
+    for value_descriptor in value_descriptors.values():
+      value_descriptor.windows_versions.sort(
+          key=versions.WindowsVersions.KeyFunction)
+
+    key_descriptor.value_descriptors = sorted(
+        value_descriptors.values(), key=lambda value_descriptor: (
+            self._collector._GetValueDescriptorSortKey(  # pylint: disable=protected-access
+                (value_descriptor.name, value_descriptor.data_type)),
+            value_descriptor.data_type))
+
+    return key_descriptor
+
+  def Merge(self, source_definitions):
+    """Catalogs and merges Windows Registry files.
+
+    Args:
+      source_definitions (list[tuple[str, str]]): path of the Windows Registry
+          file and corresponding Windows version, where the Windows version
+          can be None.
+
+    Yields:
+      MergedCatalogKeyDescriptor: merged catalog key descriptor, in order of
+          upper case key path.
+    """
+    with tempfile.TemporaryDirectory(
+        dir=self._temporary_directory) as temporary_directory:
+      database_paths = [
+          os.path.join(temporary_directory, f'catalog{index:d}.db')
+          for index in range(len(source_definitions))]
+
+      paths = [path for path, _ in source_definitions]
+
+      if self._number_of_workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self._number_of_workers) as executor:
+          results = list(executor.map(
+              _WriteCatalogToDatabase, paths, database_paths))
+      else:
+        results = list(map(_WriteCatalogToDatabase, paths, database_paths))
+
+      rows_generators = []
+      for result, database_path, (path, windows_version) in zip(
+          results, database_paths, source_definitions):
+        if not result:
+          logging.warning(f'Unable to open Windows Registry file: {path:s}')
         else:
-          key_descriptors_per_value_hash[values_hash] = key_descriptor
+          rows_generators.append(self._GetRowsFromDatabase(
+              database_path, windows_version))
 
-      yield from key_descriptors_per_value_hash.values()
+      merged_rows = heapq.merge(*rows_generators, key=lambda row: row[0])
+      for _, rows in itertools.groupby(merged_rows, key=lambda row: row[0]):
+        yield self._MergeRows(rows)
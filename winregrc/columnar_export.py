@@ -0,0 +1,590 @@
+# -*- coding: utf-8 -*-
+"""Columnar export of records, such as the objects generated by collectors.
+
+Records are accumulated in typed column buffers and written per row group.
+When pyarrow is installed the row groups are written as record batches of
+an Apache Arrow IPC file or as row groups of a Parquet file, when the path
+ends with ".parquet". Otherwise the row groups are written as arrays of
+a NumPy .npz file.
+
+A NumPy .npz file contains per row group and column an array named
+"{column}.{row group}" and, if the column has rows without a value, a boolean
+array named "{column}.{row group}.validity". Binary data is stored as
+a hexadecimal string.
+"""
+
+import abc
+import array
+import json
+import sys
+import zipfile
+
+from dfdatetime import interface as dfdatetime_interface
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+try:
+  import pyarrow
+  from pyarrow import ipc as pyarrow_ipc
+  from pyarrow import parquet as pyarrow_parquet
+except ImportError:
+  pyarrow = None
+
+from winregrc import errors
+from winregrc import output_writers
+
+
+class ColumnBuffer(object):
+  """Column buffer.
+
+  Integer, floating-point and boolean values are stored in an array of
+  the corresponding type and strings are interned, since collector results
+  contain many recurring strings.
+
+  Attributes:
+    is_frozen (bool): True if the type of the values can no longer change,
+        since a row group was written.
+    name (str): name of the column.
+    validity (bytearray): per row 1 if the row has a value or 0 if not.
+    value_type (str): type of the values of the column or None if not
+        determined, since the column has no values.
+    values (array.array|list[object]): per row the value or a default value
+        if the row has no value.
+  """
+
+  VALUE_TYPE_BINARY = 'binary'
+  VALUE_TYPE_BOOLEAN = 'boolean'
+  VALUE_TYPE_FLOAT = 'float'
+  VALUE_TYPE_INTEGER = 'integer'
+  VALUE_TYPE_STRING = 'string'
+
+  _ARRAY_TYPECODES = {
+      VALUE_TYPE_BOOLEAN: 'b',
+      VALUE_TYPE_FLOAT: 'd',
+      VALUE_TYPE_INTEGER: 'q'}
+
+  _DEFAULT_VALUES = {
+      None: None,
+      VALUE_TYPE_BINARY: b'',
+      VALUE_TYPE_BOOLEAN: False,
+      VALUE_TYPE_FLOAT: 0.0,
+      VALUE_TYPE_INTEGER: 0,
+      VALUE_TYPE_STRING: ''}
+
+  def __init__(self, name, value_type=None):
+    """Initializes a column buffer.
+
+    Args:
+      name (str): name of the column.
+      value_type (Optional[str]): type of the values of the column.
+    """
+    super(ColumnBuffer, self).__init__()
+    self._default_value = self._DEFAULT_VALUES[value_type]
+    self.is_frozen = False
+    self.name = name
+    self.validity = bytearray()
+    self.value_type = value_type
+    self.values = self._CreateValues(value_type)
+
+  def __len__(self):
+    """Retrieves the number of rows.
+
+    Returns:
+      int: number of rows.
+    """
+    return len(self.validity)
+
+  def _CreateValues(self, value_type):
+    """Creates the storage of the values.
+
+    Args:
+      value_type (str): type of the values.
+
+    Returns:
+      array.array|list[object]: storage of the values.
+    """
+    typecode = self._ARRAY_TYPECODES.get(value_type, None)
+    if typecode:
+      return array.array(typecode)
+
+    return []
+
+  def _FormatValue(self, value, value_type):
+    """Formats a value as a string.
+
+    Args:
+      value (object): value.
+      value_type (str): type of the value.
+
+    Returns:
+      str: formatted value.
+    """
+    if value_type == self.VALUE_TYPE_BINARY:
+      return value.hex()
+
+    if value_type == self.VALUE_TYPE_BOOLEAN:
+      return f'{bool(value)!s}'
+
+    return f'{value!s}'
+
+  def _SetValueType(self, value_type):
+    """Sets the type of the values.
+
+    Values that were appended before the type of the values was determined,
+    which are all rows without a value, or of which the type differs, are
+    converted.
+
+    Args:
+      value_type (str): type of the values.
+    """
+    default_value = self._DEFAULT_VALUES[value_type]
+
+    values = self._CreateValues(value_type)
+    if self.value_type is None:
+      values.extend([default_value] * len(self.validity))
+
+    else:
+      # Only a string column can store values of different types.
+      values.extend([
+          self._FormatValue(value, self.value_type) if is_valid
+          else default_value
+          for value, is_valid in zip(self.values, self.validity)])
+
+    self._default_value = default_value
+    self.value_type = value_type
+    self.values = values
+
+  def Append(self, value, value_type):
+    """Appends a value.
+
+    Args:
+      value (object): value or None if the row has no value.
+      value_type (str): type of the value or None if the row has no value.
+
+    Raises:
+      Error: if the type of the value differs from the type of the values
+          of the column and the column is frozen.
+    """
+    if value is None:
+      self.validity.append(0)
+      self.values.append(self._default_value)
+      return
+
+    if value_type != self.value_type:
+      if self.value_type is None:
+        self._SetValueType(value_type)
+
+      elif self.is_frozen and self.value_type != self.VALUE_TYPE_STRING:
+        raise errors.Error((
+            f'Unsupported {value_type:s} value in {self.value_type:s} column: '
+            f'{self.name:s}.'))
+
+      else:
+        if self.value_type != self.VALUE_TYPE_STRING:
+          self._SetValueType(self.VALUE_TYPE_STRING)
+
+        value = self._FormatValue(value, value_type)
+
+    self.validity.append(1)
+    self.values.append(value)
+
+  def Clear(self):
+    """Removes all rows, while retaining the type of the values."""
+    self.validity = bytearray()
+    self.values = self._CreateValues(self.value_type)
+
+  def Freeze(self):
+    """Freezes the type of the values.
+
+    A column without values is frozen as a string column.
+    """
+    if self.value_type is None:
+      self._SetValueType(self.VALUE_TYPE_STRING)
+
+    self.is_frozen = True
+
+
+class ColumnarExportWriter(object):
+  """Columnar export writer interface."""
+
+  DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+  # Largest and smallest integer that can be stored in a 64-bit integer
+  # column.
+  _MAXIMUM_INTEGER = 0x7fffffffffffffff
+  _MINIMUM_INTEGER = -0x8000000000000000
+
+  def __init__(self, path, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """Initializes a columnar export writer.
+
+    Args:
+      path (str): path of the export file.
+      row_group_size (Optional[int]): maximum number of rows per row group.
+    """
+    super(ColumnarExportWriter, self).__init__()
+    self._columns = []
+    self._columns_per_name = {}
+    self._number_of_row_groups = 0
+    self._number_of_rows = 0
+    self._path = path
+    self._record_classes = set()
+    self._row_group_size = row_group_size
+
+  def _AddColumn(self, name):
+    """Adds a column.
+
+    Args:
+      name (str): name of the column.
+
+    Returns:
+      ColumnBuffer: column buffer.
+
+    Raises:
+      Error: if a row group was already written.
+    """
+    if self._number_of_row_groups:
+      raise errors.Error(
+          f'Unable to add column: {name:s} after the first row group.')
+
+    column = ColumnBuffer(name)
+    for _ in range(self._number_of_rows):
+      column.Append(None, None)
+
+    self._columns.append(column)
+    self._columns_per_name[name] = column
+
+    return column
+
+  def _ConvertValue(self, value):
+    """Converts a value into a value that can be stored in a column.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      tuple[object, str]: value and type of the value, or None and None if
+          the value is None.
+    """
+    value_type = type(value)
+    if value_type is str:
+      return sys.intern(value), ColumnBuffer.VALUE_TYPE_STRING
+
+    if value_type is int:
+      if self._MINIMUM_INTEGER <= value <= self._MAXIMUM_INTEGER:
+        return value, ColumnBuffer.VALUE_TYPE_INTEGER
+
+      return f'{value:d}', ColumnBuffer.VALUE_TYPE_STRING
+
+    if value is None:
+      return None, None
+
+    if value_type is bool:
+      return value, ColumnBuffer.VALUE_TYPE_BOOLEAN
+
+    if value_type is float:
+      return value, ColumnBuffer.VALUE_TYPE_FLOAT
+
+    if value_type in (bytearray, bytes, memoryview):
+      return bytes(value), ColumnBuffer.VALUE_TYPE_BINARY
+
+    if isinstance(value, dfdatetime_interface.DateTimeValues):
+      return value.CopyToDateTimeString(), ColumnBuffer.VALUE_TYPE_STRING
+
+    # Other values, such as lists, are stored as their JSON representation.
+    value_string = json.dumps(value, default=str, separators=(',', ':'))
+    return value_string, ColumnBuffer.VALUE_TYPE_STRING
+
+  def _FlushRowGroup(self):
+    """Writes the buffered rows as a row group."""
+    if self._number_of_rows:
+      for column in self._columns:
+        column.Freeze()
+
+      self._WriteRowGroup(self._columns, self._number_of_rows)
+
+      for column in self._columns:
+        column.Clear()
+
+      self._number_of_row_groups += 1
+      self._number_of_rows = 0
+
+  @abc.abstractmethod
+  def _WriteRowGroup(self, columns, number_of_rows):
+    """Writes a row group.
+
+    Args:
+      columns (list[ColumnBuffer]): columns.
+      number_of_rows (int): number of rows in the row group.
+    """
+
+  def Close(self):
+    """Closes the columnar export writer."""
+    self._FlushRowGroup()
+
+  @abc.abstractmethod
+  def Open(self):
+    """Opens the columnar export writer.
+
+    Returns:
+      bool: True if successful or False if not.
+    """
+
+  def WriteRecord(self, record):
+    """Writes a record.
+
+    Args:
+      record (object): record.
+
+    Raises:
+      Error: if the record has attributes that are not stored in a column
+          and a row group was already written.
+    """
+    record_class = type(record)
+    if record_class not in self._record_classes:
+      for name in output_writers.GetRecordAttributeNames(record):
+        if name not in self._columns_per_name:
+          self._AddColumn(name)
+
+      self._record_classes.add(record_class)
+
+    # Instance attributes are determined per record, since records of
+    # the same class can have different instance attributes.
+    for name in getattr(record, '__dict__', {}).keys():
+      if name not in self._columns_per_name and not name.startswith('_'):
+        self._AddColumn(name)
+
+    for column in self._columns:
+      value = getattr(record, column.name, None)
+      value, value_type = self._ConvertValue(value)
+      column.Append(value, value_type)
+
+    self._number_of_rows += 1
+    if self._number_of_rows >= self._row_group_size:
+      self._FlushRowGroup()
+
+
+class ArrowColumnarExportWriter(ColumnarExportWriter):
+  """Apache Arrow IPC or Parquet columnar export writer."""
+
+  _ARROW_TYPES = {}
+
+  if pyarrow:
+    _ARROW_TYPES = {
+        ColumnBuffer.VALUE_TYPE_BINARY: pyarrow.binary(),
+        ColumnBuffer.VALUE_TYPE_BOOLEAN: pyarrow.bool_(),
+        ColumnBuffer.VALUE_TYPE_FLOAT: pyarrow.float64(),
+        ColumnBuffer.VALUE_TYPE_INTEGER: pyarrow.int64(),
+        ColumnBuffer.VALUE_TYPE_STRING: pyarrow.string()}
+
+  def __init__(
+      self, path, row_group_size=ColumnarExportWriter.DEFAULT_ROW_GROUP_SIZE):
+    """Initializes an Apache Arrow IPC or Parquet columnar export writer.
+
+    Args:
+      path (str): path of the export file, where a path that ends with
+          ".parquet" is written as Parquet.
+      row_group_size (Optional[int]): maximum number of rows per row group.
+    """
+    super(ArrowColumnarExportWriter, self).__init__(
+        path, row_group_size=row_group_size)
+    self._file_object = None
+    self._schema = None
+    self._writer = None
+
+  def _CreateArray(self, column, arrow_type):
+    """Creates an Arrow array of a column.
+
+    Args:
+      column (ColumnBuffer): column.
+      arrow_type (pyarrow.DataType): Arrow data type of the column.
+
+    Returns:
+      pyarrow.Array: Arrow array.
+    """
+    has_validity = 0 in column.validity
+
+    if column.value_type in (
+        ColumnBuffer.VALUE_TYPE_FLOAT, ColumnBuffer.VALUE_TYPE_INTEGER) and (
+            not has_validity):
+      # Integer and floating-point values of a column without rows without
+      # a value are used as an Arrow buffer as-is.
+      return pyarrow.Array.from_buffers(
+          arrow_type, len(column), [None, pyarrow.py_buffer(column.values)])
+
+    values = column.values
+    if column.value_type == ColumnBuffer.VALUE_TYPE_BOOLEAN:
+      values = [bool(value) for value in values]
+
+    if has_validity:
+      values = [
+          value if is_valid else None
+          for value, is_valid in zip(values, column.validity)]
+
+    return pyarrow.array(values, type=arrow_type)
+
+  def _WriteRowGroup(self, columns, number_of_rows):
+    """Writes a row group.
+
+    Args:
+      columns (list[ColumnBuffer]): columns.
+      number_of_rows (int): number of rows in the row group.
+    """
+    if not self._schema:
+      self._schema = pyarrow.schema([
+          (column.name, self._ARROW_TYPES[column.value_type])
+          for column in columns])
+
+      if self._path.endswith('.parquet'):
+        self._writer = pyarrow_parquet.ParquetWriter(self._path, self._schema)
+      else:
+        self._file_object = pyarrow.OSFile(self._path, 'wb')
+        self._writer = pyarrow_ipc.new_file(self._file_object, self._schema)
+
+    arrays = [
+        self._CreateArray(column, arrow_type)
+        for column, arrow_type in zip(columns, self._schema.types)]
+
+    record_batch = pyarrow.RecordBatch.from_arrays(
+        arrays, schema=self._schema)
+    self._writer.write_batch(record_batch)
+
+  def Close(self):
+    """Closes the columnar export writer."""
+    super(ArrowColumnarExportWriter, self).Close()
+
+    if self._writer:
+      self._writer.close()
+      self._writer = None
+
+    if self._file_object:
+      self._file_object.close()
+      self._file_object = None
+
+  def Open(self):
+    """Opens the columnar export writer.
+
+    Returns:
+      bool: True if successful or False if not.
+    """
+    return bool(pyarrow)
+
+
+class NumPyColumnarExportWriter(ColumnarExportWriter):
+  """NumPy .npz columnar export writer."""
+
+  def __init__(
+      self, path, row_group_size=ColumnarExportWriter.DEFAULT_ROW_GROUP_SIZE):
+    """Initializes a NumPy .npz columnar export writer.
+
+    Args:
+      path (str): path of the export file.
+      row_group_size (Optional[int]): maximum number of rows per row group.
+    """
+    super(NumPyColumnarExportWriter, self).__init__(
+        path, row_group_size=row_group_size)
+    self._zip_file = None
+
+  def _CreateArray(self, column):
+    """Creates a NumPy array of a column.
+
+    Args:
+      column (ColumnBuffer): column.
+
+    Returns:
+      numpy.ndarray: NumPy array.
+    """
+    if column.value_type == ColumnBuffer.VALUE_TYPE_BOOLEAN:
+      return numpy.frombuffer(column.values, dtype=numpy.int8).astype(
+          numpy.bool_)
+
+    if column.value_type == ColumnBuffer.VALUE_TYPE_FLOAT:
+      return numpy.frombuffer(column.values, dtype=numpy.float64)
+
+    if column.value_type == ColumnBuffer.VALUE_TYPE_INTEGER:
+      return numpy.frombuffer(column.values, dtype=numpy.int64)
+
+    if column.value_type == ColumnBuffer.VALUE_TYPE_BINARY:
+      return numpy.array([value.hex() for value in column.values], dtype=str)
+
+    return numpy.array(column.values, dtype=str)
+
+  def _WriteArray(self, name, numpy_array):
+    """Writes an array.
+
+    Args:
+      name (str): name of the array.
+      numpy_array (numpy.ndarray): NumPy array.
+    """
+    with self._zip_file.open(f'{name:s}.npy', 'w', force_zip64=True) as (
+        file_object):
+      numpy.lib.format.write_array(
+          file_object, numpy_array, allow_pickle=False)
+
+  def _WriteRowGroup(self, columns, number_of_rows):
+    """Writes a row group.
+
+    Args:
+      columns (list[ColumnBuffer]): columns.
+      number_of_rows (int): number of rows in the row group.
+    """
+    row_group_index = self._number_of_row_groups
+    for column in columns:
+      name = f'{column.name:s}.{row_group_index:d}'
+      self._WriteArray(name, self._CreateArray(column))
+
+      if 0 in column.validity:
+        validity = numpy.frombuffer(column.validity, dtype=numpy.uint8)
+        self._WriteArray(f'{name:s}.validity', validity.astype(numpy.bool_))
+
+  def Close(self):
+    """Closes the columnar export writer."""
+    super(NumPyColumnarExportWriter, self).Close()
+
+    if self._zip_file:
+      self._zip_file.close()
+      self._zip_file = None
+
+  def Open(self):
+    """Opens the columnar export writer.
+
+    Returns:
+      bool: True if successful or False if not.
+    """
+    if not numpy:
+      return False
+
+    try:
+      # pylint: disable=consider-using-with
+      self._zip_file = zipfile.ZipFile(
+          self._path, mode='w', compression=zipfile.ZIP_STORED,
+          allowZip64=True)
+    except OSError:
+      return False
+
+    return True
+
+
+def CreateColumnarExportWriter(
+    path, row_group_size=ColumnarExportWriter.DEFAULT_ROW_GROUP_SIZE):
+  """Creates a columnar export writer based on the installed modules.
+
+  Args:
+    path (str): path of the export file.
+    row_group_size (Optional[int]): maximum number of rows per row group.
+
+  Returns:
+    ColumnarExportWriter: columnar export writer.
+
+  Raises:
+    Error: if neither pyarrow nor numpy is installed.
+  """
+  if pyarrow:
+    return ArrowColumnarExportWriter(path, row_group_size=row_group_size)
+
+  if numpy:
+    return NumPyColumnarExportWriter(path, row_group_size=row_group_size)
+
+  raise errors.Error('Columnar export requires pyarrow or numpy.')
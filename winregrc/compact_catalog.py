@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""Compact catalog of Windows Registry keys and values.
+
+The compact catalog format is a line-oriented format that consists of:
+
+* a header line "# winregrc compact catalog 1";
+* per key, a key line with the number of leading characters the key path
+  shares with the path of the previous key, a tab and the remainder of the
+  key path;
+* per value of a key, a value line with a tab, the value name, a tab and
+  the data type of the value.
+
+Since key and value names can contain any character, the characters "%",
+line feed and carriage return are escaped as "%25", "%0A" and "%0D"
+respectively.
+"""
+
+import re
+
+from winregrc import catalog
+from winregrc import errors
+
+
+_ESCAPE_CHARACTERS = str.maketrans({'%': '%25', '\n': '%0A', '\r': '%0D'})
+
+_UNESCAPE_CHARACTERS = {'%25': '%', '%0A': '\n', '%0D': '\r'}
+
+_UNESCAPE_RE = re.compile('%(?:25|0A|0D)')
+
+
+def _Unescape(string):
+  """Unescapes a key path or value name.
+
+  Args:
+    string (str): escaped key path or value name.
+
+  Returns:
+    str: key path or value name.
+  """
+  if '%' not in string:
+    return string
+
+  return _UNESCAPE_RE.sub(
+      lambda match: _UNESCAPE_CHARACTERS[match.group(0)], string)
+
+
+class CompactCatalogWriter(object):
+  """Compact catalog writer."""
+
+  HEADER = '# winregrc compact catalog 1\n'
+
+  def __init__(self, file_object):
+    """Initializes a compact catalog writer.
+
+    Args:
+      file_object (file): text file-like object to write to.
+    """
+    super(CompactCatalogWriter, self).__init__()
+    self._file_object = file_object
+    self._previous_key_path = ''
+
+  def WriteHeader(self):
+    """Writes the header of the compact catalog."""
+    self._file_object.write(self.HEADER)
+    self._previous_key_path = ''
+
+  def WriteKeyDescriptor(self, key_descriptor):
+    """Writes a catalog key descriptor.
+
+    Args:
+      key_descriptor (CatalogKeyDescriptor): catalog key descriptor.
+    """
+    key_path = key_descriptor.key_path.translate(_ESCAPE_CHARACTERS)
+
+    shared_size = 0
+    maximum_shared_size = min(len(key_path), len(self._previous_key_path))
+    while (shared_size < maximum_shared_size and
+           key_path[shared_size] == self._previous_key_path[shared_size]):
+      shared_size += 1
+
+    lines = [f'{shared_size:d}\t{key_path[shared_size:]:s}\n']
+    for value_name, data_type in key_descriptor.value_descriptors:
+      value_name = value_name.translate(_ESCAPE_CHARACTERS)
+      lines.append(f'\t{value_name:s}\t{data_type:s}\n')
+
+    self._file_object.write(''.join(lines))
+    self._previous_key_path = key_path
+
+
+class CompactCatalogReader(object):
+  """Compact catalog reader."""
+
+  def __init__(self, file_object):
+    """Initializes a compact catalog reader.
+
+    Args:
+      file_object (file): text file-like object to read from.
+    """
+    super(CompactCatalogReader, self).__init__()
+    self._file_object = file_object
+
+  def ParseValueLine(self, line):
+    """Parses a value line.
+
+    Args:
+      line (str): value line without end-of-line character.
+
+    Returns:
+      tuple[str, str]: value name and data type.
+
+    Raises:
+      ParseError: if the value line is not supported.
+    """
+    value_name, separator, data_type = line[1:].rpartition('\t')
+    if not separator:
+      raise errors.ParseError(f'Unsupported value line: {line:s}')
+
+    return _Unescape(value_name), data_type
+
+  def ReadRecords(self):
+    """Reads the records of the compact catalog.
+
+    The value lines are returned as read, such that records of different
+    catalogs can be compared without parsing them.
+
+    Yields:
+      tuple[str, list[str]]: key path and value lines, without end-of-line
+          characters, of a key, where the value names in the value lines are
+          escaped.
+
+    Raises:
+      ParseError: if the compact catalog is not supported.
+    """
+    line = self._file_object.readline()
+    if line != CompactCatalogWriter.HEADER:
+      raise errors.ParseError('Unsupported compact catalog header.')
+
+    # The key path is stored escaped, hence the shared size refers to
+    # the escaped key path.
+    escaped_key_path = None
+    value_lines = []
+
+    for line in self._file_object:
+      line = line.rstrip('\n')
+      if line.startswith('\t'):
+        if escaped_key_path is None:
+          raise errors.ParseError('Value line without key line.')
+
+        value_lines.append(line)
+        continue
+
+      if escaped_key_path is not None:
+        yield _Unescape(escaped_key_path), value_lines
+
+      shared_size, separator, suffix = line.partition('\t')
+      if not separator or not shared_size.isdigit():
+        raise errors.ParseError(f'Unsupported key line: {line:s}')
+
+      escaped_key_path = ''.join([
+          (escaped_key_path or '')[:int(shared_size, 10)], suffix])
+      value_lines = []
+
+    if escaped_key_path is not None:
+      yield _Unescape(escaped_key_path), value_lines
+
+  def ReadKeyDescriptors(self):
+    """Reads the catalog key descriptors of the compact catalog.
+
+    Yields:
+      CatalogKeyDescriptor: catalog key descriptor.
+
+    Raises:
+      ParseError: if the compact catalog is not supported.
+    """
+    for key_path, value_lines in self.ReadRecords():
+      key_descriptor = catalog.CatalogKeyDescriptor()
+      key_descriptor.key_path = key_path
+      key_descriptor.value_descriptors = [
+          self.ParseValueLine(line) for line in value_lines]
+
+      yield key_descriptor
+
+
+class CompactCatalogDiffer(object):
+  """Compares compact catalogs.
+
+  The catalogs are compared in a single pass, which requires the keys of
+  both catalogs to be in case-insensitive key path order, with the key path
+  segments compared individually. This is the order in which the catalog
+  collector traverses a Windows Registry file since the subkeys are stored
+  in that order. Only the values of keys of which the value lines differ
+  are parsed.
+  """
+
+  def _GetKeyPathSortKey(self, key_path):
+    """Retrieves the sort key of a key path.
+
+    Windows Registry key names are compared by their upper case characters,
+    where every character is converted individually. Unlike str.upper(), such
+    a conversion never changes the number of characters, hence characters
+    of which the upper case consists of multiple characters, such as "ß",
+    are left as-is.
+
+    Args:
+      key_path (str): key path.
+
+    Returns:
+      tuple[str]: sort key.
+    """
+    if key_path.isascii():
+      key_path_upper = key_path.upper()
+    else:
+      characters = []
+      for character in key_path:
+        upper_case_character = character.upper()
+        if len(upper_case_character) != 1:
+          upper_case_character = character
+        characters.append(upper_case_character)
+
+      key_path_upper = ''.join(characters)
+
+    return tuple(key_path_upper.split('\\'))
+
+  def _GetRecordsInOrder(self, reader):
+    """Retrieves the records of a compact catalog and checks their order.
+
+    Args:
+      reader (CompactCatalogReader): compact catalog reader.
+
+    Yields:
+      tuple[tuple[str], str, list[str]]: sort key, key path and value lines.
+
+    Raises:
+      ParseError: if the compact catalog is not supported or its keys are
+          not in order.
+    """
+    previous_sort_key = None
+
+    for key_path, value_lines in reader.ReadRecords():
+      sort_key = self._GetKeyPathSortKey(key_path)
+      if previous_sort_key is not None and sort_key <= previous_sort_key:
+        raise errors.ParseError(f'Key: {key_path:s} out of order.')
+
+      yield sort_key, key_path, value_lines
+
+      previous_sort_key = sort_key
+
+  def Diff(self, reader, other_reader):
+    """Compares two compact catalogs.
+
+    Args:
+      reader (CompactCatalogReader): reader of the compact catalog.
+      other_reader (CompactCatalogReader): reader of the compact catalog to
+          compare with.
+
+    Yields:
+      tuple[str, str, tuple[str, str]]: change, key path and value
+          descriptor, where change is "-" if the key or value is only in
+          the first catalog and "+" if only in the second catalog and where
+          the value descriptor is None if the change applies to the key.
+
+    Raises:
+      ParseError: if a compact catalog is not supported or its keys are not
+          in order.
+    """
+    records = self._GetRecordsInOrder(reader)
+    other_records = self._GetRecordsInOrder(other_reader)
+
+    record = next(records, None)
+    other_record = next(other_records, None)
+
+    while record or other_record:
+      if not other_record or (record and record[0] < other_record[0]):
+        yield '-', record[1], None
+        record = next(records, None)
+
+      elif not record or other_record[0] < record[0]:
+        yield '+', other_record[1], None
+        other_record = next(other_records, None)
+
+      else:
+        _, key_path, value_lines = record
+        _, _, other_value_lines = other_record
+
+        if value_lines != other_value_lines:
+          other_value_lines_set = set(other_value_lines)
+          for line in value_lines:
+            if line not in other_value_lines_set:
+              yield '-', key_path, reader.ParseValueLine(line)
+
+          value_lines_set = set(value_lines)
+          for line in other_value_lines:
+            if line not in value_lines_set:
+              yield '+', key_path, other_reader.ParseValueLine(line)
+
+        record = next(records, None)
+        other_record = next(other_records, None)
@@ -1,14 +1,140 @@
 # -*- coding: utf-8 -*-
 """Binary data format."""
 
+import collections
+import hashlib
 import os
+import pickle
+import struct
+import threading
 
 from dfdatetime import filetime as dfdatetime_filetime
 
+import dtfabric
+
+from dtfabric import data_types as dtfabric_data_types
+from dtfabric import definitions as dtfabric_definitions
 from dtfabric import errors as dtfabric_errors
+from dtfabric.runtime import data_maps as dtfabric_data_maps
 from dtfabric.runtime import fabric as dtfabric_fabric
 
 from winregrc import errors
+from winregrc import hexdump
+
+
+class StructDecoder(object):
+  """Decoder of a fixed-size structure using Python struct.
+
+  Attributes:
+    data_type_map (dtfabric.DataTypeMap): data type map of the structure.
+    size (int): size of the structure in bytes.
+  """
+
+  def __init__(self, data_type_map, format_string, member_names):
+    """Initializes a decoder of a fixed-size structure.
+
+    Args:
+      data_type_map (dtfabric.DataTypeMap): data type map of the structure.
+      format_string (str): Python struct format string, including the byte
+          order.
+      member_names (list[str]): names of the structure members.
+    """
+    super(StructDecoder, self).__init__()
+    self._struct = struct.Struct(format_string)
+    self._values_class = collections.namedtuple(
+        data_type_map.name, member_names)
+    self.data_type_map = data_type_map
+    self.size = self._struct.size
+
+  def Decode(self, byte_stream):
+    """Decodes the structure from a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream, which must contain at least the size
+          of the structure.
+
+    Returns:
+      collections.namedtuple: structure values.
+    """
+    return self._values_class._make(self._struct.unpack_from(byte_stream))
+
+  def DecodeSequence(self, byte_stream):
+    """Decodes a sequence of consecutive structures from a byte stream.
+
+    Args:
+      byte_stream (bytes|memoryview): byte stream, of which the size must be
+          a multiple of the size of the structure.
+
+    Returns:
+      iterator[collections.namedtuple]: structure values.
+    """
+    return map(self._values_class._make, self._struct.iter_unpack(byte_stream))
+
+  @classmethod
+  def CreateFromDefinition(cls, data_type_map, data_type_definition):
+    """Creates a decoder from a data type definition.
+
+    Args:
+      data_type_map (dtfabric.DataTypeMap): data type map of the structure.
+      data_type_definition (dtfabric.DataTypeDefinition): data type
+          definition of the structure.
+
+    Returns:
+      StructDecoder: decoder or None if the structure does not have a fixed
+          layout of integer and floating-point members.
+    """
+    if not isinstance(
+        data_type_definition, dtfabric_data_types.StructureDefinition):
+      return None
+
+    members = data_type_definition.members
+    if not members:
+      return None
+
+    member_names = []
+    for member_definition in members:
+      # Values constrained by the definition are validated by dtFabric.
+      if getattr(member_definition, 'values', None):
+        return None
+
+      member_data_type_definition = getattr(
+          member_definition, 'member_data_type_definition', member_definition)
+      if not isinstance(member_data_type_definition, (
+          dtfabric_data_types.FloatingPointDefinition,
+          dtfabric_data_types.IntegerDefinition)):
+        return None
+
+      # Mixed byte orders require dtFabric.
+      for byte_order in (
+          member_definition.byte_order,
+          member_data_type_definition.byte_order):
+        if byte_order not in (
+            dtfabric_definitions.BYTE_ORDER_NATIVE,
+            data_type_definition.byte_order):
+          return None
+
+      member_names.append(member_definition.name)
+
+    try:
+      byte_order_string = data_type_map.GetStructByteOrderString()
+      format_string = data_type_map.GetStructFormatString()
+    except dtfabric_errors.Error:
+      return None
+
+    if not byte_order_string or not format_string:
+      return None
+
+    try:
+      decoder = cls(
+          data_type_map, f'{byte_order_string:s}{format_string:s}',
+          member_names)
+    except (TypeError, ValueError, struct.error):
+      return None
+
+    if decoder.size != data_type_definition.GetByteSize():
+      return None
+
+    return decoder
 
 
 class BinaryDataFormat(object):
@@ -21,8 +147,20 @@ class BinaryDataFormat(object):
   # at run-time.
   _DEFINITION_FILES_PATH = os.path.dirname(__file__)
 
-  _HEXDUMP_CHARACTER_MAP = [
-      '.' if byte < 0x20 or byte > 0x7e else chr(byte) for byte in range(256)]
+  # Version of the format of the precompiled definitions cache files, which
+  # must be increased when the format changes.
+  _DEFINITIONS_CACHE_FORMAT_VERSION = 2
+
+  # Path of the directory that contains the precompiled definitions cache
+  # files or None if the precompiled definitions should not be cached on disk.
+  _definitions_cache_path = None
+
+  # Data type fabrics and data type maps shared by all instances in
+  # the process, per path of the definition file.
+  _data_type_maps_per_definition_file = {}
+  _fabrics_per_definition_file = {}
+  _struct_decoders_per_definition_file = {}
+  _fabrics_lock = threading.Lock()
 
   def __init__(self, debug=False, output_writer=None):
     """Initializes a binary data format.
@@ -32,11 +170,27 @@ class BinaryDataFormat(object):
       output_writer (Optional[OutputWriter]): output writer.
     """
     super(BinaryDataFormat, self).__init__()
-    self._data_type_maps = {}
     self._debug = debug
-    self._fabric = self._ReadDefinitionFile(self._DEFINITION_FILE)
     self._output_writer = output_writer
 
+    definition_file = None
+    if self._DEFINITION_FILE:
+      definition_file = os.path.join(
+          self._DEFINITION_FILES_PATH, self._DEFINITION_FILE)
+
+    with self._fabrics_lock:
+      if definition_file in self._fabrics_per_definition_file:
+        self._fabric = self._fabrics_per_definition_file[definition_file]
+      else:
+        self._fabric = self._ReadDefinitionFile(self._DEFINITION_FILE)
+        self._fabrics_per_definition_file[definition_file] = self._fabric
+
+      data_type_maps = self._data_type_maps_per_definition_file
+      self._data_type_maps = data_type_maps.setdefault(definition_file, {})
+
+      struct_decoders = self._struct_decoders_per_definition_file
+      self._struct_decoders = struct_decoders.setdefault(definition_file, {})
+
   def _DebugPrintData(self, description, data):
     """Prints data for debugging.
 
@@ -45,10 +199,7 @@ class BinaryDataFormat(object):
       data (bytes): data.
     """
     if self._output_writer:
-      self._output_writer.WriteText(f'{description:s}:\n')
-
-      value_string = self._FormatDataInHexadecimal(data)
-      self._output_writer.WriteText(value_string)
+      self._output_writer.DebugPrintData(description, data)
 
   def _DebugPrintDecimalValue(self, description, value):
     """Prints a decimal value for debugging.
@@ -66,19 +217,8 @@ class BinaryDataFormat(object):
       description (str): description.
       value (object): value.
     """
-    if value == 0:
-      date_time_string = 'Not set (0)'
-    elif value == 0x7fffffffffffffff:
-      date_time_string = 'Never (0x7fffffffffffffff)'
-    else:
-      date_time = dfdatetime_filetime.Filetime(timestamp=value)
-      date_time_string = date_time.CopyToDateTimeString()
-      if date_time_string:
-        date_time_string = f'{date_time_string:s} UTC'
-      else:
-        date_time_string = f'0x{value:08x}'
-
-    self._DebugPrintValue(description, date_time_string)
+    if self._output_writer:
+      self._output_writer.DebugPrintFiletimeValue(description, value)
 
   def _DebugPrintStructureObject(self, structure_object, debug_info):
     """Prints structure object debug information.
@@ -87,8 +227,9 @@ class BinaryDataFormat(object):
       structure_object (object): structure object.
       debug_info (list[tuple[str, str, int]]): debug information.
     """
-    text = self._FormatStructureObject(structure_object, debug_info)
-    self._output_writer.WriteText(text)
+    if self._output_writer:
+      self._output_writer.DebugPrintStructureObject(
+          structure_object, debug_info, self)
 
   def _DebugPrintText(self, text):
     """Prints text for debugging.
@@ -107,8 +248,7 @@ class BinaryDataFormat(object):
       value (object): value.
     """
     if self._output_writer:
-      text = self._FormatValue(description, value)
-      self._output_writer.WriteText(text)
+      self._output_writer.DebugPrintValue(description, value)
 
   def _FormatDataInHexadecimal(self, data):
     """Formats data in a hexadecimal representation.
@@ -119,60 +259,7 @@ class BinaryDataFormat(object):
     Returns:
       str: hexadecimal representation of the data.
     """
-    in_group = False
-    previous_hexadecimal_string = None
-
-    lines = []
-    data_size = len(data)
-    for block_index in range(0, data_size, 16):
-      data_string = data[block_index:block_index + 16]
-
-      hexadecimal_byte_values = []
-      printable_values = []
-      for byte_value in data_string:
-        if isinstance(byte_value, str):
-          byte_value = ord(byte_value)
-
-        hexadecimal_byte_values.append(f'{byte_value:02x}')
-
-        printable_value = self._HEXDUMP_CHARACTER_MAP[byte_value]
-        printable_values.append(printable_value)
-
-      remaining_size = 16 - len(data_string)
-      if remaining_size == 0:
-        whitespace = ''
-      elif remaining_size >= 8:
-        whitespace = ' ' * ((3 * remaining_size) - 1)
-      else:
-        whitespace = ' ' * (3 * remaining_size)
-
-      hexadecimal_string_part1 = ' '.join(hexadecimal_byte_values[0:8])
-      hexadecimal_string_part2 = ' '.join(hexadecimal_byte_values[8:16])
-      hexadecimal_string = (
-          f'{hexadecimal_string_part1:s}  {hexadecimal_string_part2:s}'
-          f'{whitespace:s}')
-
-      if (previous_hexadecimal_string is not None and
-          previous_hexadecimal_string == hexadecimal_string and
-          block_index + 16 < data_size):
-
-        if not in_group:
-          in_group = True
-
-          lines.append('...')
-
-      else:
-        printable_string = ''.join(printable_values)
-
-        lines.append(
-            f'0x{block_index:08x}  {hexadecimal_string:s}  '
-            f'{printable_string:s}')
-
-        in_group = False
-        previous_hexadecimal_string = hexadecimal_string
-
-    lines.extend(['', ''])
-    return '\n'.join(lines)
+    return hexdump.Hexdump(data)
 
   def _FormatIntegerAsDecimal(self, integer):
     """Formats an integer as a decimal.
@@ -297,7 +384,9 @@ class BinaryDataFormat(object):
   def _GetDataTypeMap(self, name):
     """Retrieves a data type map defined by the definition file.
 
-    The data type maps are cached for reuse.
+    The data type maps are cached for reuse. If the data type is a structure
+    with a fixed layout, a Python struct based decoder is created as well,
+    which is used by _ReadStructureFromByteStream.
 
     Args:
       name (str): name of the data type as defined by the definition file.
@@ -308,11 +397,107 @@ class BinaryDataFormat(object):
     """
     data_type_map = self._data_type_maps.get(name, None)
     if not data_type_map:
-      data_type_map = self._fabric.CreateDataTypeMap(name)
-      self._data_type_maps[name] = data_type_map
+      with self._fabrics_lock:
+        data_type_map = self._data_type_maps.get(name, None)
+        if not data_type_map:
+          data_type_map = self._fabric.CreateDataTypeMap(name)
+          self._data_type_maps[name] = data_type_map
+
+          if data_type_map:
+            data_type_definition = self._fabric.GetDefinitionByName(name)
+            struct_decoder = StructDecoder.CreateFromDefinition(
+                data_type_map, data_type_definition)
+            if struct_decoder:
+              self._struct_decoders[name] = struct_decoder
 
     return data_type_map
 
+  def _GetUTF16StringSize(self, data, offset=0, maximum_size=None):
+    """Determines the size of an UTF-16 string.
+
+    Args:
+      data (bytes): data that contains the UTF-16 little-endian string.
+      offset (Optional[int]): offset of the string relative to the start of
+          the data.
+      maximum_size (Optional[int]): maximum size of the string including the
+          end-of-string character, where None represents the remainder of
+          the data.
+
+    Returns:
+      int: size of the string without the end-of-string character or the size
+          of the string data, rounded down to a multiple of 2, if no
+          end-of-string character was found.
+    """
+    end_offset = len(data)
+    if maximum_size is not None:
+      end_offset = min(offset + maximum_size, end_offset)
+
+    string_end_offset = data.find(b'\x00\x00', offset, end_offset)
+
+    # The end-of-string character must be 16-bit aligned.
+    while string_end_offset > offset and (string_end_offset - offset) % 2:
+      string_end_offset = data.find(
+          b'\x00\x00', string_end_offset + 1, end_offset)
+
+    if string_end_offset < 0:
+      return max(end_offset - offset, 0) & ~1
+
+    return string_end_offset - offset
+
+  def _ReadCachedDefinitionFile(
+      self, cache_path, definition, modification_time):
+    """Reads a precompiled dtFabric definition file from the cache.
+
+    Args:
+      cache_path (str): path of the precompiled definitions cache file.
+      definition (bytes): UTF-8 and YAML formatted data type definitions.
+      modification_time (int): modification time of the definition file in
+          number of nanoseconds since January 1, 1970 00:00:00 UTC.
+
+    A cache file is out of date if it was written by another version of
+    dtFabric, since the pickled data type fabric depends on its classes. If
+    only the modification time of the definition file changed, the cache file
+    is written again with the new modification time, so that the digest does
+    not need to be calculated on subsequent reads.
+
+    Returns:
+      dtfabric.DataTypeFabric: data type fabric or None if the cache file
+          is not available or out of date.
+    """
+    try:
+      with open(cache_path, 'rb') as file_object:
+        cached_definition = pickle.load(file_object)
+
+    # Note that unpickling raises AttributeError or ImportError, which includes
+    # ModuleNotFoundError, if a pickled class is no longer available.
+    except (AttributeError, EOFError, ImportError, IndexError, IOError,
+            OSError, TypeError, ValueError, pickle.UnpicklingError):
+      return None
+
+    if not isinstance(cached_definition, dict):
+      return None
+
+    if cached_definition.get(
+        'format_version', None) != self._DEFINITIONS_CACHE_FORMAT_VERSION:
+      return None
+
+    if cached_definition.get('dtfabric_version', None) != dtfabric.__version__:
+      return None
+
+    fabric = cached_definition.get('fabric', None)
+    if not isinstance(fabric, dtfabric_fabric.DataTypeFabric):
+      return None
+
+    if cached_definition.get('modification_time', None) != modification_time:
+      digest = hashlib.sha256(definition).hexdigest()
+      if cached_definition.get('digest', None) != digest:
+        return None
+
+      self._WriteCachedDefinitionFile(
+          cache_path, definition, modification_time, fabric)
+
+    return fabric
+
   def _ReadDefinitionFile(self, filename):
     """Reads a dtFabric definition file.
 
@@ -331,12 +516,33 @@ class BinaryDataFormat(object):
     with open(path, 'rb') as file_object:
       definition = file_object.read()
 
-    return dtfabric_fabric.DataTypeFabric(yaml_definition=definition)
+    if not self._definitions_cache_path:
+      return dtfabric_fabric.DataTypeFabric(yaml_definition=definition)
+
+    modification_time = os.stat(path).st_mtime_ns
+    cache_path = os.path.join(
+        self._definitions_cache_path, f'{filename:s}.pickle')
+
+    fabric = self._ReadCachedDefinitionFile(
+        cache_path, definition, modification_time)
+    if fabric:
+      return fabric
+
+    fabric = dtfabric_fabric.DataTypeFabric(yaml_definition=definition)
+    self._WriteCachedDefinitionFile(
+        cache_path, definition, modification_time, fabric)
+
+    return fabric
 
   def _ReadStructureFromByteStream(
       self, byte_stream, file_offset, data_type_map, description, context=None):
     """Reads a structure from a byte stream.
 
+    Structures with a fixed layout are decoded with a Python struct based
+    decoder if available, other structures are mapped by dtFabric. If debug
+    information should be written, the data of the structure is passed to
+    the output writer.
+
     Args:
       byte_stream (bytes): byte stream.
       file_offset (int): offset of the structure data relative to the start
@@ -358,10 +564,94 @@ class BinaryDataFormat(object):
     if not data_type_map:
       raise ValueError('Missing data type map.')
 
+    struct_decoder = self._struct_decoders.get(data_type_map.name, None)
+    if (struct_decoder and struct_decoder.data_type_map is data_type_map and
+        len(byte_stream) >= struct_decoder.size):
+      if context:
+        context.byte_size = struct_decoder.size
+        context.requested_size = struct_decoder.size
+        context.state = {}
+
+      structure_values = struct_decoder.Decode(byte_stream)
+
+      if self._debug and self._output_writer:
+        self._output_writer.DebugPrintStructure(
+            description, file_offset, data_type_map.name,
+            byte_stream[:struct_decoder.size])
+
+      return structure_values
+
+    if self._debug and self._output_writer and not context:
+      context = dtfabric_data_maps.DataTypeMapContext()
+
     try:
-      return data_type_map.MapByteStream(byte_stream, context=context)
+      structure_values = data_type_map.MapByteStream(
+          byte_stream, context=context)
     except (dtfabric_errors.ByteStreamTooSmallError,
             dtfabric_errors.MappingError) as exception:
       raise errors.ParseError((
           f'Unable to map {description:s} data at offset: 0x{file_offset:08x} '
           f'with error: {exception!s}'))
+
+    if self._debug and self._output_writer:
+      self._output_writer.DebugPrintStructure(
+          description, file_offset, data_type_map.name,
+          byte_stream[:context.byte_size])
+
+    return structure_values
+
+  def _WriteCachedDefinitionFile(
+      self, cache_path, definition, modification_time, fabric):
+    """Writes a precompiled dtFabric definition file to the cache.
+
+    Failing to write the cache file is not considered an error, since
+    the definition file can be read again.
+
+    Args:
+      cache_path (str): path of the precompiled definitions cache file.
+      definition (bytes): UTF-8 and YAML formatted data type definitions.
+      modification_time (int): modification time of the definition file in
+          number of nanoseconds since January 1, 1970 00:00:00 UTC.
+      fabric (dtfabric.DataTypeFabric): data type fabric.
+    """
+    cached_definition = {
+        'digest': hashlib.sha256(definition).hexdigest(),
+        'dtfabric_version': dtfabric.__version__,
+        'fabric': fabric,
+        'format_version': self._DEFINITIONS_CACHE_FORMAT_VERSION,
+        'modification_time': modification_time}
+
+    # Write to a temporary file first so that concurrent readers never see
+    # a partially written cache file.
+    temporary_path = f'{cache_path:s}.{os.getpid():d}.tmp'
+    try:
+      with open(temporary_path, 'wb') as file_object:
+        pickle.dump(cached_definition, file_object)
+
+      os.replace(temporary_path, cache_path)
+
+    except (IOError, OSError, pickle.PicklingError):
+      if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+
+  @classmethod
+  def SetDefinitionsCachePath(cls, path):
+    """Sets the path of the precompiled definitions cache.
+
+    The precompiled definitions cache stores the data type fabrics of
+    the dtFabric definition files so that the definition files do not need to
+    be parsed again. A cache file is used if it was written by the same
+    version of dtFabric and the modification time or the SHA-256 digest of
+    the definition file did not change. Note that
+    the cache files are read using pickle and therefore the cache directory
+    should only be writable by trusted users.
+
+    Args:
+      path (str): path of the directory that contains the precompiled
+          definitions cache files or None to disable the cache.
+    """
+    if path:
+      os.makedirs(path, exist_ok=True)
+
+    with cls._fabrics_lock:
+      BinaryDataFormat._definitions_cache_path = path
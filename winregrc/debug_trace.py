@@ -0,0 +1,528 @@
+# -*- coding: utf-8 -*-
+"""Binary debug trace.
+
+A debug trace records the calls to the debug functions of an output writer
+as compact binary events, such that the debug information is formatted
+later by replaying the events on another output writer.
+
+A debug trace file consists of the signature "WRCTRACE", a 32-bit format
+version and a sequence of events. Every event consists of an 8-bit event
+type, a 32-bit size of the event data and the event data, which is a
+sequence of tagged values.
+"""
+
+import struct
+import types
+
+from winregrc import data_format
+from winregrc import errors
+from winregrc import output_writers
+
+
+class DebugTraceOutputWriter(output_writers.OutputWriter):
+  """Output writer that records a binary debug trace."""
+
+  FORMAT_VERSION = 1
+
+  SIGNATURE = b'WRCTRACE'
+
+  # Event types, which correspond to the functions of the output writer.
+  EVENT_TYPE_DEBUG_PRINT_DATA = 1
+  EVENT_TYPE_DEBUG_PRINT_FILETIME_VALUE = 2
+  EVENT_TYPE_DEBUG_PRINT_STRUCTURE = 3
+  EVENT_TYPE_DEBUG_PRINT_STRUCTURE_OBJECT = 4
+  EVENT_TYPE_DEBUG_PRINT_TEXT = 5
+  EVENT_TYPE_DEBUG_PRINT_VALUE = 6
+  EVENT_TYPE_WRITE_DEBUG_DATA = 7
+  EVENT_TYPE_WRITE_FILETIME_VALUE = 8
+  EVENT_TYPE_WRITE_INTEGER_VALUE_AS_DECIMAL = 9
+  EVENT_TYPE_WRITE_TEXT = 10
+  EVENT_TYPE_WRITE_VALUE = 11
+
+  # Value tags.
+  VALUE_TAG_NONE = 0
+  VALUE_TAG_INTEGER = 1
+  VALUE_TAG_LARGE_INTEGER = 2
+  VALUE_TAG_STRING = 3
+  VALUE_TAG_BYTES = 4
+  VALUE_TAG_LIST = 5
+  VALUE_TAG_BOOLEAN = 6
+  VALUE_TAG_FLOAT = 7
+
+  _EVENT_HEADER = struct.Struct('<BI')
+
+  _HEADER = struct.Struct('<8sI')
+
+  _INTEGER = struct.Struct('<Bq')
+
+  _FLOAT = struct.Struct('<Bd')
+
+  _SIZE = struct.Struct('<BI')
+
+  # Structure object format callbacks that are applied when the debug trace
+  # is formatted, other format callbacks are applied when the event is
+  # recorded since they are specific to a binary data format.
+  _DEFERRED_FORMAT_CALLBACKS = frozenset([
+      '_FormatDataInHexadecimal',
+      '_FormatIntegerAsDecimal',
+      '_FormatIntegerAsFiletime',
+      '_FormatIntegerAsHexadecimal2',
+      '_FormatIntegerAsHexadecimal4',
+      '_FormatIntegerAsHexadecimal8'])
+
+  def __init__(self, path):
+    """Initializes a debug trace output writer.
+
+    Args:
+      path (str): path of the debug trace file.
+    """
+    super(DebugTraceOutputWriter, self).__init__()
+    self._file_object = None
+    self._path = path
+
+  def _EncodeValue(self, value, encoded_values):
+    """Encodes a value.
+
+    Values of types that cannot be encoded, including tuples, are encoded as
+    their string representation, which is how they are formatted.
+
+    Args:
+      value (object): value.
+      encoded_values (list[bytes]): encoded values to append to.
+    """
+    if value is None:
+      encoded_values.append(bytes([self.VALUE_TAG_NONE]))
+
+    elif isinstance(value, bool):
+      encoded_values.append(bytes([self.VALUE_TAG_BOOLEAN, int(value)]))
+
+    elif isinstance(value, int):
+      if -0x8000000000000000 <= value <= 0x7fffffffffffffff:
+        encoded_values.append(self._INTEGER.pack(self.VALUE_TAG_INTEGER, value))
+      else:
+        encoded_value = f'{value:d}'.encode('ascii')
+        encoded_values.append(self._SIZE.pack(
+            self.VALUE_TAG_LARGE_INTEGER, len(encoded_value)))
+        encoded_values.append(encoded_value)
+
+    elif isinstance(value, float):
+      encoded_values.append(self._FLOAT.pack(self.VALUE_TAG_FLOAT, value))
+
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+      encoded_values.append(self._SIZE.pack(self.VALUE_TAG_BYTES, len(value)))
+      encoded_values.append(bytes(value))
+
+    elif isinstance(value, list):
+      encoded_values.append(self._SIZE.pack(self.VALUE_TAG_LIST, len(value)))
+      for list_value in value:
+        self._EncodeValue(list_value, encoded_values)
+
+    else:
+      encoded_value = f'{value!s}'.encode('utf-8', errors='surrogatepass')
+      encoded_values.append(self._SIZE.pack(
+          self.VALUE_TAG_STRING, len(encoded_value)))
+      encoded_values.append(encoded_value)
+
+  def _WriteEvent(self, event_type, *values):
+    """Writes an event.
+
+    Args:
+      event_type (int): event type.
+      values (list[object]): values of the event.
+    """
+    encoded_values = [None]
+    for value in values:
+      # Strings and integers, the most common values, are encoded inline.
+      value_type = type(value)
+      if value_type is str:
+        encoded_value = value.encode('utf-8', errors='surrogatepass')
+        encoded_values.append(self._SIZE.pack(
+            self.VALUE_TAG_STRING, len(encoded_value)))
+        encoded_values.append(encoded_value)
+
+      elif value_type is int and (
+          -0x8000000000000000 <= value <= 0x7fffffffffffffff):
+        encoded_values.append(self._INTEGER.pack(self.VALUE_TAG_INTEGER, value))
+
+      else:
+        self._EncodeValue(value, encoded_values)
+
+    encoded_values[0] = b''
+    event_data_size = sum(map(len, encoded_values))
+    encoded_values[0] = self._EVENT_HEADER.pack(event_type, event_data_size)
+
+    self._file_object.write(b''.join(encoded_values))
+
+  def Close(self):
+    """Closes the output writer."""
+    if self._file_object:
+      self._file_object.close()
+      self._file_object = None
+
+  def DebugPrintData(self, description, data):
+    """Prints data for debugging.
+
+    Args:
+      description (str): description.
+      data (bytes): data.
+    """
+    self._WriteEvent(self.EVENT_TYPE_DEBUG_PRINT_DATA, description, data)
+
+  def DebugPrintFiletimeValue(self, description, value):
+    """Prints a FILETIME timestamp value for debugging.
+
+    Args:
+      description (str): description.
+      value (int): FILETIME timestamp value.
+    """
+    self._WriteEvent(
+        self.EVENT_TYPE_DEBUG_PRINT_FILETIME_VALUE, description, value)
+
+  def DebugPrintStructure(self, description, file_offset, name, data):
+    """Prints the data of a structure for debugging.
+
+    Args:
+      description (str): description of the structure.
+      file_offset (int): offset of the structure data relative to the start
+          of the file-like object.
+      name (str): name of the data type of the structure.
+      data (bytes): data of the structure.
+    """
+    self._WriteEvent(
+        self.EVENT_TYPE_DEBUG_PRINT_STRUCTURE, description, file_offset, name,
+        data)
+
+  def DebugPrintStructureObject(
+      self, structure_object, debug_info, binary_data_format):
+    """Prints structure object debug information.
+
+    Args:
+      structure_object (object): structure object.
+      debug_info (list[tuple[str, str, int]]): debug information.
+      binary_data_format (BinaryDataFormat): binary data format that defines
+          the format callbacks of the debug information.
+    """
+    attributes = []
+    for attribute_name, description, value_format_callback in debug_info:
+      attribute_value = getattr(structure_object, attribute_name, None)
+
+      if (attribute_value is not None and value_format_callback and
+          value_format_callback not in self._DEFERRED_FORMAT_CALLBACKS):
+        value_format_function = getattr(
+            binary_data_format, value_format_callback, None)
+        if value_format_function:
+          attribute_value = value_format_function(attribute_value)
+
+        value_format_callback = None
+
+      attributes.append([
+          attribute_name, description, value_format_callback,
+          attribute_value])
+
+    self._WriteEvent(self.EVENT_TYPE_DEBUG_PRINT_STRUCTURE_OBJECT, attributes)
+
+  def DebugPrintText(self, text):
+    """Prints text for debugging.
+
+    Args:
+      text (str): text.
+    """
+    self._WriteEvent(self.EVENT_TYPE_DEBUG_PRINT_TEXT, text)
+
+  def DebugPrintValue(self, description, value):
+    """Prints a value for debugging.
+
+    Args:
+      description (str): description.
+      value (object): value.
+    """
+    self._WriteEvent(self.EVENT_TYPE_DEBUG_PRINT_VALUE, description, value)
+
+  def Open(self):
+    """Opens the output writer.
+
+    Returns:
+      bool: True if successful or False if not.
+    """
+    try:
+      # pylint: disable=consider-using-with
+      self._file_object = open(self._path, 'wb', buffering=1024 * 1024)
+    except OSError:
+      return False
+
+    self._file_object.write(self._HEADER.pack(
+        self.SIGNATURE, self.FORMAT_VERSION))
+    return True
+
+  def WriteDebugData(self, description, data):
+    """Writes data for debugging.
+
+    Args:
+      description (str): description.
+      data (bytes): data.
+    """
+    self._WriteEvent(self.EVENT_TYPE_WRITE_DEBUG_DATA, description, data)
+
+  def WriteFiletimeValue(self, description, value):
+    """Writes a FILETIME timestamp value.
+
+    Args:
+      description (str): description.
+      value (int): FILETIME timestamp value.
+    """
+    self._WriteEvent(self.EVENT_TYPE_WRITE_FILETIME_VALUE, description, value)
+
+  def WriteIntegerValueAsDecimal(self, description, value):
+    """Writes an integer value as decimal.
+
+    Args:
+      description (str): description.
+      value (int): integer value.
+    """
+    self._WriteEvent(
+        self.EVENT_TYPE_WRITE_INTEGER_VALUE_AS_DECIMAL, description, value)
+
+  def WriteText(self, text):
+    """Writes text.
+
+    Args:
+      text (str): text to write.
+    """
+    self._WriteEvent(self.EVENT_TYPE_WRITE_TEXT, text)
+
+  def WriteValue(self, description, value):
+    """Writes a value.
+
+    Args:
+      description (str): description.
+      value (object): value.
+    """
+    self._WriteEvent(self.EVENT_TYPE_WRITE_VALUE, description, value)
+
+
+class DebugTraceReader(object):
+  """Debug trace reader."""
+
+  _EVENT_HEADER = DebugTraceOutputWriter._EVENT_HEADER  # pylint: disable=protected-access
+
+  _HEADER = DebugTraceOutputWriter._HEADER  # pylint: disable=protected-access
+
+  _INTEGER = struct.Struct('<q')
+
+  _FLOAT = struct.Struct('<d')
+
+  _SIZE = struct.Struct('<I')
+
+  def __init__(self, file_object):
+    """Initializes a debug trace reader.
+
+    Args:
+      file_object (file): binary file-like object to read from.
+    """
+    super(DebugTraceReader, self).__init__()
+    self._file_object = file_object
+
+  def _DecodeValue(self, data, offset):
+    """Decodes a value.
+
+    Args:
+      data (bytes): event data.
+      offset (int): offset of the value relative to the start of the event
+          data.
+
+    Returns:
+      tuple[object, int]: value and offset of the next value.
+
+    Raises:
+      ParseError: if the value is not supported.
+    """
+    try:
+      value_tag = data[offset]
+      offset += 1
+
+      if value_tag == DebugTraceOutputWriter.VALUE_TAG_NONE:
+        return None, offset
+
+      if value_tag == DebugTraceOutputWriter.VALUE_TAG_BOOLEAN:
+        return bool(data[offset]), offset + 1
+
+      if value_tag == DebugTraceOutputWriter.VALUE_TAG_INTEGER:
+        (value, ) = self._INTEGER.unpack_from(data, offset)
+        return value, offset + 8
+
+      if value_tag == DebugTraceOutputWriter.VALUE_TAG_FLOAT:
+        (value, ) = self._FLOAT.unpack_from(data, offset)
+        return value, offset + 8
+
+      (size, ) = self._SIZE.unpack_from(data, offset)
+      offset += 4
+
+      if value_tag == DebugTraceOutputWriter.VALUE_TAG_LIST:
+        values = []
+        for _ in range(size):
+          value, offset = self._DecodeValue(data, offset)
+          values.append(value)
+
+        return values, offset
+
+      value_data = data[offset:offset + size]
+      if len(value_data) != size:
+        raise errors.ParseError('Value data too small.')
+
+      if value_tag == DebugTraceOutputWriter.VALUE_TAG_BYTES:
+        return value_data, offset + size
+
+      if value_tag == DebugTraceOutputWriter.VALUE_TAG_LARGE_INTEGER:
+        return int(value_data, 10), offset + size
+
+      if value_tag == DebugTraceOutputWriter.VALUE_TAG_STRING:
+        return value_data.decode('utf-8', errors='surrogatepass'), (
+            offset + size)
+
+    except (
+        IndexError, struct.error, UnicodeDecodeError, ValueError) as exception:
+      raise errors.ParseError(
+          f'Unable to decode value with error: {exception!s}')
+
+    raise errors.ParseError(f'Unsupported value tag: {value_tag:d}')
+
+  def ReadEvents(self):
+    """Reads the events of the debug trace.
+
+    Yields:
+      tuple[int, list[object]]: event type and values of the event.
+
+    Raises:
+      ParseError: if the debug trace is not supported.
+    """
+    header_data = self._file_object.read(self._HEADER.size)
+    if len(header_data) != self._HEADER.size:
+      raise errors.ParseError('Debug trace header too small.')
+
+    signature, format_version = self._HEADER.unpack(header_data)
+    if signature != DebugTraceOutputWriter.SIGNATURE:
+      raise errors.ParseError('Unsupported debug trace signature.')
+
+    if format_version != DebugTraceOutputWriter.FORMAT_VERSION:
+      raise errors.ParseError(
+          f'Unsupported debug trace format version: {format_version:d}.')
+
+    while True:
+      event_header_data = self._file_object.read(self._EVENT_HEADER.size)
+      if not event_header_data:
+        break
+
+      if len(event_header_data) != self._EVENT_HEADER.size:
+        raise errors.ParseError('Debug trace event header too small.')
+
+      event_type, event_data_size = self._EVENT_HEADER.unpack(
+          event_header_data)
+
+      event_data = self._file_object.read(event_data_size)
+      if len(event_data) != event_data_size:
+        raise errors.ParseError('Debug trace event data too small.')
+
+      values = []
+      offset = 0
+      while offset < event_data_size:
+        value, offset = self._DecodeValue(event_data, offset)
+        values.append(value)
+
+      yield event_type, values
+
+
+class DebugTraceFormatter(object):
+  """Formats a debug trace by replaying its events on an output writer."""
+
+  def __init__(self, output_writer, structures=False):
+    """Initializes a debug trace formatter.
+
+    Args:
+      output_writer (OutputWriter): output writer.
+      structures (Optional[bool]): True if the data of structures should be
+          formatted, which is not part of the debug output.
+    """
+    super(DebugTraceFormatter, self).__init__()
+    self._binary_data_format = data_format.BinaryDataFormat()
+    self._output_writer = output_writer
+    self._structures = structures
+
+    self._functions_per_event_type = {
+        DebugTraceOutputWriter.EVENT_TYPE_DEBUG_PRINT_DATA: (
+            output_writer.DebugPrintData),
+        DebugTraceOutputWriter.EVENT_TYPE_DEBUG_PRINT_FILETIME_VALUE: (
+            output_writer.DebugPrintFiletimeValue),
+        DebugTraceOutputWriter.EVENT_TYPE_DEBUG_PRINT_STRUCTURE: (
+            self._FormatStructure),
+        DebugTraceOutputWriter.EVENT_TYPE_DEBUG_PRINT_STRUCTURE_OBJECT: (
+            self._FormatStructureObject),
+        DebugTraceOutputWriter.EVENT_TYPE_DEBUG_PRINT_TEXT: (
+            output_writer.DebugPrintText),
+        DebugTraceOutputWriter.EVENT_TYPE_DEBUG_PRINT_VALUE: (
+            output_writer.DebugPrintValue),
+        DebugTraceOutputWriter.EVENT_TYPE_WRITE_DEBUG_DATA: (
+            output_writer.WriteDebugData),
+        DebugTraceOutputWriter.EVENT_TYPE_WRITE_FILETIME_VALUE: (
+            output_writer.WriteFiletimeValue),
+        DebugTraceOutputWriter.EVENT_TYPE_WRITE_INTEGER_VALUE_AS_DECIMAL: (
+            output_writer.WriteIntegerValueAsDecimal),
+        DebugTraceOutputWriter.EVENT_TYPE_WRITE_TEXT: (
+            output_writer.WriteText),
+        DebugTraceOutputWriter.EVENT_TYPE_WRITE_VALUE: (
+            output_writer.WriteValue)}
+
+  def _FormatStructure(self, description, file_offset, name, data):
+    """Formats the data of a structure.
+
+    Args:
+      description (str): description of the structure.
+      file_offset (int): offset of the structure data relative to the start
+          of the file-like object.
+      name (str): name of the data type of the structure.
+      data (bytes): data of the structure.
+    """
+    if self._structures:
+      self._output_writer.DebugPrintData((
+          f'{description:s} ({name:s}) at offset: 0x{file_offset:08x}'), data)
+
+  def _FormatStructureObject(self, attributes):
+    """Formats structure object debug information.
+
+    Args:
+      attributes (list[list[object]]): attribute name, description, format
+          callback and value of the attributes of the structure object.
+    """
+    structure_object = types.SimpleNamespace()
+    debug_info = []
+
+    # The same attribute can be formatted multiple times with a different
+    # format callback, hence every entry is stored as a separate attribute.
+    for index, (_, description, value_format_callback, value) in enumerate(
+        attributes):
+      attribute_name = f'attribute{index:d}'
+      setattr(structure_object, attribute_name, value)
+      debug_info.append((attribute_name, description, value_format_callback))
+
+    self._output_writer.DebugPrintStructureObject(
+        structure_object, debug_info, self._binary_data_format)
+
+  def Format(self, reader):
+    """Formats a debug trace.
+
+    Args:
+      reader (DebugTraceReader): debug trace reader.
+
+    Raises:
+      ParseError: if the debug trace is not supported.
+    """
+    for event_type, values in reader.ReadEvents():
+      function = self._functions_per_event_type.get(event_type, None)
+      if not function:
+        raise errors.ParseError(f'Unsupported event type: {event_type:d}')
+
+      try:
+        function(*values)
+      except TypeError as exception:
+        raise errors.ParseError((
+            f'Unsupported values of event type: {event_type:d} with error: '
+            f'{exception!s}'))
@@ -136,6 +136,11 @@ class WindowsRegistryKeyPathPrefixFilter(BaseWindowsRegistryKeyFilter):
     super(WindowsRegistryKeyPathPrefixFilter, self).__init__()
     self._key_path_prefix = key_path_prefix
 
+  @property
+  def key_path_prefix(self):
+    """str: key path prefix."""
+    return self._key_path_prefix
+
   def Match(self, registry_key):
     """Determines if a Windows Registry key matches the filter.
 
@@ -145,7 +150,7 @@ class WindowsRegistryKeyPathPrefixFilter(BaseWindowsRegistryKeyFilter):
     Returns:
       bool: True if a match, False otherwise.
     """
-    return registry_key.path.startsswith(self._key_path_prefix)
+    return registry_key.path.startswith(self._key_path_prefix)
 
 
 class WindowsRegistryKeyPathSuffixFilter(BaseWindowsRegistryKeyFilter):
@@ -160,6 +165,11 @@ class WindowsRegistryKeyPathSuffixFilter(BaseWindowsRegistryKeyFilter):
     super(WindowsRegistryKeyPathSuffixFilter, self).__init__()
     self._key_path_suffix = key_path_suffix
 
+  @property
+  def key_path_suffix(self):
+    """str: key path suffix."""
+    return self._key_path_suffix
+
   def Match(self, registry_key):
     """Determines if a Windows Registry key matches the filter.
 
@@ -173,10 +183,21 @@ class WindowsRegistryKeyPathSuffixFilter(BaseWindowsRegistryKeyFilter):
 
 
 class WindowsRegistryKeyWithValuesFilter(BaseWindowsRegistryKeyFilter):
-  """Windows Registry key with values filter."""
+  """Windows Registry key with values filter.
+
+  A small number of value names is matched by looking up the values by name,
+  which stops at the first value that is missing, instead of retrieving
+  the names of all the values in the key.
+  """
 
   _EMPTY_SET = frozenset()
 
+  # Maximum number of value names that are looked up by name, more value
+  # names are matched against the names of all the values in the key. Note
+  # that looking up a value by name in a REGF file scans the list of values
+  # of the key.
+  _MAXIMUM_NUMBER_OF_PROBED_VALUE_NAMES = 32
+
   def __init__(self, value_names):
     """Initializes a Windows Registry key filter.
 
@@ -186,8 +207,31 @@ class WindowsRegistryKeyWithValuesFilter(BaseWindowsRegistryKeyFilter):
     super(WindowsRegistryKeyWithValuesFilter, self).__init__()
     self._value_names = frozenset(value_names)
 
-  def Match(self, registry_key):
-    """Determines if a Windows Registry key matches the filter.
+  @property
+  def value_names(self):
+    """frozenset[str]: value names that should be present in the key."""
+    return self._value_names
+
+  def _MatchByProbing(self, registry_key):
+    """Determines if a key matches by looking up the values by name.
+
+    Args:
+      registry_key (dfwinreg.WinRegistryKey): a Windows Registry key.
+
+    Returns:
+      bool: True if a match, False otherwise.
+    """
+    for value_name in self._value_names:
+      registry_value = registry_key.GetValueByName(value_name)
+      # Note that the value name comparison is case sensitive, as in
+      # _MatchByValueNames.
+      if not registry_value or registry_value.name != value_name:
+        return False
+
+    return True
+
+  def _MatchByValueNames(self, registry_key):
+    """Determines if a key matches by retrieving the names of all its values.
 
     Args:
       registry_key (dfwinreg.WinRegistryKey): a Windows Registry key.
@@ -199,3 +243,373 @@ class WindowsRegistryKeyWithValuesFilter(BaseWindowsRegistryKeyFilter):
         registry_value.name for registry_value in registry_key.GetValues()])
 
     return self._value_names.issubset(value_names)
+
+  def Match(self, registry_key):
+    """Determines if a Windows Registry key matches the filter.
+
+    Args:
+      registry_key (dfwinreg.WinRegistryKey): a Windows Registry key.
+
+    Returns:
+      bool: True if a match, False otherwise.
+    """
+    if len(self._value_names) <= self._MAXIMUM_NUMBER_OF_PROBED_VALUE_NAMES:
+      return self._MatchByProbing(registry_key)
+
+    if registry_key.number_of_values < len(self._value_names):
+      return False
+
+    return self._MatchByValueNames(registry_key)
+
+
+class _KeyFilterTrieNode(object):
+  """Key path segment trie node.
+
+  Attributes:
+    control_set_node (_KeyFilterTrieNode): child node for control set key
+        names, such as "ControlSet001", or None if not set.
+    key_filters (list[BaseWindowsRegistryKeyFilter]): filters that match
+        the key path of the node.
+    literal_nodes (dict[str, _KeyFilterTrieNode]): child nodes per key name,
+        which is upper case in the key path trie.
+    partial_key_filters (list[tuple[str, object]]): filters that match
+        a child key and all its descendants, if the name of the child key
+        starts with the string, or child nodes if the name of the child key
+        ends with the string for suffix filters.
+  """
+
+  def __init__(self):
+    """Initializes a key path segment trie node."""
+    super(_KeyFilterTrieNode, self).__init__()
+    self.control_set_node = None
+    self.key_filters = []
+    self.literal_nodes = {}
+    self.partial_key_filters = []
+
+  def GetChildNode(self, key_name):
+    """Retrieves or creates a child node.
+
+    Args:
+      key_name (str): key name, which is upper case in the key path trie.
+
+    Returns:
+      _KeyFilterTrieNode: child node.
+    """
+    child_node = self.literal_nodes.get(key_name, None)
+    if not child_node:
+      child_node = _KeyFilterTrieNode()
+      self.literal_nodes[key_name] = child_node
+
+    return child_node
+
+  def GetControlSetNode(self):
+    """Retrieves or creates the child node for control set key names.
+
+    Returns:
+      _KeyFilterTrieNode: child node.
+    """
+    if not self.control_set_node:
+      self.control_set_node = _KeyFilterTrieNode()
+
+    return self.control_set_node
+
+
+class KeyFilterState(object):
+  """State of matching a key path against a compiled key filter set.
+
+  The state of a key is derived from the state of its parent key, which
+  allows a tree walk to match every key with a single trie descent step.
+
+  Attributes:
+    nodes (list[_KeyFilterTrieNode]): key path trie nodes that correspond to
+        the key path.
+    prefix_filters (list[BaseWindowsRegistryKeyFilter]): key path prefix
+        filters that match the key path and all its descendants.
+    prefix_nodes (list[_KeyFilterTrieNode]): key path prefix trie nodes that
+        correspond to the key path.
+    suffix_nodes (list[_KeyFilterTrieNode]): key path suffix trie nodes that
+        correspond to the trailing key path segments.
+  """
+
+  def __init__(
+      self, nodes=None, prefix_filters=None, prefix_nodes=None,
+      suffix_nodes=None):
+    """Initializes the state of matching a key path.
+
+    Args:
+      nodes (Optional[list[_KeyFilterTrieNode]]): key path trie nodes that
+          correspond to the key path.
+      prefix_filters (Optional[list[BaseWindowsRegistryKeyFilter]]): key path
+          prefix filters that match the key path and all its descendants.
+      prefix_nodes (Optional[list[_KeyFilterTrieNode]]): key path prefix trie
+          nodes that correspond to the key path.
+      suffix_nodes (Optional[list[_KeyFilterTrieNode]]): key path suffix trie
+          nodes that correspond to the trailing key path segments.
+    """
+    super(KeyFilterState, self).__init__()
+    self.nodes = nodes or []
+    self.prefix_filters = prefix_filters or []
+    self.prefix_nodes = prefix_nodes or []
+    self.suffix_nodes = suffix_nodes or []
+
+
+class CompiledKeyFilterSet(object):
+  """Set of Windows Registry key filters compiled into a key path trie.
+
+  Key path, key path prefix and key path suffix filters are compiled into
+  tries of key path segments, with the CurrentControlSet and Wow6432Node key
+  path variants of key path filters precomputed. The filters that match a key
+  are determined with a single descent of the key path, or a single step per
+  key when the state of the parent key is reused during a tree walk. A key
+  matches the same filters as their Match function, hence key names are
+  matched case-insensitively for key path filters and case-sensitively for
+  key path prefix and suffix filters.
+
+  Other filters, such as key with values filters, are matched by calling
+  their Match function.
+  """
+
+  _CONTROL_SET_KEY_PATH_SEGMENTS = [
+      'HKEY_LOCAL_MACHINE', 'SYSTEM', 'CURRENTCONTROLSET']
+
+  def __init__(self, key_filters):
+    """Initializes a compiled key filter set.
+
+    Args:
+      key_filters (list[BaseWindowsRegistryKeyFilter]): key filters.
+    """
+    super(CompiledKeyFilterSet, self).__init__()
+    self._key_filters = list(key_filters)
+    self._key_filter_indexes = {}
+    self._other_key_filters = []
+    self._prefix_root_node = _KeyFilterTrieNode()
+    self._root_node = _KeyFilterTrieNode()
+    self._suffix_root_node = _KeyFilterTrieNode()
+
+    for key_filter_index, key_filter in enumerate(self._key_filters):
+      self._key_filter_indexes[id(key_filter)] = key_filter_index
+      self._AddKeyFilter(key_filter)
+
+  def _AddKeyFilter(self, key_filter):
+    """Adds a key filter to the tries.
+
+    Args:
+      key_filter (BaseWindowsRegistryKeyFilter): key filter.
+    """
+    if isinstance(key_filter, WindowsRegistryKeyPathFilter):
+      for key_path in key_filter.key_paths:
+        # A key path with an empty key path segment, such as the Wow6432Node
+        # variant of "HKEY_CURRENT_USER\Software", never matches.
+        key_path_segments = key_path.upper().split('\\')
+        if not all(key_path_segments):
+          continue
+
+        node = self._root_node
+        for key_path_segment in key_path_segments:
+          node = node.GetChildNode(key_path_segment)
+        node.key_filters.append(key_filter)
+
+        if (key_path_segments[:3] == self._CONTROL_SET_KEY_PATH_SEGMENTS and
+            len(key_path_segments) > 3):
+          node = self._root_node
+          for key_path_segment in key_path_segments[:2]:
+            node = node.GetChildNode(key_path_segment)
+
+          node = node.GetControlSetNode()
+          for key_path_segment in key_path_segments[3:]:
+            node = node.GetChildNode(key_path_segment)
+          node.key_filters.append(key_filter)
+
+    elif isinstance(key_filter, WindowsRegistryKeyPathPrefixFilter):
+      # The last key path segment of the prefix can be a partial key name.
+      # A prefix that ends with a key path separator matches all descendants
+      # since every key name starts with the empty string.
+      key_path_segments = key_filter.key_path_prefix.split('\\')
+
+      node = self._prefix_root_node
+      for key_path_segment in key_path_segments[:-1]:
+        node = node.GetChildNode(key_path_segment)
+      node.partial_key_filters.append((key_path_segments[-1], key_filter))
+
+    elif isinstance(key_filter, WindowsRegistryKeyPathSuffixFilter):
+      # The first key path segment of the suffix can be a partial key name.
+      # A suffix that ends with a key path separator never matches.
+      key_path_segments = key_filter.key_path_suffix.split('\\')
+      if key_path_segments[-1] or len(key_path_segments) == 1:
+        if key_path_segments[0] or len(key_path_segments) == 1:
+          node = _KeyFilterTrieNode()
+          self._suffix_root_node.partial_key_filters.append(
+              (key_path_segments[0], node))
+        else:
+          key_path_segments = key_path_segments[1:]
+          node = self._suffix_root_node.GetChildNode(key_path_segments[0])
+
+        for key_path_segment in key_path_segments[1:]:
+          node = node.GetChildNode(key_path_segment)
+        node.key_filters.append(key_filter)
+
+    else:
+      self._other_key_filters.append(key_filter)
+
+  def _IsControlSetKeyName(self, key_name_upper):
+    """Determines if a key name is that of a control set, such as ControlSet001.
+
+    Args:
+      key_name_upper (str): upper case key name.
+
+    Returns:
+      bool: True if the key name is that of a control set.
+    """
+    if not key_name_upper.startswith('CONTROLSET'):
+      return False
+
+    try:
+      int(key_name_upper[10:], 10)
+    except ValueError:
+      return False
+
+    return True
+
+  def CanMatchDescendants(self, state):
+    """Determines if descendants of a key can match any of the filters.
+
+    This allows a tree walk to skip the descendants of a key.
+
+    Args:
+      state (KeyFilterState): state of the key.
+
+    Returns:
+      bool: True if the descendants of the key can match any of the filters.
+    """
+    if (state.prefix_filters or self._suffix_root_node.literal_nodes or
+        self._suffix_root_node.partial_key_filters or
+        self._other_key_filters):
+      return True
+
+    for node in state.prefix_nodes:
+      if node.literal_nodes or node.partial_key_filters:
+        return True
+
+    for node in state.nodes:
+      if node.literal_nodes or node.control_set_node:
+        return True
+
+    return False
+
+  def GetChildState(self, state, key_name):
+    """Determines the state of a child key.
+
+    Args:
+      state (KeyFilterState): state of the parent key.
+      key_name (str): name of the child key.
+
+    Returns:
+      KeyFilterState: state of the child key.
+    """
+    key_name_upper = key_name.upper()
+    is_control_set = None
+
+    nodes = []
+    for node in state.nodes:
+      child_node = node.literal_nodes.get(key_name_upper, None)
+      if child_node:
+        nodes.append(child_node)
+
+      if node.control_set_node:
+        if is_control_set is None:
+          is_control_set = self._IsControlSetKeyName(key_name_upper)
+        if is_control_set:
+          nodes.append(node.control_set_node)
+
+    prefix_nodes = []
+    prefix_filters = state.prefix_filters
+    for node in state.prefix_nodes:
+      child_node = node.literal_nodes.get(key_name, None)
+      if child_node:
+        prefix_nodes.append(child_node)
+
+      for key_name_prefix, key_filter in node.partial_key_filters:
+        if key_name.startswith(key_name_prefix):
+          if prefix_filters is state.prefix_filters:
+            prefix_filters = list(state.prefix_filters)
+          prefix_filters.append(key_filter)
+
+    suffix_nodes = []
+    child_node = self._suffix_root_node.literal_nodes.get(key_name, None)
+    if child_node:
+      suffix_nodes.append(child_node)
+
+    for key_name_suffix, child_node in (
+        self._suffix_root_node.partial_key_filters):
+      if key_name.endswith(key_name_suffix):
+        suffix_nodes.append(child_node)
+
+    for node in state.suffix_nodes:
+      child_node = node.literal_nodes.get(key_name, None)
+      if child_node:
+        suffix_nodes.append(child_node)
+
+    return KeyFilterState(
+        nodes=nodes, prefix_filters=prefix_filters, prefix_nodes=prefix_nodes,
+        suffix_nodes=suffix_nodes)
+
+  def GetMatchingFilters(self, registry_key, state=None):
+    """Retrieves the filters that match a Windows Registry key.
+
+    Args:
+      registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+      state (Optional[KeyFilterState]): state of the key, where None
+          represents the state is determined from the key path.
+
+    Returns:
+      list[BaseWindowsRegistryKeyFilter]: filters that match the key, in
+          the order they were provided.
+    """
+    if state is None:
+      state = self.GetStateByPath(registry_key.path)
+
+    matching_filters = {}
+    for node in state.nodes:
+      for key_filter in node.key_filters:
+        matching_filters[id(key_filter)] = key_filter
+
+    for key_filter in state.prefix_filters:
+      matching_filters[id(key_filter)] = key_filter
+
+    for node in state.suffix_nodes:
+      for key_filter in node.key_filters:
+        matching_filters[id(key_filter)] = key_filter
+
+    for key_filter in self._other_key_filters:
+      if key_filter.Match(registry_key):
+        matching_filters[id(key_filter)] = key_filter
+
+    return sorted(
+        matching_filters.values(),
+        key=lambda key_filter: self._key_filter_indexes[id(key_filter)])
+
+  def GetRootState(self):
+    """Retrieves the state of the virtual root key.
+
+    Returns:
+      KeyFilterState: state of the virtual root key, which has an empty key
+          path.
+    """
+    return KeyFilterState(
+        nodes=[self._root_node], prefix_nodes=[self._prefix_root_node])
+
+  def GetStateByPath(self, key_path):
+    """Determines the state of a key path.
+
+    Args:
+      key_path (str): key path.
+
+    Returns:
+      KeyFilterState: state of the key path.
+    """
+    state = self.GetRootState()
+    for key_name in key_path.split('\\'):
+      if key_name:
+        state = self.GetChildState(state, key_name)
+
+    return state
@@ -2,69 +2,98 @@
 """Function to provide hexadecimal representation of data."""
 
 
-_HEXDUMP_CHARACTER_MAP = [
-    '.' if byte < 0x20 or byte > 0x7e else chr(byte) for byte in range(256)]
+# Maps bytes that are not printable ASCII characters to ".".
+_HEXDUMP_TRANSLATION_TABLE = bytes(
+    0x2e if byte < 0x20 or byte > 0x7e else byte for byte in range(256))
 
+# Number of bytes formatted per chunk, which must be a multiple of 16.
+_CHUNK_SIZE = 4096
 
-def Hexdump(data):
-  """Formats data in a hexadecimal representation.
+
+def GenerateHexdump(data):
+  """Formats data in a hexadecimal representation incrementally.
+
+  The data is formatted per chunk of up to 256 lines of 16 bytes, such that
+  the hexadecimal representation of large data does not need to be held in
+  memory. Consecutive lines with the same 16 bytes are represented by "...",
+  except for the last line.
 
   Args:
-    data (byte): data.
+    data (bytes): data.
 
-  Returns:
-    str: hexadecimal representation of the data.
+  Yields:
+    str: hexadecimal representation of a chunk of the data, where every line
+        is terminated by an end-of-line character and the last chunk is
+        followed by an empty line.
   """
-  in_group = False
-  previous_hexadecimal_string = None
+  if not data:
+    yield '\n'
+    return
 
-  lines = []
   data_size = len(data)
-  for block_index in range(0, data_size, 16):
-    data_string = data[block_index:block_index + 16]
+  last_row_offset = data_size - 16
 
-    hexadecimal_byte_values = []
-    printable_values = []
-    for byte_value in data_string:
-      if isinstance(byte_value, str):
-        byte_value = ord(byte_value)
+  in_group = False
+  previous_row = None
 
-      hexadecimal_byte_values.append(f'{byte_value:02x}')
+  for chunk_offset in range(0, data_size, _CHUNK_SIZE):
+    chunk = bytes(data[chunk_offset:chunk_offset + _CHUNK_SIZE])
 
-      printable_value = _HEXDUMP_CHARACTER_MAP[byte_value]
-      printable_values.append(printable_value)
+    # Every byte is represented as 2 hexadecimal digits followed by a space.
+    hexadecimal_chunk = chunk.hex(' ')
+    printable_chunk = chunk.translate(_HEXDUMP_TRANSLATION_TABLE).decode(
+        'ascii')
 
-    remaining_size = 16 - len(data_string)
-    if remaining_size == 0:
-      whitespace = ''
-    elif remaining_size >= 8:
-      whitespace = ' ' * ((3 * remaining_size) - 1)
-    else:
-      whitespace = ' ' * (3 * remaining_size)
+    lines = []
+    for row_offset in range(0, len(chunk), 16):
+      row = chunk[row_offset:row_offset + 16]
+      block_index = chunk_offset + row_offset
 
-    hexadecimal_string_part1 = ' '.join(hexadecimal_byte_values[0:8])
-    hexadecimal_string_part2 = ' '.join(hexadecimal_byte_values[8:16])
-    hexadecimal_string = (
-        f'{hexadecimal_string_part1:s}  {hexadecimal_string_part2:s}'
-        f'{whitespace:s}')
+      # A full row is never the last row if more data follows, hence rows
+      # only match if they are both full.
+      if row == previous_row and block_index < last_row_offset:
+        if not in_group:
+          in_group = True
 
-    if (previous_hexadecimal_string is not None and
-        previous_hexadecimal_string == hexadecimal_string and
-        block_index + 16 < data_size):
+          lines.append('...\n')
 
-      if not in_group:
-        in_group = True
+        continue
 
-        lines.append('...')
+      hexadecimal_offset = row_offset * 3
+      if len(row) == 16:
+        hexadecimal_string = ''.join([
+            hexadecimal_chunk[hexadecimal_offset:hexadecimal_offset + 23],
+            '  ',
+            hexadecimal_chunk[hexadecimal_offset + 24:hexadecimal_offset + 47]])
+      else:
+        hexadecimal_string = (
+            f'{row[:8].hex(" "):s}  {row[8:].hex(" "):s}'.ljust(48))
 
-    else:
-      printable_string = ''.join(printable_values)
+      printable_string = printable_chunk[row_offset:row_offset + 16]
 
       lines.append(
-          f'0x{block_index:08x}  {hexadecimal_string:s}  {printable_string:s}')
+          f'0x{block_index:08x}  {hexadecimal_string:s}  '
+          f'{printable_string:s}\n')
 
       in_group = False
-      previous_hexadecimal_string = hexadecimal_string
+      previous_row = row
+
+    if chunk_offset + _CHUNK_SIZE >= data_size:
+      lines.append('\n')
+
+    # A chunk of which all lines are represented by a preceding "..." has
+    # no lines.
+    if lines:
+      yield ''.join(lines)
 
-  lines.extend(['', ''])
-  return '\n'.join(lines)
+
+def Hexdump(data):
+  """Formats data in a hexadecimal representation.
+
+  Args:
+    data (byte): data.
+
+  Returns:
+    str: hexadecimal representation of the data.
+  """
+  return ''.join(GenerateHexdump(data))
@@ -47,6 +47,8 @@ class MostRecentlyUsedCollector(data_format.BinaryDataFormat):
 
   _DEFINITION_FILE = 'mru.yaml'
 
+  _CURRENT_USER_CLASSES_KEY_PATH = 'HKEY_CURRENT_USER\\Software\\Classes'
+
   _OPENSAVE_MRU_KEY_PATH = (
       'HKEY_CURRENT_USER\\Software\\Microsoft\\Windows\\CurrentVersion\\'
       'Explorer\\ComDlg32\\OpenSaveMRU').upper()
@@ -127,26 +129,33 @@ class MostRecentlyUsedCollector(data_format.BinaryDataFormat):
 
     return False
 
-  def _ProcessKey(self, registry_key):
-    """Processes a Windows Registry key.
+  def _ProcessCurrentUserClassesKey(self, registry):
+    """Processes the current user classes key and its subkeys.
 
     Args:
-      registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+      registry (dfwinreg.WinRegistry): Windows Registry.
 
     Returns:
       bool: True if a Most Recently Used (MRU) key was found, False if not.
     """
-    result = False
-    value_names = [
-        registry_value.name for registry_value in registry_key.GetValues()]
+    # Fallback for if source is a single UsrClass.dat file.
+    current_user_classes_key = registry.GetKeyByPath(
+        self._CURRENT_USER_CLASSES_KEY_PATH)
+    if not current_user_classes_key:
+      return False
 
-    if 'MRUList' in value_names:
-      if self._ProcessKeyWithMRUListValue(registry_key):
-        result = True
+    return self._ProcessKey(current_user_classes_key)
 
-    elif 'MRUListEx' in value_names:
-      if self._ProcessKeyWithMRUListExValue(registry_key):
-        result = True
+  def _ProcessKey(self, registry_key):
+    """Processes a Windows Registry key and its subkeys.
+
+    Args:
+      registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+
+    Returns:
+      bool: True if a Most Recently Used (MRU) key was found, False if not.
+    """
+    result = self._ProcessKeyValues(registry_key)
 
     for subkey in registry_key.GetSubkeys():
       if self._ProcessKey(subkey):
@@ -154,6 +163,28 @@ class MostRecentlyUsedCollector(data_format.BinaryDataFormat):
 
     return result
 
+  def _ProcessKeyValues(self, registry_key):
+    """Processes the values of a Windows Registry key.
+
+    Args:
+      registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+
+    Returns:
+      bool: True if the key is a Most Recently Used (MRU) key, False if not.
+    """
+    # Since every key is processed the MRUList and MRUListEx values are
+    # looked up by name instead of retrieving the names of all the values.
+    # Note that the value name comparison is case sensitive.
+    registry_value = registry_key.GetValueByName('MRUList')
+    if registry_value and registry_value.name == 'MRUList':
+      return self._ProcessKeyWithMRUListValue(registry_key)
+
+    registry_value = registry_key.GetValueByName('MRUListEx')
+    if registry_value and registry_value.name == 'MRUListEx':
+      return self._ProcessKeyWithMRUListExValue(registry_key)
+
+    return False
+
   def _ProcessKeyWithMRUListValue(self, registry_key):
     """Processes a Windows Registry key that contains a MRUList value.
 
@@ -353,17 +384,14 @@ class MostRecentlyUsedCollector(data_format.BinaryDataFormat):
     """
     value_data_size = len(value_data)
 
-    data_offset = 0
-    for data_offset in range(0, value_data_size, 2):
-      if value_data[data_offset:data_offset + 2] == b'\0\0':
-        data_offset += 2
-        break
+    string_size = self._GetUTF16StringSize(value_data)
+    data_offset = min(string_size + 2, value_data_size)
 
     if self._debug:
       self._output_writer.WriteDebugData(
           'String data', value_data[0:data_offset])
 
-    string = value_data[0:data_offset - 2].decode('utf-16-le')
+    string = value_data[0:string_size].decode('utf-16-le')
 
     if self._debug:
       self._output_writer.WriteValue('String', string)
@@ -387,17 +415,14 @@ class MostRecentlyUsedCollector(data_format.BinaryDataFormat):
     """
     value_data_size = len(value_data)
 
-    data_offset = 0
-    for data_offset in range(0, value_data_size, 2):
-      if value_data[data_offset:data_offset + 2] == b'\0\0':
-        data_offset += 2
-        break
+    string_size = self._GetUTF16StringSize(value_data)
+    data_offset = min(string_size + 2, value_data_size)
 
     if self._debug:
       self._output_writer.WriteDebugData(
           'String data', value_data[0:data_offset])
 
-    string = value_data[0:data_offset - 2].decode('utf-16-le')
+    string = value_data[0:string_size].decode('utf-16-le')
 
     if self._debug:
       self._output_writer.WriteValue('String', string)
@@ -423,17 +448,14 @@ class MostRecentlyUsedCollector(data_format.BinaryDataFormat):
     """
     value_data_size = len(value_data)
 
-    data_offset = 0
-    for data_offset in range(0, value_data_size, 2):
-      if value_data[data_offset:data_offset + 2] == b'\0\0':
-        data_offset += 2
-        break
+    string_size = self._GetUTF16StringSize(value_data)
+    data_offset = min(string_size + 2, value_data_size)
 
     if self._debug:
       self._output_writer.WriteDebugData(
           'String data', value_data[0:data_offset])
 
-    string = value_data[0:data_offset - 2].decode('utf-16-le')
+    string = value_data[0:string_size].decode('utf-16-le')
 
     if self._debug:
       self._output_writer.WriteValue('String', string)
@@ -448,6 +470,15 @@ class MostRecentlyUsedCollector(data_format.BinaryDataFormat):
         string=string, value_name=value_name)
     self.mru_entries.append(mru_entry)
 
+  def _WalkCompleted(self, registry):
+    """Processes the current user classes key after a walk, if needed.
+
+    Args:
+      registry (dfwinreg.WinRegistry): Windows Registry.
+    """
+    if not self.mru_entries:
+      self._ProcessCurrentUserClassesKey(registry)
+
   def Collect(self, registry):  # pylint: disable=arguments-differ
     """Collects Most Recently Used (MRU) entries.
 
@@ -465,11 +496,22 @@ class MostRecentlyUsedCollector(data_format.BinaryDataFormat):
         result = True
 
     if not result:
-      # Fallback for if source is a single UsrClass.dat file.
-      current_user_classes_key = registry.GetKeyByPath(
-          'HKEY_CURRENT_USER\\Software\\Classes')
-      if current_user_classes_key:
-        if self._ProcessKey(current_user_classes_key):
-          result = True
+      result = self._ProcessCurrentUserClassesKey(registry)
 
     return result
+
+  def SubscribeToWalker(self, walker):
+    """Subscribes to the current user keys of a Windows Registry key walker.
+
+    The Most Recently Used (MRU) entries are collected when the walker walks
+    the Windows Registry. As in Collect, every current user key is processed,
+    since a key with a MRUList or MRUListEx value can be stored anywhere, and
+    the current user classes key is processed after the walk if no MRU key
+    was found.
+
+    Args:
+      walker (WindowsRegistryKeyWalker): Windows Registry key walker.
+    """
+    walker.AddSubscription(
+        'HKEY_CURRENT_USER', self._ProcessKeyValues, recursive=True)
+    walker.AddWalkCompletedCallback(self._WalkCompleted)
@@ -2,85 +2,73 @@
 """Output writer."""
 
 import abc
+import json
+import operator
+import sys
 
 from dfdatetime import fat_date_time as dfdatetime_fat_date_time
 from dfdatetime import filetime as dfdatetime_filetime
+from dfdatetime import interface as dfdatetime_interface
 
 from winregrc import hexdump
 
 
-class OutputWriter(object):
-  """Output writer interface."""
-
-  # Note that redundant-returns-doc is broken for pylint 1.7.x
-  # pylint: disable=redundant-returns-doc
-
-  _HEXDUMP_CHARACTER_MAP = [
-      '.' if byte < 0x20 or byte > 0x7e else chr(byte) for byte in range(256)]
-
-  def _FormatDataInHexadecimal(self, data):
-    """Formats data in a hexadecimal representation.
+def _GetClassAttributeNames(record_class):
+  """Retrieves the attribute names that are defined by the class of a record.
 
-    Args:
-      data (bytes): data.
+  Args:
+    record_class (type): class of the record.
 
-    Returns:
-      str: hexadecimal representation of the data.
-    """
-    in_group = False
-    previous_hexadecimal_string = None
+  Returns:
+    set[str]: names of the slots and properties of the class.
+  """
+  attribute_names = set()
+  for base_class in record_class.__mro__:
+    slots = getattr(base_class, '__slots__', [])
+    if isinstance(slots, str):
+      slots = [slots]
 
-    lines = []
-    data_size = len(data)
-    for block_index in range(0, data_size, 16):
-      data_string = data[block_index:block_index + 16]
+    attribute_names.update(slots)
+    attribute_names.update([
+        name for name, value in vars(base_class).items()
+        if isinstance(value, property)])
 
-      hexadecimal_byte_values = []
-      printable_values = []
-      for byte_value in data_string:
-        if isinstance(byte_value, str):
-          byte_value = ord(byte_value)
+  return attribute_names
 
-        hexadecimal_byte_values.append(f'{byte_value:02x}')
 
-        printable_value = self._HEXDUMP_CHARACTER_MAP[byte_value]
-        printable_values.append(printable_value)
+def GetRecordAttributeNames(record):
+  """Retrieves the attribute names of a record.
 
-      remaining_size = 16 - len(data_string)
-      if remaining_size == 0:
-        whitespace = ''
-      elif remaining_size >= 8:
-        whitespace = ' ' * ((3 * remaining_size) - 1)
-      else:
-        whitespace = ' ' * (3 * remaining_size)
+  Args:
+    record (object): record.
 
-      hexadecimal_string_part1 = ' '.join(hexadecimal_byte_values[0:8])
-      hexadecimal_string_part2 = ' '.join(hexadecimal_byte_values[8:16])
-      hexadecimal_string = (
-          f'{hexadecimal_string_part1:s}  {hexadecimal_string_part2:s}'
-          f'{whitespace:s}')
+  Returns:
+    tuple[str]: names of the public instance attributes, slots and properties
+        of the record, in alphabetical order.
+  """
+  attribute_names = _GetClassAttributeNames(type(record))
+  attribute_names.update(getattr(record, '__dict__', {}).keys())
 
-      if (previous_hexadecimal_string is not None and
-          previous_hexadecimal_string == hexadecimal_string and
-          block_index + 16 < data_size):
+  return tuple(sorted(
+      name for name in attribute_names if not name.startswith('_')))
 
-        if not in_group:
-          in_group = True
 
-          lines.append('...')
+class OutputWriter(object):
+  """Output writer interface."""
 
-      else:
-        printable_string = ''.join(printable_values)
+  # Note that redundant-returns-doc is broken for pylint 1.7.x
+  # pylint: disable=redundant-returns-doc
 
-        lines.append(
-            f'0x{block_index:08x}  {hexadecimal_string:s}  '
-            f'{printable_string:s}')
+  def _FormatDataInHexadecimal(self, data):
+    """Formats data in a hexadecimal representation.
 
-        in_group = False
-        previous_hexadecimal_string = hexadecimal_string
+    Args:
+      data (bytes): data.
 
-    lines.extend(['', ''])
-    return '\n'.join(lines)
+    Returns:
+      str: hexadecimal representation of the data.
+    """
+    return hexdump.Hexdump(data)
 
   def _FormatFATDateTimeValue(self, value):
     """Formats a FAT date time value.
@@ -137,8 +125,49 @@ class OutputWriter(object):
     """
     self.WriteText(f'{description:s}:\n')
 
-    value_string = self._FormatDataInHexadecimal(data)
-    self.WriteText(value_string)
+    for text in hexdump.GenerateHexdump(data):
+      self.WriteText(text)
+
+  def DebugPrintFiletimeValue(self, description, value):
+    """Prints a FILETIME timestamp value for debugging.
+
+    Args:
+      description (str): description.
+      value (int): FILETIME timestamp value.
+    """
+    date_time_string = self._FormatFiletimeValue(value)
+    self.DebugPrintValue(description, date_time_string)
+
+  def DebugPrintStructure(self, description, file_offset, name, data):
+    """Prints the data of a structure for debugging.
+
+    The data of structures is only recorded by output writers that format
+    the debug information later, such as the debug trace output writer.
+
+    Args:
+      description (str): description of the structure.
+      file_offset (int): offset of the structure data relative to the start
+          of the file-like object.
+      name (str): name of the data type of the structure.
+      data (bytes): data of the structure.
+    """
+    # pylint: disable=unused-argument
+    return
+
+  def DebugPrintStructureObject(
+      self, structure_object, debug_info, binary_data_format):
+    """Prints structure object debug information.
+
+    Args:
+      structure_object (object): structure object.
+      debug_info (list[tuple[str, str, int]]): debug information.
+      binary_data_format (BinaryDataFormat): binary data format that defines
+          the format callbacks of the debug information.
+    """
+    # pylint: disable=protected-access
+    text = binary_data_format._FormatStructureObject(
+        structure_object, debug_info)
+    self.WriteText(text)
 
   def DebugPrintValue(self, description, value):
     """Prints a value for debugging.
@@ -215,6 +244,38 @@ class OutputWriter(object):
 class StdoutOutputWriter(OutputWriter):
   """Stdout output writer."""
 
+  # Maximum number of value prefixes that are cached, since descriptions can
+  # contain variable parts such as an index.
+  _MAXIMUM_NUMBER_OF_CACHED_VALUE_PREFIXES = 1024
+
+  def __init__(self):
+    """Initializes a stdout output writer."""
+    super(StdoutOutputWriter, self).__init__()
+    self._value_prefixes = {}
+
+  def _GetValuePrefix(self, description):
+    """Retrieves the prefix of a value.
+
+    Args:
+      description (str): description.
+
+    Returns:
+      str: description followed by the tab alignment of the value and the
+          value separator.
+    """
+    value_prefix = self._value_prefixes.get(description, None)
+    if value_prefix is None:
+      description_no_tabs = description.replace('\t', ' ' * 8)
+      alignment, _ = divmod(len(description_no_tabs), 8)
+      alignment_string = '\t' * (8 - alignment + 1)
+      value_prefix = f'{description:s}{alignment_string:s}: '
+
+      if (len(self._value_prefixes) <
+          self._MAXIMUM_NUMBER_OF_CACHED_VALUE_PREFIXES):
+        self._value_prefixes[description] = value_prefix
+
+    return value_prefix
+
   def Close(self):
     """Closes the output writer."""
     return
@@ -237,8 +298,8 @@ class StdoutOutputWriter(OutputWriter):
     self.WriteText(description)
     self.WriteText('\n')
 
-    hexdump_text = hexdump.Hexdump(data)
-    self.WriteText(hexdump_text)
+    for text in hexdump.GenerateHexdump(data):
+      self.WriteText(text)
 
   def WriteFiletimeValue(self, description, value):
     """Writes a FILETIME timestamp value.
@@ -259,6 +320,22 @@ class StdoutOutputWriter(OutputWriter):
     """
     self.WriteValue(description, f'{value:d}')
 
+  def WriteRecordValues(self, record_values):
+    """Writes the values of a record, such as a record read from a store.
+
+    Args:
+      record_values (dict[str, object]): values of the record per attribute
+          name.
+    """
+    for attribute_name, attribute_value in record_values.items():
+      if attribute_value is not None:
+        if isinstance(attribute_value, bytes):
+          attribute_value = attribute_value.hex()
+
+        self.WriteValue(attribute_name, attribute_value)
+
+    self.WriteText('\n')
+
   def WriteText(self, text):
     """Writes text.
 
@@ -274,7 +351,237 @@ class StdoutOutputWriter(OutputWriter):
       description (str): description.
       value (object): value.
     """
-    description_no_tabs = description.replace('\t', ' ' * 8)
-    alignment, _ = divmod(len(description_no_tabs), 8)
-    alignment_string = '\t' * (8 - alignment + 1)
-    self.WriteText(f'{description:s}{alignment_string:s}: {value!s}\n')
+    value_prefix = self._GetValuePrefix(description)
+    self.WriteText(f'{value_prefix:s}{value!s}\n')
+
+
+class BufferedStdoutOutputWriter(StdoutOutputWriter):
+  """Buffered stdout output writer.
+
+  Text is collected in a buffer that is written to stdout once it contains
+  buffer size or more characters, which reduces the number of writes when
+  many small fragments of text are written.
+  """
+
+  DEFAULT_BUFFER_SIZE = 64 * 1024
+
+  def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Initializes a buffered stdout output writer.
+
+    Args:
+      buffer_size (Optional[int]): number of characters to buffer before
+          the buffer is written to stdout.
+    """
+    super(BufferedStdoutOutputWriter, self).__init__()
+    self._buffer = []
+    self._buffer_size = buffer_size
+    self._number_of_buffered_characters = 0
+
+  def Close(self):
+    """Closes the output writer."""
+    self.Flush()
+
+  def Flush(self):
+    """Writes the buffered text to stdout."""
+    if self._buffer:
+      sys.stdout.write(''.join(self._buffer))
+      self._buffer = []
+      self._number_of_buffered_characters = 0
+
+    sys.stdout.flush()
+
+  def WriteText(self, text):
+    """Writes text.
+
+    Args:
+      text (str): text to write.
+    """
+    self._buffer.append(text)
+    self._number_of_buffered_characters += len(text)
+
+    if self._number_of_buffered_characters >= self._buffer_size:
+      self.Flush()
+
+
+class JSONLinesOutputWriter(BufferedStdoutOutputWriter):
+  """JSON Lines output writer.
+
+  Records, such as the objects generated by the collectors, are written as
+  a JSON object per line. The attributes of a record are its public instance
+  attributes, which are determined per record, and its slots and properties,
+  which are determined once per class.
+
+  Text that is not a record, such as a status message or debug information,
+  is written to stderr, such that stdout only contains JSON objects.
+  """
+
+  _BYTES_TYPES = frozenset([bytearray, bytes, memoryview])
+
+  _JSON_TYPES = frozenset([bool, float, int, str, type(None)])
+
+  _SEQUENCE_TYPES = frozenset([frozenset, list, set, tuple])
+
+  def __init__(
+      self, buffer_size=BufferedStdoutOutputWriter.DEFAULT_BUFFER_SIZE):
+    """Initializes a JSON Lines output writer.
+
+    Args:
+      buffer_size (Optional[int]): number of characters to buffer before
+          the buffer is written to stdout.
+    """
+    super(JSONLinesOutputWriter, self).__init__(buffer_size=buffer_size)
+    self._json_encoder = json.JSONEncoder(separators=(',', ':'))
+    self._record_encoders = {}
+
+  def _EncodeRecord(self, record):
+    """Encodes a record.
+
+    Args:
+      record (object): record.
+
+    Returns:
+      dict[str, object]: JSON serializable attribute values of the record
+          per attribute name.
+    """
+    record_encoder = self._record_encoders.get(type(record), None)
+    if not record_encoder:
+      record_encoder = self._GetRecordEncoder(record)
+
+    # Instance attributes are determined per record, since records of
+    # the same class can have different instance attributes.
+    record_values = {
+        name: value for name, value in getattr(record, '__dict__', {}).items()
+        if not name.startswith('_')}
+
+    attribute_names, get_attribute_values = record_encoder
+    if attribute_names:
+      try:
+        attribute_values = get_attribute_values(record)
+        if len(attribute_names) == 1:
+          attribute_values = (attribute_values, )
+
+      except AttributeError:
+        # A slot that is not set.
+        attribute_values = [
+            getattr(record, name, None) for name in attribute_names]
+
+      record_values.update(zip(attribute_names, attribute_values))
+
+    # Values that are JSON serializable, which are the most common, are not
+    # encoded.
+    json_types = self._JSON_TYPES
+    return {
+        attribute_name: attribute_value
+        if type(attribute_value) in json_types
+        else self._EncodeValue(attribute_value)
+        for attribute_name, attribute_value in sorted(record_values.items())}
+
+  def _EncodeValue(self, value):
+    """Encodes a value.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      object: JSON serializable value, where binary data is represented as
+          a hexadecimal string and date and time values as a date and time
+          string.
+    """
+    value_type = type(value)
+    if value_type in self._JSON_TYPES:
+      return value
+
+    if value_type in self._BYTES_TYPES:
+      return value.hex()
+
+    if value_type in self._SEQUENCE_TYPES:
+      return [self._EncodeValue(element) for element in value]
+
+    if value_type is dict:
+      return {
+          f'{key!s}': self._EncodeValue(element)
+          for key, element in value.items()}
+
+    if isinstance(value, dfdatetime_interface.DateTimeValues):
+      return value.CopyToDateTimeString()
+
+    if hasattr(value, '__dict__') or hasattr(value_type, '__slots__'):
+      return self._EncodeRecord(value)
+
+    return f'{value!s}'
+
+  def _GetRecordEncoder(self, record):
+    """Retrieves the encoder of the class of a record.
+
+    Args:
+      record (object): record.
+
+    Returns:
+      tuple[tuple[str], operator.attrgetter]: names of the slots and
+          properties of the class of the record and function to retrieve
+          their values or None if the class has no slots and properties.
+    """
+    attribute_names = tuple(sorted(
+        name for name in _GetClassAttributeNames(type(record))
+        if not name.startswith('_')))
+
+    get_attribute_values = None
+    if attribute_names:
+      get_attribute_values = operator.attrgetter(*attribute_names)
+
+    record_encoder = (attribute_names, get_attribute_values)
+    self._record_encoders[type(record)] = record_encoder
+
+    return record_encoder
+
+  def _WriteLine(self, json_string):
+    """Writes a JSON object as a line to stdout.
+
+    Args:
+      json_string (str): JSON object.
+    """
+    super(JSONLinesOutputWriter, self).WriteText(f'{json_string:s}\n')
+
+  def WriteRecord(self, record, additional_values=None):
+    """Writes a record.
+
+    Args:
+      record (object): record.
+      additional_values (Optional[dict[str, object]]): JSON serializable
+          values that are written in addition to the attribute values of
+          the record, such as the username of the user the record belongs to.
+          An additional value takes precedence over an attribute value of
+          the record with the same name.
+    """
+    record_values = self._EncodeRecord(record)
+    if additional_values:
+      # The additional values are written first, but must not be overwritten
+      # by the attribute values of the record.
+      record_values = {
+          **additional_values, **record_values, **additional_values}
+
+    json_string = self._json_encoder.encode(record_values)
+    self._WriteLine(json_string)
+
+  def WriteRecordValues(self, record_values):
+    """Writes the values of a record, such as a record read from a store.
+
+    Args:
+      record_values (dict[str, object]): values of the record per attribute
+          name.
+    """
+    json_string = self._json_encoder.encode(self._EncodeValue(record_values))
+    self._WriteLine(json_string)
+
+  def WriteText(self, text):
+    """Writes text that is not a record to stderr.
+
+    Args:
+      text (str): text to write.
+    """
+    # Flush the buffered records first to preserve the order of the output
+    # when stdout and stderr refer to the same terminal.
+    self.Flush()
+
+    sys.stderr.write(text)
+    sys.stderr.flush()
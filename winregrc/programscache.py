@@ -81,8 +81,8 @@ class ProgramsCacheDataParser(data_format.BinaryDataFormat):
 
     try:
       entry_footer = self._ReadStructureFromByteStream(
-          value_data[value_data_offset:], value_data_offset, data_type_map,
-          'entry footer')
+          memoryview(value_data)[value_data_offset:], value_data_offset,
+          data_type_map, 'entry footer')
     except (ValueError, errors.ParseError) as exception:
       raise errors.ParseError(
           f'Unable to parse entry footer value with error: {exception!s}')
@@ -142,6 +142,9 @@ class ProgramsCacheDataParser(data_format.BinaryDataFormat):
 
     header, value_data_offset = self._ParseHeader(value_data)
 
+    # Note that slices of the value data view do not copy the value data.
+    value_data_view = memoryview(value_data)
+
     if header.format_version == 1:
       value_data_offset += 4
 
@@ -151,8 +154,8 @@ class ProgramsCacheDataParser(data_format.BinaryDataFormat):
 
       try:
         header9 = self._ReadStructureFromByteStream(
-            value_data[value_data_offset:], value_data_offset, data_type_map,
-            'header9', context=context)
+            value_data_view[value_data_offset:], value_data_offset,
+            data_type_map, 'header9', context=context)
       except (ValueError, errors.ParseError) as exception:
         raise errors.ParseError(
             f'Unable to parse header9 value with error: {exception!s}')
@@ -191,8 +194,8 @@ class ProgramsCacheDataParser(data_format.BinaryDataFormat):
 
       try:
         entry_header = self._ReadStructureFromByteStream(
-            value_data[value_data_offset:], value_data_offset, data_type_map,
-            'entry header', context=context)
+            value_data_view[value_data_offset:], value_data_offset,
+            data_type_map, 'entry header', context=context)
       except (ValueError, errors.ParseError) as exception:
         raise errors.ParseError(
             f'Unable to parse entry header value with error: {exception!s}')
@@ -205,9 +208,12 @@ class ProgramsCacheDataParser(data_format.BinaryDataFormat):
       value_data_offset += context.byte_size
 
       entry_data_size = entry_header.data_size
+      entry_data_end_offset = value_data_offset + entry_data_size
 
+      # Note that pyfwsi requires bytes, hence only the entry data is copied.
       shell_item_list = pyfwsi.item_list()
-      shell_item_list.copy_from_byte_stream(value_data[value_data_offset:])
+      shell_item_list.copy_from_byte_stream(
+          value_data[value_data_offset:entry_data_end_offset])
 
       for shell_item in iter(shell_item_list.items):
         if self._debug:
@@ -225,8 +231,10 @@ class ProgramsCacheDataParser(data_format.BinaryDataFormat):
 
       if entry_footer.sentinel == 2 and value_data_offset < value_data_size:
         # TODO: determine the logic to this value.
-        while ord(value_data[value_data_offset]) != 0x00:
-          value_data_offset += 1
+        value_data_offset = value_data.find(b'\x00', value_data_offset)
+        if value_data_offset < 0:
+          raise errors.ParseError('Unsupported entry data.')
+
         value_data_offset += 7
 
         entry_footer, data_size = self._ParseEntryFooter(
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""Content-addressed on-disk cache of collector results."""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import types
+
+import winregrc
+
+
+class ResultCache(object):
+  """Content-addressed on-disk cache of collector results.
+
+  The results of a collector are cached in a file per cache key, which is
+  the SHA-256 digest of the digest of the data the results were collected
+  from, such as a Windows Registry file or value data, the name of the
+  collector class, the collector version and the options of the collection.
+  The results are cached in pickled form, hence the cache directory should
+  only be writable by trusted users.
+
+  The total size of the cached results is bounded, where the least recently
+  used results are evicted first. The modification time of a cache file is
+  updated when its results are used.
+
+  Collectors with debug enabled are not cached, since their debug output is
+  generated during the collection.
+
+  Attributes:
+    number_of_cache_hits (int): number of collections served from the cache.
+    number_of_cache_misses (int): number of collections not served from
+        the cache.
+  """
+
+  DEFAULT_MAXIMUM_SIZE = 256 * 1024 * 1024
+
+  # Options that do not affect the results of a collection.
+  _IGNORED_OPTIONS = frozenset(['number_of_workers'])
+
+  _CACHE_FILE_SUFFIX = '.pickle'
+
+  def __init__(self, path, maximum_size=DEFAULT_MAXIMUM_SIZE):
+    """Initializes a result cache.
+
+    Args:
+      path (str): path of the cache directory.
+      maximum_size (Optional[int]): maximum total size of the cached results
+          in bytes.
+
+    Raises:
+      ValueError: if the maximum size is less than 1.
+    """
+    if maximum_size < 1:
+      raise ValueError(f'Unsupported maximum size: {maximum_size:d}.')
+
+    super(ResultCache, self).__init__()
+    self._maximum_size = maximum_size
+    self._path = path
+
+    self.number_of_cache_hits = 0
+    self.number_of_cache_misses = 0
+
+  def _EvictCacheFiles(self):
+    """Evicts the least recently used cache files that exceed the size."""
+    cache_files = []
+    total_size = 0
+
+    with os.scandir(self._path) as directory_entries:
+      for directory_entry in directory_entries:
+        if directory_entry.name.endswith(self._CACHE_FILE_SUFFIX):
+          try:
+            stat_object = directory_entry.stat()
+          except FileNotFoundError:
+            continue
+
+          cache_files.append((
+              stat_object.st_mtime_ns, stat_object.st_size,
+              directory_entry.path))
+          total_size += stat_object.st_size
+
+    if total_size > self._maximum_size:
+      for _, size, path in sorted(cache_files):
+        try:
+          os.remove(path)
+        except FileNotFoundError:
+          # The cache file was already evicted by another process.
+          pass
+
+        total_size -= size
+        if total_size <= self._maximum_size:
+          break
+
+  def _GetCacheFilePath(self, cache_key):
+    """Retrieves the path of a cache file.
+
+    Args:
+      cache_key (str): cache key.
+
+    Returns:
+      str: path of the cache file.
+    """
+    return os.path.join(
+        self._path, f'{cache_key:s}{self._CACHE_FILE_SUFFIX:s}')
+
+  def _GetCollectorAttributes(self, collector_object):
+    """Retrieves the public attributes of a collector.
+
+    Collectors such as the AppCompatCache collector store their results in
+    public attributes.
+
+    Args:
+      collector_object (WindowsRegistryKeyCollector): collector.
+
+    Returns:
+      dict[str, object]: values of the public attributes per name.
+    """
+    return {
+        name: value for name, value in vars(collector_object).items()
+        if not name.startswith('_')}
+
+  def _ReadResults(self, cache_key):
+    """Reads cached results.
+
+    Args:
+      cache_key (str): cache key.
+
+    Returns:
+      tuple[object, dict[str, object]]: return value of the collection and
+          values of the public attributes of the collector per name or None
+          if not cached or if the cached results cannot be read, such as
+          results cached by a version that defines different classes.
+    """
+    path = self._GetCacheFilePath(cache_key)
+
+    try:
+      with open(path, 'rb') as file_object:
+        results = pickle.load(file_object)
+
+      os.utime(path)
+
+    except (
+        AttributeError, EOFError, ImportError, IndexError, OSError, TypeError,
+        ValueError, pickle.UnpicklingError) as exception:
+      if not isinstance(exception, FileNotFoundError):
+        logging.warning(
+            f'Unable to read results from cache: {exception!s}')
+      return None
+
+    if not isinstance(results, tuple) or len(results) != 2 or not isinstance(
+        results[1], dict):
+      return None
+
+    return results
+
+  def _WriteResults(self, cache_key, results):
+    """Writes results to the cache.
+
+    The results are written to a temporary file that replaces the cache file,
+    such that other processes never read a partially written cache file.
+    Writing the results to the cache is best effort, where results that
+    cannot be pickled or written are not cached.
+
+    Args:
+      cache_key (str): cache key.
+      results (tuple[object, dict[str, object]]): return value of the
+          collection and values of the public attributes of the collector
+          per name.
+
+    Returns:
+      bool: True if the results were written to the cache or False if not.
+    """
+    try:
+      data = pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+    except (AttributeError, TypeError, pickle.PicklingError) as exception:
+      logging.warning(
+          f'Unable to cache results that cannot be pickled: {exception!s}')
+      return False
+
+    if len(data) > self._maximum_size:
+      return False
+
+    temporary_path = None
+    try:
+      os.makedirs(self._path, exist_ok=True)
+
+      file_descriptor, temporary_path = tempfile.mkstemp(
+          dir=self._path, suffix='.tmp')
+      with os.fdopen(file_descriptor, 'wb') as file_object:
+        file_object.write(data)
+
+      os.replace(temporary_path, self._GetCacheFilePath(cache_key))
+
+      self._EvictCacheFiles()
+
+    except OSError as exception:
+      logging.warning(f'Unable to write results to cache: {exception!s}')
+
+      if temporary_path and os.path.exists(temporary_path):
+        os.remove(temporary_path)
+      return False
+
+    return True
+
+  def Collect(self, collector_object, registry, digest, **kwargs):
+    """Collects results with a collector or retrieves them from the cache.
+
+    Args:
+      collector_object (WindowsRegistryKeyCollector): collector.
+      registry (dfwinreg.WinRegistry): Windows Registry.
+      digest (str): digest of the data the results are collected from, such
+          as the hexadecimal SHA-256 digest of the Windows Registry file.
+      kwargs (dict[str, object]): options of the collection, which are passed
+          to the Collect method of the collector.
+
+    Returns:
+      object: return value of the Collect method of the collector, where
+          a generator is returned as a list.
+    """
+    # Note that debug is not a public attribute of the collectors.
+    use_cache = not getattr(collector_object, '_debug', False)
+
+    if use_cache:
+      cache_key = self.GetCacheKey(collector_object, digest, **kwargs)
+
+      results = self._ReadResults(cache_key)
+      if results:
+        self.number_of_cache_hits += 1
+
+        return_value, attributes = results
+        for name, value in attributes.items():
+          setattr(collector_object, name, value)
+
+        return return_value
+
+      self.number_of_cache_misses += 1
+
+    return_value = collector_object.Collect(registry, **kwargs)
+    if isinstance(return_value, types.GeneratorType):
+      return_value = list(return_value)
+
+    if use_cache:
+      attributes = self._GetCollectorAttributes(collector_object)
+      self._WriteResults(cache_key, (return_value, attributes))
+
+    return return_value
+
+  def GetCacheKey(self, collector_object, digest, **kwargs):
+    """Retrieves the cache key of a collection.
+
+    Args:
+      collector_object (WindowsRegistryKeyCollector): collector.
+      digest (str): digest of the data the results are collected from.
+      kwargs (dict[str, object]): options of the collection.
+
+    Returns:
+      str: hexadecimal SHA-256 digest that identifies the collection.
+    """
+    collector_class = type(collector_object)
+    options = {
+        name: value for name, value in kwargs.items()
+        if name not in self._IGNORED_OPTIONS}
+
+    key_string = json.dumps([
+        digest, collector_class.__module__, collector_class.__name__,
+        winregrc.__version__, options], default=str, sort_keys=True)
+
+    return hashlib.sha256(key_string.encode('utf-8')).hexdigest()
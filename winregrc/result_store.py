@@ -0,0 +1,482 @@
+# -*- coding: utf-8 -*-
+"""SQLite result store."""
+
+import itertools
+import json
+import os
+import sqlite3
+
+from dfdatetime import filetime as dfdatetime_filetime
+from dfdatetime import interface as dfdatetime_interface
+from dfdatetime import semantic_time as dfdatetime_semantic_time
+
+from winregrc import appcompatcache
+from winregrc import errors
+from winregrc import mru
+from winregrc import output_writers
+from winregrc import sam
+from winregrc import services
+from winregrc import task_cache
+from winregrc import usbstor
+from winregrc import userassist
+
+
+class ResultStore(object):
+  """SQLite result store.
+
+  The result store contains a table per result type, with a row per record,
+  and a collections table, with a row per set of records of a result type
+  that was collected from a Windows Registry file, identified by the SHA-256
+  digest of the file, with a specific version of the collector.
+
+  Values that are not natively supported by SQLite are encoded, such as
+  a FILETIME date and time value as its timestamp, and decoded when
+  the records are retrieved, such that the retrieved records are identical
+  to the records that were written.
+  """
+
+  DEFAULT_BATCH_SIZE = 1024
+
+  # Columns per result type, where the columns correspond with the
+  # attributes of the records.
+  RESULT_TYPES = {
+      'appcompatcache_entries': (
+          'cached_entry_size', 'control_sets', 'data', 'file_size',
+          'insertion_flags', 'last_modification_time', 'last_update_time',
+          'path', 'shim_flags'),
+      'cached_tasks': (
+          'identifier', 'last_registered_time', 'launch_time', 'name'),
+      'mru_entries': (
+          'key_path', 'shell_item_data', 'shell_item_list_data', 'string',
+          'value_name'),
+      'services': (
+          'description', 'display_name', 'image_path', 'name', 'object_name',
+          'service_type', 'start_value'),
+      'usb_storage_devices': (
+          'device_type', 'display_name', 'key_path', 'product', 'properties',
+          'revision', 'vendor'),
+      'user_accounts': (
+          'account_expiration_time', 'codepage', 'comment', 'full_name',
+          'last_login_time', 'last_password_failure_time',
+          'last_password_set_time', 'name', 'number_of_logons',
+          'number_of_password_failures', 'primary_gid', 'rid',
+          'user_account_control_flags', 'user_comment', 'username'),
+      'userassist_entries': ('guid', 'name', 'value_name')}
+
+  # Classes of the records per result type.
+  _RECORD_CLASSES = {
+      'appcompatcache_entries': appcompatcache.AppCompatCacheCachedEntry,
+      'cached_tasks': task_cache.CachedTask,
+      'mru_entries': mru.MostRecentlyUsedEntry,
+      'services': services.WindowsService,
+      'usb_storage_devices': usbstor.USBStorageDevice,
+      'user_accounts': sam.UserAccount,
+      'userassist_entries': userassist.UserAssistEntry}
+
+  # Value types of the columns per result type, that are not natively
+  # supported by SQLite and need to be decoded.
+  _COLUMN_VALUE_TYPES = {
+      'appcompatcache_entries': {
+          'control_sets': 'json',
+          'file_size': 'integer',
+          'insertion_flags': 'integer',
+          'last_modification_time': 'integer',
+          'last_update_time': 'integer',
+          'shim_flags': 'integer'},
+      'cached_tasks': {
+          'last_registered_time': 'date_time',
+          'launch_time': 'date_time'},
+      'usb_storage_devices': {
+          'properties': 'usb_storage_device_properties'},
+      'user_accounts': {
+          'account_expiration_time': 'integer',
+          'last_login_time': 'integer',
+          'last_password_failure_time': 'integer',
+          'last_password_set_time': 'integer'}}
+
+  # Value type of an USB storage device property that contains a FILETIME.
+  _USB_STORAGE_DEVICE_PROPERTY_FILETIME = 0x00000010
+
+  # Largest and smallest integer that can be stored in a SQLite integer.
+  _MAXIMUM_INTEGER = 0x7fffffffffffffff
+  _MINIMUM_INTEGER = -0x8000000000000000
+
+  def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+    """Initializes a result store.
+
+    Args:
+      path (str): path of the SQLite database.
+      batch_size (Optional[int]): maximum number of records inserted per
+          batch.
+    """
+    super(ResultStore, self).__init__()
+    self._batch_size = batch_size
+    self._connection = None
+    self._path = path
+
+  def _CreateAppCompatCacheCachedEntry(self, record_values):
+    """Creates an Application Compatibility Cache cached entry.
+
+    Args:
+      record_values (dict[str, object]): values of the record per attribute
+          name.
+
+    Returns:
+      AppCompatCacheCachedEntry: cached entry.
+    """
+    data = record_values.pop('data', None) or b''
+    path = record_values.pop('path', None)
+
+    path_data = b''
+    if path is not None:
+      path_data = path.encode('utf-16-le')
+
+    cached_entry = appcompatcache.AppCompatCacheCachedEntry(
+        value_data=b''.join([path_data, data]))
+    cached_entry.SetData(len(path_data), len(data))
+    if path is not None:
+      cached_entry.SetPath(0, len(path_data))
+
+    for name, value in record_values.items():
+      setattr(cached_entry, name, value)
+
+    return cached_entry
+
+  def _CreateRecord(self, result_type, record_values):
+    """Creates a record.
+
+    Args:
+      result_type (str): result type.
+      record_values (dict[str, object]): decoded values of the record per
+          attribute name.
+
+    Returns:
+      object: record.
+    """
+    if result_type == 'appcompatcache_entries':
+      return self._CreateAppCompatCacheCachedEntry(record_values)
+
+    record_class = self._RECORD_CLASSES[result_type]
+    # These records are initialized with the values of their attributes.
+    if result_type in ('mru_entries', 'services', 'userassist_entries'):
+      return record_class(**record_values)
+
+    record = record_class()
+    for name, value in record_values.items():
+      setattr(record, name, value)
+
+    return record
+
+  def _CreateTables(self):
+    """Creates the tables if they do not exist."""
+    with self._connection:
+      self._connection.execute((
+          'CREATE TABLE IF NOT EXISTS collections ('
+          'collection_identifier INTEGER PRIMARY KEY, result_type TEXT, '
+          'digest TEXT, collector_version TEXT, '
+          'UNIQUE (result_type, digest, collector_version))'))
+
+      for result_type, column_names in self.RESULT_TYPES.items():
+        column_definitions = ', '.join(column_names)
+        self._connection.execute((
+            f'CREATE TABLE IF NOT EXISTS {result_type:s} ('
+            f'collection_identifier INTEGER, {column_definitions:s})'))
+        self._connection.execute((
+            f'CREATE INDEX IF NOT EXISTS {result_type:s}_index ON '
+            f'{result_type:s} (collection_identifier)'))
+
+  def _DecodeDateTime(self, value):
+    """Decodes a date and time value.
+
+    Args:
+      value (int|str): timestamp of a FILETIME date and time value or
+          the string of a semantic date and time value.
+
+    Returns:
+      dfdatetime.DateTimeValues: date and time value or None if not set.
+    """
+    if value is None:
+      return None
+
+    if isinstance(value, int):
+      return dfdatetime_filetime.Filetime(timestamp=value)
+
+    return dfdatetime_semantic_time.SemanticTime(string=value)
+
+  def _DecodeUSBStorageDeviceProperties(self, value):
+    """Decodes USB storage device properties.
+
+    Args:
+      value (list[dict[str, object]]): values of the properties per attribute
+          name.
+
+    Returns:
+      list[USBStorageDeviceProperty]: properties.
+    """
+    storage_device_properties = []
+    for property_values in value:
+      storage_device_property = usbstor.USBStorageDeviceProperty(
+          property_values['property_set'], property_values['identifier'])
+      storage_device_property.value = property_values['value']
+      storage_device_property.value_type = property_values['value_type']
+
+      if (storage_device_property.value_type ==
+          self._USB_STORAGE_DEVICE_PROPERTY_FILETIME):
+        storage_device_property.value = self._DecodeDateTime(
+            storage_device_property.value)
+
+      storage_device_properties.append(storage_device_property)
+
+    return storage_device_properties
+
+  def _DecodeValue(self, value_type, value):
+    """Decodes a SQLite value.
+
+    Args:
+      value_type (str): value type of the column or None if the value is
+          natively supported by SQLite.
+      value (object): SQLite representation of the value.
+
+    Returns:
+      object: value.
+    """
+    if value is None or not value_type:
+      return value
+
+    if value_type == 'date_time':
+      return self._DecodeDateTime(value)
+
+    if value_type == 'integer':
+      return int(value)
+
+    value = json.loads(value)
+    if value_type == 'usb_storage_device_properties':
+      return self._DecodeUSBStorageDeviceProperties(value)
+
+    return value
+
+  def _EncodeDateTime(self, value):
+    """Encodes a date and time value.
+
+    Args:
+      value (dfdatetime.DateTimeValues): date and time value.
+
+    Returns:
+      int|str: timestamp of a FILETIME date and time value or the date and
+          time string of other date and time values.
+    """
+    if isinstance(value, dfdatetime_filetime.Filetime):
+      return value.timestamp
+
+    return value.CopyToDateTimeString()
+
+  def _EncodeObject(self, value):
+    """Encodes an object that is not natively supported by JSON.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      object: JSON serializable representation of the value.
+    """
+    if isinstance(value, (bytearray, bytes)):
+      return value.hex()
+
+    if isinstance(value, dfdatetime_interface.DateTimeValues):
+      return self._EncodeDateTime(value)
+
+    attribute_names = output_writers.GetRecordAttributeNames(value)
+    if not attribute_names:
+      return f'{value!s}'
+
+    return {name: getattr(value, name, None) for name in attribute_names}
+
+  def _EncodeValue(self, value):
+    """Encodes a value as a SQLite value.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      object: SQLite representation of the value.
+    """
+    value_type = type(value)
+    if value is None or value_type in (float, str):
+      return value
+
+    if value_type is int:
+      if self._MINIMUM_INTEGER <= value <= self._MAXIMUM_INTEGER:
+        return value
+
+      return f'{value:d}'
+
+    if value_type is bool:
+      return int(value)
+
+    if value_type in (bytearray, bytes):
+      return bytes(value)
+
+    if isinstance(value, dfdatetime_interface.DateTimeValues):
+      return self._EncodeDateTime(value)
+
+    # Other values, such as lists, are stored as their JSON representation.
+    return json.dumps(
+        value, default=self._EncodeObject, separators=(',', ':'))
+
+  def _GetCollectionIdentifier(self, result_type, digest, collector_version):
+    """Retrieves the identifier of a collection.
+
+    Args:
+      result_type (str): result type.
+      digest (str): hexadecimal SHA-256 digest of the Windows Registry file.
+      collector_version (str): version of the collector.
+
+    Returns:
+      int: identifier of the collection or None if not stored.
+    """
+    cursor = self._connection.execute((
+        'SELECT collection_identifier FROM collections WHERE '
+        'result_type = ? AND digest = ? AND collector_version = ?'), (
+            result_type, digest, collector_version))
+    row = cursor.fetchone()
+    if not row:
+      return None
+
+    return row[0]
+
+  def Close(self):
+    """Closes the result store."""
+    if self._connection:
+      self._connection.close()
+      self._connection = None
+
+  def GetRecords(self, result_type, digest, collector_version):
+    """Retrieves stored records.
+
+    Args:
+      result_type (str): result type.
+      digest (str): hexadecimal SHA-256 digest of the Windows Registry file.
+      collector_version (str): version of the collector.
+
+    Yields:
+      object: record, such as an UserAssist entry.
+
+    Raises:
+      Error: if the result type is not supported.
+    """
+    column_names = self.RESULT_TYPES.get(result_type, None)
+    if not column_names:
+      raise errors.Error(f'Unsupported result type: {result_type:s}.')
+
+    collection_identifier = self._GetCollectionIdentifier(
+        result_type, digest, collector_version)
+    if collection_identifier is not None:
+      columns = ', '.join(column_names)
+      cursor = self._connection.execute((
+          f'SELECT {columns:s} FROM {result_type:s} WHERE '
+          f'collection_identifier = ? ORDER BY rowid'), (
+              collection_identifier, ))
+      column_value_types = self._COLUMN_VALUE_TYPES.get(result_type, {})
+      for row in cursor:
+        record_values = {
+            column_name: self._DecodeValue(
+                column_value_types.get(column_name, None), value)
+            for column_name, value in zip(column_names, row)}
+        yield self._CreateRecord(result_type, record_values)
+
+  def HasRecords(self, result_type, digest, collector_version):
+    """Determines if records are stored.
+
+    Args:
+      result_type (str): result type.
+      digest (str): hexadecimal SHA-256 digest of the Windows Registry file.
+      collector_version (str): version of the collector.
+
+    Returns:
+      bool: True if the records of the result type that were collected from
+          the Windows Registry file with the version of the collector are
+          stored.
+    """
+    return self._GetCollectionIdentifier(
+        result_type, digest, collector_version) is not None
+
+  def Open(self):
+    """Opens the result store.
+
+    Returns:
+      bool: True if successful or False if not.
+    """
+    directory_name = os.path.dirname(os.path.abspath(self._path))
+    if not os.path.isdir(directory_name):
+      return False
+
+    try:
+      self._connection = sqlite3.connect(self._path)
+      self._CreateTables()
+
+    except sqlite3.Error:
+      self.Close()
+      return False
+
+    return True
+
+  def WriteRecords(self, result_type, digest, collector_version, records):
+    """Writes records.
+
+    The records are inserted in batches within a single transaction, such
+    that the records of a collection are either all stored or not at all.
+    Records that were previously stored for the same Windows Registry file
+    and version of the collector are replaced.
+
+    Args:
+      result_type (str): result type.
+      digest (str): hexadecimal SHA-256 digest of the Windows Registry file.
+      collector_version (str): version of the collector.
+      records (iterable[object]): records.
+
+    Returns:
+      int: number of records written.
+
+    Raises:
+      Error: if the result type is not supported.
+    """
+    column_names = self.RESULT_TYPES.get(result_type, None)
+    if not column_names:
+      raise errors.Error(f'Unsupported result type: {result_type:s}.')
+
+    placeholders = ', '.join(['?'] * (len(column_names) + 1))
+    insert_statement = (
+        f'INSERT INTO {result_type:s} VALUES ({placeholders:s})')
+
+    number_of_records = 0
+    records_iterator = iter(records)
+
+    with self._connection:
+      collection_identifier = self._GetCollectionIdentifier(
+          result_type, digest, collector_version)
+      if collection_identifier is not None:
+        self._connection.execute(
+            f'DELETE FROM {result_type:s} WHERE collection_identifier = ?',
+            (collection_identifier, ))
+        self._connection.execute(
+            'DELETE FROM collections WHERE collection_identifier = ?',
+            (collection_identifier, ))
+
+      cursor = self._connection.execute((
+          'INSERT INTO collections (result_type, digest, collector_version) '
+          'VALUES (?, ?, ?)'), (result_type, digest, collector_version))
+      collection_identifier = cursor.lastrowid
+
+      while True:
+        rows = [
+            (collection_identifier, *[
+                self._EncodeValue(getattr(record, column_name, None))
+                for column_name in column_names])
+            for record in itertools.islice(records_iterator, self._batch_size)]
+        if not rows:
+          break
+
+        self._connection.executemany(insert_statement, rows)
+        number_of_records += len(rows)
+
+    return number_of_records
@@ -150,7 +150,7 @@ class SecurityAccountManagerDataParser(data_format.BinaryDataFormat):
       descriptor (user_information_descriptor): user information descriptor.
       descriptor_data_offset (int): offset of the descriptor data relative from
           the start of the V value data.
-      descriptor_data (bytes): descriptor data.
+      descriptor_data (memoryview): descriptor data.
     """
     descriptor_index = index + 1
     self._DebugPrintText(
@@ -316,12 +316,15 @@ class SecurityAccountManagerDataParser(data_format.BinaryDataFormat):
       raise errors.ParseError(
           f'Unable to parse V value with error: {exception!s}')
 
+    # Note that slices of the value data view do not copy the value data.
+    value_data_view = memoryview(value_data)
+
     for index in range(0, 17):
       user_information_descriptor = v_value[index]
 
       data_start_offset = user_information_descriptor.offset + 0xcc
       data_end_offset = data_start_offset + user_information_descriptor.size
-      descriptor_data = value_data[data_start_offset:data_end_offset]
+      descriptor_data = value_data_view[data_start_offset:data_end_offset]
 
       if self._debug:
         self._DebugPrintUserInformationDescriptor(
@@ -330,39 +333,40 @@ class SecurityAccountManagerDataParser(data_format.BinaryDataFormat):
 
       if index == 0:
         if self._debug:
-          value_string = self._FormatSecurityDescriptor(descriptor_data)
+          value_string = self._FormatSecurityDescriptor(
+              descriptor_data.tobytes())
 
           self._DebugPrintText('Security descriptor:\n')
           self._DebugPrintText(value_string)
           self._DebugPrintText('\n')
 
       elif index == 1:
-        user_account.username = descriptor_data.decode(
-            'utf-16-le').rstrip('\x00')
+        user_account.username = str(
+            descriptor_data, 'utf-16-le').rstrip('\x00')
 
         if self._debug:
           self._DebugPrintValue('Username', user_account.username)
           self._DebugPrintText('\n')
 
       elif index == 2:
-        user_account.full_name = descriptor_data.decode(
-            'utf-16-le').rstrip('\x00')
+        user_account.full_name = str(
+            descriptor_data, 'utf-16-le').rstrip('\x00')
 
         if self._debug:
           self._DebugPrintValue('Full name', user_account.full_name)
           self._DebugPrintText('\n')
 
       elif index == 3:
-        user_account.comment = descriptor_data.decode(
-            'utf-16-le').rstrip('\x00')
+        user_account.comment = str(
+            descriptor_data, 'utf-16-le').rstrip('\x00')
 
         if self._debug:
           self._DebugPrintValue('Comment', user_account.comment)
           self._DebugPrintText('\n')
 
       elif index == 4:
-        user_account.user_comment = descriptor_data.decode(
-            'utf-16-le').rstrip('\x00')
+        user_account.user_comment = str(
+            descriptor_data, 'utf-16-le').rstrip('\x00')
 
         if self._debug:
           self._DebugPrintValue(
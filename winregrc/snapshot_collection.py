@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""Collection of information from Volume Shadow Snapshots."""
+
+import hashlib
+import logging
+
+from winregrc import user_collection
+
+
+class SnapshotCollection(object):
+  """Information collected from the Windows Registry files of a snapshot.
+
+  Attributes:
+    collector (WindowsRegistryKeyCollector): collector, which contains
+        the collected information in its public attributes, such as
+        cached_entries.
+    result (object): return value of the Collect method of the collector.
+    snapshot_creation_time (dfdatetime.DateTimeValues): creation date and
+        time of the snapshot or None if not available.
+    snapshot_identifier (str): identifier of the snapshot, such as "vss1".
+  """
+
+  def __init__(self, snapshot, collector, result):
+    """Initializes information collected from the Registry of a snapshot.
+
+    Args:
+      snapshot (VolumeSnapshot): snapshot.
+      collector (WindowsRegistryKeyCollector): collector.
+      result (object): return value of the Collect method of the collector.
+    """
+    super(SnapshotCollection, self).__init__()
+    self.collector = collector
+    self.result = result
+    self.snapshot_creation_time = snapshot.creation_time
+    self.snapshot_identifier = snapshot.identifier
+
+
+class SnapshotsCollector(user_collection.RegistryFilesCollector):
+  """Collects information from all Volume Shadow Snapshots of a volume.
+
+  The Windows Registry files the collector needs, such as the SYSTEM file,
+  are read from every snapshot, after which the collector is run for every
+  snapshot.
+
+  Snapshots of which the Windows Registry files are identical to those of
+  the current volume or of an earlier snapshot are skipped, since their
+  information is the same.
+  """
+
+  def __init__(
+      self, collector_class, registry_file_paths, debug=False,
+      number_of_workers=1, output_writer=None):
+    """Initializes a snapshots collector.
+
+    Args:
+      collector_class (type): class of the collector, which is initialized
+          with the debug and output_writer arguments.
+      registry_file_paths (list[str]): Windows paths of the Windows Registry
+          files the collector needs, such as
+          "%SystemRoot%\\System32\\config\\SYSTEM".
+      debug (Optional[bool]): True if debug information should be printed.
+          Debug information can only be printed by the main process, hence
+          the snapshots are processed sequentially when debug is enabled.
+      number_of_workers (Optional[int]): number of worker processes.
+      output_writer (Optional[OutputWriter]): output writer.
+    """
+    super(SnapshotsCollector, self).__init__(
+        collector_class, debug=debug, number_of_workers=number_of_workers,
+        output_writer=output_writer)
+    self._registry_file_paths = registry_file_paths
+
+  def _ReadDistinctSnapshots(self, scanner):
+    """Reads the Windows Registry files of snapshots with distinct content.
+
+    Args:
+      scanner (WindowsRegistryVolumeScanner): volume scanner.
+
+    Yields:
+      tuple[VolumeSnapshot, dict[str, bytes]]: snapshot and the data of its
+          Windows Registry files per Windows path.
+    """
+    snapshots = scanner.GetSnapshots()
+    if not snapshots:
+      return
+
+    digests = tuple(
+        scanner.GetRegistryFileDigest(path)
+        for path in self._registry_file_paths)
+    processed_digests = set([digests])
+
+    for snapshot in snapshots:
+      data_per_path = scanner.ReadSnapshotRegistryFiles(
+          snapshot, self._registry_file_paths)
+      if not data_per_path:
+        logging.info((
+            f'Skipping snapshot: {snapshot.identifier:s} without Windows '
+            f'Registry files.'))
+        continue
+
+      digests = tuple(
+          hashlib.sha256(data_per_path[path]).hexdigest()
+          if path in data_per_path else None
+          for path in self._registry_file_paths)
+      if digests in processed_digests:
+        logging.info((
+            f'Skipping snapshot: {snapshot.identifier:s} with Windows '
+            f'Registry files identical to those already processed.'))
+        continue
+
+      processed_digests.add(digests)
+
+      yield snapshot, data_per_path
+
+  def Collect(self, scanner, **kwargs):
+    """Collects information from all Volume Shadow Snapshots of a volume.
+
+    Args:
+      scanner (WindowsRegistryVolumeScanner): volume scanner.
+      kwargs (dict[str, object]): arguments passed to the Collect method of
+          the collector.
+
+    Yields:
+      SnapshotCollection: information collected from the Windows Registry
+          files of a snapshot, from the oldest to the most recent snapshot.
+    """
+    snapshots_data = self._ReadDistinctSnapshots(scanner)
+
+    for snapshot, collector_object, return_value in (
+        self._CollectFromRegistryFiles(snapshots_data, kwargs)):
+      yield SnapshotCollection(snapshot, collector_object, return_value)
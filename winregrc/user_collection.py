@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""Collection of per-user information from all user profiles."""
+
+import collections
+import concurrent.futures
+import types
+
+from dfwinreg import registry as dfwinreg_registry
+
+from winregrc import volume_scanner
+
+
+def CollectFromRegistryFiles(
+    collector_object, data_per_path, collect_arguments):
+  """Collects information from Windows Registry files read into memory.
+
+  Args:
+    collector_object (WindowsRegistryKeyCollector): collector.
+    data_per_path (dict[str, bytes]): data of the Windows Registry files per
+        Windows path.
+    collect_arguments (dict[str, object]): arguments passed to the Collect
+        method of the collector.
+
+  Returns:
+    tuple[object, dict[str, object]]: return value of the Collect method of
+        the collector, where a generator is returned as a list, and values of
+        the public attributes of the collector per name.
+  """
+  registry = dfwinreg_registry.WinRegistry(
+      registry_file_reader=volume_scanner.DataWindowsRegistryFileReader(
+          data_per_path))
+
+  return_value = collector_object.Collect(registry, **collect_arguments)
+  if isinstance(return_value, types.GeneratorType):
+    return_value = list(return_value)
+
+  attributes = {
+      name: value for name, value in vars(collector_object).items()
+      if not name.startswith('_')}
+
+  return return_value, attributes
+
+
+def CollectFromRegistryFilesInWorker(
+    collector_class, data_per_path, collect_arguments):
+  """Collects information from Windows Registry files in a worker process.
+
+  This function is run by a worker process, which initializes its own
+  collector, since collectors cannot be passed between processes.
+
+  Args:
+    collector_class (type): class of the collector.
+    data_per_path (dict[str, bytes]): data of the Windows Registry files per
+        Windows path.
+    collect_arguments (dict[str, object]): arguments passed to the Collect
+        method of the collector.
+
+  Returns:
+    tuple[object, dict[str, object]]: return value of the Collect method of
+        the collector, where a generator is returned as a list, and values of
+        the public attributes of the collector per name.
+  """
+  return CollectFromRegistryFiles(
+      collector_class(), data_per_path, collect_arguments)
+
+
+class RegistryFilesCollector(object):
+  """Collects information from sets of Windows Registry files.
+
+  A set of Windows Registry files, such as those of a user profile or of
+  a snapshot, is read into memory sequentially, since dfVFS does not support
+  concurrent access, after which a pool of worker processes runs a collector
+  for every set.
+
+  To bound the memory used, a set is only read when a worker process is
+  available, such that at most one set per worker process is read ahead of
+  the collection, up to a maximum total size of the data.
+  """
+
+  # Maximum total size of the data of the sets of Windows Registry files that
+  # are read ahead of the collection. A set is always read if no other set is
+  # pending.
+  _MAXIMUM_PENDING_DATA_SIZE = 256 * 1024 * 1024
+
+  def __init__(
+      self, collector_class, debug=False, number_of_workers=1,
+      output_writer=None):
+    """Initializes a Windows Registry files collector.
+
+    Args:
+      collector_class (type): class of the collector, which is initialized
+          with the debug and output_writer arguments.
+      debug (Optional[bool]): True if debug information should be printed.
+          Debug information can only be printed by the main process, hence
+          the sets of Windows Registry files are processed sequentially when
+          debug is enabled.
+      number_of_workers (Optional[int]): number of worker processes.
+      output_writer (Optional[OutputWriter]): output writer.
+    """
+    super(RegistryFilesCollector, self).__init__()
+    self._collector_class = collector_class
+    self._debug = debug
+    self._number_of_workers = number_of_workers
+    self._output_writer = output_writer
+
+  def _CollectFromRegistryFiles(self, registry_files_data, collect_arguments):
+    """Collects information from sets of Windows Registry files.
+
+    Args:
+      registry_files_data (iterable[tuple[object, dict[str, bytes]]]): source
+          of a set of Windows Registry files, such as a user profile or
+          a snapshot, and the data of its Windows Registry files per Windows
+          path, which is read when the set is requested from the iterable.
+      collect_arguments (dict[str, object]): arguments passed to the Collect
+          method of the collector.
+
+    Yields:
+      tuple[object, WindowsRegistryKeyCollector, object]: source of the set
+          of Windows Registry files, collector and return value of its
+          Collect method, in the order of the sets.
+    """
+    if self._number_of_workers > 1 and not self._debug:
+      yield from self._CollectInParallel(
+          registry_files_data, collect_arguments)
+      return
+
+    for source, data_per_path in registry_files_data:
+      collector_object = self._collector_class(
+          debug=self._debug, output_writer=self._output_writer)
+      return_value, _ = CollectFromRegistryFiles(
+          collector_object, data_per_path, collect_arguments)
+
+      yield source, collector_object, return_value
+
+  def _CollectInParallel(self, registry_files_data, collect_arguments):
+    """Collects information with a pool of worker processes.
+
+    Args:
+      registry_files_data (iterable[tuple[object, dict[str, bytes]]]): source
+          of a set of Windows Registry files, such as a user profile or
+          a snapshot, and the data of its Windows Registry files per Windows
+          path, which is read when the set is requested from the iterable.
+      collect_arguments (dict[str, object]): arguments passed to the Collect
+          method of the collector.
+
+    Yields:
+      tuple[object, WindowsRegistryKeyCollector, object]: source of the set
+          of Windows Registry files, collector and return value of its
+          Collect method, in the order of the sets.
+    """
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=self._number_of_workers) as executor:
+      pending = collections.deque()
+      pending_data_size = 0
+
+      registry_files_data = iter(registry_files_data)
+      while True:
+        if pending and (
+            len(pending) >= self._number_of_workers or
+            pending_data_size >= self._MAXIMUM_PENDING_DATA_SIZE):
+          source, data_size, future = pending.popleft()
+          pending_data_size -= data_size
+          yield self._CreateCollectionResult(source, *future.result())
+          continue
+
+        source, data_per_path = next(registry_files_data, (None, None))
+        if data_per_path is None:
+          break
+
+        data_size = sum(len(data) for data in data_per_path.values())
+        future = executor.submit(
+            CollectFromRegistryFilesInWorker, self._collector_class,
+            data_per_path, collect_arguments)
+        pending.append((source, data_size, future))
+        pending_data_size += data_size
+
+      while pending:
+        source, _, future = pending.popleft()
+        yield self._CreateCollectionResult(source, *future.result())
+
+  def _CreateCollectionResult(self, source, return_value, attributes):
+    """Creates a collector from the attributes collected by a worker process.
+
+    Args:
+      source (object): source of the set of Windows Registry files, such as
+          a user profile or a snapshot.
+      return_value (object): return value of the Collect method of
+          the collector.
+      attributes (dict[str, object]): values of the public attributes of
+          the collector per name.
+
+    Returns:
+      tuple[object, WindowsRegistryKeyCollector, object]: source of the set
+          of Windows Registry files, collector and return value of its
+          Collect method.
+    """
+    collector_object = self._collector_class(
+        debug=self._debug, output_writer=self._output_writer)
+    for name, value in attributes.items():
+      setattr(collector_object, name, value)
+
+    return source, collector_object, return_value
+
+
+class UserCollection(object):
+  """Information collected from the Windows Registry files of a user.
+
+  Attributes:
+    collector (WindowsRegistryKeyCollector): collector, which contains
+        the collected information in its public attributes, such as
+        user_assist_entries.
+    result (object): return value of the Collect method of the collector.
+    security_identifier (str): security identifier (SID) of the user or None
+        if not available.
+    username (str): username.
+  """
+
+  def __init__(self, user_profile, collector, result):
+    """Initializes information collected from the Windows Registry of a user.
+
+    Args:
+      user_profile (WindowsUserProfile): user profile.
+      collector (WindowsRegistryKeyCollector): collector.
+      result (object): return value of the Collect method of the collector.
+    """
+    super(UserCollection, self).__init__()
+    self.collector = collector
+    self.result = result
+    self.security_identifier = user_profile.security_identifier
+    self.username = user_profile.username
+
+
+class AllUsersCollector(RegistryFilesCollector):
+  """Collects per-user information from all user profiles.
+
+  The user profiles and their Windows Registry files, such as NTUSER.DAT and
+  UsrClass.dat, are determined with a single volume scan, after which
+  a per-user collector, such as the UserAssist collector, is run for every
+  user.
+  """
+
+  def Collect(self, scanner, **kwargs):
+    """Collects per-user information from all user profiles.
+
+    Args:
+      scanner (WindowsRegistryVolumeScanner): volume scanner.
+      kwargs (dict[str, object]): arguments passed to the Collect method of
+          the collector.
+
+    Yields:
+      UserCollection: information collected from the Windows Registry files
+          of a user, in the order of the user profiles.
+    """
+    registry_files_data = (
+        (user_profile, scanner.ReadUserRegistryFiles(user_profile))
+        for user_profile in scanner.GetUserProfiles())
+
+    for user_profile, collector_object, return_value in (
+        self._CollectFromRegistryFiles(registry_files_data, kwargs)):
+      yield UserCollection(user_profile, collector_object, return_value)
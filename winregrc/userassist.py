@@ -218,3 +218,15 @@ class UserAssistCollector(interface.WindowsRegistryKeyCollector):
       self._CollectUserAssistFromKey(guid_subkey)
 
     return True
+
+  def SubscribeToWalker(self, walker):
+    """Subscribes to the UserAssist keys of a Windows Registry key walker.
+
+    The UserAssist information is collected when the walker walks the Windows
+    Registry.
+
+    Args:
+      walker (WindowsRegistryKeyWalker): Windows Registry key walker.
+    """
+    walker.AddSubscription(
+        f'{self._USER_ASSIST_KEY:s}\\*', self._CollectUserAssistFromKey)
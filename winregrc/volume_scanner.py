@@ -1,17 +1,35 @@
 # -*- coding: utf-8 -*-
 """Windows Registry volume scanner."""
 
+import collections
+import hashlib
+import io
+import mmap
+import re
+
+from dfdatetime import filetime as dfdatetime_filetime
+
 from dfimagetools import windows_registry
 
 from dfvfs.helpers import command_line as dfvfs_command_line
 from dfvfs.helpers import volume_scanner as dfvfs_volume_scanner
+from dfvfs.helpers import windows_path_resolver as dfvfs_windows_path_resolver
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.lib import errors as dfvfs_errors
+from dfvfs.path import factory as dfvfs_path_spec_factory
 from dfvfs.resolver import resolver as dfvfs_resolver
+from dfvfs.volume import vshadow_volume_system as dfvfs_vshadow_volume_system
 
 from dfwinreg import interface as dfwinreg_interface
 from dfwinreg import registry as dfwinreg_registry
 
+from winregrc import profiles
+
+
+# Default maximum number of key lookups that are cached by the caching
+# Windows Registry.
+DEFAULT_KEY_CACHE_SIZE = 1024
+
 
 class VolumeScannerOptions(dfvfs_volume_scanner.VolumeScannerOptions):
   """Volume scanner options.
@@ -19,11 +37,16 @@ class VolumeScannerOptions(dfvfs_volume_scanner.VolumeScannerOptions):
   Attributes:
     credentials (list[tuple[str, str]]): credentials, per type, to unlock
         volumes.
+    key_cache_size (int): maximum number of key lookups that are cached by
+        the caching Windows Registry, where None or 0 represents no caching.
+        Volume scanner options that do not define the key cache size, such
+        as those of dfVFS, use DEFAULT_KEY_CACHE_SIZE.
     partitions (list[str]): partition identifiers.
     scan_mode (str): mode that defines how the VolumeScanner should scan
         for volumes and snapshots.
     snapshots (list[str]): snapshot identifiers.
-    username (str): username.
+    username (str): username, where ['none'] represents no user and ['all']
+        represents all users, which are retrieved with GetUserProfiles.
     volumes (list[str]): volume identifiers, e.g. those of an APFS or LVM
         volume system.
   """
@@ -31,21 +54,264 @@ class VolumeScannerOptions(dfvfs_volume_scanner.VolumeScannerOptions):
   def __init__(self):
     """Initializes volume scanner options."""
     super(VolumeScannerOptions, self).__init__()
+    self.key_cache_size = DEFAULT_KEY_CACHE_SIZE
     self.username = None
 
 
+class CachingWindowsRegistry(object):
+  """Caching Windows Registry.
+
+  Facade around a Windows Registry that memoizes the results of key lookups,
+  including lookups of keys that do not exist. A key that is not cached is
+  resolved from its deepest cached ancestor, within the same Windows Registry
+  file, so that shared key path prefixes are only resolved once. The number
+  of cached lookups is bounded, where the least recently used lookups are
+  evicted first.
+
+  Attributes:
+    number_of_cache_hits (int): number of key lookups served from the cache.
+    number_of_cache_misses (int): number of key lookups not served from
+        the cache.
+  """
+
+  # pylint: disable=protected-access
+
+  # Key paths where Windows Registry files are mapped, as defined by the file
+  # mappings of the Windows Registry. A key can only be resolved from a cached
+  # ancestor if no mount point lies between them.
+  _MOUNT_POINTS = frozenset([
+      tuple(mapping.key_path_prefix.upper().split('\\'))
+      for mapping in dfwinreg_registry.WinRegistry._REGISTRY_FILE_MAPPINGS])
+
+  # Key paths of the virtual keys of the Windows Registry, such as HKEY_USERS.
+  # Keys contained by a virtual key are not resolved from a cached ancestor.
+  _VIRTUAL_KEY_PATHS = frozenset([
+      tuple(key_path.upper().split('\\'))
+      for key_path, _ in dfwinreg_registry.WinRegistry._VIRTUAL_KEYS])
+
+  # pylint: enable=protected-access
+
+  _ROOT_KEY_ALIASES = {
+      'HKCC': 'HKEY_CURRENT_CONFIG',
+      'HKCR': 'HKEY_CLASSES_ROOT',
+      'HKCU': 'HKEY_CURRENT_USER',
+      'HKLM': 'HKEY_LOCAL_MACHINE',
+      'HKU': 'HKEY_USERS'}
+
+  def __init__(
+      self, registry, maximum_number_of_cached_keys=DEFAULT_KEY_CACHE_SIZE):
+    """Initializes a caching Windows Registry.
+
+    Args:
+      registry (dfwinreg.WinRegistry): Windows Registry.
+      maximum_number_of_cached_keys (Optional[int]): maximum number of key
+          lookups that are cached.
+
+    Raises:
+      ValueError: if the maximum number of cached keys is less than 1.
+    """
+    if maximum_number_of_cached_keys < 1:
+      raise ValueError(
+          f'Unsupported maximum number of cached keys: '
+          f'{maximum_number_of_cached_keys:d}.')
+
+    super(CachingWindowsRegistry, self).__init__()
+    self._cached_keys = collections.OrderedDict()
+    self._maximum_number_of_cached_keys = maximum_number_of_cached_keys
+    self._mount_points = set(self._MOUNT_POINTS)
+    self._registry = registry
+
+    self.number_of_cache_hits = 0
+    self.number_of_cache_misses = 0
+
+  @property
+  def number_of_cached_keys(self):
+    """int: number of cached key lookups."""
+    return len(self._cached_keys)
+
+  def _CacheKey(self, key_path_segments, registry_key):
+    """Caches the result of a key lookup.
+
+    Args:
+      key_path_segments (tuple[str]): upper case key path segments.
+      registry_key (dfwinreg.WinRegistryKey): Windows Registry key or None
+          if not available.
+    """
+    self._cached_keys[key_path_segments] = registry_key
+    self._cached_keys.move_to_end(key_path_segments)
+
+    if len(self._cached_keys) > self._maximum_number_of_cached_keys:
+      self._cached_keys.popitem(last=False)
+
+  def _GetMountPointDepth(self, key_path_segments):
+    """Determines the depth of the mount point that contains a key.
+
+    Args:
+      key_path_segments (tuple[str]): upper case key path segments.
+
+    Returns:
+      int: number of key path segments of the deepest mount point that
+          contains the key or 0 if the key is not contained by a mount point
+          or is contained by a virtual key.
+    """
+    for virtual_key_path in self._VIRTUAL_KEY_PATHS:
+      if key_path_segments[:len(virtual_key_path)] == virtual_key_path:
+        return 0
+
+    mount_point_depth = 0
+    for mount_point in self._mount_points:
+      number_of_segments = len(mount_point)
+      if (number_of_segments > mount_point_depth and
+          key_path_segments[:number_of_segments] == mount_point):
+        mount_point_depth = number_of_segments
+
+    return mount_point_depth
+
+  def ClearCache(self):
+    """Clears the cached key lookups."""
+    self._cached_keys.clear()
+
+  def GetKeyByPath(self, key_path):
+    """Retrieves the key for a specific path.
+
+    Args:
+      key_path (str): Windows Registry key path.
+
+    Returns:
+      dfwinreg.WinRegistryKey: Windows Registry key or None if not available.
+
+    Raises:
+      RuntimeError: if the root key is not supported or the key path prefix
+          does not match the key path.
+    """
+    key_path_segments = [
+        segment for segment in key_path.upper().split('\\') if segment]
+    if key_path_segments:
+      key_path_segments[0] = self._ROOT_KEY_ALIASES.get(
+          key_path_segments[0], key_path_segments[0])
+
+    key_path_segments = tuple(key_path_segments)
+
+    if key_path_segments in self._cached_keys:
+      self.number_of_cache_hits += 1
+      self._cached_keys.move_to_end(key_path_segments)
+      return self._cached_keys[key_path_segments]
+
+    self.number_of_cache_misses += 1
+
+    mount_point_depth = self._GetMountPointDepth(key_path_segments)
+    if not mount_point_depth:
+      registry_key = self._registry.GetKeyByPath(key_path)
+      self._CacheKey(key_path_segments, registry_key)
+      return registry_key
+
+    depth = len(key_path_segments) - 1
+    while depth >= mount_point_depth:
+      if key_path_segments[:depth] in self._cached_keys:
+        break
+      depth -= 1
+
+    if depth < mount_point_depth:
+      depth = mount_point_depth
+      mount_point_path = '\\'.join(key_path_segments[:depth])
+      registry_key = self._registry.GetKeyByPath(mount_point_path)
+      self._CacheKey(key_path_segments[:depth], registry_key)
+    else:
+      registry_key = self._cached_keys[key_path_segments[:depth]]
+      self._cached_keys.move_to_end(key_path_segments[:depth])
+
+    while registry_key and depth < len(key_path_segments):
+      registry_key = registry_key.GetSubkeyByName(key_path_segments[depth])
+      depth += 1
+      self._CacheKey(key_path_segments[:depth], registry_key)
+
+    if depth < len(key_path_segments):
+      # The key does not exist if one of its ancestors does not exist.
+      self._CacheKey(key_path_segments, None)
+
+    return registry_key
+
+  def GetRegistryFileMapping(self, registry_file):
+    """Determines the Registry file mapping based on the content of the file.
+
+    Args:
+      registry_file (dfwinreg.WinRegistyFile): Windows Registry file.
+
+    Returns:
+      str: key path prefix or an empty string.
+    """
+    return self._registry.GetRegistryFileMapping(registry_file)
+
+  def GetRootKey(self):
+    """Retrieves the Windows Registry root key.
+
+    Returns:
+      dfwinreg.WinRegistryKey: Windows Registry root key.
+    """
+    return self._registry.GetRootKey()
+
+  def MapFile(self, key_path_prefix, registry_file):
+    """Maps the Windows Registry file to a specific key path prefix.
+
+    Args:
+      key_path_prefix (str): key path prefix.
+      registry_file (dfwinreg.WinRegistryFile): Windows Registry file.
+    """
+    self._registry.MapFile(key_path_prefix, registry_file)
+
+    key_path_segments = tuple(
+        segment for segment in key_path_prefix.upper().split('\\')
+        if segment)
+    if key_path_segments:
+      self._mount_points.add(key_path_segments)
+
+    self.ClearCache()
+
+
 class SingleFileWindowsRegistryFileReader(
     dfwinreg_interface.WinRegistryFileReader):
   """Single file Windows Registry file reader."""
 
-  def __init__(self, path):
+  def __init__(self, path, use_mmap=True):
     """Initializes a single file Windows Registry file reader.
 
     Args:
       path (str): path of the Windows Registry file.
+      use_mmap (Optional[bool]): True if the Windows Registry file should be
+          memory mapped instead of read with buffered reads.
     """
     super(SingleFileWindowsRegistryFileReader, self).__init__()
     self._path = path
+    self._use_mmap = use_mmap
+
+  def _OpenMemoryMappedFile(self):
+    """Opens the Windows Registry file as a memory mapped file.
+
+    Memory mapping the file replaces the many small seek and read calls that
+    libregf makes across the file by memory accesses. The operating system is
+    advised to read ahead the entire file.
+
+    Returns:
+      mmap.mmap: memory mapped file-like object or None if the file cannot
+          be memory mapped, such as an empty file or a file on a file system
+          that does not support memory mapping.
+    """
+    with open(self._path, 'rb') as file_object:
+      try:
+        # Note that the memory map remains valid after the file is closed.
+        memory_map = mmap.mmap(
+            file_object.fileno(), 0, access=mmap.ACCESS_READ)
+      except (OSError, ValueError):
+        return None
+
+    # madvise is not available on all platforms, such as Windows.
+    if hasattr(memory_map, 'madvise') and hasattr(mmap, 'MADV_WILLNEED'):
+      try:
+        memory_map.madvise(mmap.MADV_WILLNEED)
+      except OSError:
+        pass
+
+    return memory_map
 
   def Open(self, path, ascii_codepage='cp1252'):
     """Opens the Windows Registry file specified by the path.
@@ -60,9 +326,12 @@ class SingleFileWindowsRegistryFileReader(
       WinRegistryFile: Windows Registry file or None if the file cannot
           be opened.
     """
-    file_object = open(self._path, 'rb')  # pylint: disable=consider-using-with
+    file_object = None
+    if self._use_mmap:
+      file_object = self._OpenMemoryMappedFile()
+
     if file_object is None:
-      return None
+      file_object = open(self._path, 'rb')  # pylint: disable=consider-using-with
 
     try:
       signature = file_object.read(4)
@@ -84,13 +353,128 @@ class SingleFileWindowsRegistryFileReader(
     return registry_file
 
 
+class DataWindowsRegistryFileReader(dfwinreg_interface.WinRegistryFileReader):
+  """Windows Registry file reader of Windows Registry files read into memory.
+
+  This file reader allows Windows Registry files, read from a storage media
+  image, to be passed to other processes.
+  """
+
+  def __init__(self, data_per_path):
+    """Initializes a Windows Registry file reader of data.
+
+    Args:
+      data_per_path (dict[str, bytes]): data of the Windows Registry files
+          per Windows path, such as "%UserProfile%\\NTUSER.DAT".
+    """
+    super(DataWindowsRegistryFileReader, self).__init__()
+    self._data_per_path = {
+        path.upper(): data for path, data in data_per_path.items()}
+
+  def Open(self, path, ascii_codepage='cp1252'):
+    """Opens the Windows Registry file specified by the path.
+
+    Args:
+      path (str): path of the Windows Registry file.
+      ascii_codepage (Optional[str]): ASCII string codepage.
+
+    Returns:
+      WinRegistryFile: Windows Registry file or None if the file cannot
+          be opened.
+    """
+    data = self._data_per_path.get(path.upper(), None)
+    if data is None:
+      return None
+
+    if data[:4] == b'regf':
+      registry_file = windows_registry.REGFWindowsRegistryFile(
+          ascii_codepage=ascii_codepage)
+    else:
+      registry_file = windows_registry.CREGWindowsRegistryFile(
+          ascii_codepage=ascii_codepage)
+
+    file_object = io.BytesIO(data)
+
+    try:
+      # Note that registry_file takes over management of file_object.
+      registry_file.Open(file_object)
+
+    except IOError:
+      file_object.close()
+      return None
+
+    return registry_file
+
+
+class VolumeSnapshot(object):
+  """Volume Shadow Snapshot (VSS).
+
+  Attributes:
+    creation_time (dfdatetime.DateTimeValues): creation date and time of
+        the snapshot or None if not available.
+    identifier (str): identifier of the snapshot, such as "vss1".
+  """
+
+  def __init__(self, identifier, creation_time=None):
+    """Initializes a Volume Shadow Snapshot.
+
+    Args:
+      identifier (str): identifier of the snapshot.
+      creation_time (Optional[dfdatetime.DateTimeValues]): creation date and
+          time of the snapshot.
+    """
+    super(VolumeSnapshot, self).__init__()
+    self.creation_time = creation_time
+    self.identifier = identifier
+
+
+class WindowsUserProfile(object):
+  """Windows user profile.
+
+  Attributes:
+    path (str): Windows path of the user profile directory, such as
+        "\\Users\\username".
+    security_identifier (str): security identifier (SID) of the user or None
+        if not available.
+    username (str): username, which is the name of the user profile
+        directory.
+  """
+
+  def __init__(self, username, path, security_identifier=None):
+    """Initializes a Windows user profile.
+
+    Args:
+      username (str): username.
+      path (str): Windows path of the user profile directory.
+      security_identifier (Optional[str]): security identifier (SID) of
+          the user.
+    """
+    super(WindowsUserProfile, self).__init__()
+    self.path = path
+    self.security_identifier = security_identifier
+    self.username = username
+
+
 class WindowsRegistryVolumeScanner(dfvfs_volume_scanner.WindowsVolumeScanner):
   """Windows Registry volume scanner.
 
   Attributes:
-    registry (dfwinreg.WinRegistry): Windows Registry.
+    registry (dfwinreg.WinRegistry|CachingWindowsRegistry): Windows Registry.
   """
 
+  _READ_BUFFER_SIZE = 16 * 1024 * 1024
+
+  # Prefix of a path in the ProfileList that refers to the system drive.
+  _SYSTEM_DRIVE_PREFIX_RE = re.compile(
+      r'^(%SystemDrive%|[A-Z]:)', re.IGNORECASE)
+
+  # Paths of the Windows Registry files of a user, relative to the user
+  # profile directory.
+  _USER_REGISTRY_FILE_PATHS = (
+      'NTUSER.DAT',
+      'AppData\\Local\\Microsoft\\Windows\\UsrClass.dat',
+      'Local Settings\\Application Data\\Microsoft\\Windows\\UsrClass.dat')
+
   def __init__(self, mediator=None):
     """Initializes a Windows Registry collector.
 
@@ -100,10 +484,36 @@ class WindowsRegistryVolumeScanner(dfvfs_volume_scanner.WindowsVolumeScanner):
     """
     super(WindowsRegistryVolumeScanner, self).__init__(mediator=mediator)
     self._single_file = False
+    self._user_profile_path = None
     self._users_path = False
 
     self.registry = None
 
+  def _GetProfilePath(self, profile_image_path):
+    """Determines the Windows path of a user profile directory.
+
+    Args:
+      profile_image_path (str): path of the user profile directory as stored
+          in the ProfileList, such as "%SystemDrive%\\Users\\username" or
+          "C:\\Users\\username".
+
+    Returns:
+      str: Windows path of the user profile directory relative to the root of
+          the volume or None if not available.
+    """
+    if not profile_image_path:
+      return None
+
+    path = self._SYSTEM_DRIVE_PREFIX_RE.sub('', profile_image_path)
+    path = path.rstrip('\\')
+    if not path:
+      return None
+
+    if not path.startswith(('\\', '%')):
+      path = f'\\{path:s}'
+
+    return path
+
   def _GetUsername(self, options):
     """Determines the username.
 
@@ -117,28 +527,13 @@ class WindowsRegistryVolumeScanner(dfvfs_volume_scanner.WindowsVolumeScanner):
       ScannerError: if the scanner does not know how to proceed.
       UserAbort: if the user requested to abort.
     """
-    usernames = []
-
-    # TODO: handle alternative users path locations
-    self._users_path = '\\Users'
-    users_path_spec = self._path_resolver.ResolvePath(self._users_path)
-    if not users_path_spec:
-      self._users_path = '\\Documents and Settings'
-      users_path_spec = self._path_resolver.ResolvePath(self._users_path)
-
-    if users_path_spec:
-      users_file_entry = dfvfs_resolver.Resolver.OpenFileEntry(
-          users_path_spec)
-      for sub_file_entry in users_file_entry.sub_file_entries:
-        if sub_file_entry.IsDirectory():
-          usernames.append(sub_file_entry.name)
-
+    usernames = self._GetUsernames()
     if not usernames:
       return None
 
     # Handle options without an username.
     if hasattr(options, 'username'):
-      if options.username == ['none']:
+      if options.username in (['all'], ['none']):
         return None
 
       if options.username:
@@ -161,6 +556,160 @@ class WindowsRegistryVolumeScanner(dfvfs_volume_scanner.WindowsVolumeScanner):
 
     return username
 
+  def _GetUsernames(self):
+    """Determines the usernames from the user profile directories.
+
+    Returns:
+      list[str]: usernames.
+    """
+    usernames = []
+
+    # TODO: handle alternative users path locations
+    self._users_path = '\\Users'
+    users_path_spec = self._path_resolver.ResolvePath(self._users_path)
+    if not users_path_spec:
+      self._users_path = '\\Documents and Settings'
+      users_path_spec = self._path_resolver.ResolvePath(self._users_path)
+
+    if users_path_spec:
+      users_file_entry = dfvfs_resolver.Resolver.OpenFileEntry(
+          users_path_spec)
+      for sub_file_entry in users_file_entry.sub_file_entries:
+        if sub_file_entry.IsDirectory():
+          usernames.append(sub_file_entry.name)
+
+    return usernames
+
+  def _GetVolumePathSpec(self):
+    """Retrieves the path specification of the volume of the file system.
+
+    Returns:
+      dfvfs.PathSpec: path specification of the volume that contains the file
+          system with the Windows directory or None if not available, such as
+          when the source is a directory.
+    """
+    if not self._file_system:
+      return None
+
+    root_file_entry = self._file_system.GetRootFileEntry()
+    if not root_file_entry:
+      return None
+
+    return root_file_entry.path_spec.parent
+
+  def GetRegistryFileDigest(self, windows_path):
+    """Calculates the SHA-256 digest of a Windows Registry file.
+
+    Args:
+      windows_path (str): Windows path of the Windows Registry file, such as
+          "%SystemRoot%\\System32\\config\\SYSTEM". The path is ignored if
+          the Registry consists of a single file.
+
+    Returns:
+      str: hexadecimal SHA-256 digest of the Windows Registry file or None if
+          not available.
+    """
+    if self._single_file:
+      # pylint: disable=consider-using-with
+      file_object = open(self._source_path, 'rb')
+    elif self._path_resolver:
+      file_object = self.OpenFile(windows_path)
+    else:
+      file_object = None
+
+    if not file_object:
+      return None
+
+    try:
+      hash_context = hashlib.sha256()
+
+      data = file_object.read(self._READ_BUFFER_SIZE)
+      while data:
+        hash_context.update(data)
+        data = file_object.read(self._READ_BUFFER_SIZE)
+
+    finally:
+      file_object.close()
+
+    return hash_context.hexdigest()
+
+  def GetSnapshots(self):
+    """Retrieves the Volume Shadow Snapshots of the Windows volume.
+
+    Returns:
+      list[VolumeSnapshot]: snapshots, from the oldest to the most recent
+          one.
+    """
+    if self._single_file:
+      return []
+
+    volume_path_spec = self._GetVolumePathSpec()
+    if not volume_path_spec:
+      return []
+
+    vshadow_path_spec = dfvfs_path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_VSHADOW, location='/',
+        parent=volume_path_spec)
+
+    volume_system = dfvfs_vshadow_volume_system.VShadowVolumeSystem()
+    try:
+      volume_system.Open(vshadow_path_spec)
+    except (dfvfs_errors.BackEndError, dfvfs_errors.VolumeSystemError):
+      # The volume does not contain Volume Shadow Snapshots.
+      return []
+
+    snapshots = []
+    for volume in volume_system.volumes:
+      creation_time = None
+      volume_attribute = volume.GetAttribute('creation_time')
+      if volume_attribute and volume_attribute.value:
+        creation_time = dfdatetime_filetime.Filetime(
+            timestamp=volume_attribute.value)
+
+      snapshots.append(VolumeSnapshot(
+          volume.identifier, creation_time=creation_time))
+
+    return snapshots
+
+  def GetUserProfiles(self):
+    """Retrieves the user profiles.
+
+    The user profiles are determined from the user profile directories, such
+    as those in "\\Users", and the ProfileList in the SOFTWARE Windows
+    Registry file, which provides the security identifiers (SIDs) of the
+    users.
+
+    Returns:
+      list[WindowsUserProfile]: user profiles, where user profiles in
+          the ProfileList without a profile directory are ignored.
+    """
+    if self._single_file or not self._path_resolver:
+      return []
+
+    user_profiles_per_path = {}
+    for username in self._GetUsernames():
+      path = f'{self._users_path:s}\\{username:s}'
+      user_profiles_per_path[path.upper()] = WindowsUserProfile(username, path)
+
+    collector_object = profiles.UserProfilesCollector()
+    for user_profile in collector_object.Collect(self.registry):
+      path = self._GetProfilePath(user_profile.profile_path)
+      if not path:
+        continue
+
+      windows_user_profile = user_profiles_per_path.get(path.upper(), None)
+      if windows_user_profile:
+        windows_user_profile.security_identifier = (
+            user_profile.security_identifier)
+
+      elif self._path_resolver.ResolvePath(path):
+        _, _, username = path.rpartition('\\')
+        user_profiles_per_path[path.upper()] = WindowsUserProfile(
+            username, path,
+            security_identifier=user_profile.security_identifier)
+
+    return list(user_profiles_per_path.values())
+
   def IsSingleFileRegistry(self):
     """Determines if the Registry consists of a single file.
 
@@ -169,6 +718,94 @@ class WindowsRegistryVolumeScanner(dfvfs_volume_scanner.WindowsVolumeScanner):
     """
     return self._single_file
 
+  def ReadSnapshotRegistryFiles(self, snapshot, windows_paths):
+    """Reads Windows Registry files from a Volume Shadow Snapshot.
+
+    Args:
+      snapshot (VolumeSnapshot): snapshot.
+      windows_paths (list[str]): Windows paths of the Windows Registry files,
+          such as "%SystemRoot%\\System32\\config\\SYSTEM", where
+          %UserProfile% refers to the profile of the selected user.
+
+    Returns:
+      dict[str, bytes]: data of the Windows Registry files per Windows path,
+          which can be read with DataWindowsRegistryFileReader, where Windows
+          Registry files that do not exist in the snapshot are omitted.
+    """
+    volume_path_spec = self._GetVolumePathSpec()
+    if not volume_path_spec:
+      return {}
+
+    vshadow_path_spec = dfvfs_path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_VSHADOW,
+        location=f'/{snapshot.identifier:s}', parent=volume_path_spec)
+
+    if (dfvfs_definitions.PREFERRED_NTFS_BACK_END ==
+        dfvfs_definitions.TYPE_INDICATOR_TSK):
+      location = '/'
+    else:
+      location = '\\'
+
+    file_system_path_spec = dfvfs_path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.PREFERRED_NTFS_BACK_END, location=location,
+        parent=vshadow_path_spec)
+
+    file_system = dfvfs_resolver.Resolver.OpenFileSystem(file_system_path_spec)
+
+    path_resolver = dfvfs_windows_path_resolver.WindowsPathResolver(
+        file_system, vshadow_path_spec)
+    path_resolver.SetEnvironmentVariable('SystemRoot', self._windows_directory)
+    path_resolver.SetEnvironmentVariable('WinDir', self._windows_directory)
+
+    if self._user_profile_path:
+      path_resolver.SetEnvironmentVariable(
+          'UserProfile', self._user_profile_path)
+
+    data_per_path = {}
+    for windows_path in windows_paths:
+      path_spec = path_resolver.ResolvePath(windows_path)
+      if not path_spec:
+        continue
+
+      file_object = file_system.GetFileObjectByPathSpec(path_spec)
+      if not file_object:
+        continue
+
+      try:
+        data = file_object.read()
+      finally:
+        file_object.close()
+
+      data_per_path[windows_path] = data
+
+    return data_per_path
+
+  def ReadUserRegistryFiles(self, user_profile):
+    """Reads the Windows Registry files of a user profile.
+
+    Args:
+      user_profile (WindowsUserProfile): user profile.
+
+    Returns:
+      dict[str, bytes]: data of the Windows Registry files per Windows path,
+          such as "%UserProfile%\\NTUSER.DAT", which can be read with
+          DataWindowsRegistryFileReader.
+    """
+    data_per_path = {}
+    for relative_path in self._USER_REGISTRY_FILE_PATHS:
+      file_object = self.OpenFile(f'{user_profile.path:s}\\{relative_path:s}')
+      if not file_object:
+        continue
+
+      try:
+        data = file_object.read()
+      finally:
+        file_object.close()
+
+      data_per_path[f'%UserProfile%\\{relative_path:s}'] = data
+
+    return data_per_path
+
   def ScanForWindowsVolume(self, source_path, options=None):
     """Scans for a Windows volume.
 
@@ -198,8 +835,9 @@ class WindowsRegistryVolumeScanner(dfvfs_volume_scanner.WindowsVolumeScanner):
     elif result:
       username = self._GetUsername(options)
       if username:
+        self._user_profile_path = f'{self._users_path:s}\\{username:s}'
         self._path_resolver.SetEnvironmentVariable(
-            'UserProfile', f'{self._users_path:s}\\{username:s}')
+            'UserProfile', self._user_profile_path)
 
       registry_file_reader = (
           windows_registry.StorageMediaImageWindowsRegistryFileReader(
@@ -209,6 +847,12 @@ class WindowsRegistryVolumeScanner(dfvfs_volume_scanner.WindowsVolumeScanner):
       self.registry = dfwinreg_registry.WinRegistry(
           registry_file_reader=registry_file_reader)
 
+      key_cache_size = getattr(
+          options, 'key_cache_size', DEFAULT_KEY_CACHE_SIZE)
+      if key_cache_size:
+        self.registry = CachingWindowsRegistry(
+            self.registry, maximum_number_of_cached_keys=key_cache_size)
+
     return bool(registry_file_reader)
 
 
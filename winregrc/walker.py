@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""Single-pass Windows Registry key walker."""
+
+import fnmatch
+
+
+class KeyPathSubscription(object):
+  """Key path subscription.
+
+  Attributes:
+    callback (function): function that is called with a matching Windows
+        Registry key.
+    key_path_pattern (str): key path pattern.
+    recursive (bool): True if the callback should also be called for all
+        descendants of a matching key.
+  """
+
+  def __init__(self, key_path_pattern, callback, recursive=False):
+    """Initializes a key path subscription.
+
+    Args:
+      key_path_pattern (str): key path pattern.
+      callback (function): function that is called with a matching Windows
+          Registry key.
+      recursive (Optional[bool]): True if the callback should also be called
+          for all descendants of a matching key.
+    """
+    super(KeyPathSubscription, self).__init__()
+    self.callback = callback
+    self.key_path_pattern = key_path_pattern
+    self.recursive = recursive
+
+
+class _KeyPathPatternNode(object):
+  """Key path pattern node.
+
+  Attributes:
+    literal_nodes (dict[str, _KeyPathPatternNode]): child nodes per upper case
+        key name.
+    subscriptions (list[KeyPathSubscription]): subscriptions that match
+        the key path of the node.
+    wildcard_nodes (list[tuple[str, _KeyPathPatternNode]]): child nodes with
+        an upper case key name pattern that contains wildcards.
+  """
+
+  def __init__(self):
+    """Initializes a key path pattern node."""
+    super(_KeyPathPatternNode, self).__init__()
+    self.literal_nodes = {}
+    self.subscriptions = []
+    self.wildcard_nodes = []
+
+  def GetChildNode(self, key_name_upper):
+    """Retrieves or creates a child node.
+
+    Args:
+      key_name_upper (str): upper case key name or key name pattern.
+
+    Returns:
+      _KeyPathPatternNode: child node.
+    """
+    if not _HasWildcards(key_name_upper):
+      child_node = self.literal_nodes.get(key_name_upper, None)
+      if not child_node:
+        child_node = _KeyPathPatternNode()
+        self.literal_nodes[key_name_upper] = child_node
+
+      return child_node
+
+    for pattern, child_node in self.wildcard_nodes:
+      if pattern == key_name_upper:
+        return child_node
+
+    child_node = _KeyPathPatternNode()
+    self.wildcard_nodes.append((key_name_upper, child_node))
+    return child_node
+
+
+def _HasWildcards(key_name):
+  """Determines if a key name contains wildcards.
+
+  Args:
+    key_name (str): key name or key name pattern.
+
+  Returns:
+    bool: True if the key name contains wildcards.
+  """
+  return '*' in key_name or '?' in key_name or '[' in key_name
+
+
+class WindowsRegistryKeyWalker(object):
+  """Single-pass Windows Registry key walker.
+
+  The walker compiles the key path patterns of all subscriptions into a tree of
+  key path segments and walks every key of interest only once. Each key is
+  dispatched to all the subscriptions that match it. A key path pattern
+  consists of key names, where a key name can contain the wildcards: "*", "?"
+  and "[...]", for example:
+  "HKEY_LOCAL_MACHINE\\System\\ControlSet*\\Services".
+
+  Attributes:
+    number_of_keys_walked (int): number of keys walked during the last walk.
+  """
+
+  _ROOT_KEY_ALIASES = {
+      'HKCC': 'HKEY_CURRENT_CONFIG',
+      'HKCR': 'HKEY_CLASSES_ROOT',
+      'HKCU': 'HKEY_CURRENT_USER',
+      'HKLM': 'HKEY_LOCAL_MACHINE',
+      'HKU': 'HKEY_USERS'}
+
+  def __init__(self):
+    """Initializes a Windows Registry key walker."""
+    super(WindowsRegistryKeyWalker, self).__init__()
+    self._root_node = _KeyPathPatternNode()
+    self._subscriptions = []
+    self._walk_completed_callbacks = []
+
+    self.number_of_keys_walked = 0
+
+  def _DispatchKey(self, registry_key, nodes, recursive_subscriptions):
+    """Dispatches a Windows Registry key to the matching subscriptions.
+
+    Args:
+      registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+      nodes (list[_KeyPathPatternNode]): nodes that match the key.
+      recursive_subscriptions (list[KeyPathSubscription]): recursive
+          subscriptions that matched an ancestor of the key.
+
+    Returns:
+      list[KeyPathSubscription]: recursive subscriptions that apply to
+          the descendants of the key.
+    """
+    dispatched_subscriptions = set()
+    for subscription in recursive_subscriptions:
+      dispatched_subscriptions.add(id(subscription))
+      subscription.callback(registry_key)
+
+    descendant_subscriptions = recursive_subscriptions
+    for node in nodes:
+      for subscription in node.subscriptions:
+        subscription_identifier = id(subscription)
+        if subscription_identifier in dispatched_subscriptions:
+          continue
+
+        dispatched_subscriptions.add(subscription_identifier)
+        subscription.callback(registry_key)
+
+        if subscription.recursive:
+          if descendant_subscriptions is recursive_subscriptions:
+            descendant_subscriptions = list(recursive_subscriptions)
+          descendant_subscriptions.append(subscription)
+
+    return descendant_subscriptions
+
+  def _GetAnchorKeys(self, registry, node, key_path_segments):
+    """Retrieves the keys from which the walk is started.
+
+    Intermediate keys that are not of interest are skipped by resolving
+    the longest literal key path from the Windows Registry directly.
+
+    Args:
+      registry (dfwinreg.WinRegistry): Windows Registry.
+      node (_KeyPathPatternNode): node.
+      key_path_segments (list[str]): key path segments of the node.
+
+    Yields:
+      tuple[dfwinreg.WinRegistryKey, _KeyPathPatternNode]: anchor key and
+          corresponding node.
+    """
+    while (not node.subscriptions and not node.wildcard_nodes and
+           len(node.literal_nodes) == 1):
+      key_name_upper, node = list(node.literal_nodes.items())[0]
+      key_path_segments = key_path_segments + [key_name_upper]
+
+    registry_key = None
+    if key_path_segments:
+      key_path = '\\'.join(key_path_segments)
+      try:
+        registry_key = registry.GetKeyByPath(key_path)
+      except RuntimeError:
+        registry_key = None
+
+      if not registry_key and (node.subscriptions or node.wildcard_nodes):
+        # Fallback to the virtual root key, which opens all the Windows
+        # Registry files, since the subkeys of the node cannot be looked up
+        # by name.
+        registry_key = registry.GetRootKey()
+        for key_name_upper in key_path_segments:
+          registry_key = registry_key.GetSubkeyByName(key_name_upper)
+          if not registry_key:
+            break
+
+    if registry_key:
+      yield registry_key, node
+
+    else:
+      # Keys above the Windows Registry file mount points, such as
+      # HKEY_LOCAL_MACHINE, cannot always be resolved hence try to resolve
+      # the child nodes individually.
+      for key_name_upper, child_node in node.literal_nodes.items():
+        yield from self._GetAnchorKeys(
+            registry, child_node, key_path_segments + [key_name_upper])
+
+  def _WalkKey(self, registry_key, nodes, recursive_subscriptions):
+    """Walks a Windows Registry key and its relevant descendants.
+
+    Args:
+      registry_key (dfwinreg.WinRegistryKey): Windows Registry key.
+      nodes (list[_KeyPathPatternNode]): nodes that match the key.
+      recursive_subscriptions (list[KeyPathSubscription]): recursive
+          subscriptions that matched an ancestor of the key.
+    """
+    self.number_of_keys_walked += 1
+
+    recursive_subscriptions = self._DispatchKey(
+        registry_key, nodes, recursive_subscriptions)
+
+    has_wildcard_nodes = False
+    for node in nodes:
+      if node.wildcard_nodes:
+        has_wildcard_nodes = True
+        break
+
+    if not recursive_subscriptions and not has_wildcard_nodes:
+      # Only subkeys with a literal name are of interest, therefore look them
+      # up by name instead of enumerating all subkeys.
+      nodes_per_key_name = {}
+      for node in nodes:
+        for key_name_upper, child_node in node.literal_nodes.items():
+          nodes_per_key_name.setdefault(key_name_upper, []).append(child_node)
+
+      for key_name_upper, child_nodes in nodes_per_key_name.items():
+        subkey = registry_key.GetSubkeyByName(key_name_upper)
+        if subkey:
+          self._WalkKey(subkey, child_nodes, recursive_subscriptions)
+
+      return
+
+    for subkey in registry_key.GetSubkeys():
+      key_name_upper = subkey.name.upper()
+
+      child_nodes = []
+      for node in nodes:
+        child_node = node.literal_nodes.get(key_name_upper, None)
+        if child_node:
+          child_nodes.append(child_node)
+
+        for pattern, child_node in node.wildcard_nodes:
+          if fnmatch.fnmatchcase(key_name_upper, pattern):
+            child_nodes.append(child_node)
+
+      if child_nodes or recursive_subscriptions:
+        self._WalkKey(subkey, child_nodes, recursive_subscriptions)
+
+  def AddSubscription(self, key_path_pattern, callback, recursive=False):
+    """Adds a subscription.
+
+    Args:
+      key_path_pattern (str): key path pattern.
+      callback (function): function that is called with a matching Windows
+          Registry key.
+      recursive (Optional[bool]): True if the callback should also be called
+          for all descendants of a matching key.
+
+    Returns:
+      KeyPathSubscription: subscription.
+
+    Raises:
+      ValueError: if the key path pattern is not supported.
+    """
+    key_path_segments = [
+        segment for segment in key_path_pattern.upper().split('\\') if segment]
+    if not key_path_segments:
+      raise ValueError('Missing key path pattern.')
+
+    root_key_name = self._ROOT_KEY_ALIASES.get(
+        key_path_segments[0], key_path_segments[0])
+    if _HasWildcards(root_key_name):
+      raise ValueError(
+          f'Unsupported key path pattern: {key_path_pattern:s} root key name '
+          f'cannot contain wildcards.')
+
+    key_path_segments[0] = root_key_name
+
+    node = self._root_node
+    for key_path_segment in key_path_segments:
+      node = node.GetChildNode(key_path_segment)
+
+    subscription = KeyPathSubscription(
+        key_path_pattern, callback, recursive=recursive)
+    node.subscriptions.append(subscription)
+    self._subscriptions.append(subscription)
+
+    return subscription
+
+  def AddWalkCompletedCallback(self, callback):
+    """Adds a callback that is called when a walk has completed.
+
+    This allows a subscriber to post-process the keys it was dispatched, for
+    example to look up a fallback key when no key of interest was found.
+
+    Args:
+      callback (function): function that is called with the Windows Registry
+          after all the keys of interest were dispatched.
+    """
+    self._walk_completed_callbacks.append(callback)
+
+  def Walk(self, registry):
+    """Walks the Windows Registry and dispatches the keys of interest.
+
+    Args:
+      registry (dfwinreg.WinRegistry): Windows Registry.
+    """
+    self.number_of_keys_walked = 0
+
+    for anchor_key, node in self._GetAnchorKeys(registry, self._root_node, []):
+      self._WalkKey(anchor_key, [node], [])
+
+    for callback in self._walk_completed_callbacks:
+      callback(registry)